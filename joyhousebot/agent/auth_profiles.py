@@ -27,6 +27,12 @@ def save_profile_usage(usage: dict[str, dict[str, Any]]) -> None:
     store.set_sync_json(name=_USAGE_SYNC_KEY, value=usage)
 
 
+async def save_profile_usage_async(usage: dict[str, dict[str, Any]]) -> None:
+    """save_profile_usage on the state store's executor (snapshot taken on the caller's thread)."""
+    snapshot = {key: dict(value) for key, value in usage.items()}
+    await LocalStateStore.default().aio.set_sync_json(name=_USAGE_SYNC_KEY, value=snapshot)
+
+
 def classify_failover_reason(text: str) -> str:
     msg = (text or "").lower()
     if any(x in msg for x in ("insufficient", "credit", "billing", "payment", "quota exceeded")):
@@ -161,6 +167,11 @@ def build_auth_profiles_report(config: Any, now_ms: float | None = None) -> dict
             "cooldownUntilMs": stats.get("cooldown_until_ms"),
             "disabledUntilMs": stats.get("disabled_until_ms"),
             "unusableUntilMs": int(unusable_until) if unusable_until > 0 else None,
+            # Live routing stats mirrored by the agent's ModelRouter.
+            "latencyEwmaMs": stats.get("latency_ewma_ms"),
+            "ttftEwmaMs": stats.get("ttft_ewma_ms"),
+            "errorRate": stats.get("error_rate"),
+            "rateLimitRate": stats.get("rate_limit_rate"),
         }
         rows.append(row)
         summary = by_provider.setdefault(
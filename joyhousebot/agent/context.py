@@ -9,7 +9,9 @@ from typing import Any
 from loguru import logger
 
 from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.agent.prompt_cache import PromptSectionCache, env_signature, stat_signature
 from joyhousebot.agent.skills import SkillsLoader
+from joyhousebot.utils.tokens import message_tokens
 
 
 class ContextBuilder:
@@ -26,58 +28,141 @@ class ContextBuilder:
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self.prompt_cache = PromptSectionCache()
     
     def build_system_prompt(self, skill_names: list[str] | None = None, scope_key: str | None = None) -> str:
         """
         Build the system prompt from bootstrap files, memory, and skills.
-        
+
         Args:
             skill_names: Optional list of skills to include.
             scope_key: When set, use per-session/per-user memory (memory/<scope_key>/); else shared memory.
-        
+
         Returns:
-            Complete system prompt.
+            Complete system prompt (stable part, then volatile part; see build_system_prompt_parts).
         """
-        parts = []
-        
-        # Core identity
-        parts.append(self._get_identity())
-        
-        # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
-        if bootstrap:
-            parts.append(bootstrap)
-        
+        stable, volatile = self.build_system_prompt_parts(skill_names=skill_names, scope_key=scope_key)
+        return "\n\n---\n\n".join(part for part in (stable, volatile) if part)
+
+    def build_system_prompt_parts(
+        self, skill_names: list[str] | None = None, scope_key: str | None = None
+    ) -> tuple[str, str]:
+        """
+        Build the system prompt as (stable, volatile).
+
+        The stable part (identity, bootstrap files, skills) only changes when those
+        files do, so providers can cache it as a prompt prefix. The volatile part
+        (installed apps, plugin tools, memory, current time) comes after it.
+
+        Each section is memoized in self.prompt_cache, keyed by the stat signature of
+        its source files and the config it reads, so only sections whose inputs
+        changed are rebuilt.
+        """
+        config = self._get_config()
+        stable = [
+            # Core identity
+            self.prompt_cache.get("identity", (str(self.workspace),), self._get_identity),
+            # Bootstrap files
+            self.prompt_cache.get(
+                "bootstrap",
+                stat_signature(self.workspace / f for f in self.BOOTSTRAP_FILES),
+                self._load_bootstrap_files,
+            ),
+            self._skills_section(config),
+        ]
+        volatile = [
+            self._apps_section(config),
+            self._plugin_tools_section(),
+            self._memory_section(config, scope_key),
+            self._current_time_section(),
+        ]
+        return (
+            "\n\n---\n\n".join(part for part in stable if part),
+            "\n\n---\n\n".join(part for part in volatile if part),
+        )
+
+    def prompt_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss counts and build time per prompt section."""
+        return self.prompt_cache.stats()
+
+    @staticmethod
+    def _get_config() -> Any:
+        try:
+            from joyhousebot.config.access import get_config
+            return get_config()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _current_time_section() -> str:
+        from datetime import datetime
+        import time as _time
+        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        tz = _time.strftime("%Z") or "UTC"
+        return f"# Current Time\n\n{now} ({tz})"
+
+    def _memory_section(self, config: Any, scope_key: str | None) -> str:
         # Memory context: legacy = MEMORY.md only; with memory_use_l0 = L0 + MEMORY.md; scope_key => scoped memory
-        memory = self._get_memory_context(scope_key=scope_key)
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
-        
+        from datetime import date, timedelta
+
+        store = MemoryStore(self.workspace, scope_key=scope_key) if scope_key else self.memory
+        flags = self._memory_flags(config)
+        files = [store.memory_file, store.memory_dir / ".abstract"]
+        if flags[2]:
+            files += [store.get_l2_path((date.today() - timedelta(days=d)).isoformat()) for d in (0, 1)]
+        key = (flags, stat_signature(files))
+
+        def build() -> str:
+            memory = self._get_memory_context(scope_key=scope_key)
+            return f"# Memory\n\n{memory}" if memory else ""
+
+        return self.prompt_cache.get(f"memory:{scope_key or ''}", key, build)
+
+    def _skills_section(self, config: Any) -> str:
         # Skills - progressive loading (respect config.skills.entries enabled)
         enabled_skill_names = self._get_enabled_skill_names()
-        # 1. Always-loaded skills: include full content
-        always_skills = self.skills.get_always_skills(allowed_names=enabled_skill_names)
-        if always_skills:
-            logger.debug(f"Building context: always-loaded skills={always_skills}")
-            always_content = self.skills.load_skills_for_context(always_skills)
-            if always_content:
-                parts.append(f"# Active Skills\n\n{always_content}")
-        
-        # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary(allowed_names=enabled_skill_names)
-        if skills_summary:
-            all_skills = self.skills.list_skills(filter_unavailable=False, allowed_names=enabled_skill_names)
-            logger.debug(f"Building context: skills summary for {len(all_skills)} skills (names: {[s['name'] for s in all_skills]})")
-            parts.append(f"""# Skills
+        key = (
+            tuple(sorted(enabled_skill_names)) if enabled_skill_names is not None else None,
+            self.skills.signature(),
+            env_signature(),
+        )
+
+        def build() -> str:
+            parts = []
+            # 1. Always-loaded skills: include full content
+            always_skills = self.skills.get_always_skills(allowed_names=enabled_skill_names)
+            if always_skills:
+                logger.debug(f"Building context: always-loaded skills={always_skills}")
+                always_content = self.skills.load_skills_for_context(always_skills)
+                if always_content:
+                    parts.append(f"# Active Skills\n\n{always_content}")
+
+            # 2. Available skills: only show summary (agent uses read_file to load)
+            skills_summary = self.skills.build_skills_summary(allowed_names=enabled_skill_names)
+            if skills_summary:
+                logger.debug(f"Building context: skills summary ({skills_summary.count('<skill ')} skills)")
+                parts.append(f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
 Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
 
 {skills_summary}""")
+            return "\n\n---\n\n".join(parts)
+
+        return self.prompt_cache.get("skills", key, build)
 
+    def _apps_section(self, config: Any) -> str:
         # Installed Apps and Plugin Tools (so agent knows what app_id / plugin_invoke tool_name to use)
-        installed_apps = self._get_installed_apps_for_context()
-        if installed_apps:
+        try:
+            from joyhousebot.plugins.discovery import plugin_manifest_signature
+            key = (config, plugin_manifest_signature(self.workspace, config))
+        except Exception:
+            key = (config, None)
+
+        def build() -> str:
+            installed_apps = self._get_installed_apps_for_context()
+            if not installed_apps:
+                return ""
             lines = [
                 "Use open_app with one of these app_id values; do not guess.",
                 "",
@@ -88,36 +173,47 @@ Skills with available="false" need dependencies installed first - you can try in
                 route = (a.get("route") or "").strip()
                 if app_id:
                     lines.append(f"- app_id: {app_id} (name: {name}, route: {route})")
-            if len(lines) > 2:
-                parts.append("# Installed Apps\n\n" + "\n".join(lines))
+            return "# Installed Apps\n\n" + "\n".join(lines) if len(lines) > 2 else ""
+
+        return self.prompt_cache.get("apps", key, build)
 
-        plugin_tools = self._get_plugin_tool_names_for_context()
-        if plugin_tools:
-            parts.append(
+    def _plugin_tools_section(self) -> str:
+        try:
+            from joyhousebot.plugins.manager import get_plugin_manager
+            registry = get_plugin_manager().registry
+        except Exception:
+            registry = None
+
+        def build() -> str:
+            plugin_tools = self._get_plugin_tool_names_for_context()
+            if not plugin_tools:
+                return ""
+            return (
                 "# Plugin Tools\n\n"
                 "Use plugin_invoke with these tool names; do not guess. "
                 "Available: " + ", ".join(plugin_tools)
             )
 
-        return "\n\n---\n\n".join(parts)
+        # A plugin reload replaces the registry object.
+        return self.prompt_cache.get("plugin_tools", (registry,), build)
+
+    @staticmethod
+    def _memory_flags(config: Any) -> tuple[bool, bool, bool]:
+        """(memory_use_l0, memory_first, memory_include_daily_in_context) from config.tools.retrieval."""
+        retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
+        if retrieval is None:
+            return False, False, False
+        return (
+            bool(getattr(retrieval, "memory_use_l0", False)),
+            bool(getattr(retrieval, "memory_first", False)),
+            bool(getattr(retrieval, "memory_include_daily_in_context", False)),
+        )
 
     def _get_memory_context(self, scope_key: str | None = None) -> str:
         """Resolve memory block: config.memory_use_l0 -> L0 + MEMORY.md; else MEMORY.md only.
         Optionally add today+yesterday daily logs (memory_include_daily_in_context) and memory_first hint.
         When scope_key is set, use MemoryStore(workspace, scope_key) for per-session/per-user memory."""
-        use_l0 = False
-        memory_first = False
-        include_daily = False
-        try:
-            from joyhousebot.config.access import get_config
-            config = get_config()
-            retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
-            if retrieval is not None:
-                use_l0 = getattr(retrieval, "memory_use_l0", False)
-                memory_first = getattr(retrieval, "memory_first", False)
-                include_daily = getattr(retrieval, "memory_include_daily_in_context", False)
-        except Exception:
-            pass
+        use_l0, memory_first, include_daily = self._memory_flags(self._get_config())
         store = MemoryStore(self.workspace, scope_key=scope_key) if scope_key else self.memory
         if use_l0:
             memory = store.get_memory_context_with_l0()
@@ -162,11 +258,7 @@ Skills with available="false" need dependencies installed first - you can try in
             return []
 
     def _get_identity(self) -> str:
-        """Get the core identity section."""
-        from datetime import datetime
-        import time as _time
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
+        """Get the core identity section (no clock, so it stays cacheable; see _current_time_section)."""
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -180,9 +272,6 @@ You are joyhousebot, a helpful AI assistant. You have access to tools that allow
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now} ({tz})
-
 ## Runtime
 {runtime}
 
@@ -214,37 +303,18 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
         return "\n\n".join(parts) if parts else ""
 
     @staticmethod
-    def _estimate_message_tokens(msg: dict[str, Any]) -> int:
-        """Rough token count for one message (chars / 4 + overhead)."""
-        n = 4  # role + structure
-        content = msg.get("content")
-        if isinstance(content, str):
-            n += max(0, len(content)) // 4
-        elif isinstance(content, list):
-            for part in content:
-                if isinstance(part, dict) and part.get("type") == "text" and "text" in part:
-                    n += max(0, len(str(part["text"]))) // 4
-                else:
-                    n += 64  # placeholder for image/other
-        if msg.get("tool_calls"):
-            n += sum(max(0, len(str(t))) // 4 for t in msg.get("tool_calls", []))
-        return n
-
-    @classmethod
     def trim_history_by_tokens(
-        cls,
         history: list[dict[str, Any]],
         max_tokens: int,
     ) -> list[dict[str, Any]]:
-        """Trim history from the front so that total estimated tokens of kept messages <= max_tokens (keep tail)."""
+        """Trim history from the front so that total tokens of kept messages <= max_tokens (keep tail); uses cached per-message counts."""
         if max_tokens <= 0 or not history:
             return history
         total = 0
         start = len(history)
         for i in range(len(history) - 1, -1, -1):
-            total += cls._estimate_message_tokens(history[i])
+            total += message_tokens(history[i])
             if total > max_tokens:
-                start = i + 1
                 break
             start = i
         if start <= 0:
@@ -280,11 +350,15 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
         """
         messages = []
 
-        # System prompt
-        system_prompt = self.build_system_prompt(skill_names=skill_names, scope_key=scope_key)
+        # System prompt: stable prefix first (provider prompt caches key on it), then the
+        # volatile context as a second system message. Providers without prompt caching
+        # get the two merged into one (see LiteLLMProvider).
+        stable, volatile = self.build_system_prompt_parts(skill_names=skill_names, scope_key=scope_key)
         if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+            volatile += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+        messages.append({"role": "system", "content": stable})
+        if volatile.strip():
+            messages.append({"role": "system", "content": volatile.strip()})
 
         # History (optionally trimmed by token budget)
         if max_context_tokens is not None and max_context_tokens > 0:
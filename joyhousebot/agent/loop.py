@@ -18,7 +18,10 @@ from loguru import logger
 
 from joyhousebot.bus.events import InboundMessage, OutboundMessage
 from joyhousebot.bus.queue import MessageBus
+from joyhousebot.bus.workers import DEFAULT_MAX_CONCURRENCY, SessionWorkerPool
 from joyhousebot.providers.base import LLMProvider, LLMResponse
+from joyhousebot.providers.pool import ProviderPool, resolve_runtime_provider_settings
+from joyhousebot.providers.response_cache import CachingProvider, get_response_cache, response_cache_allowed
 from joyhousebot.utils.exceptions import (
     LLMError,
     sanitize_error_message,
@@ -42,6 +45,8 @@ from joyhousebot.agent.tools.open_app import OpenAppTool
 from joyhousebot.agent.tools.plugin_invoke import PluginInvokeTool
 from joyhousebot.agent.memory import MemoryStore
 from joyhousebot.agent.response_prefix import resolve_response_prefix
+from joyhousebot.agent.run_context import RunContext, agent_run_context, current_run_context
+from joyhousebot.agent.routing import ModelRouter
 from joyhousebot.agent.subagent import SubagentManager
 from joyhousebot.agent.auth_profiles import (
     classify_failover_reason,
@@ -50,9 +55,10 @@ from joyhousebot.agent.auth_profiles import (
     mark_profile_failure,
     mark_profile_success,
     resolve_profile_order,
-    save_profile_usage,
+    save_profile_usage_async,
 )
-from joyhousebot.session.manager import Session, SessionManager
+from joyhousebot.session.manager import Session, SessionManager, default_sessions_dir
+from joyhousebot.session.usage_ledger import UsageLedger
 from joyhousebot.plugins.hooks.types import (
     HookName,
     HookContext,
@@ -139,6 +145,7 @@ class AgentLoop:
         transcribe_provider: Any = None,
         mcp_memory_search_callable: Any = None,
         mcp_knowledge_search_callable: Any = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ):
         from joyhousebot.config.schema import ExecToolConfig
         from joyhousebot.cron.service import CronService
@@ -154,6 +161,7 @@ class AgentLoop:
         self.max_tokens = max_tokens
         self.memory_window = memory_window
         self.max_context_tokens = max_context_tokens
+        self.max_concurrency = max(1, int(max_concurrency or 1))
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
@@ -161,9 +169,18 @@ class AgentLoop:
         self.config = config
         self.transcribe_provider = transcribe_provider
         self._auth_profile_usage = load_profile_usage()
+        self.provider_pool = ProviderPool()
+        routing_config = getattr(getattr(getattr(config, "agents", None), "defaults", None), "routing", None)
+        self.router = ModelRouter(routing_config, profile_usage=self._auth_profile_usage)
+        self.response_cache = get_response_cache(config)
 
         self.context = ContextBuilder(workspace)
-        self.sessions = session_manager or SessionManager(workspace)
+        sessions_config = getattr(self.config, "sessions", None)
+        self.sessions = session_manager or SessionManager(workspace, sessions_config=sessions_config)
+        self.usage_ledger: UsageLedger | None = (
+            UsageLedger(default_sessions_dir() / "usage.db")
+            if getattr(sessions_config, "usage_ledger", True) else None
+        )
         optional_allowlist = []
         if self.config is not None:
             optional_allowlist = list(getattr(getattr(self.config, "tools", None), "optional_allowlist", []) or [])
@@ -180,6 +197,8 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            provider_pool=self.provider_pool,
+            router=self.router,
         )
         
         self._running = False
@@ -192,7 +211,7 @@ class AgentLoop:
         self._approval_resolve_fn = approval_resolve_fn
         self._mcp_memory_search_callable = mcp_memory_search_callable
         self._mcp_knowledge_search_callable = mcp_knowledge_search_callable
-        self._current_session_key: str = ""
+        self._workers: SessionWorkerPool | None = None
         self._register_default_tools()
 
     @staticmethod
@@ -230,7 +249,8 @@ class AgentLoop:
             return None
 
         async def _wrapped(command: str, timeout_ms: int, request_id: str | None = None) -> str | None:
-            sk = getattr(self, "_current_session_key", None) or ""
+            run_ctx = current_run_context()
+            sk = run_ctx.session_key if run_ctx is not None else ""
             return await self._exec_approval_request(
                 command, timeout_ms, request_id, session_key=sk
             )
@@ -258,6 +278,12 @@ class AgentLoop:
         return ""
 
     def _build_runtime_provider(self, *, model: str, profile_id: str | None) -> LLMProvider:
+        provider = self._pooled_runtime_provider(model=model, profile_id=profile_id)
+        if self.response_cache is not None:
+            return CachingProvider(provider, self.response_cache)
+        return provider
+
+    def _pooled_runtime_provider(self, *, model: str, profile_id: str | None) -> LLMProvider:
         if self.config is None:
             return self.provider
         try:
@@ -267,33 +293,13 @@ class AgentLoop:
         if not isinstance(self.provider, LiteLLMProvider):
             return self.provider
 
-        provider_name = self._resolve_provider_name_for_model(model) or self.config.get_provider_name(model)
-        base_cfg = self.config.get_provider(model)
-        api_key = base_cfg.api_key if base_cfg else None
-        api_base = self.config.get_api_base(model)
-        extra_headers = dict(base_cfg.extra_headers or {}) if base_cfg else {}
-
-        if profile_id:
-            profile = (getattr(self.config, "auth", None).profiles or {}).get(profile_id)
-            if profile is not None:
-                if getattr(profile, "api_key", ""):
-                    api_key = profile.api_key
-                elif getattr(profile, "token", ""):
-                    api_key = profile.token
-                if getattr(profile, "api_base", None):
-                    api_base = profile.api_base
-                if getattr(profile, "extra_headers", None):
-                    extra_headers.update(dict(profile.extra_headers))
-                if getattr(profile, "provider", ""):
-                    provider_name = str(profile.provider).strip() or provider_name
-
-        return LiteLLMProvider(
-            api_key=api_key,
-            api_base=api_base,
-            default_model=model,
-            extra_headers=extra_headers or None,
-            provider_name=provider_name or None,
+        settings = resolve_runtime_provider_settings(
+            self.config,
+            model=model,
+            profile_id=profile_id,
+            provider_name=self._resolve_provider_name_for_model(model) or self.config.get_provider_name(model),
         )
+        return self.provider_pool.get(settings)
 
     def _resolve_profile_candidates(self, provider_name: str) -> list[str | None]:
         if self.config is None or not provider_name:
@@ -313,6 +319,149 @@ class AgentLoop:
         ordered = available if available else in_cooldown
         return [None] + ordered
 
+    async def _invoke_provider(
+        self,
+        runtime_provider: LLMProvider,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        stream_callback: Callable[[str], Awaitable[None]] | None = None,
+        on_first_token: Callable[[], None] | None = None,
+    ) -> tuple[LLMResponse, float | None]:
+        """
+        One model call, streamed when stream_callback is set and the provider supports it.
+
+        Returns the response and the monotonic time of its first token (first delta, or
+        the successful completion when nothing was streamed). on_first_token fires then.
+        """
+        first_token_at: float | None = None
+
+        def _first_token() -> None:
+            nonlocal first_token_at
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+                if on_first_token is not None:
+                    on_first_token()
+
+        if stream_callback is not None and hasattr(runtime_provider, "chat_stream"):
+            response: LLMResponse | None = None
+            try:
+                async for kind, data in runtime_provider.chat_stream(
+                    messages=messages,
+                    tools=tools,
+                    model=model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                ):
+                    if kind == "delta" and isinstance(data, str):
+                        _first_token()
+                        await stream_callback(data)
+                    elif kind == "done" and data is not None:
+                        response = data
+                        break
+            except asyncio.TimeoutError:
+                response = LLMResponse(content="Stream timeout", finish_reason="error")
+                logger.warning(f"Stream timeout for model {model}")
+            except ConnectionError as e:
+                response = LLMResponse(content=f"Connection error: {sanitize_error_message(str(e))}", finish_reason="error")
+                logger.error(f"Stream connection error for model {model}")
+            except Exception as e:
+                code, _, _ = classify_exception(e)
+                sanitized = sanitize_error_message(str(e))
+                response = LLMResponse(content=f"Stream error [{code}]: {sanitized}", finish_reason="error")
+                logger.error(f"Stream error [{code}] for model {model}: {sanitized}")
+            if response is None:
+                response = LLMResponse(content="Stream ended without response", finish_reason="error")
+        else:
+            response = await runtime_provider.chat(
+                messages=messages,
+                tools=tools,
+                model=model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+        if response.finish_reason != "error":
+            _first_token()
+        return response, first_token_at
+
+    async def _invoke_hedged(
+        self,
+        contestants: list[tuple[str, str | None, LLMProvider]],
+        *,
+        hedge_delay_s: float,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        stream_callback: Callable[[str], Awaitable[None]] | None,
+    ) -> tuple[int, LLMResponse, float, float | None]:
+        """
+        Call contestants[0]; if it has no first token within hedge_delay_s, also call
+        contestants[1]. The first to produce a token wins (only its deltas are streamed)
+        and the other is cancelled. Returns (winner index, response, started_at, first_token_at).
+        """
+        winner: int | None = None
+        decided = asyncio.Event()
+        started: dict[int, float] = {}
+        tasks: dict[int, asyncio.Task[tuple[LLMResponse, float | None]]] = {}
+
+        def _start(i: int) -> None:
+            model, _, runtime_provider = contestants[i]
+
+            def _on_first_token() -> None:
+                nonlocal winner
+                if winner is None:
+                    winner = i
+                    decided.set()
+
+            async def _gated(delta: str) -> None:
+                if winner == i and stream_callback is not None:
+                    await stream_callback(delta)
+
+            started[i] = time.monotonic()
+            tasks[i] = asyncio.create_task(self._invoke_provider(
+                runtime_provider,
+                model=model,
+                messages=messages,
+                tools=tools,
+                stream_callback=_gated if stream_callback is not None else None,
+                on_first_token=_on_first_token,
+            ))
+
+        decided_waiter = asyncio.create_task(decided.wait())
+        try:
+            _start(0)
+            done, _ = await asyncio.wait(
+                {tasks[0], decided_waiter}, timeout=hedge_delay_s, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.info(
+                    f"Hedging {contestants[0][0]}: no first token in {hedge_delay_s:.2f}s, "
+                    f"also calling {contestants[1][0]}"
+                )
+                _start(1)
+            while winner is None:
+                pending = [t for t in tasks.values() if not t.done()]
+                if not pending:
+                    break
+                await asyncio.wait({*pending, decided_waiter}, return_when=asyncio.FIRST_COMPLETED)
+            # Nobody produced a token: every started call failed; report the primary's error.
+            chosen = winner if winner is not None else 0
+            for i, task in tasks.items():
+                if i != chosen and not task.done():
+                    model, profile_id, _ = contestants[i]
+                    self.router.record_slow(
+                        model, profile_id, waited_ms=(time.monotonic() - started[i]) * 1000
+                    )
+            response, first_token_at = await tasks[chosen]
+            return chosen, response, started[chosen], first_token_at
+        finally:
+            decided_waiter.cancel()
+            losers = [t for t in tasks.values() if not t.done()]
+            for task in losers:
+                task.cancel()
+            # Let cancelled calls unwind (closing their HTTP streams) before returning.
+            await asyncio.gather(*losers, return_exceptions=True)
+
     async def _call_provider_with_fallback(
         self,
         *,
@@ -337,13 +486,15 @@ class AgentLoop:
             candidates = available
         elif in_cooldown:
             candidates = in_cooldown
+        candidates = self.router.order_models(candidates)
         last_response: LLMResponse | None = None
         stream_used = False
         for idx, candidate in enumerate(candidates):
-            provider_name = self._resolve_provider_name_for_model(candidate)
-            profile_candidates = self._resolve_profile_candidates(provider_name)
+            profile_candidates = self._ordered_profile_candidates(candidate)
             for pidx, profile_id in enumerate(profile_candidates):
                 runtime_provider = self._build_runtime_provider(model=candidate, profile_id=profile_id)
+                # The model/profile actually answering; differs from the loop's when a hedge wins.
+                used_model, used_profile = candidate, profile_id
                 use_stream = (
                     allow_stream
                     and stream_callback is not None
@@ -351,54 +502,57 @@ class AgentLoop:
                     and idx == 0
                     and pidx == 0
                 )
-                if use_stream and hasattr(runtime_provider, "chat_stream"):
-                    response: LLMResponse | None = None
-                    stream_buffer: list[str] = []
-                    try:
-                        async for kind, data in runtime_provider.chat_stream(
-                            messages=messages,
-                            tools=tools,
-                            model=candidate,
-                            temperature=self.temperature,
-                            max_tokens=self.max_tokens,
-                        ):
-                            if kind == "delta" and isinstance(data, str):
-                                stream_buffer.append(data)
-                                if stream_callback is not None:
-                                    await stream_callback(data)
-                            elif kind == "done" and data is not None:
-                                response = data
-                                break
-                    except asyncio.TimeoutError:
-                        response = LLMResponse(content="Stream timeout", finish_reason="error")
-                        logger.warning(f"Stream timeout for model {candidate}")
-                    except ConnectionError as e:
-                        response = LLMResponse(content=f"Connection error: {sanitize_error_message(str(e))}", finish_reason="error")
-                        logger.error(f"Stream connection error for model {candidate}")
-                    except Exception as e:
-                        code, _, _ = classify_exception(e)
-                        sanitized = sanitize_error_message(str(e))
-                        response = LLMResponse(content=f"Stream error [{code}]: {sanitized}", finish_reason="error")
-                        logger.error(f"Stream error [{code}] for model {candidate}: {sanitized}")
-                    if response is None:
-                        response = LLMResponse(content="Stream ended without response", finish_reason="error")
-                    stream_used = True
-                else:
-                    response = await runtime_provider.chat(
+                hedge_delay_s = (
+                    self.router.hedge_delay_s(candidate, profile_id)
+                    if idx == 0 and pidx == 0 and len(candidates) > 1
+                    else None
+                )
+                if hedge_delay_s is not None:
+                    hedge_model = candidates[1]
+                    hedge_profile = self._ordered_profile_candidates(hedge_model)[0]
+                    contestants = [
+                        (candidate, profile_id, runtime_provider),
+                        (hedge_model, hedge_profile, self._build_runtime_provider(model=hedge_model, profile_id=hedge_profile)),
+                    ]
+                    won, response, started_at, first_token_at = await self._invoke_hedged(
+                        contestants,
+                        hedge_delay_s=hedge_delay_s,
                         messages=messages,
                         tools=tools,
+                        stream_callback=stream_callback if use_stream else None,
+                    )
+                    used_model, used_profile, runtime_provider = contestants[won]
+                else:
+                    started_at = time.monotonic()
+                    response, first_token_at = await self._invoke_provider(
+                        runtime_provider,
                         model=candidate,
-                        temperature=self.temperature,
-                        max_tokens=self.max_tokens,
+                        messages=messages,
+                        tools=tools,
+                        stream_callback=stream_callback if use_stream else None,
                     )
+                if use_stream:
+                    stream_used = True
+                provider_name = self._resolve_provider_name_for_model(used_model)
+                reason = ""
+                if response.finish_reason == "error":
+                    reason = str(response.error_kind or "").strip() or classify_failover_reason(response.content or "")
+                self.router.record(
+                    used_model,
+                    used_profile,
+                    latency_ms=(time.monotonic() - started_at) * 1000,
+                    ttft_ms=(first_token_at - started_at) * 1000 if first_token_at is not None else None,
+                    ok=response.finish_reason != "error",
+                    reason=reason,
+                )
                 if response.finish_reason != "error":
-                    if profile_id:
-                        mark_profile_success(self._auth_profile_usage, profile_id)
-                        save_profile_usage(self._auth_profile_usage)
-                    self._mark_model_success(candidate)
-                    if candidate != primary_model:
-                        logger.warning(f"Model fallback selected: {primary_model} -> {candidate}")
-                    return response, candidate
+                    if used_profile:
+                        mark_profile_success(self._auth_profile_usage, used_profile)
+                        await save_profile_usage_async(self._auth_profile_usage)
+                    self._mark_model_success(used_model)
+                    if used_model != primary_model:
+                        logger.warning(f"Model fallback selected: {primary_model} -> {used_model}")
+                    return response, used_model
                 # DeepSeek occasionally reports invalid tools name on long legacy sessions.
                 # Retry once with a shorter context (keep system + most recent turns).
                 err_text = str(response.content or "")
@@ -408,15 +562,17 @@ class AgentLoop:
                     and len(messages) > 8
                 ):
                     compact_messages: list[dict[str, Any]] = []
-                    if messages and isinstance(messages[0], dict) and messages[0].get("role") == "system":
-                        compact_messages.append(messages[0])
+                    for m in messages[:2]:
+                        if not (isinstance(m, dict) and m.get("role") == "system"):
+                            break
+                        compact_messages.append(m)
                     recent = [m for m in messages[-6:] if isinstance(m, dict)]
                     compact_messages.extend(recent)
                     try:
                         retry_response = await runtime_provider.chat(
                             messages=compact_messages,
                             tools=tools,
-                            model=candidate,
+                            model=used_model,
                             temperature=self.temperature,
                             max_tokens=self.max_tokens,
                         )
@@ -424,21 +580,20 @@ class AgentLoop:
                             logger.warning(
                                 "Recovered from provider tool-name validation error by using compact history"
                             )
-                            return retry_response, candidate
+                            return retry_response, used_model
                     except Exception:
                         pass
                 last_response = response
-                reason = str(response.error_kind or "").strip() or classify_failover_reason(response.content or "")
-                if profile_id and self.config is not None:
+                if used_profile and self.config is not None:
                     mark_profile_failure(
                         self._auth_profile_usage,
-                        profile_id=profile_id,
+                        profile_id=used_profile,
                         provider=provider_name,
                         reason=reason,
                         config=self.config,
                     )
-                    save_profile_usage(self._auth_profile_usage)
-                self._mark_model_failure(candidate)
+                    await save_profile_usage_async(self._auth_profile_usage)
+                self._mark_model_failure(used_model)
                 if pidx < len(profile_candidates) - 1:
                     logger.warning(
                         f"Model call failed on {candidate} profile={profile_id}, trying next profile"
@@ -447,6 +602,11 @@ class AgentLoop:
                 logger.warning(f"Model call failed on {candidate}, trying fallback")
         return last_response or LLMResponse(content="All models failed", finish_reason="error"), primary_model
 
+    def _ordered_profile_candidates(self, model: str) -> list[str | None]:
+        """Profile candidates for model: the base provider config first, then profiles in routing order."""
+        profile_candidates = self._resolve_profile_candidates(self._resolve_provider_name_for_model(model))
+        return profile_candidates[:1] + self.router.order_profiles(model, profile_candidates[1:])
+
     def _mark_model_success(self, model: str) -> None:
         self._model_failure_count.pop(model, None)
         self._model_cooldown_until.pop(model, None)
@@ -586,7 +746,6 @@ class AgentLoop:
                 from joyhousebot.services.knowledge_pipeline import (
                     KnowledgePipelineQueue,
                     start_watcher,
-                    sync_processed_dir_to_store,
                 )
                 ingest_cfg = getattr(self.config.tools, "ingest", None)
                 self._knowledge_queue = KnowledgePipelineQueue(
@@ -596,11 +755,7 @@ class AgentLoop:
                     ingest_config=ingest_cfg,
                     pipeline_config=kp,
                 )
-                chunk_sz = getattr(kp, "convert_chunk_size", 1200)
-                chunk_ol = getattr(kp, "convert_chunk_overlap", 200)
-                n = sync_processed_dir_to_store(self.workspace, processed_dir, chunk_size=chunk_sz, chunk_overlap=chunk_ol)
-                if n > 0:
-                    logger.debug(f"Knowledge pipeline: synced {n} processed files to index")
+                # start() resumes unfinished work and reconciles the source dir with the ingestion ledger.
                 self._knowledge_queue.start()
                 self._knowledge_watcher_thread = start_watcher(
                     self.workspace, source_dir, processed_dir, self._knowledge_queue, config=self.config
@@ -683,28 +838,120 @@ class AgentLoop:
             return f"{channel}:{user_id}"
         return None
 
-    def _set_tool_context(self, channel: str, chat_id: str) -> None:
-        """Update context for all tools that need routing info."""
-        if message_tool := self.tools.get("message"):
-            if isinstance(message_tool, MessageTool):
-                message_tool.set_context(channel, chat_id)
-
-        if spawn_tool := self.tools.get("spawn"):
-            if isinstance(spawn_tool, SpawnTool):
-                spawn_tool.set_context(channel, chat_id)
-
-        if cron_tool := self.tools.get("cron"):
-            if isinstance(cron_tool, CronTool):
-                cron_tool.set_context(channel, chat_id)
-
-    def _set_memory_scope(self, scope_key: str | None) -> None:
-        """Set memory scope for retrieve and memory_get tools (per-session/per-user isolation)."""
-        if retrieve_tool := self.tools.get("retrieve"):
-            if hasattr(retrieve_tool, "set_memory_scope"):
-                retrieve_tool.set_memory_scope(scope_key)
-        if memory_get_tool := self.tools.get("memory_get"):
-            if hasattr(memory_get_tool, "set_memory_scope"):
-                memory_get_tool.set_memory_scope(scope_key)
+    def _parallel_tool_calls_enabled(self) -> bool:
+        tools_cfg = getattr(self.config, "tools", None) if self.config else None
+        return bool(tools_cfg and getattr(tools_cfg, "parallel_tool_calls", False))
+
+    def _max_parallel_tool_calls(self) -> int:
+        tools_cfg = getattr(self.config, "tools", None) if self.config else None
+        return max(1, int(getattr(tools_cfg, "max_parallel_tool_calls", 4) or 1))
+
+    def _plan_tool_batches(self, tool_calls: list[Any]) -> list[list[Any]]:
+        """Split one turn's tool calls into ordered batches.
+
+        With parallel_tool_calls off every call is its own batch. With it on, consecutive
+        calls to parallel_safe tools share a batch (run concurrently); any other call is a
+        barrier so side effects stay ordered relative to the calls around it.
+        """
+        if not self._parallel_tool_calls_enabled():
+            return [[tc] for tc in tool_calls]
+        batches: list[list[Any]] = []
+        prev_safe = False
+        for tc in tool_calls:
+            name = tc.name.strip() if isinstance(tc.name, str) else ""
+            safe = bool(name) and self.tools.is_parallel_safe(name)
+            if safe and prev_safe:
+                batches[-1].append(tc)
+            else:
+                batches.append([tc])
+            prev_safe = safe
+        return batches
+
+    async def _execute_tool_call(
+        self,
+        tool_call: Any,
+        *,
+        suppress_tool_errors: bool,
+        execution_stream_callback: Callable[[str, dict], Awaitable[None]] | None = None,
+    ) -> tuple[str, str, bool]:
+        """Run one tool call with its before/after hooks.
+
+        Returns (tool_name, result, executed); executed is False when the call was
+        rejected (missing name) or blocked by a hook.
+        """
+        tool_name = (tool_call.name or "").strip() if isinstance(tool_call.name, str) else ""
+        tool_args = tool_call.arguments if isinstance(tool_call.arguments, dict) else {}
+        if not tool_name:
+            logger.warning("Tool call with empty name; returning error result to keep message sync")
+            return tool_call.name or "", "Error: invalid tool call (missing name or arguments).", False
+
+        hook_dispatcher = get_hook_dispatcher()
+        run_ctx = current_run_context()
+        hook_ctx = HookContext(
+            session_key=run_ctx.session_key if run_ctx is not None else "",
+            channel=run_ctx.channel if run_ctx is not None else "",
+        )
+
+        before_event = BeforeToolCallEvent(
+            tool_name=tool_name,
+            params=dict(tool_args),
+        )
+        before_result = await hook_dispatcher.emit_first_result(
+            HookName.BEFORE_TOOL_CALL, before_event, hook_ctx
+        )
+
+        if before_result and isinstance(before_result, BeforeToolCallResult):
+            if before_result.block:
+                logger.info(f"Tool {tool_name} blocked by hook: {before_result.block_reason}")
+                return tool_name, before_result.block_reason or "Tool execution blocked by plugin", False
+            if before_result.params:
+                tool_args = before_result.params
+
+        args_str = json.dumps(tool_args, ensure_ascii=False)
+        logger.info(f"Tool call: {tool_name}({args_str[:200]})")
+        started_at_ms = int(time.time() * 1000)
+        started = time.perf_counter()
+        if execution_stream_callback:
+            await execution_stream_callback(
+                "tool_start",
+                {
+                    "tool": tool_name,
+                    "args": tool_args,
+                    "tool_call_id": tool_call.id,
+                    "started_at_ms": started_at_ms,
+                },
+            )
+        result = await self.tools.execute(
+            tool_name,
+            tool_args,
+            execution_stream_callback=execution_stream_callback,
+        )
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        if execution_stream_callback:
+            await execution_stream_callback(
+                "tool_end",
+                {
+                    "tool": tool_name,
+                    "result": result,
+                    "tool_call_id": tool_call.id,
+                    "started_at_ms": started_at_ms,
+                    "duration_ms": duration_ms,
+                },
+            )
+        if suppress_tool_errors and (result or "").strip().startswith("Error"):
+            logger.debug(f"Tool {tool_name} error (suppressed for user): {result[:300]}")
+            result = "Error: Tool execution failed."
+
+        after_event = AfterToolCallEvent(
+            tool_name=tool_name,
+            params=dict(tool_args),
+            result=result,
+        )
+        await hook_dispatcher.emit(HookName.AFTER_TOOL_CALL, after_event, hook_ctx)
+
+        preview = (result[:500] + "...") if len(result) > 500 else result
+        logger.debug(f"Tool {tool_name} result (preview, {duration_ms}ms): {preview}")
+        return tool_name, result, True
 
     async def _run_agent_loop(
         self,
@@ -719,7 +966,7 @@ class AgentLoop:
         Args:
             initial_messages: Starting messages for the LLM conversation.
             stream_callback: If set and provider supports chat_stream, called with each content delta.
-            execution_stream_callback: If set, called with (event_type, payload) for llm_delta, tool_start, tool_output, tool_end, final.
+            execution_stream_callback: If set, called with (event_type, payload) for llm_delta, llm_end (per-iteration timing), tool_start, tool_output, tool_end, final.
             check_abort_requested: If set, called at start of each iteration with current run_id; when True, loop breaks and returns (None, tools_used, True, None).
 
         Returns:
@@ -732,7 +979,17 @@ class AgentLoop:
         tools_used: list[str] = []
         active_model = self.model
 
+        streamed_any = False
+        first_delta_at: float | None = None
+
         async def _stream_cb(content: str) -> None:
+            nonlocal streamed_any, first_delta_at
+            if first_delta_at is None:
+                first_delta_at = time.monotonic()
+                # Keep text from successive iterations apart in cumulative stream consumers.
+                if streamed_any:
+                    content = "\n\n" + content
+            streamed_any = True
             if stream_callback:
                 await stream_callback(content)
             if execution_stream_callback:
@@ -751,8 +1008,9 @@ class AgentLoop:
             use_stream = (
                 (stream_callback is not None or execution_stream_callback is not None)
                 and hasattr(self.provider, "chat_stream")
-                and iteration == 1
             )
+            first_delta_at = None
+            call_started_at = time.monotonic()
             response, used_model = await self._call_provider_with_fallback(
                 messages=messages,
                 tools=self.tools.get_definitions(),
@@ -760,6 +1018,19 @@ class AgentLoop:
                 stream_callback=_stream_cb if use_stream else None,
                 allow_stream=use_stream,
             )
+            if not response.model:
+                response.model = used_model
+            if execution_stream_callback:
+                await execution_stream_callback("llm_end", {
+                    "iteration": iteration,
+                    "model": used_model,
+                    "streamed": first_delta_at is not None,
+                    "ttftMs": (
+                        int((first_delta_at - call_started_at) * 1000) if first_delta_at is not None else None
+                    ),
+                    "durationMs": int((time.monotonic() - call_started_at) * 1000),
+                    "toolCalls": len(response.tool_calls),
+                })
             last_response = response
             active_model = used_model
             logger.debug(
@@ -787,76 +1058,32 @@ class AgentLoop:
                 suppress_tool_errors = bool(
                     messages_config_loop and getattr(messages_config_loop, "suppress_tool_errors", False)
                 )
-                for tool_call in response.tool_calls:
-                    tool_name = (tool_call.name or "").strip() if isinstance(tool_call.name, str) else ""
-                    tool_args = tool_call.arguments if isinstance(tool_call.arguments, dict) else {}
-                    if not tool_name:
-                        logger.warning("Tool call with empty name; returning error result to keep message sync")
-                        result = "Error: invalid tool call (missing name or arguments)."
+                for batch in self._plan_tool_batches(response.tool_calls):
+                    if len(batch) == 1:
+                        outcomes = [await self._execute_tool_call(
+                            batch[0],
+                            suppress_tool_errors=suppress_tool_errors,
+                            execution_stream_callback=execution_stream_callback,
+                        )]
+                    else:
+                        slots = asyncio.Semaphore(self._max_parallel_tool_calls())
+
+                        async def _run_limited(tc: Any) -> tuple[str, str, bool]:
+                            async with slots:
+                                return await self._execute_tool_call(
+                                    tc,
+                                    suppress_tool_errors=suppress_tool_errors,
+                                    execution_stream_callback=execution_stream_callback,
+                                )
+
+                        outcomes = await asyncio.gather(*(_run_limited(tc) for tc in batch))
+                    # Append in original tool_call order so message history stays deterministic.
+                    for tool_call, (tool_name, result, executed) in zip(batch, outcomes):
+                        if executed:
+                            tools_used.append(tool_name)
                         messages = self.context.add_tool_result(
-                            messages, tool_call.id, tool_call.name or "", result
-                        )
-                        continue
-                    
-                    hook_dispatcher = get_hook_dispatcher()
-                    hook_ctx = HookContext(
-                        session_key=getattr(self, "_current_session_key", "") or "",
-                        channel="",
-                    )
-                    
-                    before_event = BeforeToolCallEvent(
-                        tool_name=tool_name,
-                        params=dict(tool_args),
-                    )
-                    before_result = await hook_dispatcher.emit_first_result(
-                        HookName.BEFORE_TOOL_CALL, before_event, hook_ctx
-                    )
-                    
-                    if before_result and isinstance(before_result, BeforeToolCallResult):
-                        if before_result.block:
-                            logger.info(f"Tool {tool_name} blocked by hook: {before_result.block_reason}")
-                            result = before_result.block_reason or "Tool execution blocked by plugin"
-                            messages = self.context.add_tool_result(
-                                messages, tool_call.id, tool_name, result
-                            )
-                            continue
-                        if before_result.params:
-                            tool_args = before_result.params
-                    
-                    tools_used.append(tool_name)
-                    args_str = json.dumps(tool_args, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_name}({args_str[:200]})")
-                    if execution_stream_callback:
-                        await execution_stream_callback(
-                            "tool_start",
-                            {"tool": tool_name, "args": tool_args},
+                            messages, tool_call.id, tool_name, result
                         )
-                    result = await self.tools.execute(
-                        tool_name,
-                        tool_args,
-                        execution_stream_callback=execution_stream_callback,
-                    )
-                    if execution_stream_callback:
-                        await execution_stream_callback(
-                            "tool_end",
-                            {"tool": tool_name, "result": result},
-                        )
-                    if suppress_tool_errors and (result or "").strip().startswith("Error"):
-                        logger.debug(f"Tool {tool_name} error (suppressed for user): {result[:300]}")
-                        result = "Error: Tool execution failed."
-                    
-                    after_event = AfterToolCallEvent(
-                        tool_name=tool_name,
-                        params=dict(tool_args),
-                        result=result,
-                    )
-                    await hook_dispatcher.emit(HookName.AFTER_TOOL_CALL, after_event, hook_ctx)
-                    
-                    preview = (result[:500] + "...") if len(result) > 500 else result
-                    logger.debug(f"Tool {tool_name} result (preview): {preview}")
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_name, result
-                    )
                 follow_up = _default_after_tool_results_prompt
                 if messages_config_loop and getattr(messages_config_loop, "after_tool_results_prompt", None):
                     follow_up = (messages_config_loop.after_tool_results_prompt or "").strip() or follow_up
@@ -870,53 +1097,79 @@ class AgentLoop:
 
         return final_content, tools_used, False, last_response
 
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one bus message and publish the reply (or a user-facing error)."""
+        try:
+            response = await self._process_message(msg)
+            if response:
+                await self.bus.publish_outbound(response)
+        except LLMError as e:
+            logger.error(f"LLM error processing message: {e.code} - {e.message}")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an LLM error: {e.message}"
+            ))
+        except asyncio.TimeoutError:
+            logger.warning("Timeout processing message")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content="Sorry, the request timed out. Please try again."
+            ))
+        except ConnectionError as e:
+            logger.error(f"Connection error: {sanitize_error_message(str(e))}")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content="Sorry, there was a connection error. Please try again later."
+            ))
+        except Exception as e:
+            code, category, _ = classify_exception(e)
+            logger.exception(f"Unexpected error [{code}] processing message")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content="Sorry, I encountered an unexpected error. Please try again."
+            ))
+
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, processing messages from the bus.
+
+        Messages are sharded by session key: strictly FIFO within a session, different
+        sessions processed concurrently up to max_concurrency.
+        """
         self._running = True
         await self._connect_mcp()
-        logger.info("Agent loop started")
+        self._workers = SessionWorkerPool(self._handle_inbound, max_concurrency=self.max_concurrency)
+        logger.info(f"Agent loop started (max_concurrency={self.max_concurrency})")
 
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+        try:
+            while self._running:
                 try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except LLMError as e:
-                    logger.error(f"LLM error processing message: {e.code} - {e.message}")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an LLM error: {e.message}"
-                    ))
+                    msg = await asyncio.wait_for(
+                        self.bus.consume_inbound(),
+                        timeout=1.0
+                    )
                 except asyncio.TimeoutError:
-                    logger.warning("Timeout processing message")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content="Sorry, the request timed out. Please try again."
-                    ))
-                except ConnectionError as e:
-                    logger.error(f"Connection error: {sanitize_error_message(str(e))}")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content="Sorry, there was a connection error. Please try again later."
-                    ))
-                except Exception as e:
-                    code, category, _ = classify_exception(e)
-                    logger.exception(f"Unexpected error [{code}] processing message")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content="Sorry, I encountered an unexpected error. Please try again."
-                    ))
-            except asyncio.TimeoutError:
-                continue
+                    continue
+                self._workers.submit(msg)
+        finally:
+            workers, self._workers = self._workers, None
+            await workers.close()
+
+    def worker_stats(self) -> dict[str, Any]:
+        """Queue depth and in-flight counts per session shard (empty when run() is not active)."""
+        if self._workers is None:
+            return {
+                "maxConcurrency": self.max_concurrency,
+                "inFlight": 0,
+                "queued": 0,
+                "activeShards": 0,
+                "processedTotal": 0,
+                "shards": [],
+            }
+        return self._workers.stats()
     
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -931,6 +1184,9 @@ class AgentLoop:
         """Stop the agent loop."""
         self._running = False
         logger.info("Agent loop stopping")
+        self.sessions.close()
+        if self.usage_ledger is not None:
+            self.usage_ledger.close()
         
         if self._knowledge_subprocess:
             from joyhousebot.services.knowledge_pipeline.service import stop_knowledge_pipeline_subprocess
@@ -968,10 +1224,33 @@ class AgentLoop:
         # System messages route back via chat_id ("channel:chat_id")
         if msg.channel == "system":
             return await self._process_system_message(msg)
-        
+
+        key = session_key or msg.session_key
+        scope_key = self._resolve_memory_scope_key(key, getattr(msg, "sender_id", "") or "", getattr(msg, "metadata", None) or {})
+        run_ctx = RunContext(session_key=key, channel=msg.channel, chat_id=msg.chat_id, memory_scope_key=scope_key)
+        with agent_run_context(run_ctx):
+            return await self._process_user_message(
+                msg,
+                key,
+                scope_key,
+                stream_callback=stream_callback,
+                execution_stream_callback=execution_stream_callback,
+                check_abort_requested=check_abort_requested,
+            )
+
+    async def _process_user_message(
+        self,
+        msg: InboundMessage,
+        key: str,
+        scope_key: str | None,
+        stream_callback: Callable[[str], Awaitable[None]] | None = None,
+        execution_stream_callback: Callable[[str, dict], Awaitable[None]] | None = None,
+        check_abort_requested: Callable[[str], bool] | None = None,
+    ) -> OutboundMessage | None:
+        """Body of _process_message; runs inside the message's RunContext."""
         hook_dispatcher = get_hook_dispatcher()
         hook_ctx = HookContext(
-            session_key=session_key or msg.session_key,
+            session_key=key,
             channel=msg.channel,
         )
         
@@ -985,16 +1264,11 @@ class AgentLoop:
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
-        key = session_key or msg.session_key
-        self._current_session_key = key
         session = self.sessions.get_or_create(key)
-        scope_key = self._resolve_memory_scope_key(key, getattr(msg, "sender_id", "") or "", getattr(msg, "metadata", None) or {})
         if scope_key:
             retrieval = getattr(getattr(self.config, "tools", None), "retrieval", None) if self.config else None
             if retrieval and getattr(retrieval, "memory_scope", "shared") == "user":
                 session.metadata["last_memory_scope_key"] = scope_key
-        self._set_tool_context(msg.channel, msg.chat_id)
-        self._set_memory_scope(scope_key)
         
         # Handle slash commands (only when config.commands.native is not False)
         cmd = msg.content.strip().lower()
@@ -1008,7 +1282,7 @@ class AgentLoop:
             # Capture messages before clearing (avoid race condition with background task)
             messages_to_archive = session.messages.copy()
             session.clear()
-            self.sessions.save(session)
+            await self.sessions.save_async(session)
             self.sessions.invalidate(session.key)
 
             async def _consolidate_and_cleanup():
@@ -1050,7 +1324,7 @@ class AgentLoop:
             asyncio.create_task(self._consolidate_memory(session))
 
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=session.get_history(max_messages=self.memory_window, max_tokens=self.max_context_tokens),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
@@ -1100,8 +1374,11 @@ class AgentLoop:
         usage_kw: dict[str, Any] = {"tools_used": tools_used if tools_used else None}
         if last_response and last_response.usage:
             usage_kw["usage"] = dict(last_response.usage)
+        if last_response and last_response.model:
+            usage_kw["model"] = last_response.model
         session.add_message("assistant", final_content, **usage_kw)
-        self.sessions.save(session)
+        await self.sessions.save_async(session)
+        await self._record_usage(session, channel=msg.channel)
         
         reply_to: str | None = None
         if msg.metadata and "message_id" in msg.metadata:
@@ -1166,17 +1443,22 @@ class AgentLoop:
             getattr(msg, "sender_id", "") or "",
             getattr(msg, "metadata", None) or {},
         )
-        self._set_tool_context(origin_channel, origin_chat_id)
-        self._set_memory_scope(scope_key)
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=session.get_history(max_messages=self.memory_window, max_tokens=self.max_context_tokens),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
             max_context_tokens=self.max_context_tokens,
             scope_key=scope_key,
         )
-        final_content, _, _, last_response = await self._run_agent_loop(initial_messages)
+        run_ctx = RunContext(
+            session_key=session_key,
+            channel=origin_channel,
+            chat_id=origin_chat_id,
+            memory_scope_key=scope_key,
+        )
+        with agent_run_context(run_ctx):
+            final_content, _, _, last_response = await self._run_agent_loop(initial_messages)
 
         if final_content is None:
             final_content = "Background task completed."
@@ -1185,8 +1467,11 @@ class AgentLoop:
         usage_kw: dict[str, Any] = {}
         if last_response and last_response.usage:
             usage_kw["usage"] = dict(last_response.usage)
+        if last_response and last_response.model:
+            usage_kw["model"] = last_response.model
         session.add_message("assistant", final_content, **usage_kw)
-        self.sessions.save(session)
+        await self.sessions.save_async(session)
+        await self._record_usage(session, channel=origin_channel)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -1194,6 +1479,32 @@ class AgentLoop:
             content=final_content
         )
     
+    async def _record_usage(self, session: Session, channel: str | None) -> None:
+        """Add the session's newly persisted messages to the usage ledger (off the event loop)."""
+        if self.usage_ledger is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.usage_ledger.ingest,
+                session.key,
+                list(session.messages),
+                channel=channel,
+                provider_for_model=self._resolve_provider_name_for_model,
+            )
+        except Exception as e:
+            logger.warning(f"Usage ledger update failed for {session.key}: {e}")
+
+    def _on_memory_changed(self, scope_key: str | None) -> None:
+        """Refresh the memory vector index in the background after memory files change."""
+        if self.config is None:
+            return
+        from joyhousebot.services.retrieval.memory_vector_store import schedule_memory_index_refresh
+
+        try:
+            schedule_memory_index_refresh(self.workspace, self.config, scope_key)
+        except Exception as e:
+            logger.debug(f"Memory index refresh not scheduled: {e}")
+
     async def _consolidate_memory(self, session, archive_all: bool = False) -> None:
         """Consolidate old messages into MEMORY.md + HISTORY.md.
 
@@ -1210,7 +1521,7 @@ class AgentLoop:
                     scope_key = session.key
                 elif mode == "user":
                     scope_key = (session.metadata or {}).get("last_memory_scope_key") or session.key
-        memory = MemoryStore(self.workspace, scope_key=scope_key)
+        memory = MemoryStore(self.workspace, scope_key=scope_key, on_change=self._on_memory_changed)
         memory.ensure_memory_structure()
 
         if archive_all:
@@ -1369,6 +1680,7 @@ Respond with ONLY valid JSON, no markdown fences."""
         stream_callback: Callable[[str], Awaitable[None]] | None = None,
         execution_stream_callback: Callable[[str, dict], Awaitable[None]] | None = None,
         check_abort_requested: Callable[[str], bool] | None = None,
+        cacheable: bool = False,
     ) -> str | None:
         """
         Process a message directly (for CLI or cron usage).
@@ -1381,6 +1693,7 @@ Respond with ONLY valid JSON, no markdown fences."""
             stream_callback: If set, called with each content delta when provider supports streaming.
             execution_stream_callback: If set, called with (event_type, payload) for execution stream (e.g. /ws/agent-stream).
             check_abort_requested: If set, run can be aborted (e.g. chat.abort); when aborted returns None.
+            cacheable: Let this run's LLM calls hit the response cache (repeated cron/heartbeat/bot runs).
 
         Returns:
             The agent's response text, or None if run was aborted.
@@ -1393,11 +1706,15 @@ Respond with ONLY valid JSON, no markdown fences."""
             content=content
         )
 
-        response = await self._process_message(
-            msg,
-            session_key=session_key,
-            stream_callback=stream_callback,
-            execution_stream_callback=execution_stream_callback,
-            check_abort_requested=check_abort_requested,
-        )
+        token = response_cache_allowed.set(cacheable)
+        try:
+            response = await self._process_message(
+                msg,
+                session_key=session_key,
+                stream_callback=stream_callback,
+                execution_stream_callback=execution_stream_callback,
+                check_abort_requested=check_abort_requested,
+            )
+        finally:
+            response_cache_allowed.reset(token)
         return response.content if response else None
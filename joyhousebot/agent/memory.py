@@ -12,6 +12,7 @@ Layering (L0/L1/L2) for pluggable memory:
 """
 
 from pathlib import Path
+from typing import Callable
 
 from joyhousebot.utils.helpers import ensure_dir, safe_filename
 
@@ -33,9 +34,18 @@ class MemoryStore:
     """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log).
     Extensions: L0 (.abstract), L2 daily logs (YYYY-MM-DD.md), insights/lessons/archive structure.
     When scope_key is set, memory is stored under memory/<safe_scope_key>/ (per-session or per-user).
+    on_change(scope_key) is called after each write (e.g. to refresh the memory vector index).
     """
 
-    def __init__(self, workspace: Path, scope_key: str | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        scope_key: str | None = None,
+        on_change: Callable[[str | None], None] | None = None,
+    ):
+        self.workspace = workspace
+        self.scope_key = scope_key
+        self._on_change = on_change
         base = workspace / "memory"
         if scope_key:
             safe = safe_scope_key(scope_key)
@@ -54,6 +64,15 @@ class MemoryStore:
         if not self._l0_file.exists():
             self._l0_file.write_text("# memory index\n\n## active topics\n(none)\n\n## retrieval hints\n(none)\n\n## recency\n(last updated: —)\n", encoding="utf-8")
 
+    def _changed(self, path: Path) -> None:
+        from joyhousebot.services.retrieval.memory_fts import index_memory_write
+        from joyhousebot.services.retrieval.result_cache import bump_generation
+
+        index_memory_write(self.workspace, self.memory_dir, path)
+        bump_generation(self.workspace, "memory")
+        if self._on_change is not None:
+            self._on_change(self.scope_key)
+
     def read_long_term(self) -> str:
         if self.memory_file.exists():
             return self.memory_file.read_text(encoding="utf-8")
@@ -64,6 +83,7 @@ class MemoryStore:
         if updated_at:
             content = f"<!-- updated_at={updated_at} -->\n{content}"
         self.memory_file.write_text(content, encoding="utf-8")
+        self._changed(self.memory_file)
 
     def append_history(self, entry: str, max_entries: int = 0) -> None:
         """Append entry to HISTORY.md. If max_entries > 0, keep only last max_entries entries (paragraphs)."""
@@ -71,6 +91,7 @@ class MemoryStore:
             f.write(entry.rstrip() + "\n\n")
         if max_entries > 0:
             self._trim_history_to_last_n(max_entries)
+        self._changed(self.history_file)
 
     def _trim_history_to_last_n(self, n: int) -> None:
         """Keep only last n entries in HISTORY.md (entries = paragraphs separated by blank lines)."""
@@ -92,6 +113,7 @@ class MemoryStore:
     def update_l0_abstract(self, content: str) -> None:
         """Write L0 directory index."""
         self._l0_file.write_text(content, encoding="utf-8")
+        self._changed(self._l0_file)
 
     def get_l2_path(self, date_str: str) -> Path:
         """Return path for L2 daily log file (date_str e.g. YYYY-MM-DD)."""
@@ -102,6 +124,7 @@ class MemoryStore:
         path = self.get_l2_path(date_str)
         with open(path, "a", encoding="utf-8") as f:
             f.write(content.rstrip() + "\n\n")
+        self._changed(path)
 
     def get_memory_context(self) -> str:
         long_term = self.read_long_term()
@@ -0,0 +1,96 @@
+"""Per-section memoization for system prompt assembly."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable
+
+# Sections are few; the bound is for per-scope memory variants.
+DEFAULT_MAX_ENTRIES = 256
+
+
+def stat_signature(paths: Iterable[Path]) -> tuple:
+    """(path, mtime_ns, size) per path, (path, None, None) when missing; changes whenever a file does."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((str(p), None, None))
+    return tuple(out)
+
+
+def env_signature() -> tuple[str, ...]:
+    """Names of non-empty environment variables plus PATH (what skill requirement checks look at)."""
+    return (os.environ.get("PATH", ""), *sorted(k for k, v in os.environ.items() if v))
+
+
+class PromptSectionCache:
+    """
+    Memoized prompt sections keyed by a cheap signature of their inputs.
+
+    get(name, key, build) returns the cached text while key is unchanged and calls
+    build() otherwise, so only dirty sections are rebuilt. Keys are computed by the
+    caller from stat signatures of the section's source files and the config values
+    it reads (objects in a key compare by identity first, so passing the config
+    object itself is cheap). Names may carry a ":<variant>" suffix (e.g. one memory
+    section per scope); variants share stats and are evicted least recently used
+    beyond max_entries. Per-section hit/miss counts and build times feed stats().
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[Hashable, str]] = OrderedDict()
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, key: Hashable, build: Callable[[], str]) -> str:
+        section = name.split(":", 1)[0]
+        with self._lock:
+            entry = self._entries.get(name)
+            stats = self._stats.setdefault(section, {"hits": 0, "misses": 0, "buildMs": 0.0, "lastBuildMs": None})
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(name)
+                stats["hits"] += 1
+                return entry[1]
+        t0 = time.perf_counter()
+        value = build()
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._entries[name] = (key, value)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            stats["misses"] += 1
+            stats["buildMs"] += elapsed_ms
+            stats["lastBuildMs"] = round(elapsed_ms, 3)
+        return value
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one section (or all), forcing a rebuild on next use."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            sections = {
+                name: {**s, "buildMs": round(s["buildMs"], 3)} for name, s in self._stats.items()
+            }
+        hits = sum(s["hits"] for s in sections.values())
+        misses = sum(s["misses"] for s in sections.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "buildMs": round(sum(s["buildMs"] for s in sections.values()), 3),
+            "entries": len(self._entries),
+            "sections": sections,
+        }
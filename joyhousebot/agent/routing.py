@@ -0,0 +1,215 @@
+"""Latency-aware ordering of model / auth-profile candidates from live call stats."""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+ROUTING_STRATEGIES = ("fixed", "fastest", "weighted", "hedged")
+
+# Recent TTFT samples kept per route for the hedge percentile.
+_TTFT_WINDOW = 64
+
+T = TypeVar("T")
+
+
+@dataclass
+class RouteStats:
+    """EWMA latency / first-token time and error / rate-limit rates for one route."""
+
+    samples: int = 0
+    latency_ewma_ms: float | None = None
+    ttft_ewma_ms: float | None = None
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    last_ms: float = 0.0
+    ttft_window: deque[float] = field(default_factory=lambda: deque(maxlen=_TTFT_WINDOW))
+
+    def ttft_p95_ms(self) -> float | None:
+        if not self.ttft_window:
+            return None
+        ordered = sorted(self.ttft_window)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        p95 = self.ttft_p95_ms()
+        return {
+            "samples": self.samples,
+            "latencyEwmaMs": _round(self.latency_ewma_ms),
+            "ttftEwmaMs": _round(self.ttft_ewma_ms),
+            "ttftP95Ms": _round(p95),
+            "errorRate": round(self.error_rate, 4),
+            "rateLimitRate": round(self.rate_limit_rate, 4),
+            "lastMs": int(self.last_ms) or None,
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+def _ewma(prev: float | None, value: float, alpha: float) -> float:
+    return value if prev is None else prev + alpha * (value - prev)
+
+
+class ModelRouter:
+    """
+    Routing policy for _call_provider_with_fallback.
+
+    Every model call reports its latency, time to first token and outcome; stats are
+    kept per (model, profile) and per model. Strategies:
+
+    - fixed: configured order (primary, then fallbacks) as before.
+    - fastest: healthy routes by TTFT EWMA, then routes without enough samples, then
+      routes whose error rate exceeds max_error_rate.
+    - weighted: random order weighted by (1 - error rate) / TTFT EWMA.
+    - hedged: fastest order; the caller also starts the next candidate when the first
+      has not produced a token within its TTFT p95 (hedge_delay_s).
+
+    Per-profile stats are mirrored into the auth profile usage dict, so they persist
+    with it and show up in the auth profiles report.
+    """
+
+    def __init__(
+        self,
+        config: Any | None = None,
+        profile_usage: dict[str, dict[str, Any]] | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        strategy = str(getattr(config, "strategy", "fixed") or "fixed")
+        self.strategy = strategy if strategy in ROUTING_STRATEGIES else "fixed"
+        self.alpha = min(1.0, max(0.01, float(getattr(config, "ewma_alpha", 0.3))))
+        self.min_samples = max(1, int(getattr(config, "min_samples", 3)))
+        self.max_error_rate = float(getattr(config, "max_error_rate", 0.5))
+        self.hedge_delay_ms = max(0, int(getattr(config, "hedge_delay_ms", 2000)))
+        self.hedge_min_delay_ms = max(0, int(getattr(config, "hedge_min_delay_ms", 250)))
+        self._profile_usage = profile_usage
+        self._rng = rng or random.Random()
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+        self._models: dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        model: str,
+        profile_id: str | None,
+        *,
+        latency_ms: float,
+        ttft_ms: float | None = None,
+        ok: bool = True,
+        reason: str = "",
+        now_ms: float | None = None,
+    ) -> None:
+        """Record one finished call; latency only counts for successful calls."""
+        with self._lock:
+            for stats in self._stats_for_update(model, profile_id):
+                stats.samples += 1
+                stats.last_ms = float(now_ms or (time.time() * 1000))
+                stats.error_rate = _ewma(stats.error_rate, 0.0 if ok else 1.0, self.alpha)
+                stats.rate_limit_rate = _ewma(
+                    stats.rate_limit_rate, 1.0 if reason == "rate_limit" else 0.0, self.alpha
+                )
+                if ok:
+                    first = latency_ms if ttft_ms is None else ttft_ms
+                    stats.latency_ewma_ms = _ewma(stats.latency_ewma_ms, latency_ms, self.alpha)
+                    stats.ttft_ewma_ms = _ewma(stats.ttft_ewma_ms, first, self.alpha)
+                    stats.ttft_window.append(first)
+            self._mirror_profile(model, profile_id)
+
+    def record_slow(self, model: str, profile_id: str | None, *, waited_ms: float) -> None:
+        """Record a hedged-away call that produced no token within waited_ms (a TTFT lower bound)."""
+        with self._lock:
+            for stats in self._stats_for_update(model, profile_id):
+                stats.ttft_ewma_ms = _ewma(stats.ttft_ewma_ms, waited_ms, self.alpha)
+                stats.ttft_window.append(waited_ms)
+            self._mirror_profile(model, profile_id)
+
+    def order_models(self, candidates: list[str]) -> list[str]:
+        with self._lock:
+            return self._rank(candidates, lambda m: self._models.get(m))
+
+    def order_profiles(self, model: str, profile_ids: list[str]) -> list[str]:
+        with self._lock:
+            return self._rank(profile_ids, lambda pid: self._routes.get((model, pid)))
+
+    def hedge_delay_s(self, model: str, profile_id: str | None) -> float | None:
+        """Seconds to wait for a first token before hedging; None unless strategy is hedged."""
+        if self.strategy != "hedged":
+            return None
+        with self._lock:
+            stats = self._routes.get((model, profile_id or ""))
+            p95 = stats.ttft_p95_ms() if stats and stats.samples >= self.min_samples else None
+        delay_ms = self.hedge_delay_ms if p95 is None else p95
+        return max(self.hedge_min_delay_ms, delay_ms) / 1000.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "models": {m: s.to_dict() for m, s in sorted(self._models.items())},
+                "routes": [
+                    {"model": m, "profileId": pid or None, **s.to_dict()}
+                    for (m, pid), s in sorted(self._routes.items())
+                ],
+            }
+
+    def _stats_for_update(self, model: str, profile_id: str | None) -> tuple[RouteStats, RouteStats]:
+        route = self._routes.setdefault((model, profile_id or ""), RouteStats())
+        return route, self._models.setdefault(model, RouteStats())
+
+    def _mirror_profile(self, model: str, profile_id: str | None) -> None:
+        if not profile_id or self._profile_usage is None:
+            return
+        # A profile may serve several models; the usage row carries its latest route's stats.
+        stats = self._routes[(model, profile_id)]
+        row = dict(self._profile_usage.get(profile_id, {}))
+        row["latency_ewma_ms"] = _round(stats.latency_ewma_ms)
+        row["ttft_ewma_ms"] = _round(stats.ttft_ewma_ms)
+        row["error_rate"] = round(stats.error_rate, 4)
+        row["rate_limit_rate"] = round(stats.rate_limit_rate, 4)
+        self._profile_usage[profile_id] = row
+
+    def _rank(self, items: list[T], stats_for: Callable[[T], RouteStats | None]) -> list[T]:
+        if self.strategy == "fixed" or len(items) < 2:
+            return list(items)
+        # A route is known once it has enough samples, whether or not any call succeeded:
+        # a route that always fails has no TTFT but must still rank as unhealthy.
+        known: dict[int, RouteStats] = {}
+        for i, item in enumerate(items):
+            stats = stats_for(item)
+            if stats is not None and stats.samples >= self.min_samples:
+                known[i] = stats
+        if self.strategy == "weighted":
+            ttfts = [s.ttft_ewma_ms for s in known.values() if s.ttft_ewma_ms is not None]
+            # Known routes without a successful call are weighted as slow as the slowest one.
+            slowest = max(ttfts, default=1.0)
+            weights = {
+                i: max(1e-6, 1.0 - s.error_rate) / max(1.0, s.ttft_ewma_ms if s.ttft_ewma_ms is not None else slowest)
+                for i, s in known.items()
+            }
+            top = max(weights.values(), default=1.0)
+            weights = {i: w / top for i, w in weights.items()}
+            # Routes without stats get the mean weight so they are still explored.
+            default = sum(weights.values()) / len(weights) if weights else 1.0
+            keys = {
+                i: self._rng.random() ** (1.0 / weights.get(i, default))
+                for i in range(len(items))
+            }
+            return [items[i] for i in sorted(keys, key=lambda i: -keys[i])]
+
+        def key(i: int) -> tuple[int, int, float, int]:
+            stats = known.get(i)
+            if stats is None:
+                return (0, 1, 0.0, i)
+            unhealthy = 1 if stats.error_rate > self.max_error_rate else 0
+            if stats.ttft_ewma_ms is None:
+                # Never succeeded: after every route with a measured TTFT in the same tier.
+                return (unhealthy, 1, 0.0, i)
+            return (unhealthy, 0, stats.ttft_ewma_ms, i)
+
+        return [items[i] for i in sorted(range(len(items)), key=key)]
@@ -0,0 +1,42 @@
+"""Per-run context for agent message processing.
+
+AgentLoop processes messages from different sessions concurrently, so routing info
+(channel/chat_id) and memory scope must not live on the shared loop or tool instances.
+The active RunContext is held in a ContextVar: each asyncio task sees its own value,
+and tasks spawned during a run (e.g. parallel tool calls) inherit it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Routing and isolation info for one agent run (one inbound message)."""
+
+    session_key: str = ""
+    channel: str = ""
+    chat_id: str = ""
+    memory_scope_key: str | None = None
+
+
+_current_run_context: ContextVar[RunContext | None] = ContextVar("agent_run_context", default=None)
+
+
+def current_run_context() -> RunContext | None:
+    """Return the RunContext of the run executing in the current task, or None outside a run."""
+    return _current_run_context.get()
+
+
+@contextmanager
+def agent_run_context(ctx: RunContext) -> Iterator[RunContext]:
+    """Activate ctx for the duration of the block (restores the previous value on exit)."""
+    token = _current_run_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current_run_context.reset(token)
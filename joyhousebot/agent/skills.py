@@ -5,6 +5,7 @@ import os
 import re
 import shutil
 from pathlib import Path
+from typing import Any
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
@@ -22,6 +23,7 @@ class SkillsLoader:
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self._plugin_dirs: tuple[Any, tuple, list[Path]] | None = None
     
     def list_skills(
         self,
@@ -69,18 +71,40 @@ class SkillsLoader:
             roots.append(("builtin", self.builtin_skills))
 
         try:
-            from joyhousebot.config.access import get_config
-            from joyhousebot.plugins.skills import resolve_plugin_skill_dirs
-
-            config = get_config()
-            plugin_dirs = resolve_plugin_skill_dirs(self.workspace, config)
-            for plugin_dir in plugin_dirs:
+            for plugin_dir in self._plugin_skill_dirs():
                 roots.append(("plugin", plugin_dir))
         except Exception:
             # Keep skills resilient even when plugin host/config is unavailable.
             pass
 
         return roots
+
+    def _plugin_skill_dirs(self) -> list[Path]:
+        """Plugin skill dirs, re-resolved only when the config or a plugin manifest changes."""
+        from joyhousebot.config.access import get_config
+        from joyhousebot.plugins.discovery import plugin_manifest_signature
+        from joyhousebot.plugins.skills import resolve_plugin_skill_dirs
+
+        config = get_config()
+        signature = plugin_manifest_signature(self.workspace, config)
+        cached = self._plugin_dirs
+        if cached is None or cached[0] is not config or cached[1] != signature:
+            cached = (config, signature, resolve_plugin_skill_dirs(self.workspace, config))
+            self._plugin_dirs = cached
+        return list(cached[2])
+
+    def signature(self) -> tuple:
+        """Cheap fingerprint of every skill root and SKILL.md (stat only, no file reads)."""
+        from joyhousebot.agent.prompt_cache import stat_signature
+
+        out = []
+        for source, root in self._iter_skill_roots():
+            try:
+                names = sorted(d.name for d in root.iterdir() if d.is_dir())
+            except OSError:
+                names = []
+            out.append((source, str(root), stat_signature(root / n / "SKILL.md" for n in names)))
+        return tuple(out)
     
     def load_skill(self, name: str) -> str | None:
         """
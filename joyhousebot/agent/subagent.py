@@ -12,6 +12,8 @@ from loguru import logger
 from joyhousebot.bus.events import InboundMessage
 from joyhousebot.bus.queue import MessageBus
 from joyhousebot.providers.base import LLMProvider
+from joyhousebot.providers.pool import ProviderPool, resolve_runtime_provider_settings
+from joyhousebot.agent.routing import ModelRouter
 from joyhousebot.agent.tools.registry import ToolRegistry
 from joyhousebot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from joyhousebot.agent.tools.shell import ExecTool
@@ -23,7 +25,7 @@ from joyhousebot.agent.auth_profiles import (
     mark_profile_failure,
     mark_profile_success,
     resolve_profile_order,
-    save_profile_usage,
+    save_profile_usage_async,
 )
 
 
@@ -49,6 +51,8 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: Any | None = None,
         restrict_to_workspace: bool = False,
+        provider_pool: ProviderPool | None = None,
+        router: ModelRouter | None = None,
     ):
         from joyhousebot.config.schema import ExecToolConfig
         self.provider = provider
@@ -70,6 +74,10 @@ class SubagentManager:
         self.restrict_to_workspace = restrict_to_workspace
         self.config = config
         self._auth_profile_usage = load_profile_usage()
+        # Shared with the owning AgentLoop so both reuse the same provider instances.
+        self.provider_pool = provider_pool or ProviderPool()
+        # Likewise the routing stats: subagent calls feed and follow the same ranking.
+        self.router = router or ModelRouter()
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
 
     def _resolve_provider_name_for_model(self, model: str) -> str:
@@ -102,31 +110,13 @@ class SubagentManager:
         if not isinstance(self.provider, LiteLLMProvider):
             return self.provider
 
-        provider_name = self._resolve_provider_name_for_model(model) or self.config.get_provider_name(model)
-        base_cfg = self.config.get_provider(model)
-        api_key = base_cfg.api_key if base_cfg else None
-        api_base = self.config.get_api_base(model)
-        extra_headers = dict(base_cfg.extra_headers or {}) if base_cfg else {}
-        if profile_id:
-            profile = (getattr(self.config, "auth", None).profiles or {}).get(profile_id)
-            if profile is not None:
-                if getattr(profile, "api_key", ""):
-                    api_key = profile.api_key
-                elif getattr(profile, "token", ""):
-                    api_key = profile.token
-                if getattr(profile, "api_base", None):
-                    api_base = profile.api_base
-                if getattr(profile, "extra_headers", None):
-                    extra_headers.update(dict(profile.extra_headers))
-                if getattr(profile, "provider", ""):
-                    provider_name = str(profile.provider).strip() or provider_name
-        return LiteLLMProvider(
-            api_key=api_key,
-            api_base=api_base,
-            default_model=model,
-            extra_headers=extra_headers or None,
-            provider_name=provider_name or None,
+        settings = resolve_runtime_provider_settings(
+            self.config,
+            model=model,
+            profile_id=profile_id,
+            provider_name=self._resolve_provider_name_for_model(model) or self.config.get_provider_name(model),
         )
+        return self.provider_pool.get(settings)
     
     async def spawn(
         self,
@@ -218,11 +208,18 @@ class SubagentManager:
             while iteration < max_iterations:
                 iteration += 1
                 response = None
-                for idx, candidate in enumerate([active_model] + [m for m in self.model_fallbacks if m != active_model]):
+                candidates = self.router.order_models(
+                    [active_model] + [m for m in self.model_fallbacks if m != active_model]
+                )
+                for candidate in candidates:
                     provider_name = self._resolve_provider_name_for_model(candidate)
                     profile_candidates = self._resolve_profile_candidates(provider_name)
+                    profile_candidates = profile_candidates[:1] + self.router.order_profiles(
+                        candidate, profile_candidates[1:]
+                    )
                     for pidx, profile_id in enumerate(profile_candidates):
                         runtime_provider = self._build_runtime_provider(model=candidate, profile_id=profile_id)
+                        started_at = time.monotonic()
                         response = await runtime_provider.chat(
                             messages=messages,
                             tools=tools.get_definitions(),
@@ -230,15 +227,24 @@ class SubagentManager:
                             temperature=self.temperature,
                             max_tokens=self.max_tokens,
                         )
+                        reason = ""
+                        if response.finish_reason == "error":
+                            reason = str(response.error_kind or "").strip() or classify_failover_reason(response.content or "")
+                        self.router.record(
+                            candidate,
+                            profile_id,
+                            latency_ms=(time.monotonic() - started_at) * 1000,
+                            ok=response.finish_reason != "error",
+                            reason=reason,
+                        )
                         if response.finish_reason != "error":
                             if profile_id:
                                 mark_profile_success(self._auth_profile_usage, profile_id)
-                                save_profile_usage(self._auth_profile_usage)
-                            if idx > 0:
+                                await save_profile_usage_async(self._auth_profile_usage)
+                            if candidate != active_model:
                                 logger.warning(f"Subagent [{task_id}] model fallback: {active_model} -> {candidate}")
                             active_model = candidate
                             break
-                        reason = str(response.error_kind or "").strip() or classify_failover_reason(response.content or "")
                         if profile_id and self.config is not None:
                             mark_profile_failure(
                                 self._auth_profile_usage,
@@ -247,7 +253,7 @@ class SubagentManager:
                                 reason=reason,
                                 config=self.config,
                             )
-                            save_profile_usage(self._auth_profile_usage)
+                            await save_profile_usage_async(self._auth_profile_usage)
                         if pidx < len(profile_candidates) - 1:
                             logger.warning(
                                 f"Subagent [{task_id}] profile failed for {candidate}: {profile_id}, trying next profile"
@@ -10,7 +10,13 @@ class Tool(ABC):
     
     Tools are capabilities that the agent can use to interact with
     the environment, such as reading files, executing commands, etc.
+
+    Set parallel_safe = True on tools that have no side effects and do not depend on
+    ordering (reads, searches, fetches); the agent loop may then run several calls of
+    them concurrently within one LLM turn when tools.parallel_tool_calls is enabled.
     """
+
+    parallel_safe: bool = False
     
     _TYPE_MAP = {
         "string": str,
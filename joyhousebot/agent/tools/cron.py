@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from joyhousebot.agent.run_context import current_run_context
 from joyhousebot.agent.tools.base import Tool
 from joyhousebot.cron.service import CronService
 from joyhousebot.cron.types import CronSchedule
@@ -19,6 +20,13 @@ class CronTool(Tool):
         """Set the current session context for delivery."""
         self._channel = channel
         self._chat_id = chat_id
+
+    def _delivery_target(self) -> tuple[str, str]:
+        """(channel, chat_id) of the active run, falling back to set_context values."""
+        run_ctx = current_run_context()
+        if run_ctx is not None and run_ctx.channel and run_ctx.chat_id:
+            return run_ctx.channel, run_ctx.chat_id
+        return self._channel, self._chat_id
     
     @property
     def name(self) -> str:
@@ -83,7 +91,8 @@ class CronTool(Tool):
     def _add_job(self, message: str, every_seconds: int | None, cron_expr: str | None, at: str | None) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = self._delivery_target()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         
         # Build schedule
@@ -106,8 +115,8 @@ class CronTool(Tool):
             schedule=schedule,
             message=message,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
             delete_after_run=delete_after,
         )
         return f"Created job '{job.name}' (id: {job.id})"
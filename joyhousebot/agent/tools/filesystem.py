@@ -40,6 +40,8 @@ def _validate_file_size(file_path: Path) -> None:
 class ReadFileTool(Tool):
     """Tool to read file contents."""
 
+    parallel_safe = True
+
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
@@ -173,6 +175,8 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
 
+    parallel_safe = True
+
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
 
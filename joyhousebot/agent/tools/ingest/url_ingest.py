@@ -6,13 +6,11 @@ import re
 import socket
 from urllib.parse import urlparse
 
-import httpx
-
 from joyhousebot.agent.tools.ingest.chunking import chunk_text
 from joyhousebot.agent.tools.ingest.models import IngestDoc
+from joyhousebot.utils.http_client import HttpClientService, get_http_client
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5
 
 
 def _strip_tags(text: str) -> str:
@@ -59,21 +57,20 @@ def _is_forbidden_host(host: str) -> bool:
     return False
 
 
-async def fetch_and_ingest_url(url: str, max_chars: int = 50000) -> IngestDoc:
-    """Fetch URL, extract readable content, chunk and return IngestDoc."""
+async def fetch_and_ingest_url(
+    url: str, max_chars: int = 50000, http: HttpClientService | None = None
+) -> IngestDoc:
+    """Fetch URL, extract readable content, chunk and return IngestDoc (http defaults to the shared client)."""
     ok, err = _validate_url(url)
     if not ok:
         raise ValueError(err)
 
     from readability import Document
 
-    async with httpx.AsyncClient(
-        follow_redirects=True,
-        max_redirects=MAX_REDIRECTS,
-        timeout=30.0,
-    ) as client:
-        r = await client.get(url, headers={"User-Agent": USER_AGENT})
-        r.raise_for_status()
+    r = await (http or get_http_client()).get(
+        url, name="url_ingest", follow_redirects=True, headers={"User-Agent": USER_AGENT}
+    )
+    r.raise_for_status()
 
     final_host = urlparse(str(r.url)).hostname
     if final_host and _is_forbidden_host(final_host):
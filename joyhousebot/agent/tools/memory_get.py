@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from typing import Any
 
+from joyhousebot.agent.run_context import current_run_context
 from joyhousebot.agent.tools.base import Tool
 from joyhousebot.agent.memory import safe_scope_key
 
@@ -12,23 +13,31 @@ class MemoryGetTool(Tool):
     """Read a file under workspace/memory/ by path. Returns { text, path }; text is empty if file missing.
     When memory scope is set, only paths under memory/<scope_key>/ are allowed."""
 
+    parallel_safe = True
+
     def __init__(self, workspace: Path):
         self.workspace = Path(workspace)
         self._memory_scope_key: str | None = None
-        self._update_memory_dir()
 
-    def _update_memory_dir(self) -> None:
+    def _effective_memory_scope(self) -> str | None:
+        """Memory scope of the active run; falls back to set_memory_scope() outside a run."""
+        run_ctx = current_run_context()
+        if run_ctx is not None:
+            return run_ctx.memory_scope_key
+        return self._memory_scope_key
+
+    @property
+    def memory_dir(self) -> Path:
         base = self.workspace / "memory"
-        if self._memory_scope_key:
-            safe = safe_scope_key(self._memory_scope_key)
-            self.memory_dir = base / safe if safe else base
-        else:
-            self.memory_dir = base
+        scope_key = self._effective_memory_scope()
+        if scope_key:
+            safe = safe_scope_key(scope_key)
+            return base / safe if safe else base
+        return base
 
     def set_memory_scope(self, scope_key: str | None) -> None:
         """Set current memory scope (per-session/per-user); restricts reads to memory/<scope_key>/."""
         self._memory_scope_key = scope_key
-        self._update_memory_dir()
 
     @property
     def name(self) -> str:
@@ -71,15 +80,17 @@ class MemoryGetTool(Tool):
             return None
         if path_str.startswith("memory/"):
             path_str = path_str[7:].lstrip("/")
-        if self._memory_scope_key:
-            safe = safe_scope_key(self._memory_scope_key)
+        scope_key = self._effective_memory_scope()
+        memory_dir = self.memory_dir
+        if scope_key:
+            safe = safe_scope_key(scope_key)
             if safe and path_str.startswith(safe + "/"):
                 path_str = path_str[len(safe) + 1:]
             elif safe and path_str == safe:
                 return None
-        resolved = (self.memory_dir / path_str).resolve()
+        resolved = (memory_dir / path_str).resolve()
         try:
-            resolved.relative_to(self.memory_dir.resolve())
+            resolved.relative_to(memory_dir.resolve())
         except ValueError:
             return None
         if path_str.startswith("..") or ".." in path_str:
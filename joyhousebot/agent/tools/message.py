@@ -2,6 +2,7 @@
 
 from typing import Any, Callable, Awaitable
 
+from joyhousebot.agent.run_context import current_run_context
 from joyhousebot.agent.tools.base import Tool
 from joyhousebot.bus.events import OutboundMessage
 
@@ -64,6 +65,10 @@ class MessageTool(Tool):
         chat_id: str | None = None,
         **kwargs: Any
     ) -> str:
+        run_ctx = current_run_context()
+        if run_ctx is not None:
+            channel = channel or run_ctx.channel
+            chat_id = chat_id or run_ctx.chat_id
         channel = channel or self._default_channel
         chat_id = chat_id or self._default_chat_id
         
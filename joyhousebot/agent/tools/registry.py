@@ -43,6 +43,11 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools and self._is_enabled(name)
     
+    def is_parallel_safe(self, name: str) -> bool:
+        """True if the tool is enabled and declares itself safe to run concurrently."""
+        tool = self.get(name)
+        return bool(tool is not None and getattr(tool, "parallel_safe", False))
+
     def get_definitions(self) -> list[dict[str, Any]]:
         """Get all tool definitions in OpenAI format."""
         return [tool.to_schema() for name, tool in self._tools.items() if self._is_enabled(name)]
@@ -6,6 +6,7 @@ from typing import Any
 
 from loguru import logger
 
+from joyhousebot.agent.run_context import current_run_context
 from joyhousebot.agent.tools.base import Tool
 from joyhousebot.utils.exceptions import (
     ToolError,
@@ -20,6 +21,8 @@ class RetrieveTool(Tool):
     Uses retrieval adapter: builtin hybrid by default; memory scope can use configurable backend (e.g. MCP qmd).
     """
 
+    parallel_safe = True
+
     def __init__(
         self,
         workspace: Path,
@@ -37,6 +40,13 @@ class RetrieveTool(Tool):
         """Set current memory scope for scope=memory searches (per-session/per-user isolation)."""
         self._memory_scope_key = scope_key
 
+    def _effective_memory_scope(self) -> str | None:
+        """Memory scope of the active run; falls back to set_memory_scope() outside a run."""
+        run_ctx = current_run_context()
+        if run_ctx is not None:
+            return run_ctx.memory_scope_key
+        return self._memory_scope_key
+
     def set_mcp_memory_search_callable(self, callable: Any) -> None:
         """Inject MCP memory search callable (e.g. after QMD connects)."""
         self._mcp_memory_search_callable = callable
@@ -90,6 +100,7 @@ class RetrieveTool(Tool):
         if not query:
             raise ValidationError("query is required", field="query")
 
+        cache_info: dict[str, Any] = {}
         try:
             from joyhousebot.services.retrieval.adapter import search_async
             hits = await search_async(
@@ -101,7 +112,8 @@ class RetrieveTool(Tool):
                 scope=scope,
                 mcp_memory_search_callable=self._mcp_memory_search_callable,
                 mcp_knowledge_search_callable=self._mcp_knowledge_search_callable,
-                memory_scope_key=self._memory_scope_key,
+                memory_scope_key=self._effective_memory_scope(),
+                cache_info=cache_info,
             )
         except ToolError:
             raise
@@ -114,9 +126,18 @@ class RetrieveTool(Tool):
             logger.error(f"Retrieve error [{code}]: {sanitized}")
             return json.dumps({"error": sanitized, "code": code, "hits": []})
 
-        return json.dumps(
-            {"query": query, "scope": scope, "count": len(hits), "hits": hits},
-            ensure_ascii=False,
-            indent=2,
-        )
+        payload: dict[str, Any] = {"query": query, "scope": scope, "count": len(hits), "hits": hits}
+        if cache_info:
+            payload["cached"] = cache_info.get("hit", False)
+            stats = self.cache_stats()
+            if stats:
+                logger.debug(f"Retrieve cache {'hit' if payload['cached'] else 'miss'}; hit rate {stats['hitRate']}")
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """Result cache counters (hits, misses, evictions, hitRate, entries); None when the cache is off."""
+        from joyhousebot.services.retrieval.result_cache import get_result_cache
+
+        cache = get_result_cache(self.config)
+        return cache.stats() if cache is not None else None
 
@@ -2,6 +2,7 @@
 
 from typing import Any, TYPE_CHECKING
 
+from joyhousebot.agent.run_context import current_run_context
 from joyhousebot.agent.tools.base import Tool
 
 if TYPE_CHECKING:
@@ -57,9 +58,13 @@ class SpawnTool(Tool):
     
     async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
         """Spawn a subagent to execute the given task."""
+        origin_channel, origin_chat_id = self._origin_channel, self._origin_chat_id
+        run_ctx = current_run_context()
+        if run_ctx is not None and run_ctx.channel and run_ctx.chat_id:
+            origin_channel, origin_chat_id = run_ctx.channel, run_ctx.chat_id
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=origin_channel,
+            origin_chat_id=origin_chat_id,
         )
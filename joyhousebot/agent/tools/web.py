@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 import httpx
 
 from joyhousebot.agent.tools.base import Tool
+from joyhousebot.utils.http_client import HttpClientService, get_http_client
 from joyhousebot.utils.exceptions import (
     ToolError,
     TimeoutError,
@@ -22,9 +23,6 @@ from joyhousebot.utils.exceptions import (
 
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5
-_REQUEST_TIMEOUT = 30.0
-_SEARCH_TIMEOUT = 10.0
 _MAX_RETRIES = 3
 
 
@@ -103,6 +101,7 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
 
     name = "web_search"
+    parallel_safe = True
     description = (
         "Search the web for information. PREFERRED for finding news, articles, and current events. "
         "Returns titles, URLs, and snippets. Use this FIRST before web_fetch. "
@@ -117,9 +116,14 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
 
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(self, api_key: str | None = None, max_results: int = 5, http: HttpClientService | None = None):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self._http = http
+
+    @property
+    def http(self) -> HttpClientService:
+        return self._http or get_http_client()
 
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -127,39 +131,36 @@ class WebSearchTool(Tool):
 
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = None
-                last_error: Exception | None = None
-                for attempt in range(_MAX_RETRIES):
-                    try:
-                        r = await client.get(
-                            "https://api.search.brave.com/res/v1/web/search",
-                            params={"q": query, "count": n},
-                            headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                            timeout=_SEARCH_TIMEOUT
-                        )
-                        r.raise_for_status()
-                        break
-                    except httpx.TimeoutException:
-                        last_error = TimeoutError("web_search", _SEARCH_TIMEOUT)
-                        if attempt < _MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
-                            continue
-                        raise last_error
-                    except httpx.HTTPStatusError as e:
-                        if e.response.status_code == 429:
-                            raise RateLimitError("Brave Search")
-                        if e.response.status_code >= 500 and attempt < _MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
-                            continue
-                        raise
-                    except httpx.RequestError as e:
-                        last_error = e
-                        if attempt < _MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
-                            continue
-                        raise
-                assert r is not None
+            timeout = self.http.timeout_for(self.name)
+            r = None
+            for attempt in range(_MAX_RETRIES):
+                try:
+                    r = await self.http.get(
+                        "https://api.search.brave.com/res/v1/web/search",
+                        name=self.name,
+                        params={"q": query, "count": n},
+                        headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                    )
+                    r.raise_for_status()
+                    break
+                except httpx.TimeoutException:
+                    if attempt < _MAX_RETRIES - 1:
+                        await asyncio.sleep(0.5 * (attempt + 1))
+                        continue
+                    raise TimeoutError("web_search", timeout)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 429:
+                        raise RateLimitError("Brave Search")
+                    if e.response.status_code >= 500 and attempt < _MAX_RETRIES - 1:
+                        await asyncio.sleep(0.5 * (attempt + 1))
+                        continue
+                    raise
+                except httpx.RequestError:
+                    if attempt < _MAX_RETRIES - 1:
+                        await asyncio.sleep(0.5 * (attempt + 1))
+                        continue
+                    raise
+            assert r is not None
 
             results = r.json().get("web", {}).get("results", [])
             if not results:
@@ -189,6 +190,7 @@ class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
 
     name = "web_fetch"
+    parallel_safe = True
     description = (
         "Fetch a specific URL and extract readable content. "
         "LIMITATIONS: Cannot render JavaScript-heavy pages (Google News, Twitter/X, SPA sites). "
@@ -205,8 +207,13 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
 
-    def __init__(self, max_chars: int = 50000):
+    def __init__(self, max_chars: int = 50000, http: HttpClientService | None = None):
         self.max_chars = max_chars
+        self._http = http
+
+    @property
+    def http(self) -> HttpClientService:
+        return self._http or get_http_client()
 
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
         from readability import Document
@@ -218,28 +225,26 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=_REQUEST_TIMEOUT
-            ) as client:
-                r = None
-                for attempt in range(_MAX_RETRIES):
-                    try:
-                        r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                        r.raise_for_status()
-                        break
-                    except httpx.TimeoutException:
-                        if attempt < _MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
-                            continue
-                        return json.dumps({"error": f"Request timed out after {_REQUEST_TIMEOUT}s", "url": url})
-                    except httpx.RequestError as e:
-                        if attempt < _MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
-                            continue
-                        return json.dumps({"error": f"Connection failed: {sanitize_error_message(str(e))}", "url": url})
-                assert r is not None
+            r = None
+            for attempt in range(_MAX_RETRIES):
+                try:
+                    r = await self.http.get(
+                        url, name=self.name, follow_redirects=True, headers={"User-Agent": USER_AGENT}
+                    )
+                    r.raise_for_status()
+                    break
+                except httpx.TimeoutException:
+                    if attempt < _MAX_RETRIES - 1:
+                        await asyncio.sleep(0.5 * (attempt + 1))
+                        continue
+                    timeout = self.http.timeout_for(self.name)
+                    return json.dumps({"error": f"Request timed out after {timeout}s", "url": url})
+                except httpx.RequestError as e:
+                    if attempt < _MAX_RETRIES - 1:
+                        await asyncio.sleep(0.5 * (attempt + 1))
+                        continue
+                    return json.dumps({"error": f"Connection failed: {sanitize_error_message(str(e))}", "url": url})
+            assert r is not None
 
             final_host = urlparse(str(r.url)).hostname
             if final_host and _is_forbidden_host(final_host):
@@ -31,6 +31,11 @@ def update_config_response(
 ) -> dict[str, Any]:
     def update_app_config(cfg: Any) -> None:
         app_state["config"] = cfg
+        # Provider keys, bases and auth profiles may have changed: rebuild runtime providers.
+        for agent in (app_state.get("agents_map") or {}).values():
+            pool = getattr(agent, "provider_pool", None)
+            if pool is not None:
+                pool.invalidate()
 
     def plugin_reloader(cfg: Any) -> None:
         plugin_manager = app_state.get("plugin_manager")
@@ -56,16 +56,34 @@ def control_queue_response(
     app_state: dict[str, Any],
     now_ms: Callable[[], int],
 ) -> dict[str, Any]:
-    """Queue metrics for control UI: lanes (sessionKey, runningRunId, queued, queueDepth, headWaitMs)."""
+    """Queue metrics for control UI: lanes (sessionKey, runningRunId, queued, queueDepth, headWaitMs)
+    plus bus worker shards (queueDepth, inFlight per session), system prompt section cache,
+    runtime provider pool and LLM response cache stats when an agent loop is running,
+    and the shared outbound HTTP client stats."""
     from joyhousebot.services.lanes import lane_list_all, lane_status
+    from joyhousebot.utils.http_client import get_http_client
 
     lanes_list = lane_list_all(app_state, now_ms())
     status_full = lane_status(app_state, None, now_ms())
     summary = status_full.get("summary", {})
-    return {
+    out: dict[str, Any] = {
         "ok": True,
         "sessions": lanes_list,
         "summary": summary,
         "ts": now_ms(),
     }
+    agent = app_state.get("agent_loop")
+    if agent is not None and hasattr(agent, "worker_stats"):
+        out["busWorkers"] = agent.worker_stats()
+    context = getattr(agent, "context", None)
+    if context is not None and hasattr(context, "prompt_cache_stats"):
+        out["promptCache"] = context.prompt_cache_stats()
+    pool = getattr(agent, "provider_pool", None)
+    if pool is not None and hasattr(pool, "stats"):
+        out["providerPool"] = pool.stats()
+    response_cache = getattr(agent, "response_cache", None)
+    if response_cache is not None and hasattr(response_cache, "stats"):
+        out["responseCache"] = response_cache.stats()
+    out["httpClient"] = get_http_client().stats()
+    return out
 
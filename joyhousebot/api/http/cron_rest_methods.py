@@ -43,6 +43,7 @@ def cron_job_to_dict(job: Any) -> dict[str, Any]:
             "deliver": job.payload.deliver,
             "channel": job.payload.channel,
             "to": job.payload.to,
+            "cacheable": bool(getattr(job.payload, "cacheable", False)),
         },
         "state": {
             "next_run_at_ms": job.state.next_run_at_ms,
@@ -87,6 +88,7 @@ def add_cron_job_response(
         delete_after_run=body.delete_after_run,
         agent_id=body.agent_id,
         payload_kind=payload_kind,
+        cacheable=bool(getattr(body, "cacheable", False)),
     )
     return {"ok": True, "job": job_to_dict(job)}
 
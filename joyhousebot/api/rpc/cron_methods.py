@@ -112,6 +112,7 @@ def build_cron_add_args(params: dict[str, Any]) -> dict[str, Any]:
         "channel": params.get("channel"),
         "to": params.get("to"),
         "delete_after_run": bool(params.get("delete_after_run", False)),
+        "cacheable": bool(payload.get("cacheable", params.get("cacheable", False))),
         "agent_id": params.get("agent_id") or params.get("agentId"),
         "payload_kind": payload_kind,
     }
@@ -134,6 +135,7 @@ def build_cron_add_body_from_params(
         to=add_args["to"],
         delete_after_run=add_args["delete_after_run"],
         agent_id=add_args["agent_id"],
+        cacheable=add_args["cacheable"],
     )
     if "payload_kind" in add_args:
         kwargs["payload_kind"] = add_args["payload_kind"]
@@ -138,6 +138,8 @@ from joyhousebot.presence.store import PresenceStore
 from joyhousebot.node import NodeInvokeResult, NodeRegistry, NodeSession
 from joyhousebot.services.control.overview_service import build_channels_status_snapshot as service_build_channels_status_snapshot
 from joyhousebot.services.skills.skill_service import build_skills_status_report as build_skills_status_report_from_service
+from joyhousebot.utils.http_client import close_http_client, configure_http_client
+from joyhousebot.utils.tokens import count_tokens
 from loguru import logger
 
 # Presence: in-memory list of connected clients + gateway (OpenClaw-style)
@@ -264,6 +266,7 @@ async def lifespan(app: FastAPI):
     try:
         config = get_cached_config(force_reload=True)
         app_state["config"] = config
+        configure_http_client(config)
         try:
             from joyhousebot.plugins.manager import initialize_plugins_for_workspace, get_plugin_manager
 
@@ -443,6 +446,7 @@ async def lifespan(app: FastAPI):
             pass
         if app_state.get("agent_loop") and not app_state.get("_gateway_injected"):
             await app_state["agent_loop"].close_mcp()
+        await close_http_client()
         plugin_manager = app_state.get("plugin_manager")
         if plugin_manager is not None and not app_state.get("_gateway_injected"):
             try:
@@ -2489,8 +2493,9 @@ def _persist_trace(run_id: str, session_key: str, status: str, error: str | None
         return
     try:
         ended_ms = _now_ms()
-        store = _get_store()
-        store.insert_agent_trace(
+        # Fire-and-forget on the store executor: the run's caller never waits on SQLite.
+        future = _get_store().aio.submit(
+            "insert_agent_trace",
             trace_id=run_id,
             session_key=session_key,
             status=status,
@@ -2501,10 +2506,19 @@ def _persist_trace(run_id: str, session_key: str, status: str, error: str | None
             tools_used=rec.to_tools_used_json(),
             message_preview=rec.message_preview or None,
         )
+        future.add_done_callback(lambda f: _log_trace_write_failure(run_id, f))
     finally:
         trace_recorder.set(None)
 
 
+def _log_trace_write_failure(run_id: str, future: Any) -> None:
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Persist agent trace {} failed: {}", run_id, exc)
+
+
 def _load_persistent_state(name: str, default: Any) -> Any:
     try:
         return _get_store().get_sync_json(name=name, default=default)
@@ -2521,8 +2535,8 @@ def _save_persistent_state(name: str, value: Any) -> None:
 
 
 def _estimate_tokens(text: str) -> int:
-    # Lightweight estimate for usage dashboards when provider usage is unavailable.
-    return max(0, (len(text or "") + 3) // 4)
+    # Usage dashboards when provider usage is unavailable: same counter as context budgeting.
+    return count_tokens(text or "")
 
 
 async def _run_update_install() -> None:
@@ -2572,6 +2586,8 @@ def _session_usage_entry(key: str, messages: list[dict[str, Any]]) -> dict[str,
     errors = 0
     input_tokens = 0
     output_tokens = 0
+    cache_read_tokens = 0
+    cache_write_tokens = 0
     total_cost = 0.0
     input_cost = 0.0
     output_cost = 0.0
@@ -2615,7 +2631,12 @@ def _session_usage_entry(key: str, messages: list[dict[str, Any]]) -> dict[str,
             out = int(msg_usage.get("output") or msg_usage.get("completion_tokens") or 0)
             input_tokens += inp
             output_tokens += out
+            cache_read = int(msg_usage.get("cacheRead") or msg_usage.get("cache_read_tokens") or 0)
+            cache_write = int(msg_usage.get("cacheWrite") or msg_usage.get("cache_write_tokens") or 0)
+            cache_read_tokens += cache_read
+            cache_write_tokens += cache_write
         else:
+            cache_read = cache_write = 0
             inp = _estimate_tokens(content) if role == "user" else 0
             out = _estimate_tokens(content) if role == "assistant" else 0
             if role == "user":
@@ -2650,12 +2671,16 @@ def _session_usage_entry(key: str, messages: list[dict[str, Any]]) -> dict[str,
             daily[day] = {
                 "date": day,
                 "tokens": 0,
+                "cacheRead": 0,
+                "cacheWrite": 0,
                 "cost": 0,
                 "messages": 0,
                 "toolCalls": 0,
                 "errors": 0,
             }
         daily[day]["messages"] += 1
+        daily[day]["cacheRead"] += cache_read
+        daily[day]["cacheWrite"] += cache_write
         if role == "user":
             daily[day]["tokens"] += inp if isinstance(msg_usage, dict) else _estimate_tokens(content)
         elif role == "assistant":
@@ -2683,8 +2708,8 @@ def _session_usage_entry(key: str, messages: list[dict[str, Any]]) -> dict[str,
         "usage": {
             "input": input_tokens,
             "output": output_tokens,
-            "cacheRead": 0,
-            "cacheWrite": 0,
+            "cacheRead": cache_read_tokens,
+            "cacheWrite": cache_write_tokens,
             "totalTokens": total_tokens,
             "totalCost": total_cost,
             "inputCost": input_cost,
@@ -2770,7 +2795,7 @@ async def list_traces(
     """List agent run traces (observability). Optional session_key, limit, cursor for pagination."""
     limit = max(1, min(limit, 200))
     store = _get_store()
-    items, next_cursor = store.list_agent_traces(
+    items, next_cursor = await store.aio.list_agent_traces(
         session_key=session_key,
         limit=limit,
         cursor=cursor,
@@ -2785,7 +2810,7 @@ async def list_traces(
 async def get_trace(trace_id: str):
     """Get one agent run trace by id (run_id)."""
     store = _get_store()
-    trace = store.get_agent_trace(trace_id.strip())
+    trace = await store.aio.get_agent_trace(trace_id.strip())
     if trace is None:
         raise HTTPException(status_code=404, detail="trace not found")
     return trace
@@ -2861,7 +2886,7 @@ async def get_house_identity():
     """Get house identity info."""
     from joyhousebot.storage import LocalStateStore
     store = LocalStateStore.default()
-    return get_house_identity_response(store=store)
+    return await store.aio.run(get_house_identity_response, store=store)
 
 
 @api_router.post("/house/register")
@@ -3048,6 +3073,7 @@ class CronJobCreate(BaseModel):
     delete_after_run: bool = False
     agent_id: str | None = None  # OpenClaw: which agent runs this job; None = default
     payload_kind: str = "agent_turn"  # agent_turn | memory_compaction
+    cacheable: bool = False  # Serve repeated identical LLM calls from the response cache
 
 
 class CronJobPatch(BaseModel):
@@ -3670,7 +3696,7 @@ async def list_tasks(status: str | None = None, limit: int = 50):
     """List tasks from local storage."""
     try:
         store = LocalStateStore.default()
-        return list_tasks_response(store=store, status=status, limit=limit)
+        return await store.aio.run(list_tasks_response, store=store, status=status, limit=limit)
     except Exception as e:
         logger.error(f"Failed to list tasks: {e}")
         raise HTTPException(status_code=500, detail=unknown_error_detail(e))
@@ -3681,7 +3707,7 @@ async def get_task(task_id: str):
     """Get task details."""
     try:
         store = LocalStateStore.default()
-        return get_task_response(store=store, task_id=task_id)
+        return await store.aio.run(get_task_response, store=store, task_id=task_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -3694,7 +3720,7 @@ async def list_task_events(task_id: str, limit: int = 100):
     """List execution events for a task (for GUI)."""
     try:
         store = LocalStateStore.default()
-        return list_task_events_response(store=store, task_id=task_id, limit=limit)
+        return await store.aio.run(list_task_events_response, store=store, task_id=task_id, limit=limit)
     except Exception as e:
         logger.error(f"Failed to list task events: {e}")
         raise HTTPException(status_code=500, detail=unknown_error_detail(e))
@@ -3705,7 +3731,7 @@ async def get_identity():
     """Get bot identity information."""
     try:
         store = LocalStateStore.default()
-        return get_identity_response(store=store)
+        return await store.aio.run(get_identity_response, store=store)
     except Exception as e:
         logger.error(f"Failed to get identity: {e}")
         raise HTTPException(status_code=500, detail=unknown_error_detail(e))
@@ -2,5 +2,6 @@
 
 from joyhousebot.bus.events import InboundMessage, OutboundMessage
 from joyhousebot.bus.queue import MessageBus
+from joyhousebot.bus.workers import SessionWorkerPool
 
-__all__ = ["MessageBus", "InboundMessage", "OutboundMessage"]
+__all__ = ["MessageBus", "InboundMessage", "OutboundMessage", "SessionWorkerPool"]
@@ -1,7 +1,7 @@
 """Async message queue for decoupled channel-agent communication.
 
-在整体架构中：MessageBus 单 FIFO 入队、单消费者（AgentLoop），出队经 subscribe_outbound
-分发给各 channel，实现通道与 agent 解耦。
+在整体架构中：MessageBus 单 FIFO 入队，AgentLoop 消费后按 session_key 分片交给
+SessionWorkerPool 并发处理；出队经 subscribe_outbound 分发给各 channel，实现通道与 agent 解耦。
 """
 
 import asyncio
@@ -16,8 +16,10 @@ class MessageBus:
     """
     Async message bus that decouples chat channels from the agent core.
 
-    Single FIFO inbound queue; one consumer (AgentLoop) processes messages in order.
-    Channel semantics: natural followup (new messages queued and consumed sequentially).
+    Single FIFO inbound queue; one consumer (AgentLoop) hands messages to a
+    SessionWorkerPool, which keeps strict order within a session and runs
+    different sessions concurrently.
+    Channel semantics: natural followup (new messages queued and consumed sequentially per session).
     See docs/openclaw-implementation-verification.md command-queue semantics.
     """
     
@@ -0,0 +1,145 @@
+"""Session-sharded worker pool for inbound messages.
+
+Messages are sharded by the session they will write (see shard_key): each shard is a FIFO drained by
+exactly one worker task, so ordering is strict within a session, while different
+sessions run in parallel up to max_concurrency. Shards are created on first message
+and dropped once drained, so idle sessions cost nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from joyhousebot.bus.events import InboundMessage
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def shard_key(msg: InboundMessage) -> str:
+    """
+    Session a message is handled in. System messages (subagent announcements) carry
+    "<origin_channel>:<origin_chat_id>" as chat_id and run in that origin session,
+    mirroring AgentLoop._process_system_message.
+    """
+    if msg.channel == "system":
+        return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+    return msg.session_key
+
+
+@dataclass
+class _Shard:
+    key: str
+    pending: deque[tuple[InboundMessage, float]] = field(default_factory=deque)
+    in_flight: int = 0
+    processed: int = 0
+    task: asyncio.Task | None = None
+
+
+class SessionWorkerPool:
+    """
+    Run a message handler with per-session FIFO ordering and cross-session concurrency.
+
+    submit() never blocks on the handler; the handler is responsible for its own error
+    reporting (exceptions are logged and do not stop the shard).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[InboundMessage], Awaitable[None]],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self._handler = handler
+        self.max_concurrency = max(1, int(max_concurrency or 1))
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._shards: dict[str, _Shard] = {}
+        self._processed_total = 0
+
+    def submit(self, msg: InboundMessage) -> None:
+        """Queue msg on its session shard and ensure a worker is draining it."""
+        key = shard_key(msg)
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = _Shard(key=key)
+            self._shards[key] = shard
+        shard.pending.append((msg, time.monotonic()))
+        if shard.task is None or shard.task.done():
+            shard.task = asyncio.create_task(self._drain(shard), name=f"session-worker:{key}")
+
+    async def _drain(self, shard: _Shard) -> None:
+        try:
+            while shard.pending:
+                # Take the slot before popping so a message waiting for one still counts
+                # as queued in stats().
+                async with self._slots:
+                    msg, _ = shard.pending.popleft()
+                    shard.in_flight += 1
+                    try:
+                        await self._handler(msg)
+                    except Exception:
+                        logger.exception(f"Session worker {shard.key}: handler failed")
+                    finally:
+                        shard.in_flight -= 1
+                        shard.processed += 1
+                        self._processed_total += 1
+        finally:
+            # No await between the emptiness check and removal, so a concurrent submit()
+            # either lands before (and is drained above) or creates a fresh shard.
+            if not shard.pending and self._shards.get(shard.key) is shard:
+                del self._shards[shard.key]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of messages currently being handled."""
+        return sum(s.in_flight for s in self._shards.values())
+
+    @property
+    def queued(self) -> int:
+        """Number of messages waiting for their shard (excluding in-flight)."""
+        return sum(len(s.pending) for s in self._shards.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and in-flight counts overall and per shard (session key)."""
+        now = time.monotonic()
+        shards = []
+        for key in sorted(self._shards):
+            shard = self._shards[key]
+            head_wait_ms = int((now - shard.pending[0][1]) * 1000) if shard.pending else None
+            shards.append({
+                "sessionKey": key,
+                "queueDepth": len(shard.pending),
+                "inFlight": shard.in_flight,
+                "processed": shard.processed,
+                "headWaitMs": head_wait_ms,
+            })
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "activeShards": len(shards),
+            "processedTotal": self._processed_total,
+            "shards": shards,
+        }
+
+    async def join(self) -> None:
+        """Wait until every shard has drained."""
+        while self._shards:
+            tasks = [s.task for s in self._shards.values() if s.task is not None]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel all workers and drop pending messages."""
+        tasks = [s.task for s in self._shards.values() if s.task is not None and not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._shards.clear()
@@ -138,6 +138,29 @@ def register_comms_commands(app: typer.Typer, console: Console) -> None:
             raise typer.Exit(1)
         console.print(f"[green]✓[/green] Deleted session: {key}")
 
+    @sessions_app.command("migrate")
+    def sessions_migrate(
+        db_path: str = typer.Option("", "--db", help="Target SQLite database (default: sessions.sqlite_path or ~/.joyhousebot/sessions/sessions.db)"),
+        overwrite: bool = typer.Option(False, "--overwrite", help="Replace sessions already in the database"),
+    ) -> None:
+        """Import JSONL session files into the SQLite session backend."""
+        from joyhousebot.session.manager import default_sessions_dir
+        from joyhousebot.session.migrate import migrate_jsonl_to_sqlite
+
+        if db_path:
+            target = Path(db_path).expanduser()
+        else:
+            configured = load_config().sessions.sqlite_path.strip()
+            target = Path(configured).expanduser() if configured else default_sessions_dir() / "sessions.db"
+        report = migrate_jsonl_to_sqlite(default_sessions_dir(), target, overwrite=overwrite)
+        console.print(
+            f"[green]✓[/green] Imported {report.imported} session(s) ({report.messages} messages) into {target}; "
+            f"skipped {report.skipped}, failed {len(report.failed)}"
+        )
+        for path in report.failed:
+            console.print(f"[yellow]Failed:[/yellow] {path}")
+        console.print('Set "sessions": {"backend": "sqlite"} in config to use it.')
+
     memory_app = typer.Typer(help="Memory search tools")
     app.add_typer(memory_app, name="memory")
 
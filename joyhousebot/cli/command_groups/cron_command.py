@@ -63,6 +63,7 @@ def register_cron_commands(app: typer.Typer, console: Console) -> None:
         to: str = typer.Option(None, "--to", help="Recipient for delivery"),
         channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
         kind: str = typer.Option("agent_turn", "--kind", "-k", help="Payload kind: agent_turn (send message to agent) or memory_compaction (L2->L1->L0)"),
+        cacheable: bool = typer.Option(False, "--cacheable", help="Reuse cached LLM responses for identical requests (needs agents.defaults.response_cache.enabled)"),
     ) -> None:
         """Add a scheduled job."""
         from joyhousebot.config.loader import get_data_dir
@@ -97,6 +98,7 @@ def register_cron_commands(app: typer.Typer, console: Console) -> None:
             to=to,
             channel=channel,
             payload_kind=payload_kind,
+            cacheable=cacheable,
         )
         console.print(f"[green]✓[/green] Added job '{job.name}' ({job.id})")
 
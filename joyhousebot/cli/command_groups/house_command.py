@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import hashlib
 import json
+import os
 import platform
 import socket
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Callable
 from uuid import uuid4
 
 import typer
@@ -101,6 +104,90 @@ def _resolve_control_plane_backoff_policy(config: Any) -> dict[str, float]:
     }
 
 
+class _AgentLoopPool:
+    """
+    Warm AgentLoop instances reused across worker tasks.
+
+    Loops are built on demand up to `size` and returned to the idle list after each
+    task, so tool registration, skills and MCP connections are set up once per loop
+    instead of once per task.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int):
+        self._factory = factory
+        self.size = max(1, int(size))
+        self._idle: list[Any] = []
+        self._all: list[Any] = []
+        self._available = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def lease(self) -> AsyncIterator[Any]:
+        async with self._available:
+            while not self._idle and len(self._all) >= self.size:
+                await self._available.wait()
+            if self._idle:
+                loop = self._idle.pop()
+            else:
+                loop = self._factory()
+                self._all.append(loop)
+        try:
+            yield loop
+        finally:
+            async with self._available:
+                self._idle.append(loop)
+                self._available.notify()
+
+    @property
+    def created(self) -> int:
+        return len(self._all)
+
+    async def close(self) -> None:
+        loops, self._all, self._idle = self._all, [], []
+        for loop in loops:
+            try:
+                await loop.close_mcp()
+            finally:
+                loop.stop()
+
+
+class _WorkerTaskStats:
+    """Task outcome counters and latency/throughput figures for the worker status."""
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 256):
+        self.window_seconds = window_seconds
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self._latencies_ms: deque[float] = deque(maxlen=max_samples)
+        self._finished_at: deque[float] = deque()
+
+    def record(self, outcome: str, latency_s: float, now: float | None = None) -> None:
+        if outcome == "completed":
+            self.completed += 1
+        elif outcome == "retried":
+            self.retried += 1
+        else:
+            self.failed += 1
+        self._latencies_ms.append(latency_s * 1000.0)
+        self._finished_at.append(time.monotonic() if now is None else now)
+
+    def snapshot(self, running: int, now: float | None = None) -> dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        while self._finished_at and now - self._finished_at[0] > self.window_seconds:
+            self._finished_at.popleft()
+        latencies = sorted(self._latencies_ms)
+        return {
+            "running": running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "lastLatencyMs": int(self._latencies_ms[-1]) if latencies else None,
+            "avgLatencyMs": int(sum(latencies) / len(latencies)) if latencies else None,
+            "p95LatencyMs": int(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]) if latencies else None,
+            "throughputPerMin": round(len(self._finished_at) * 60.0 / self.window_seconds, 2),
+        }
+
+
 def register_house_commands(app: typer.Typer, console: Console, make_provider: Callable[[Any], Any]) -> None:
     """Register house and house tasks command groups."""
     house_app = typer.Typer(
@@ -247,6 +334,11 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
         concurrency: int = typer.Option(1, "--concurrency", "-c", help="Max concurrent task executions"),
         max_retries: int = typer.Option(3, "--max-retries", help="Max automatic retries per task"),
         retry_backoff_base: int = typer.Option(5, "--retry-backoff-base", help="Base backoff seconds"),
+        lease_seconds: int = typer.Option(
+            300,
+            "--lease-seconds",
+            help="Claim lease; tasks of a worker that stops renewing it are requeued after this long",
+        ),
         run_once: bool = typer.Option(False, "--run-once", help="Run one cycle then exit"),
     ) -> None:
         """Run local worker loop."""
@@ -262,6 +354,9 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
             raise typer.BadParameter("House is not registered. Run: joyhousebot house register --server <url>")
         if concurrency < 1:
             raise typer.BadParameter("--concurrency must be >= 1")
+        if lease_seconds < 1:
+            raise typer.BadParameter("--lease-seconds must be >= 1")
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
 
         house_id = identity.house_id
         client = ControlPlaneClient(server)
@@ -339,15 +434,21 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                 console.print("[yellow]WebSocket disabled automatically: missing access_token/ws_url[/yellow]")
                 _persist_cp_status({"wsActive": False, "wsDisabledReason": "missing_access_token_or_ws_url"})
 
-            async def _execute_task(task: Any) -> None:
-                bus = MessageBus()
-                provider = make_provider(config)
-                transcribe_provider = None
-                if config.providers.groq.api_key:
-                    from joyhousebot.providers.transcription import GroqTranscriptionProvider
-                    transcribe_provider = GroqTranscriptionProvider(api_key=config.providers.groq.api_key)
-                agent_loop = AgentLoop(
-                    bus=bus,
+            async def _renew_lease(task_id: str) -> None:
+                while True:
+                    await asyncio.sleep(max(1.0, lease_seconds / 3))
+                    if not await store.aio.renew_task_lease(task_id=task_id, lease_owner=worker_id, lease_seconds=lease_seconds):
+                        return
+
+            provider = make_provider(config)
+            transcribe_provider = None
+            if config.providers.groq.api_key:
+                from joyhousebot.providers.transcription import GroqTranscriptionProvider
+                transcribe_provider = GroqTranscriptionProvider(api_key=config.providers.groq.api_key)
+
+            def _build_agent_loop() -> AgentLoop:
+                return AgentLoop(
+                    bus=MessageBus(),
                     provider=provider,
                     workspace=config.workspace_path,
                     model=default_model,
@@ -364,11 +465,37 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                     config=config,
                     transcribe_provider=transcribe_provider,
                 )
+
+            loop_pool = _AgentLoopPool(_build_agent_loop, size=concurrency)
+            stats = _WorkerTaskStats()
+
+            def _persist_task_stats() -> None:
+                _persist_cp_status({"tasks": stats.snapshot(running=sum(1 for t in running if not t.done()))})
+
+            async def _report(label: str, report: Callable[..., Any], **kwargs: Any) -> None:
+                try:
+                    await report(house_id=house_id, **kwargs)
+                except Exception as cp_exc:
+                    _print_control_plane_warning(console, f"report {label} warning", cp_exc)
+
+            async def _execute_task(task: Any) -> None:
+                started = time.monotonic()
+                lease_task = asyncio.create_task(_renew_lease(task.task_id))
+                try:
+                    async with loop_pool.lease() as agent_loop:
+                        outcome = await _run_task(agent_loop, task)
+                finally:
+                    lease_task.cancel()
+                stats.record(outcome, time.monotonic() - started)
+                _persist_task_stats()
+
+            async def _run_task(agent_loop: Any, task: Any) -> str:
                 prompt = _build_task_prompt(task.task_type, task.payload)
                 try:
                     if task.source == "cloud":
-                        client.report_task_progress(
-                            house_id=house_id,
+                        await _report(
+                            "progress",
+                            client.report_task_progress_async,
                             task_id=task.task_id,
                             progress=0.05,
                             detail="task started",
@@ -378,16 +505,18 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                         session_key=f"bot-task:{task.task_id}",
                         channel="cli",
                         chat_id="bot-worker",
+                        cacheable=bool((task.payload or {}).get("cacheable")),
                     )
-                    store.update_task_status(task_id=task.task_id, status="completed")
-                    store.log_task_event(
+                    await store.aio.update_task_status(task_id=task.task_id, status="completed")
+                    await store.aio.log_task_event(
                         task_id=task.task_id,
                         event="result",
                         detail={"response_preview": (response or "")[:500]},
                     )
                     if task.source == "cloud":
-                        client.report_task_result(
-                            house_id=house_id,
+                        await _report(
+                            "result",
+                            client.report_task_result_async,
                             task_id=task.task_id,
                             result={
                                 "output": response or "",
@@ -396,6 +525,7 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                             },
                         )
                     console.print(f"[green]✓[/green] Completed task: [cyan]{task.task_id}[/cyan]")
+                    return "completed"
                 except Exception as exc:
                     error = {
                         "code": "TASK_EXECUTION_ERROR",
@@ -405,36 +535,30 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                     if task.retry_count < max_retries:
                         next_retry_idx = task.retry_count + 1
                         delay = retry_backoff_base * (2 ** (next_retry_idx - 1))
-                        store.requeue_with_backoff(
+                        await store.aio.requeue_with_backoff(
                             task_id=task.task_id,
                             retry_increment=1,
                             delay_seconds=delay,
                             error=error,
                         )
                         if task.source == "cloud":
-                            try:
-                                client.report_task_progress(
-                                    house_id=house_id,
-                                    task_id=task.task_id,
-                                    progress=0.0,
-                                    detail=f"retry scheduled in {delay}s",
-                                )
-                            except Exception as cp_exc:
-                                _print_control_plane_warning(console, "report progress warning", cp_exc)
+                            await _report(
+                                "progress",
+                                client.report_task_progress_async,
+                                task_id=task.task_id,
+                                progress=0.0,
+                                detail=f"retry scheduled in {delay}s",
+                            )
                         console.print(
                             f"[yellow]↺[/yellow] Task retry scheduled: {task.task_id} "
                             f"(attempt {next_retry_idx}/{max_retries}, in {delay}s)"
                         )
-                    else:
-                        store.update_task_status(task_id=task.task_id, status="failed", error=error)
-                        if task.source == "cloud":
-                            try:
-                                client.report_task_failure(house_id=house_id, task_id=task.task_id, error=error)
-                            except Exception as cp_exc:
-                                _print_control_plane_warning(console, "report failure warning", cp_exc)
-                        console.print(f"[red]✗[/red] Task failed: {task.task_id} -> {exc}")
-                finally:
-                    await agent_loop.close_mcp()
+                        return "retried"
+                    await store.aio.update_task_status(task_id=task.task_id, status="failed", error=error)
+                    if task.source == "cloud":
+                        await _report("failure", client.report_task_failure_async, task_id=task.task_id, error=error)
+                    console.print(f"[red]✗[/red] Task failed: {task.task_id} -> {exc}")
+                    return "failed"
 
             last_heartbeat = 0.0
             heartbeat_backoff_until = 0.0
@@ -446,10 +570,13 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                     now = time.time()
                     if now >= heartbeat_backoff_until and now - last_heartbeat >= heartbeat_interval:
                         try:
-                            client.heartbeat(
+                            await client.heartbeat_async(
                                 house_id=house_id,
                                 status="online",
-                                metrics={"poll_interval": poll_interval},
+                                metrics={
+                                    "poll_interval": poll_interval,
+                                    "tasks": stats.snapshot(running=len(running)),
+                                },
                             )
                             last_heartbeat = now
                             heartbeat_backoff_until = 0.0
@@ -476,7 +603,7 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
 
                     if now >= claim_backoff_until:
                         try:
-                            claimed = client.claim_task(house_id=house_id)
+                            claimed = await client.claim_task_async(house_id=house_id)
                             claim_backoff_until = 0.0
                             _persist_cp_status(
                                 {"lastClaimMs": int(now * 1000), "lastClaimError": None, "claimBackoffUntilMs": 0}
@@ -512,13 +639,16 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                                 }
                             )
 
-                    while len(running) < concurrency:
-                        task = store.pop_next_queued_task()
-                        if not task:
-                            break
-                        did_work = True
-                        t = asyncio.create_task(_execute_task(task))
-                        running.add(t)
+                    free_slots = concurrency - len(running)
+                    if free_slots > 0:
+                        for task in await store.aio.claim_tasks(
+                            limit=free_slots,
+                            lease_owner=worker_id,
+                            lease_seconds=lease_seconds,
+                            max_retries=max_retries,
+                        ):
+                            did_work = True
+                            running.add(asyncio.create_task(_execute_task(task)))
                     if run_once:
                         break
                     if not did_work and not running:
@@ -535,6 +665,9 @@ def register_house_commands(app: typer.Typer, console: Console, make_provider: C
                         ws_task.cancel()
                 if running:
                     await asyncio.gather(*running, return_exceptions=True)
+                    _persist_cp_status({"tasks": stats.snapshot(running=0)})
+                await loop_pool.close()
+                await client.aclose()
 
         asyncio.run(_run())
 
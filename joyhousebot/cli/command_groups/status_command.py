@@ -41,3 +41,18 @@ def status_command(console: Console) -> None:
                 has_key = bool(p.api_key)
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
+        kp = config.tools.knowledge_pipeline
+        from joyhousebot.services.knowledge_pipeline import read_pipeline_status
+
+        pipeline = read_pipeline_status(workspace / kp.knowledge_processed_dir)
+        if pipeline:
+            stages = pipeline.get("stages") or {}
+            rates = ", ".join(
+                f"{name} {s.get('queued', 0)}q/{s.get('inFlight', 0)}r"
+                + (f" {s['throughputPerMin']}/min" if s.get("throughputPerMin") else "")
+                for name, s in stages.items()
+            )
+            console.print(
+                f"Knowledge pipeline: {pipeline.get('indexed', 0)} indexed, {pipeline.get('pending', 0)} pending, "
+                f"{pipeline.get('failed', 0)} failed [dim]({rates})[/dim]"
+            )
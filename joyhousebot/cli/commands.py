@@ -528,6 +528,7 @@ def gateway(
     from joyhousebot.session.manager import SessionManager
     from joyhousebot.cron.service import CronService
     from joyhousebot.cron.types import CronJob
+    from joyhousebot.utils.http_client import close_http_client, configure_http_client
     from joyhousebot.heartbeat.service import HeartbeatService
     from joyhousebot.plugins.manager import initialize_plugins_for_workspace, get_plugin_manager
 
@@ -540,6 +541,7 @@ def gateway(
     console.print(f"[dim]Logs: {log_path}[/dim]")
     
     config = get_cached_config()
+    configure_http_client(config)
     default_model, default_fallbacks = config.get_agent_model_and_fallbacks(None)
     bus = MessageBus()
     provider = make_provider(config, console)
@@ -554,7 +556,7 @@ def gateway(
     def _make_one_agent(entry, agent_id: str):
         from pathlib import Path
         workspace = Path(entry.workspace).expanduser()
-        sm = SessionManager(workspace)
+        sm = SessionManager(workspace, sessions_config=config.sessions)
         return AgentLoop(
             bus=bus,
             provider=provider,
@@ -574,6 +576,7 @@ def gateway(
             mcp_servers=config.tools.mcp_servers,
             config=config,
             transcribe_provider=_transcribe,
+            max_concurrency=config.agents.defaults.max_concurrency,
         )
 
     agents_map: dict[str, AgentLoop] = {}
@@ -585,7 +588,7 @@ def gateway(
         default_agent_id = config.get_default_agent_id()
         default_agent = agents_map.get(default_agent_id) or (agents_map[next(iter(agents_map))] if agents_map else None)
     else:
-        session_manager = SessionManager(config.workspace_path)
+        session_manager = SessionManager(config.workspace_path, sessions_config=config.sessions)
         default_agent = AgentLoop(
             bus=bus,
             provider=provider,
@@ -605,6 +608,7 @@ def gateway(
             mcp_servers=config.tools.mcp_servers,
             config=config,
             transcribe_provider=_transcribe,
+            max_concurrency=config.agents.defaults.max_concurrency,
         )
         agents_map["default"] = default_agent
         default_agent_id = "default"
@@ -629,6 +633,7 @@ def gateway(
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            cacheable=job.payload.cacheable,
         )
         if job.payload.deliver and job.payload.to:
             from joyhousebot.bus.events import OutboundMessage
@@ -641,7 +646,11 @@ def gateway(
     cron.on_job = on_cron_job
 
     async def on_heartbeat(prompt: str) -> str:
-        return await default_agent.process_direct(prompt, session_key="heartbeat")
+        return await default_agent.process_direct(
+            prompt,
+            session_key="heartbeat",
+            cacheable=config.agents.defaults.response_cache.heartbeat,
+        )
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -742,6 +751,7 @@ def gateway(
             console.print("\n[yellow]Shutting down... (Please wait ~10 seconds for graceful shutdown)[/yellow]")
         finally:
             await default_agent.close_mcp()
+            await close_http_client()
             heartbeat.stop()
             cron.stop()
             default_agent.stop()
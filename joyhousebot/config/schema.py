@@ -162,6 +162,40 @@ class ChannelsConfig(BaseModel):
     qq: QQConfig = Field(default_factory=QQConfig)
 
 
+class ModelRoutingConfig(BaseModel):
+    """How model / auth-profile candidates are ordered from live latency and error stats."""
+    # fixed = primary then fallbacks; fastest = lowest TTFT EWMA among healthy candidates;
+    # weighted = random, weighted by success rate / TTFT; hedged = fastest + fire the next
+    # candidate when the first has no token within its TTFT p95, cancelling the loser
+    strategy: Literal["fixed", "fastest", "weighted", "hedged"] = "fixed"
+    ewma_alpha: float = 0.3
+    min_samples: int = 3  # Calls before a candidate's stats affect its rank
+    max_error_rate: float = 0.5  # Error-rate EWMA above which a candidate ranks last
+    hedge_delay_ms: int = 2000  # Hedge delay until the candidate has a TTFT p95
+    hedge_min_delay_ms: int = 250
+
+
+class ResponseCacheConfig(BaseModel):
+    """Exact-match LLM response cache (~/.joyhousebot/cache/llm_responses.db), opt-in."""
+    enabled: bool = False
+    # Calls are cached when temperature is 0 or the run is cacheable: cron jobs with
+    # payload.cacheable, bot tasks with payload.cacheable, and heartbeats when heartbeat=True.
+    # Off by default: heartbeat prompts repeat all day, so a cached HEARTBEAT_OK would hide
+    # time-of-day tasks in HEARTBEAT.md.
+    heartbeat: bool = False
+    # The key keeps the date from the prompt's Current Time section but not the minute, so
+    # a run is reused within a day and recomputed on the next. Set ttl_seconds below a job's
+    # interval when its answer must not be reused even within the same day.
+    ttl_seconds: int = 86400
+    max_mb: int = 64
+    # Tool results from these tools (or containing timestamps) bypass the cache
+    volatile_tools: list[str] = Field(
+        default_factory=lambda: [
+            "web_search", "web_fetch", "exec", "process", "browser", "x402_fetch", "check_token_balance"
+        ]
+    )
+
+
 class AgentDefaults(BaseModel):
     """Default agent configuration (used when agents.agent_list is empty)."""
     workspace: str = "~/.joyhousebot/workspace"
@@ -173,6 +207,9 @@ class AgentDefaults(BaseModel):
     max_tool_iterations: int = 20
     memory_window: int = 50
     max_context_tokens: int | None = None  # When set, trim history so total tokens <= this (in addition to memory_window)
+    max_concurrency: int = 4  # Bus messages from different sessions processed in parallel (FIFO within a session)
+    routing: ModelRoutingConfig = Field(default_factory=ModelRoutingConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
 
 
 class AgentEntry(BaseModel):
@@ -359,6 +396,19 @@ class WebToolsConfig(BaseModel):
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
 
 
+class HttpClientConfig(BaseModel):
+    """Shared outbound HTTP client (web_search, web_fetch, url ingest, transcription)."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False  # Needs the h2 package; falls back to HTTP/1.1 without it
+    dns_cache_ttl_seconds: float = 60.0  # 0 = resolve on every new connection
+    per_host_limit: int = 8  # Concurrent requests per host (0 = unlimited)
+    max_redirects: int = 5
+    # Per-caller timeouts in seconds (web_search, web_fetch, url_ingest, transcription); unset keys keep defaults.
+    timeouts: dict[str, float] = Field(default_factory=dict)
+
+
 class ExecToolConfig(BaseModel):
     """Shell exec tool configuration."""
     timeout: int = 60
@@ -405,6 +455,14 @@ class RetrievalConfig(BaseModel):
     vector_threshold_chunks: int = 50_000  # Enable vector when chunk count exceeds this
     embedding_provider: str = ""  # e.g. openai (for V2)
     embedding_model: str = ""  # e.g. text-embedding-3-small
+    # Embedding cache keyed by (model, sha256(text)) under <data dir>/cache/embeddings.db; only misses reach the API
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_mb: int = 256  # Vector bytes kept on disk; least recently used rows evicted beyond this
+    embedding_cache_memory_entries: int = 2048  # In-process LRU tier
+    # Query-result cache for retrieve; entries are dropped when the index generation changes.
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 512
+    result_cache_ttl_seconds: int = 300
     vector_backend: str = ""  # chroma | qdrant | pgvector (for V2)
     # Memory search backend: builtin (grep, default) | mcp_qmd (QMD via MCP) | sqlite_vector (SQLite+embedding index) | auto (mcp_qmd -> sqlite_vector -> builtin)
     memory_backend: str = "builtin"
@@ -450,11 +508,18 @@ class KnowledgePipelineConfig(BaseModel):
     subprocess_enabled: bool = True  # When True, run knowledge pipeline in subprocess to avoid blocking startup
     convert_chunk_size: int = 1200
     convert_chunk_overlap: int = 200
+    # Staged pipeline: convert (process pool) -> embed (threads) -> single SQLite/vector writer.
+    convert_workers: int = 0  # Conversion processes (PDF parse / OCR); 0 = one per CPU core, 1 = in-process
+    embed_concurrency: int = 2  # Documents embedded concurrently
+    embed_batch_size: int = 64  # Chunks per embedding request
+    stage_queue_size: int = 32  # Bound of each inter-stage queue; a full queue blocks the stage before it
+    debounce_ms: int = 1000  # A file is processed once its change events have been quiet this long
 
 
 class ToolsConfig(BaseModel):
     """Tools configuration."""
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
+    http: HttpClientConfig = Field(default_factory=HttpClientConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     code_runner: CodeRunnerConfig = Field(default_factory=CodeRunnerConfig)
     retrieval: RetrievalConfig = Field(default_factory=RetrievalConfig)
@@ -463,6 +528,9 @@ class ToolsConfig(BaseModel):
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     # Optional tools are unrestricted by default; set this allowlist to gate them.
     optional_allowlist: list[str] = Field(default_factory=list)
+    # When True, consecutive calls to parallel_safe tools in one LLM turn run concurrently (results keep call order).
+    parallel_tool_calls: bool = False
+    max_parallel_tool_calls: int = 4  # Per-turn concurrency cap when parallel_tool_calls is on
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
@@ -607,6 +675,19 @@ class CloudConnectConfig(BaseModel):
     )
 
 
+class SessionsConfig(BaseModel):
+    """Session persistence (~/.joyhousebot/sessions): JSONL files (default) or a SQLite database."""
+    backend: Literal["jsonl", "sqlite"] = "jsonl"
+    sqlite_path: str = ""  # Empty = ~/.joyhousebot/sessions/sessions.db
+    # always = fsync every save; batch = group commit (fsync at most every batch_fsync_interval_ms); os = leave to OS buffers
+    durability: Literal["always", "batch", "os"] = "batch"
+    batch_fsync_interval_ms: int = 1000
+    compact_every: int = 200  # Rewrite the file after this many appended saves (drops stale metadata trailers)
+    cache_max_entries: int = 1000  # Sessions kept in memory (LRU)
+    cache_ttl_seconds: int = 3600  # Drop cached sessions idle this long (0 = no TTL)
+    usage_ledger: bool = True  # Pre-aggregate token/cost usage in sessions/usage.db for sessions.usage dashboards
+
+
 class Config(BaseSettings):
     """Root configuration for joyhousebot."""
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
@@ -616,6 +697,7 @@ class Config(BaseSettings):
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     browser: BrowserConfig = Field(default_factory=BrowserConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
     skills: SkillsConfig = Field(default_factory=SkillsConfig)
     plugins: PluginsConfig = Field(default_factory=PluginsConfig)
     apps: AppsConfig = Field(default_factory=AppsConfig)
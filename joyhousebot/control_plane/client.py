@@ -29,6 +29,7 @@ class ControlPlaneClientError(RuntimeError):
 class ControlPlaneClient:
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
+        self._async_client: httpx.AsyncClient | None = None
 
     def _normalize_base(self) -> str:
         if self.base_url.endswith("/api/v1"):
@@ -142,18 +143,46 @@ class ControlPlaneClient:
             with httpx.Client(timeout=20.0) as client:
                 resp = client.request(method, url, json=json_body)
         except httpx.TimeoutException as exc:
-            raise ControlPlaneClientError(
-                f"control plane timeout: {method} {path}",
-                code="CONTROL_PLANE_TIMEOUT",
-                retryable=True,
-            ) from exc
+            raise self._timeout_error(method, path) from exc
         except httpx.RequestError as exc:
-            raise ControlPlaneClientError(
-                f"control plane network error: {method} {path}: {exc}",
-                code="CONTROL_PLANE_NETWORK_ERROR",
-                retryable=True,
-            ) from exc
+            raise self._network_error(method, path, exc) from exc
+        return self._parse_response(method, path, resp)
 
+    async def _arequest(self, method: str, path: str, json_body: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Async _request on a kept-alive client (see aclose)."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=20.0)
+        url = f"{self._normalize_base()}{path}"
+        try:
+            resp = await self._async_client.request(method, url, json=json_body)
+        except httpx.TimeoutException as exc:
+            raise self._timeout_error(method, path) from exc
+        except httpx.RequestError as exc:
+            raise self._network_error(method, path, exc) from exc
+        return self._parse_response(method, path, resp)
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    @staticmethod
+    def _timeout_error(method: str, path: str) -> ControlPlaneClientError:
+        return ControlPlaneClientError(
+            f"control plane timeout: {method} {path}",
+            code="CONTROL_PLANE_TIMEOUT",
+            retryable=True,
+        )
+
+    @staticmethod
+    def _network_error(method: str, path: str, exc: Exception) -> ControlPlaneClientError:
+        return ControlPlaneClientError(
+            f"control plane network error: {method} {path}: {exc}",
+            code="CONTROL_PLANE_NETWORK_ERROR",
+            retryable=True,
+        )
+
+    def _parse_response(self, method: str, path: str, resp: Any) -> dict[str, Any]:
         status_code = int(getattr(resp, "status_code", 0) or 0)
         if status_code >= 400:
             body: Any = None
@@ -306,21 +335,22 @@ class ControlPlaneClient:
         return self._request("POST", f"/houses/{house_id}/bind", body) or {}
 
     def heartbeat(self, *, house_id: str, status: str, metrics: dict[str, Any] | None = None) -> dict[str, Any]:
-        body = self._with_aliases({"status": status, "metrics": metrics or {}}, {"metrics": "metricsData"})
-        data = self._request("POST", f"/houses/{house_id}/heartbeat", body)
+        data = self._request("POST", f"/houses/{house_id}/heartbeat", self._heartbeat_body(status, metrics))
+        return self._normalize_ack_response(data)
+
+    async def heartbeat_async(
+        self, *, house_id: str, status: str, metrics: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        data = await self._arequest("POST", f"/houses/{house_id}/heartbeat", self._heartbeat_body(status, metrics))
         return self._normalize_ack_response(data)
 
     def claim_task(self, *, house_id: str) -> dict[str, Any] | None:
         data = self._request("POST", f"/houses/{house_id}/tasks/claim", {})
-        task = data.get("task")
-        if isinstance(task, dict):
-            return self._normalize_task_payload(task)
-        if isinstance(data.get("assignment"), dict):
-            return self._normalize_task_payload(data["assignment"])
-        # Some control planes return the task object directly.
-        if any(k in data for k in ("task_id", "id", "taskType", "task_type", "runId", "run_id")):
-            return self._normalize_task_payload(data)
-        return None
+        return self._claimed_task(data)
+
+    async def claim_task_async(self, *, house_id: str) -> dict[str, Any] | None:
+        data = await self._arequest("POST", f"/houses/{house_id}/tasks/claim", {})
+        return self._claimed_task(data)
 
     def report_task_progress(
         self,
@@ -330,11 +360,25 @@ class ControlPlaneClient:
         progress: float | None = None,
         detail: str | None = None,
     ) -> dict[str, Any]:
-        body = self._with_aliases({"progress": progress, "detail": detail}, {"detail": "message"})
         data = self._request(
             "POST",
             f"/houses/{house_id}/tasks/{task_id}/progress",
-            body,
+            self._progress_body(progress, detail),
+        )
+        return self._normalize_ack_response(data)
+
+    async def report_task_progress_async(
+        self,
+        *,
+        house_id: str,
+        task_id: str,
+        progress: float | None = None,
+        detail: str | None = None,
+    ) -> dict[str, Any]:
+        data = await self._arequest(
+            "POST",
+            f"/houses/{house_id}/tasks/{task_id}/progress",
+            self._progress_body(progress, detail),
         )
         return self._normalize_ack_response(data)
 
@@ -343,11 +387,45 @@ class ControlPlaneClient:
         data = self._request("POST", f"/houses/{house_id}/tasks/{task_id}/result", body)
         return self._normalize_ack_response(data)
 
+    async def report_task_result_async(
+        self, *, house_id: str, task_id: str, result: dict[str, Any]
+    ) -> dict[str, Any]:
+        body = self._with_aliases({"result": result}, {"result": "output"})
+        data = await self._arequest("POST", f"/houses/{house_id}/tasks/{task_id}/result", body)
+        return self._normalize_ack_response(data)
+
     def report_task_failure(self, *, house_id: str, task_id: str, error: dict[str, Any]) -> dict[str, Any]:
         body = self._with_aliases({"error": error}, {"error": "failure"})
         data = self._request("POST", f"/houses/{house_id}/tasks/{task_id}/fail", body)
         return self._normalize_ack_response(data)
 
+    async def report_task_failure_async(
+        self, *, house_id: str, task_id: str, error: dict[str, Any]
+    ) -> dict[str, Any]:
+        body = self._with_aliases({"error": error}, {"error": "failure"})
+        data = await self._arequest("POST", f"/houses/{house_id}/tasks/{task_id}/fail", body)
+        return self._normalize_ack_response(data)
+
+    @classmethod
+    def _heartbeat_body(cls, status: str, metrics: dict[str, Any] | None) -> dict[str, Any]:
+        return cls._with_aliases({"status": status, "metrics": metrics or {}}, {"metrics": "metricsData"})
+
+    @classmethod
+    def _progress_body(cls, progress: float | None, detail: str | None) -> dict[str, Any]:
+        return cls._with_aliases({"progress": progress, "detail": detail}, {"detail": "message"})
+
+    @classmethod
+    def _claimed_task(cls, data: dict[str, Any]) -> dict[str, Any] | None:
+        task = data.get("task")
+        if isinstance(task, dict):
+            return cls._normalize_task_payload(task)
+        if isinstance(data.get("assignment"), dict):
+            return cls._normalize_task_payload(data["assignment"])
+        # Some control planes return the task object directly.
+        if any(k in data for k in ("task_id", "id", "taskType", "task_type", "runId", "run_id")):
+            return cls._normalize_task_payload(data)
+        return None
+
     async def run_ws_listener(
         self,
         *,
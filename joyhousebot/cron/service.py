@@ -86,6 +86,7 @@ class CronService:
                             deliver=j["payload"].get("deliver", False),
                             channel=j["payload"].get("channel"),
                             to=j["payload"].get("to"),
+                            cacheable=j["payload"].get("cacheable", False),
                         ),
                         state=CronJobState(
                             next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
@@ -134,6 +135,7 @@ class CronService:
                         "deliver": j.payload.deliver,
                         "channel": j.payload.channel,
                         "to": j.payload.to,
+                        "cacheable": j.payload.cacheable,
                     },
                     "state": {
                         "nextRunAtMs": j.state.next_run_at_ms,
@@ -272,6 +274,7 @@ class CronService:
         delete_after_run: bool = False,
         agent_id: str | None = None,
         payload_kind: str = "agent_turn",
+        cacheable: bool = False,
     ) -> CronJob:
         """Add a new job (agent_id=None uses default agent). payload_kind: agent_turn | memory_compaction."""
         store = self._load_store()
@@ -290,6 +293,7 @@ class CronService:
                 deliver=deliver,
                 channel=channel,
                 to=to,
+                cacheable=cacheable,
             ),
             state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now)),
             created_at_ms=now,
@@ -27,6 +27,8 @@ class CronPayload:
     deliver: bool = False
     channel: str | None = None  # e.g. "whatsapp"
     to: str | None = None  # e.g. phone number
+    # Allow LLM response cache hits for this job's runs (see providers/response_cache.py)
+    cacheable: bool = False
 
 
 @dataclass
@@ -60,6 +60,13 @@ def get_plugin_roots(workspace: Path | str, config: Any) -> list[Path]:
     return roots
 
 
+def plugin_manifest_signature(workspace: Path | str, config: Any) -> tuple:
+    """Stat signature of every plugin manifest; changes when a plugin is added, removed or edited."""
+    from joyhousebot.agent.prompt_cache import stat_signature
+
+    return stat_signature(root / MANIFEST_FILENAME for root in get_plugin_roots(workspace, config))
+
+
 def get_installed_apps_for_agent(workspace: Path, config: Any) -> list[dict[str, Any]]:
     """
     Return enabled plugin apps for agent context (app_id, name, route).
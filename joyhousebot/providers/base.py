@@ -26,6 +26,7 @@ class LLMResponse:
     error_code: str | None = None
     error_status: int | None = None
     retryable: bool | None = None
+    model: str | None = None  # Model that answered (filled in by the agent loop after fallback)
     
     @property
     def has_tool_calls(self) -> bool:
@@ -40,7 +40,7 @@ def _sanitize_messages(
     """Ensure messages are provider-safe (non-null content, tool_call names)."""
     out: list[dict[str, Any]] = []
     name_map = original_to_alias or {}
-    allowed_keys = {"role", "content", "name", "tool_call_id", "tool_calls"}
+    allowed_keys = {"role", "content", "name", "tool_call_id", "tool_calls", "cache_control"}
     for m in messages:
         m = dict(m)
         # Drop local metadata keys (e.g. timestamp/tools_used) for strict providers.
@@ -74,6 +74,96 @@ def _sanitize_messages(
     return out
 
 
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _apply_prompt_caching(messages: list[dict[str, Any]], enabled: bool) -> list[dict[str, Any]]:
+    """
+    Lay out the leading system messages for the provider's prompt cache.
+
+    ContextBuilder sends a stable system message followed by a volatile one. With
+    prompt caching enabled, cache_control breakpoints go on the stable system message
+    (caching tools + stable system) and on the last message (caching the conversation
+    so far for the next tool iteration / turn). Otherwise the leading system messages
+    are merged into one, stable part first, for providers that expect a single one.
+    """
+    lead = 0
+    while lead < len(messages) and messages[lead].get("role") == "system":
+        lead += 1
+    if not enabled:
+        if lead < 2 or not all(isinstance(m.get("content"), str) for m in messages[:lead]):
+            return messages
+        merged = "\n\n---\n\n".join(m["content"] for m in messages[:lead] if m["content"])
+        return [{"role": "system", "content": merged}, *messages[lead:]]
+    out = list(messages)
+    breakpoints = [0] if lead else []
+    if len(out) - 1 not in breakpoints:
+        breakpoints.append(len(out) - 1)
+    for i in breakpoints:
+        m = out[i]
+        content = m.get("content")
+        # Anthropic rejects cache_control on empty text blocks.
+        if isinstance(content, str) and content:
+            out[i] = {**m, "cache_control": dict(_CACHE_CONTROL)}
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            out[i] = {**m, "content": [*content[:-1], {**content[-1], "cache_control": dict(_CACHE_CONTROL)}]}
+    return out
+
+
+def _usage_dict(raw: Any) -> dict[str, int]:
+    """
+    Normalize provider usage (object or dict) to prompt/completion/total tokens plus
+    cache_read_tokens / cache_write_tokens when the provider reports prompt caching.
+    """
+    if not raw:
+        return {}
+
+    def get(obj: Any, key: str) -> Any:
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    usage = {k: int(get(raw, k) or 0) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    # Anthropic: cache_read_input_tokens / cache_creation_input_tokens;
+    # OpenAI and LiteLLM-normalized: prompt_tokens_details.cached_tokens.
+    details = get(raw, "prompt_tokens_details")
+    cache_read = get(raw, "cache_read_input_tokens") or (get(details, "cached_tokens") if details else 0)
+    cache_write = get(raw, "cache_creation_input_tokens")
+    if isinstance(cache_read, (int, float)) and cache_read > 0:
+        usage["cache_read_tokens"] = int(cache_read)
+    if isinstance(cache_write, (int, float)) and cache_write > 0:
+        usage["cache_write_tokens"] = int(cache_write)
+    return usage
+
+
+def _merge_tool_call_delta(acc: dict[int, dict[str, Any]], delta: Any) -> None:
+    """
+    Fold one streamed tool_call fragment into acc (keyed by the fragment's index).
+
+    OpenAI-style streams send id and name once, then the arguments JSON in pieces that
+    all carry the same index; providers that omit index send each call whole.
+    """
+
+    def get(obj: Any, key: str) -> Any:
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    index = get(delta, "index")
+    if not isinstance(index, int):
+        index = len(acc)
+    slot = acc.setdefault(index, {"id": "", "name": "", "arguments": ""})
+    if get(delta, "id"):
+        slot["id"] = str(get(delta, "id"))
+    fn = get(delta, "function")
+    if fn is None:
+        return
+    name = get(fn, "name")
+    if isinstance(name, str) and name:
+        slot["name"] = name
+    args = get(fn, "arguments")
+    if isinstance(args, str):
+        slot["arguments"] += args
+    elif isinstance(args, dict):
+        slot["arguments"] = json.dumps(args)
+
+
 def _make_tool_alias(original_name: str, existing: set[str]) -> str:
     """Make provider-safe function name alias matching ^[a-zA-Z0-9_-]+$."""
     base = re.sub(r"[^a-zA-Z0-9_-]", "_", original_name).strip("_")
@@ -314,6 +404,13 @@ class LiteLLMProvider(LLMProvider):
         
         return model
     
+    def _supports_prompt_caching(self, model: str) -> bool:
+        """Whether to send cache_control breakpoints: the model's provider takes them and the route forwards them."""
+        if self._gateway is not None and not self._gateway.supports_prompt_caching:
+            return False
+        spec = find_by_model(model)
+        return bool(spec and spec.supports_prompt_caching)
+
     def _apply_model_overrides(self, model: str, kwargs: dict[str, Any]) -> None:
         """Apply model-specific parameter overrides from the registry."""
         model_lower = model.lower()
@@ -383,7 +480,10 @@ class LiteLLMProvider(LLMProvider):
             original_to_alias = {orig: alias for alias, orig in tool_alias_map.items()}
             kwargs["tools"] = provider_tools
             kwargs["tool_choice"] = "auto"
-        kwargs["messages"] = _sanitize_messages(kwargs["messages"], original_to_alias=original_to_alias)
+        kwargs["messages"] = _apply_prompt_caching(
+            _sanitize_messages(kwargs["messages"], original_to_alias=original_to_alias),
+            self._supports_prompt_caching(model),
+        )
         
         try:
             # Defensive second-pass sanitize right before request (catch any leakage).
@@ -438,6 +538,8 @@ class LiteLLMProvider(LLMProvider):
             "max_tokens": max_tokens,
             "temperature": temperature,
             "stream": True,
+            # Without this most providers omit usage from streamed responses entirely.
+            "stream_options": {"include_usage": True},
         }
         self._apply_model_overrides(model, kwargs)
         if self.api_key:
@@ -455,10 +557,13 @@ class LiteLLMProvider(LLMProvider):
             original_to_alias = {orig: alias for alias, orig in tool_alias_map.items()}
             kwargs["tools"] = provider_tools
             kwargs["tool_choice"] = "auto"
-        kwargs["messages"] = _sanitize_messages(kwargs["messages"], original_to_alias=original_to_alias)
+        kwargs["messages"] = _apply_prompt_caching(
+            _sanitize_messages(kwargs["messages"], original_to_alias=original_to_alias),
+            self._supports_prompt_caching(model),
+        )
 
         accumulated_content: list[str] = []
-        accumulated_tool_calls: list[dict[str, Any]] = []
+        accumulated_tool_calls: dict[int, dict[str, Any]] = {}
         finish_reason = "stop"
         usage: dict[str, int] = {}
 
@@ -483,12 +588,11 @@ class LiteLLMProvider(LLMProvider):
                                 tool_alias_map[safe] = n
             stream = await acompletion(**kwargs)
             async for chunk in stream:
+                chunk_usage = chunk.get("usage") if isinstance(chunk, dict) else getattr(chunk, "usage", None)
+                if chunk_usage:
+                    usage = _usage_dict(chunk_usage) or usage
                 choices = chunk.get("choices", []) if isinstance(chunk, dict) else getattr(chunk, "choices", [])
                 if not choices:
-                    if isinstance(chunk, dict) and chunk.get("usage"):
-                        usage = chunk["usage"]
-                        if isinstance(usage, dict):
-                            usage = {k: usage.get(k, 0) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
                     continue
                 choice = choices[0] if isinstance(choices, list) else choices
                 delta = choice.get("delta", {}) if isinstance(choice, dict) else getattr(choice, "delta", None) or {}
@@ -501,29 +605,22 @@ class LiteLLMProvider(LLMProvider):
                 tc_list = delta.get("tool_calls") if isinstance(delta, dict) else getattr(delta, "tool_calls", None)
                 if tc_list:
                     for tc in tc_list:
-                        if isinstance(tc, dict):
-                            accumulated_tool_calls.append(tc)
-                        else:
-                            accumulated_tool_calls.append({"id": getattr(tc, "id", ""), "function": getattr(tc, "function", {})})
+                        _merge_tool_call_delta(accumulated_tool_calls, tc)
                 fr = choice.get("finish_reason") if isinstance(choice, dict) else getattr(choice, "finish_reason", None)
                 if fr:
                     finish_reason = fr or "stop"
             # Build final LLMResponse from accumulated data
             full_content = "".join(accumulated_content)
             tool_calls_parsed: list[ToolCallRequest] = []
-            for tc in accumulated_tool_calls:
-                fn = tc.get("function") if isinstance(tc, dict) else {}
-                args = fn.get("arguments", "{}") if isinstance(fn, dict) else getattr(fn, "arguments", "{}")
-                if isinstance(args, str):
-                    args = json_repair.loads(args)
+            for _, tc in sorted(accumulated_tool_calls.items()):
+                args = json_repair.loads(tc["arguments"] or "{}")
                 if not isinstance(args, dict):
                     args = {}
-                raw_name = (fn.get("name") or "") if isinstance(fn, dict) else (getattr(fn, "name", None) or "")
-                name = _restore_tool_name(raw_name, tool_alias_map)
-                if not isinstance(name, str):
-                    name = ""
+                name = _restore_tool_name(tc["name"], tool_alias_map)
+                if not name:
+                    continue
                 tool_calls_parsed.append(ToolCallRequest(
-                    id=tc.get("id", ""),
+                    id=tc["id"],
                     name=name,
                     arguments=args,
                 ))
@@ -565,13 +662,7 @@ class LiteLLMProvider(LLMProvider):
                     arguments=args,
                 ))
         
-        usage = {}
-        if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+        usage = _usage_dict(getattr(response, "usage", None))
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
@@ -0,0 +1,140 @@
+"""Reusable runtime provider instances keyed by their resolved settings."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from joyhousebot.providers.base import LLMProvider
+
+# Distinct (model, auth profile, endpoint) combinations in use are few; the bound only
+# keeps superseded settings (rotated keys, edited profiles) from piling up.
+DEFAULT_MAX_PROVIDERS = 32
+
+
+@dataclass(frozen=True)
+class RuntimeProviderSettings:
+    """Everything a runtime provider is built from, resolved from config + auth profile."""
+
+    model: str
+    profile_id: str | None = None
+    provider_name: str | None = None
+    api_key: str | None = None
+    api_base: str | None = None
+    extra_headers: dict[str, str] = field(default_factory=dict)
+
+    def pool_key(self) -> tuple[Any, ...]:
+        """(model, profile, provider, api_base, api_key, sorted headers)."""
+        return (
+            self.model,
+            self.profile_id or "",
+            self.provider_name or "",
+            self.api_base or "",
+            self.api_key or "",
+            tuple(sorted(self.extra_headers.items())),
+        )
+
+
+def resolve_runtime_provider_settings(
+    config: Any,
+    *,
+    model: str,
+    profile_id: str | None,
+    provider_name: str | None,
+) -> RuntimeProviderSettings:
+    """Provider config for model, overridden by the auth profile's key, base, headers and provider."""
+    base_cfg = config.get_provider(model)
+    api_key = base_cfg.api_key if base_cfg else None
+    api_base = config.get_api_base(model)
+    extra_headers = dict(base_cfg.extra_headers or {}) if base_cfg else {}
+    if profile_id:
+        profile = (getattr(config, "auth", None).profiles or {}).get(profile_id)
+        if profile is not None:
+            if getattr(profile, "api_key", ""):
+                api_key = profile.api_key
+            elif getattr(profile, "token", ""):
+                api_key = profile.token
+            if getattr(profile, "api_base", None):
+                api_base = profile.api_base
+            if getattr(profile, "extra_headers", None):
+                extra_headers.update(dict(profile.extra_headers))
+            if getattr(profile, "provider", ""):
+                provider_name = str(profile.provider).strip() or provider_name
+    return RuntimeProviderSettings(
+        model=model,
+        profile_id=profile_id,
+        provider_name=provider_name or None,
+        api_key=api_key,
+        api_base=api_base,
+        extra_headers=extra_headers,
+    )
+
+
+def _build_litellm_provider(settings: RuntimeProviderSettings) -> LLMProvider:
+    from joyhousebot.providers.litellm_provider import LiteLLMProvider
+
+    return LiteLLMProvider(
+        api_key=settings.api_key,
+        api_base=settings.api_base,
+        default_model=settings.model,
+        extra_headers=settings.extra_headers or None,
+        provider_name=settings.provider_name,
+    )
+
+
+class ProviderPool:
+    """
+    Configured provider instances reused across LLM calls.
+
+    Building a LiteLLMProvider resolves the provider spec, writes API keys into
+    os.environ and copies headers; reusing one per settings key skips that and keeps
+    the request kwargs identical between calls, so LiteLLM's per-credential HTTP
+    clients (and their connection pools) are reused too. The key is derived from the
+    resolved settings, so edited config or auth profiles map to a new entry on the
+    next call; invalidate() drops everything (e.g. after a config update) and
+    superseded entries are evicted least recently used beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_PROVIDERS,
+        factory: Callable[[RuntimeProviderSettings], LLMProvider] | None = None,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._factory = factory or _build_litellm_provider
+        self._providers: OrderedDict[tuple[Any, ...], LLMProvider] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, settings: RuntimeProviderSettings) -> LLMProvider:
+        key = settings.pool_key()
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                self._providers.move_to_end(key)
+                self._hits += 1
+                return provider
+            provider = self._factory(settings)
+            self._providers[key] = provider
+            while len(self._providers) > self.max_entries:
+                self._providers.popitem(last=False)
+            self._misses += 1
+            return provider
+
+    def invalidate(self) -> None:
+        """Drop all pooled providers; the next call builds from current config."""
+        with self._lock:
+            self._providers.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRate": round(self._hits / total, 4) if total else None,
+                "entries": len(self._providers),
+            }
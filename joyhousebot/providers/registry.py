@@ -51,6 +51,10 @@ class ProviderSpec:
     # per-model param overrides, e.g. (("kimi-k2.5", {"temperature": 1.0}),)
     model_overrides: tuple[tuple[str, dict[str, Any]], ...] = ()
 
+    # prompt caching: accepts Anthropic-style cache_control breakpoints on messages.
+    # For a gateway it means breakpoints are forwarded to models that support them.
+    supports_prompt_caching: bool = False
+
     @property
     def label(self) -> str:
         return self.display_name or self.name.title()
@@ -74,6 +78,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         skip_prefixes=("openai/",),
         is_gateway=True,
         strip_model_prefix=True,
+        supports_prompt_caching=False,
     ),
 
     # === Gateways (detected by api_key / api_base, not model name) =========
@@ -94,6 +99,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="openrouter",
         default_api_base="https://openrouter.ai/api/v1",
         strip_model_prefix=False,
+        supports_prompt_caching=True,
         model_overrides=(),
     ),
 
@@ -114,6 +120,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="aihubmix",
         default_api_base="https://aihubmix.com/v1",
         strip_model_prefix=True,            # anthropic/claude-3 → claude-3 → openai/claude-3
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -134,6 +141,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=True,
         model_overrides=(),
     ),
 
@@ -152,6 +160,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -170,6 +179,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -188,6 +198,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -210,6 +221,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -228,6 +240,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -250,6 +263,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="https://api.moonshot.ai/v1",   # intl; use api.moonshot.cn for China
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(
             ("kimi-k2.5", {"temperature": 1.0}),
         ),
@@ -271,6 +285,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="https://api.minimax.io/v1",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -292,6 +307,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",                # user must provide in config
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 
@@ -313,6 +329,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",
         strip_model_prefix=False,
+        supports_prompt_caching=False,
         model_overrides=(),
     ),
 )
@@ -0,0 +1,369 @@
+"""Opt-in exact-match LLM response cache for repeated deterministic runs (cron, heartbeat, bot tasks)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from joyhousebot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from joyhousebot.utils.helpers import ensure_dir
+
+# Set by AgentLoop.process_direct(cacheable=True) for the duration of one run.
+response_cache_allowed: ContextVar[bool] = ContextVar("response_cache_allowed", default=False)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# After an over-budget write, evict least recently used rows down to this share of max_bytes.
+EVICT_TO_RATIO = 0.9
+# Tools whose output reflects the outside world at call time.
+DEFAULT_VOLATILE_TOOLS = ("web_search", "web_fetch", "exec", "process", "browser", "x402_fetch", "check_token_balance")
+
+# ContextBuilder's "# Current Time" section changes every minute; only its date is kept in
+# the key, so date-dependent runs ("today's summary") miss the cache once the day changes.
+_CURRENT_TIME_SECTION = re.compile(r"# Current Time\n\n[^\n]*")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# Timestamps in tool output (ISO datetimes, clock times, epoch seconds / milliseconds).
+_VOLATILE_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}"
+    r"|\b\d{1,2}:\d{2}:\d{2}\b"
+    r"|\b1[5-9]\d{8}(?:\d{3})?\b"
+)
+
+# Usage reported for cache hits: no tokens billed.
+CACHE_HIT_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "response_cache_hit": 1}
+
+
+def _current_date_only(match: re.Match[str]) -> str:
+    date = _DATE.search(match.group(0))
+    return f"# Current Time\n\n{date.group(0)}" if date else "# Current Time"
+
+
+def _canonical_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for m in messages:
+        if m.get("role") == "system" and isinstance(m.get("content"), str):
+            m = {**m, "content": _CURRENT_TIME_SECTION.sub(_current_date_only, m["content"])}
+        out.append(m)
+    return out
+
+
+def response_cache_key(
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """sha256 of the canonical JSON of (model, messages, tools schema, temperature, max_tokens)."""
+    payload = {
+        "model": model,
+        "messages": _canonical_messages(messages),
+        "tools": tools or [],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def has_volatile_tool_results(
+    messages: list[dict[str, Any]], volatile_tools: tuple[str, ...] | list[str] = DEFAULT_VOLATILE_TOOLS
+) -> bool:
+    """True when a tool result comes from a volatile tool or contains a timestamp."""
+    for m in messages:
+        if m.get("role") != "tool":
+            continue
+        if m.get("name") in volatile_tools:
+            return True
+        content = m.get("content")
+        if isinstance(content, str) and _VOLATILE_PATTERN.search(content):
+            return True
+    return False
+
+
+def _encode(response: LLMResponse) -> str:
+    return json.dumps(
+        {
+            "content": response.content,
+            "tool_calls": [asdict(tc) for tc in response.tool_calls],
+            "finish_reason": response.finish_reason,
+            "reasoning_content": response.reasoning_content,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _decode(blob: str, model: str) -> LLMResponse:
+    data = json.loads(blob)
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCallRequest(**tc) for tc in data.get("tool_calls") or []],
+        finish_reason=data.get("finish_reason") or "stop",
+        usage=dict(CACHE_HIT_USAGE),
+        reasoning_content=data.get("reasoning_content"),
+        model=model,
+    )
+
+
+class ResponseCache:
+    """
+    Successful LLM responses keyed by response_cache_key, in SQLite (WAL).
+
+    Entries expire after ttl_seconds; the store is bounded by max_bytes of response
+    data and evicts least recently used rows. Shared per database file within a process.
+    """
+
+    _shared: dict[str, "ResponseCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        volatile_tools: tuple[str, ...] | list[str] = DEFAULT_VOLATILE_TOOLS,
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.max_bytes = max(0, int(max_bytes))
+        self.volatile_tools = tuple(volatile_tools)
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, db_path: Path, **kwargs: Any) -> "ResponseCache":
+        """Process-wide cache for db_path (created on first use with kwargs)."""
+        key = str(Path(db_path).expanduser().resolve())
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls(Path(key), **kwargs)
+                cls._shared[key] = cache
+            return cache
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.db_path.parent)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, model: str) -> LLMResponse | None:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self.ttl_seconds and now - float(row[1]) > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache read failed: {e}")
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _decode(row[0], model)
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        if response.finish_reason == "error" or not self.max_bytes:
+            return
+        blob = _encode(response)
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob.encode("utf-8")), now, now),
+                )
+                self._evict_locked(conn, now)
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache write failed: {e}")
+
+    def _evict_locked(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds:
+            cur = conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.evictions += max(0, cur.rowcount)
+        total = int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * EVICT_TO_RATIO)
+        # Delete the oldest rows whose cumulative size brings the total under target.
+        cur = conn.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, size, SUM(size) OVER (ORDER BY last_used, key) AS freed
+                    FROM responses
+                ) WHERE freed - size < ?
+            )
+            """,
+            (total - target,),
+        )
+        self.evictions += max(0, cur.rowcount)
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachingProvider(LLMProvider):
+    """
+    LLMProvider wrapper that serves repeated requests from a ResponseCache.
+
+    A call is cacheable when temperature is 0 or the current run opted in
+    (response_cache_allowed), and no tool result in the conversation is volatile
+    (see has_volatile_tool_results). Hits return the stored response with zero usage.
+    Everything else passes through to the wrapped provider. Cache reads and writes
+    run in a worker thread so SQLite never blocks the event loop.
+    """
+
+    def __init__(self, inner: LLMProvider, cache: ResponseCache):
+        super().__init__(api_key=inner.api_key, api_base=inner.api_base)
+        self.inner = inner
+        self.cache = cache
+
+    def _cache_key(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> str | None:
+        if not (temperature == 0 or response_cache_allowed.get()):
+            return None
+        if has_volatile_tool_results(messages, self.cache.volatile_tools):
+            self.cache.note_bypass()
+            return None
+        return response_cache_key(
+            model=model, messages=messages, tools=tools, temperature=temperature, max_tokens=max_tokens
+        )
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.inner.get_default_model()
+        key = self._cache_key(messages, tools, model, max_tokens, temperature)
+        if key is not None:
+            cached = await asyncio.to_thread(self.cache.get, key, model)
+            if cached is not None:
+                return cached
+        response = await self.inner.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+        )
+        if key is not None:
+            await asyncio.to_thread(self.cache.put, key, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[tuple[str, LLMResponse | None], None]:
+        """Stream from the wrapped provider; a hit is replayed as one delta plus done."""
+        model = model or self.inner.get_default_model()
+        key = self._cache_key(messages, tools, model, max_tokens, temperature)
+        cached = await asyncio.to_thread(self.cache.get, key, model) if key is not None else None
+        if cached is None and not hasattr(self.inner, "chat_stream"):
+            cached = await self.inner.chat(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+            )
+            if key is not None:
+                await asyncio.to_thread(self.cache.put, key, cached)
+        if cached is not None:
+            if cached.content:
+                yield ("delta", cached.content)
+            yield ("done", cached)
+            return
+        async for kind, data in self.inner.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature
+        ):
+            if kind == "done" and isinstance(data, LLMResponse) and key is not None:
+                await asyncio.to_thread(self.cache.put, key, data)
+            yield (kind, data)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+def get_response_cache(config: Any) -> ResponseCache | None:
+    """Process-wide response cache per config.agents.defaults.response_cache (None when disabled)."""
+    cfg = getattr(getattr(getattr(config, "agents", None), "defaults", None), "response_cache", None)
+    if cfg is None or not getattr(cfg, "enabled", False):
+        return None
+    from joyhousebot.config.loader import get_data_dir
+
+    return ResponseCache.shared(
+        get_data_dir() / "cache" / "llm_responses.db",
+        ttl_seconds=int(getattr(cfg, "ttl_seconds", DEFAULT_TTL_SECONDS) or 0),
+        max_bytes=int(getattr(cfg, "max_mb", 64) or 0) * 1024 * 1024,
+        volatile_tools=list(getattr(cfg, "volatile_tools", DEFAULT_VOLATILE_TOOLS) or []),
+    )
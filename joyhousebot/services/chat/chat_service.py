@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import uuid
+from types import SimpleNamespace
 from typing import Any, Awaitable, Callable
 
 from joyhousebot.services.errors import ServiceError
@@ -271,9 +272,14 @@ def _chat_history(
     agent = resolve_agent(agent_id)
     if not agent:
         raise ServiceError(code="UNAVAILABLE", message="agent not initialized")
-    session = agent.sessions.get_or_create(session_key)
-    limit = int(params.get("limit") or 200)
-    return build_chat_history_payload(session, limit=max(1, min(limit, 1000)))
+    limit = max(1, min(int(params.get("limit") or 200), 1000))
+    get_history = getattr(agent.sessions, "get_history", None)
+    if callable(get_history):
+        # Range read: avoids loading (and caching) the full history of idle sessions.
+        session = SimpleNamespace(key=session_key, messages=get_history(session_key, limit))
+    else:
+        session = agent.sessions.get_or_create(session_key)
+    return build_chat_history_payload(session, limit=limit)
 
 
 async def run_agent_job_with_params(
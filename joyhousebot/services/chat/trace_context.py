@@ -14,7 +14,16 @@ trace_recorder: ContextVar["TraceRecorder | None"] = ContextVar("trace_recorder"
 class TraceRecorder:
     """Mutable recorder for one agent run; append steps from execution_stream_callback."""
 
-    __slots__ = ("started_at_ms", "steps", "final_content", "tools_used", "message_preview", "max_step_payload_chars")
+    __slots__ = (
+        "started_at_ms",
+        "steps",
+        "final_content",
+        "tools_used",
+        "message_preview",
+        "max_step_payload_chars",
+        "_delta_chunks",
+        "_delta_chars",
+    )
 
     def __init__(
         self,
@@ -28,8 +37,34 @@ class TraceRecorder:
         self.tools_used: list[str] = []
         self.message_preview = message_preview or ""
         self.max_step_payload_chars = max_step_payload_chars
+        # Chunks of the trailing llm_delta step, joined into its content by _flush_deltas.
+        self._delta_chunks: list[str] | None = None
+        self._delta_chars = 0
+
+    def _truncate(self, text: str) -> str:
+        if self.max_step_payload_chars is not None and len(text) > self.max_step_payload_chars:
+            return text[: self.max_step_payload_chars] + "…"
+        return text
+
+    def _flush_deltas(self) -> None:
+        if self._delta_chunks is not None:
+            last = self.steps[-1]
+            last["payload"] = {**last["payload"], "content": self._truncate("".join(self._delta_chunks))}
 
     def append(self, etype: str, payload: dict[str, Any], ts_ms: int) -> None:
+        if etype == "llm_delta":
+            chunk = str(payload.get("content") or "")
+            if self._delta_chunks is None:
+                # One step per streamed completion, stamped with its first token's time.
+                self.steps.append({"type": etype, "payload": payload, "ts_ms": ts_ms})
+                self._delta_chunks, self._delta_chars = [], 0
+            # Past the payload cap the rest is truncated anyway, so stop collecting.
+            if self.max_step_payload_chars is None or self._delta_chars <= self.max_step_payload_chars:
+                self._delta_chunks.append(chunk)
+                self._delta_chars += len(chunk)
+            return
+        self._flush_deltas()
+        self._delta_chunks = None
         step: dict[str, Any] = {"type": etype, "payload": payload, "ts_ms": ts_ms}
         if etype == "tool_start" and payload.get("tool"):
             tool_name = payload.get("tool")
@@ -37,19 +72,17 @@ class TraceRecorder:
                 self.tools_used.append(tool_name)
         if etype == "tool_end" and "result" in payload:
             result = payload.get("result")
-            if (
-                isinstance(result, str)
-                and self.max_step_payload_chars is not None
-                and len(result) > self.max_step_payload_chars
-            ):
-                payload = {**payload, "result": result[: self.max_step_payload_chars] + "…"}
-                step["payload"] = payload
+            if isinstance(result, str):
+                truncated = self._truncate(result)
+                if truncated is not result:
+                    step["payload"] = {**payload, "result": truncated}
         self.steps.append(step)
 
     def set_final(self, content: str | None) -> None:
         self.final_content = content
 
     def to_steps_json(self) -> str:
+        self._flush_deltas()
         return json.dumps(self.steps, ensure_ascii=False)
 
     def to_tools_used_json(self) -> str:
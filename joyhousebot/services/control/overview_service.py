@@ -98,6 +98,8 @@ def build_control_overview_payload(
     gateway_port = getattr(config.gateway, "port", 18790)
 
     auth_profiles = build_auth_profiles_report(config)
+    router = getattr(agent, "router", None) if agent else None
+    routing = router.stats() if router is not None and hasattr(router, "stats") else None
     control_plane_status = load_control_plane_worker_status()
     alerts = build_operational_alerts(
         auth_profiles=auth_profiles,
@@ -123,6 +125,7 @@ def build_control_overview_payload(
         "channelsSnapshot": channels_snapshot,
         "controlPlane": control_plane_status,
         "authProfiles": auth_profiles,
+        "routing": routing,
         "alerts": alerts,
         "alertsSummary": alerts_summary,
         "alertsLifecycle": alerts_lifecycle,
@@ -2,7 +2,7 @@
 
 from joyhousebot.services.knowledge_pipeline.converter import convert_file_to_processed
 from joyhousebot.services.knowledge_pipeline.indexer import index_processed_file, sync_processed_dir_to_store
-from joyhousebot.services.knowledge_pipeline.pipeline_queue import KnowledgePipelineQueue
+from joyhousebot.services.knowledge_pipeline.pipeline_queue import KnowledgePipelineQueue, read_pipeline_status
 from joyhousebot.services.knowledge_pipeline.watcher import start_watcher
 
 __all__ = [
@@ -10,5 +10,6 @@ __all__ = [
     "index_processed_file",
     "sync_processed_dir_to_store",
     "KnowledgePipelineQueue",
+    "read_pipeline_status",
     "start_watcher",
 ]
@@ -11,6 +11,95 @@ from joyhousebot.agent.tools.ingest.chunking import chunk_text
 from joyhousebot.services.retrieval.store import RetrievalStore
 
 
+def _load_processed_doc(processed_md_path: Path, *, chunk_size: int, chunk_overlap: int) -> dict[str, Any] | None:
+    """Read a processed .md file and its .json meta into doc fields plus chunks (None when not indexable)."""
+    if not processed_md_path.suffix == ".md" or not processed_md_path.exists():
+        return None
+    meta_path = processed_md_path.with_suffix(".json")
+    if not meta_path.exists():
+        logger.warning(f"No metadata {meta_path} for {processed_md_path}, skipping index")
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    text = processed_md_path.read_text(encoding="utf-8", errors="replace")
+    chunks_list = chunk_text(text, chunk_size=chunk_size, overlap=chunk_overlap, page=None)
+    if not chunks_list:
+        chunks_list = [{"text": text or "(empty)", "page": None}]
+    else:
+        chunks_list = [{"text": c.text, "page": c.page} for c in chunks_list]
+    return {
+        "doc_id": meta.get("doc_id") or processed_md_path.stem,
+        "source_type": meta.get("source_type", "text"),
+        "source_url": meta.get("source_url", ""),
+        "file_path": meta.get("file_path", str(processed_md_path)),
+        "title": meta.get("title", processed_md_path.stem),
+        "chunks": chunks_list,
+    }
+
+
+def _resolve_config(config: Any) -> Any:
+    if config is not None:
+        return config
+    try:
+        from joyhousebot.config.access import get_config
+        return get_config()
+    except Exception:
+        return None
+
+
+def load_processed_doc(processed_md_path: Path, *, chunk_size: int = 1200, chunk_overlap: int = 200) -> dict[str, Any] | None:
+    """Public alias of the processed-file loader used by the staged pipeline."""
+    return _load_processed_doc(Path(processed_md_path).resolve(), chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def embed_processed_doc(
+    workspace: Path, doc: dict[str, Any], *, config: Any = None, batch_size: int = 64
+) -> list[list[float]] | None:
+    """
+    Embed a loaded document's chunks when the vector layer is enabled (None otherwise).
+    Chunks are sent to the provider in batches of batch_size.
+    """
+    config = _resolve_config(config)
+    if config is None:
+        return None
+    try:
+        from joyhousebot.services.retrieval.vector_optional import (
+            get_embedding_provider,
+            get_vector_store,
+            should_enable_vector,
+        )
+        if not (should_enable_vector(workspace, config) and get_vector_store(workspace, config)):
+            return None
+        provider = get_embedding_provider(config)
+        if not provider:
+            return None
+        texts = [c.get("text", "") for c in doc["chunks"]]
+        step = max(1, int(batch_size))
+        vectors: list[list[float]] = []
+        for start in range(0, len(texts), step):
+            vectors.extend(provider.embed(texts[start:start + step]))
+        return vectors
+    except Exception as e:
+        logger.warning(f"Embedding during pipeline index failed: {e}")
+        return None
+
+
+def write_processed_doc(
+    workspace: Path,
+    doc: dict[str, Any],
+    vectors: list[list[float]] | None = None,
+    *,
+    config: Any = None,
+    store: RetrievalStore | None = None,
+) -> None:
+    """Replace the document in the FTS5 store, then write its vectors and run the optional QMD sync."""
+    (store or RetrievalStore(Path(workspace))).replace_doc(**doc)
+    logger.debug(f"Indexed doc_id={doc['doc_id']} ({len(doc['chunks'])} chunks)")
+    config = _resolve_config(config)
+    if vectors:
+        _write_vectors(workspace, doc, vectors, config=config)
+    _qmd_sync(doc, config=config)
+
+
 def index_processed_file(
     workspace: Path,
     processed_md_path: Path,
@@ -22,113 +111,101 @@ def index_processed_file(
     """
     Index a single processed .md file (and its .json meta) into RetrievalStore.
     When vector is enabled (config + vector_backend + embedding), also index into Chroma (or configured vector store).
-    Replaces any existing chunks for the same doc_id in FTS5; vector store upserts by chunk id.
+    Replaces any existing chunks for the same doc_id in FTS5 atomically; vector store upserts by chunk id.
     """
-    processed_md_path = Path(processed_md_path).resolve()
-    if not processed_md_path.suffix == ".md" or not processed_md_path.exists():
+    doc = load_processed_doc(processed_md_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    if doc is None:
         return
-    meta_path = processed_md_path.with_suffix(".json")
-    if not meta_path.exists():
-        logger.warning(f"No metadata {meta_path} for {processed_md_path}, skipping index")
-        return
-    meta = json.loads(meta_path.read_text(encoding="utf-8"))
-    doc_id = meta.get("doc_id") or processed_md_path.stem
-    source_type = meta.get("source_type", "text")
-    source_url = meta.get("source_url", "")
-    file_path = meta.get("file_path", str(processed_md_path))
-    title = meta.get("title", processed_md_path.stem)
+    config = _resolve_config(config)
+    vectors = embed_processed_doc(workspace, doc, config=config)
+    write_processed_doc(workspace, doc, vectors, config=config)
 
-    text = processed_md_path.read_text(encoding="utf-8", errors="replace")
-    chunks_list = chunk_text(text, chunk_size=chunk_size, overlap=chunk_overlap, page=None)
-    if not chunks_list:
-        chunks_list = [{"text": text or "(empty)", "page": None}]
-    else:
-        chunks_list = [{"text": c.text, "page": c.page} for c in chunks_list]
 
-    store = RetrievalStore(Path(workspace))
-    store.delete_by_doc_id(doc_id)
-    store.index_doc(
-        doc_id=doc_id,
-        source_type=source_type,
-        source_url=source_url,
-        title=title,
-        file_path=file_path,
-        chunks=chunks_list,
-    )
-    logger.debug(f"Indexed {processed_md_path} -> doc_id={doc_id} ({len(chunks_list)} chunks)")
-
-    # Optional: index into vector store (Chroma etc.) when enabled
+def _write_vectors(workspace: Path, doc: dict[str, Any], vectors: list[list[float]], *, config: Any) -> None:
+    """Upsert chunk vectors into the configured vector store (Chroma etc.)."""
     if config is None:
-        try:
-            from joyhousebot.config.access import get_config
-            config = get_config()
-        except Exception:
-            config = None
-    if config is not None:
-        try:
-            from joyhousebot.services.retrieval.vector_optional import (
-                get_embedding_provider,
-                get_vector_store,
-                should_enable_vector,
-            )
-            if should_enable_vector(workspace, config) and get_embedding_provider(config) and get_vector_store(workspace, config):
-                provider = get_embedding_provider(config)
-                vs = get_vector_store(workspace, config)
-                if provider and vs:
-                    texts = [c.get("text", "") for c in chunks_list]
-                    vectors = provider.embed(texts)
-                    for i, vec in enumerate(vectors):
-                        if i < len(chunks_list):
-                            c = chunks_list[i]
-                            vs.index(
-                                doc_id=doc_id,
-                                chunk_index=i,
-                                vector=vec,
-                                meta={
-                                    "doc_id": doc_id,
-                                    "chunk_index": i,
-                                    "source_type": source_type,
-                                    "source_url": source_url or "",
-                                    "file_path": file_path or "",
-                                    "title": title,
-                                    "page": c.get("page"),
-                                    "content": c.get("text", ""),
-                                },
-                            )
-                    logger.debug(f"Vector indexed {processed_md_path} -> doc_id={doc_id} ({len(vectors)} chunks)")
-        except Exception as e:
-            logger.warning(f"Vector index during pipeline index failed: {e}")
-
-    # Optional: sync to QMD index when knowledge_qmd_sync_enabled and URL set
-    if config is not None:
-        try:
-            retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
-            if retrieval and getattr(retrieval, "knowledge_qmd_sync_enabled", False):
-                url = (getattr(retrieval, "knowledge_qmd_sync_url", "") or "").strip()
-                if url:
-                    payload = json.dumps({
+        return
+    doc_id = doc["doc_id"]
+    chunks_list = doc["chunks"]
+    try:
+        from joyhousebot.services.retrieval.vector_optional import get_vector_store
+
+        vs = get_vector_store(workspace, config)
+        if not vs:
+            return
+        for i, vec in enumerate(vectors):
+            if i < len(chunks_list):
+                c = chunks_list[i]
+                vs.index(
+                    doc_id=doc_id,
+                    chunk_index=i,
+                    vector=vec,
+                    meta={
                         "doc_id": doc_id,
-                        "title": title,
-                        "source_type": source_type,
-                        "source_url": source_url,
-                        "file_path": file_path,
-                        "chunks": [{"text": c.get("text", ""), "page": c.get("page")} for c in chunks_list],
-                    }, ensure_ascii=False).encode("utf-8")
-                    req = urllib.request.Request(
-                        url,
-                        data=payload,
-                        method="POST",
-                        headers={"Content-Type": "application/json; charset=utf-8"},
-                    )
-                    with urllib.request.urlopen(req, timeout=30) as resp:
-                        if resp.status in (200, 201, 204):
-                            logger.debug(f"QMD sync ok for {doc_id} -> {url}")
-                        else:
-                            logger.warning(f"QMD sync returned {resp.status} for {doc_id}")
-                else:
-                    logger.debug("knowledge_qmd_sync_enabled but knowledge_qmd_sync_url empty, skip sync")
-        except Exception as e:
-            logger.warning(f"QMD sync during pipeline index failed: {e}")
+                        "chunk_index": i,
+                        "source_type": doc["source_type"],
+                        "source_url": doc["source_url"] or "",
+                        "file_path": doc["file_path"] or "",
+                        "title": doc["title"],
+                        "page": c.get("page"),
+                        "content": c.get("text", ""),
+                    },
+                )
+        logger.debug(f"Vector indexed doc_id={doc_id} ({len(vectors)} chunks)")
+    except Exception as e:
+        logger.warning(f"Vector index during pipeline index failed: {e}")
+
+
+def delete_doc_vectors(workspace: Path, doc_id: str, *, config: Any = None) -> None:
+    """Remove a document's chunk vectors from the configured vector store (Chroma etc.)."""
+    config = _resolve_config(config)
+    if config is None:
+        return
+    try:
+        from joyhousebot.services.retrieval.vector_optional import get_vector_store
+
+        vs = get_vector_store(workspace, config)
+        if not vs:
+            return
+        vs.delete_by_doc_id(doc_id)
+        logger.debug(f"Vector entries removed for doc_id={doc_id}")
+    except Exception as e:
+        logger.warning(f"Vector delete during pipeline removal failed: {e}")
+
+
+def _qmd_sync(doc: dict[str, Any], *, config: Any) -> None:
+    """POST the document to the QMD index when knowledge_qmd_sync_enabled and a URL is set."""
+    if config is None:
+        return
+    doc_id = doc["doc_id"]
+    try:
+        retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
+        if retrieval and getattr(retrieval, "knowledge_qmd_sync_enabled", False):
+            url = (getattr(retrieval, "knowledge_qmd_sync_url", "") or "").strip()
+            if url:
+                payload = json.dumps({
+                    "doc_id": doc_id,
+                    "title": doc["title"],
+                    "source_type": doc["source_type"],
+                    "source_url": doc["source_url"],
+                    "file_path": doc["file_path"],
+                    "chunks": [{"text": c.get("text", ""), "page": c.get("page")} for c in doc["chunks"]],
+                }, ensure_ascii=False).encode("utf-8")
+                req = urllib.request.Request(
+                    url,
+                    data=payload,
+                    method="POST",
+                    headers={"Content-Type": "application/json; charset=utf-8"},
+                )
+                with urllib.request.urlopen(req, timeout=30) as resp:
+                    if resp.status in (200, 201, 204):
+                        logger.debug(f"QMD sync ok for {doc_id} -> {url}")
+                    else:
+                        logger.warning(f"QMD sync returned {resp.status} for {doc_id}")
+            else:
+                logger.debug("knowledge_qmd_sync_enabled but knowledge_qmd_sync_url empty, skip sync")
+    except Exception as e:
+        logger.warning(f"QMD sync during pipeline index failed: {e}")
 
 
 def sync_processed_dir_to_store(
@@ -138,25 +215,52 @@ def sync_processed_dir_to_store(
     chunk_size: int = 1200,
     chunk_overlap: int = 200,
     config: Any = None,
+    bulk: bool = True,
 ) -> int:
     """
     Scan processed_dir for all .md files and index each into RetrievalStore (and optional vector store).
+    With bulk=True all FTS5 writes go into one transaction with a single index rebuild
+    (RetrievalStore.bulk_load); bulk=False replaces documents one at a time.
     Returns number of files indexed.
     """
     processed_dir = Path(processed_dir).resolve()
     if not processed_dir.exists():
         return 0
-    count = 0
-    for md_path in sorted(processed_dir.glob("*.md")):
-        try:
-            index_processed_file(
-                workspace,
-                md_path,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                config=config,
-            )
-            count += 1
-        except Exception as e:
-            logger.warning(f"Failed to index {md_path}: {e}")
-    return count
+    md_paths = sorted(processed_dir.glob("*.md"))
+    if not bulk:
+        count = 0
+        for md_path in md_paths:
+            try:
+                index_processed_file(
+                    workspace,
+                    md_path,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    config=config,
+                )
+                count += 1
+            except Exception as e:
+                logger.warning(f"Failed to index {md_path}: {e}")
+        return count
+    if not md_paths:
+        return 0
+
+    loaded: list[tuple[Path, dict[str, Any]]] = []
+    with RetrievalStore(Path(workspace)).bulk_load() as loader:
+        for md_path in md_paths:
+            try:
+                doc = _load_processed_doc(md_path.resolve(), chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+                if doc is None:
+                    continue
+                loader.replace_doc(**doc)
+                loaded.append((md_path, doc))
+            except Exception as e:
+                logger.warning(f"Failed to index {md_path}: {e}")
+    logger.debug(f"Bulk indexed {loader.docs} processed files ({loader.chunks} chunks)")
+    config = _resolve_config(config)
+    for _md_path, doc in loaded:
+        vectors = embed_processed_doc(workspace, doc, config=config)
+        if vectors:
+            _write_vectors(workspace, doc, vectors, config=config)
+        _qmd_sync(doc, config=config)
+    return len(loaded)
@@ -0,0 +1,249 @@
+"""Durable ingestion ledger: one row per knowledge source file, tracking what is indexed."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from joyhousebot.utils.helpers import ensure_dir
+
+LEDGER_FILE_NAME = ".ingest_ledger.db"
+# Failed files are retried on restart until they have failed this many times (or change).
+MAX_ATTEMPTS = 3
+
+STATE_PENDING = "pending"
+STATE_PROCESSING = "processing"
+STATE_INDEXED = "indexed"
+STATE_FAILED = "failed"
+
+
+def file_content_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IngestionLedger:
+    """
+    SQLite ledger of source files: path (relative to the source dir), size, mtime,
+    content hash and state.
+
+    observe() records a change and (re)sets the file's due time, so a burst of events
+    for one path collapses into a single pending row processed once the burst has been
+    quiet for the debounce interval. claim_due() hands due rows to the pipeline as
+    `processing` with a claim number; a restart turns those back into `pending`, so no
+    work is lost. A change observed while a row is processing only sets its rerun flag:
+    the row is not claimed again until the in-flight run reports back, and is then
+    re-queued instead of marked done. mark_indexed / mark_failed / forget only apply to
+    the claim they are given.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        ensure_dir(self.db_path.parent)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                content_hash TEXT,
+                indexed_hash TEXT,
+                doc_id TEXT,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                due_at REAL NOT NULL DEFAULT 0,
+                claim INTEGER NOT NULL DEFAULT 0,
+                rerun INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_ingest_files_due ON ingest_files(state, due_at);
+            """
+        )
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(ingest_files)")}
+        for column in ("claim", "rerun"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE ingest_files ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def observe(self, path: str, size: int | None, mtime: float | None, *, due_at: float) -> bool:
+        """
+        Record a change to path (size/mtime None when the file is gone). Returns False
+        when nothing changed since the file was last indexed or last failed; failed
+        rows are retried by resume() until MAX_ATTEMPTS, not by re-observing them.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, state FROM ingest_files WHERE path = ?", (path,)
+            ).fetchone()
+            stat_changed = row is None or (row["size"], row["mtime"]) != (size, mtime)
+            if not stat_changed and row["state"] in (STATE_INDEXED, STATE_FAILED, STATE_PROCESSING):
+                return False
+            if row is None:
+                self._conn.execute(
+                    """
+                    INSERT INTO ingest_files (path, size, mtime, state, due_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (path, size, mtime, STATE_PENDING, due_at, now),
+                )
+            elif row["state"] == STATE_PROCESSING:
+                # Leave the in-flight run alone; it re-queues the row when it reports back.
+                self._conn.execute(
+                    """
+                    UPDATE ingest_files
+                    SET size = ?, mtime = ?, due_at = ?, rerun = 1, attempts = 0, updated_at = ?
+                    WHERE path = ?
+                    """,
+                    (size, mtime, due_at, now, path),
+                )
+            else:
+                # Only a real change resets the retry budget.
+                self._conn.execute(
+                    """
+                    UPDATE ingest_files
+                    SET size = ?, mtime = ?, state = ?, due_at = ?, updated_at = ?,
+                        attempts = CASE WHEN ? THEN 0 ELSE attempts END
+                    WHERE path = ?
+                    """,
+                    (size, mtime, STATE_PENDING, due_at, now, int(stat_changed), path),
+                )
+            return True
+
+    def claim_due(self, *, now: float | None = None, limit: int = 32) -> list[dict[str, Any]]:
+        """Move up to limit pending rows whose debounce has elapsed to `processing` under a new claim."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                UPDATE ingest_files SET state = ?, updated_at = ?, claim = claim + 1, rerun = 0
+                WHERE path IN (
+                    SELECT path FROM ingest_files WHERE state = ? AND due_at <= ?
+                    ORDER BY due_at LIMIT ?
+                )
+                RETURNING path, size, mtime, indexed_hash, doc_id, claim
+                """,
+                (STATE_PROCESSING, now, STATE_PENDING, now, max(1, int(limit))),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def next_due_at(self) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(due_at) FROM ingest_files WHERE state = ?", (STATE_PENDING,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_indexed(self, path: str, *, claim: int, content_hash: str, doc_id: str | None) -> None:
+        """Record a successful index for claim; a row changed meanwhile goes back to pending."""
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE ingest_files
+                SET content_hash = ?, indexed_hash = ?, doc_id = COALESCE(?, doc_id), attempts = 0,
+                    last_error = NULL, updated_at = ?,
+                    state = CASE WHEN rerun THEN ? ELSE ? END, rerun = 0
+                WHERE path = ? AND state = ? AND claim = ?
+                """,
+                (content_hash, content_hash, doc_id, time.time(), STATE_PENDING, STATE_INDEXED,
+                 path, STATE_PROCESSING, claim),
+            )
+
+    def mark_failed(self, path: str, error: str, *, claim: int) -> None:
+        """Record a failed run for claim; a row changed meanwhile is retried with a fresh budget."""
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE ingest_files
+                SET attempts = CASE WHEN rerun THEN 0 ELSE attempts + 1 END, last_error = ?, updated_at = ?,
+                    state = CASE WHEN rerun THEN ? ELSE ? END, rerun = 0
+                WHERE path = ? AND state = ? AND claim = ?
+                """,
+                (error[:500], time.time(), STATE_PENDING, STATE_FAILED, path, STATE_PROCESSING, claim),
+            )
+
+    def forget(self, path: str, *, claim: int | None = None) -> None:
+        """Drop path's row; with claim, only if that run still owns it and no change arrived meanwhile."""
+        with self._lock:
+            if claim is None:
+                self._conn.execute("DELETE FROM ingest_files WHERE path = ?", (path,))
+                return
+            self._conn.execute(
+                "DELETE FROM ingest_files WHERE path = ? AND state = ? AND claim = ? AND NOT rerun",
+                (path, STATE_PROCESSING, claim),
+            )
+            # Re-created while being removed: process it again.
+            self._conn.execute(
+                """
+                UPDATE ingest_files SET state = ?, rerun = 0, updated_at = ?
+                WHERE path = ? AND state = ? AND claim = ? AND rerun
+                """,
+                (STATE_PENDING, time.time(), path, STATE_PROCESSING, claim),
+            )
+
+    def resume(self, *, now: float | None = None) -> int:
+        """Re-queue work interrupted by a restart, and failed rows with retries left."""
+        now = time.time() if now is None else now
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                UPDATE ingest_files SET state = ?, due_at = ?, updated_at = ?, rerun = 0
+                WHERE state = ? OR (state = ? AND attempts < ?)
+                """,
+                (STATE_PENDING, now, now, STATE_PROCESSING, STATE_FAILED, MAX_ATTEMPTS),
+            )
+            return max(0, cur.rowcount)
+
+    def reconcile(self, files: Iterable[tuple[str, int, float]], *, now: float | None = None) -> dict[str, int]:
+        """
+        Diff the current source files (path, size, mtime) against the ledger: new or
+        changed files become pending, and rows for vanished files become pending with
+        no size so the pipeline removes them. Unchanged indexed files are left alone.
+        """
+        now = time.time() if now is None else now
+        seen: set[str] = set()
+        changed = 0
+        for path, size, mtime in files:
+            seen.add(path)
+            if self.observe(path, size, mtime, due_at=now):
+                changed += 1
+        with self._lock:
+            known = [r[0] for r in self._conn.execute("SELECT path FROM ingest_files WHERE size IS NOT NULL")]
+        removed = 0
+        for path in known:
+            if path not in seen:
+                self.observe(path, None, None, due_at=now)
+                removed += 1
+        return {"changed": changed, "removed": removed}
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingest_files WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM ingest_files GROUP BY state").fetchall()
+        return {state: n for state, n in rows}
+
+    def outstanding(self) -> int:
+        """Rows still waiting for or undergoing processing."""
+        counts = self.counts()
+        return counts.get(STATE_PENDING, 0) + counts.get(STATE_PROCESSING, 0)
@@ -1,22 +1,149 @@
-"""Task queue for knowledge pipeline: consume paths, convert + index."""
+"""Task queue for knowledge pipeline: consume paths, convert + embed + index in parallel stages."""
 
+import json
+import multiprocessing
+import os
 import queue
 import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any
 
 from loguru import logger
 
 from joyhousebot.services.knowledge_pipeline.converter import (
     SUPPORTED_EXTENSIONS,
+    _doc_id_for_path,
     convert_file_to_processed,
 )
-from joyhousebot.services.knowledge_pipeline.indexer import index_processed_file
+from joyhousebot.services.knowledge_pipeline.indexer import (
+    delete_doc_vectors,
+    embed_processed_doc,
+    load_processed_doc,
+    write_processed_doc,
+)
+from joyhousebot.services.knowledge_pipeline.ledger import (
+    LEDGER_FILE_NAME,
+    IngestionLedger,
+    file_content_hash,
+)
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+STATUS_FILE_NAME = ".pipeline_status.json"
+# Rolling window for per-stage throughput.
+THROUGHPUT_WINDOW_S = 300.0
+STATUS_WRITE_INTERVAL_S = 1.0
+DEFAULT_DEBOUNCE_MS = 1000
+
+
+@dataclass
+class _Job:
+    """One source file moving through the stages."""
+
+    rel_path: str
+    source: Path
+    content_hash: str = ""
+    doc_id: str | None = None
+    md_path: Path | None = None
+    doc: dict[str, Any] | None = None
+    vectors: list[list[float]] | None = None
+    remove: bool = False
+    started: float = 0.0
+    claim: int = 0
+
+
+class _StageStats:
+    """Counters and recent latencies for one pipeline stage."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._latencies: deque[float] = deque(maxlen=256)
+        self._finished_at: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def start(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+        return time.monotonic()
+
+    def finish(self, started: float, ok: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+                self._latencies.append(now - started)
+                self._finished_at.append(now)
+            else:
+                self.failed += 1
+
+    def snapshot(self, queued: int) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._finished_at and now - self._finished_at[0] > THROUGHPUT_WINDOW_S:
+                self._finished_at.popleft()
+            lat = list(self._latencies)
+            window = min(THROUGHPUT_WINDOW_S, now - self._finished_at[0]) if self._finished_at else 0.0
+            return {
+                "queued": queued,
+                "inFlight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avgLatencyMs": round(sum(lat) / len(lat) * 1000, 1) if lat else None,
+                "throughputPerMin": round(len(self._finished_at) / window * 60, 2) if window > 0 else None,
+            }
+
+
+def read_pipeline_status(processed_dir: Path) -> dict[str, Any] | None:
+    """Last status written by a pipeline (in-process or subprocess) for processed_dir."""
+    path = Path(processed_dir) / STATUS_FILE_NAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _resolve_convert_workers(value: int) -> int:
+    value = int(value or 0)
+    return value if value > 0 else (os.cpu_count() or 1)
+
+
+def _process_context() -> Any:
+    # Never fork a process that already runs watcher/stage threads. The fork server
+    # imports the converter once, so each pool worker starts warm.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([convert_file_to_processed.__module__])
+    return ctx
 
 
 class KnowledgePipelineQueue:
     """
-    In-memory queue: put(source_file_path), worker thread converts to processed and indexes.
+    Staged pipeline: put(source_file_path) -> ledger -> convert -> embed -> write.
+
+    - ledger: put() only records the change in a durable SQLite IngestionLedger
+      (processed_dir/.ingest_ledger.db). Bursts of events for one path are debounced
+      into a single run; files whose content hash is already indexed are skipped; work
+      interrupted by a restart is resumed, and start() reconciles the source dir with
+      the ledger instead of re-indexing everything.
+    - convert: CPU-bound PDF parsing / OCR in a ProcessPoolExecutor (one process per
+      core by default; convert_workers=1 converts in-process). Skipped when the
+      processed markdown is already newer than the source file.
+    - embed: embed_concurrency threads load the processed markdown and embed its chunks
+      in batches of embed_batch_size (skipped when the vector layer is off).
+    - write: one thread owns all SQLite FTS5 / vector store writes, including removal
+      of documents whose source file was deleted.
+
+    Stages are joined by queues bounded by stage_queue_size; a full queue blocks the
+    stage feeding it, so a burst of files cannot pile up in memory.
+    status() reports per-stage depth, progress and throughput; it is also written to
+    processed_dir/.pipeline_status.json for the subprocess mode.
     """
 
     def __init__(
@@ -35,71 +162,346 @@ class KnowledgePipelineQueue:
         self._ingest_config = ingest_config
         self._pipeline_config = pipeline_config
         self._config = config
-        self._q: queue.Queue[Path | None] = queue.Queue()
+        self.convert_workers = _resolve_convert_workers(self._setting("convert_workers", 0))
+        self.embed_concurrency = max(1, int(self._setting("embed_concurrency", 2)))
+        self.embed_batch_size = max(1, int(self._setting("embed_batch_size", 64)))
+        self.debounce_s = max(0, int(self._setting("debounce_ms", DEFAULT_DEBOUNCE_MS))) / 1000
+        queue_size = max(1, int(self._setting("stage_queue_size", 32)))
+        self.ledger = IngestionLedger(self.processed_dir / LEDGER_FILE_NAME)
+        self._q: queue.Queue[_Job] = queue.Queue(maxsize=queue_size)
+        # Submitted conversions, in submission order; bounds in-flight work to 2x workers.
+        self._converting: queue.Queue[tuple[_Job, Future]] = queue.Queue(maxsize=self.convert_workers * 2)
+        self._embed_q: queue.Queue[_Job] = queue.Queue(maxsize=queue_size)
+        self._write_q: queue.Queue[_Job] = queue.Queue(maxsize=queue_size)
+        self._stats = {name: _StageStats() for name in ("convert", "embed", "write")}
+        self.skipped = 0
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._wake = threading.Event()
+        self._executor: Executor | None = None
+        self._threads: list[threading.Thread] = []
         self._thread: threading.Thread | None = None
         self._stop = threading.Event()
+        self._status_written = 0.0
 
-    def _chunk_size(self) -> int:
+    def _setting(self, name: str, default: Any) -> Any:
         if self._pipeline_config:
-            return getattr(self._pipeline_config, "convert_chunk_size", 1200)
-        return 1200
+            return getattr(self._pipeline_config, name, default)
+        return default
+
+    def _chunk_size(self) -> int:
+        return self._setting("convert_chunk_size", 1200)
 
     def _chunk_overlap(self) -> int:
-        if self._pipeline_config:
-            return getattr(self._pipeline_config, "convert_chunk_overlap", 200)
-        return 200
+        return self._setting("convert_chunk_overlap", 200)
 
-    def put(self, source_path: Path) -> None:
-        """Enqueue a source file for conversion and indexing."""
+    def _rel_path(self, source_path: Path) -> str | None:
         p = Path(source_path).resolve()
         if p.suffix.lower() not in SUPPORTED_EXTENSIONS:
             logger.debug(f"Pipeline skip unsupported extension: {p}")
-            return
+            return None
         try:
-            p.relative_to(self.source_dir)
+            return p.relative_to(self.source_dir).as_posix()
         except ValueError:
             logger.debug(f"Pipeline skip path outside source dir: {p}")
+            return None
+
+    def put(self, source_path: Path) -> None:
+        """Record a created, modified or deleted source file; it is processed once its events settle."""
+        rel = self._rel_path(source_path)
+        if rel is None:
             return
-        self._q.put(p)
+        try:
+            st = (self.source_dir / rel).stat()
+            size, mtime = st.st_size, st.st_mtime
+        except OSError:
+            size = mtime = None
+        if self.ledger.observe(rel, size, mtime, due_at=time.time() + self.debounce_s):
+            self._wake.set()
+
+    def reconcile(self) -> dict[str, int]:
+        """Diff the source dir against the ledger; queue new, changed and deleted files."""
+        files = []
+        if self.source_dir.exists():
+            for p in self.source_dir.rglob("*"):
+                if p.suffix.lower() not in SUPPORTED_EXTENSIONS or not p.is_file():
+                    continue
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                files.append((p.relative_to(self.source_dir).as_posix(), st.st_size, st.st_mtime))
+        report = self.ledger.reconcile(files)
+        self._wake.set()
+        return report
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-    def _worker(self) -> None:
+    def _get(self, q: queue.Queue) -> Any:
         while not self._stop.is_set():
             try:
-                item = self._q.get(timeout=0.5)
+                return q.get(timeout=0.5)
             except queue.Empty:
                 continue
-            if item is None:
-                break
+        return None
+
+    def _done(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def _fail(self, job: _Job, stage: str, error: Exception) -> None:
+        logger.warning(f"Pipeline {stage} failed for {job.rel_path}: {error}")
+        self._stats[stage].finish(job.started, ok=False)
+        self.ledger.mark_failed(job.rel_path, f"{stage}: {error}", claim=job.claim)
+        self._done()
+
+    # -- stages -------------------------------------------------------------
+
+    def _schedule_loop(self) -> None:
+        """Move due ledger rows into the stages (blocking while the convert queue is full)."""
+        while not self._stop.is_set():
+            rows = self.ledger.claim_due(limit=self._q.maxsize)
+            if not rows:
+                next_due = self.ledger.next_due_at()
+                delay = 0.5 if next_due is None else min(0.5, max(0.01, next_due - time.time()))
+                self._wake.wait(timeout=delay)
+                self._wake.clear()
+                continue
+            for row in rows:
+                if not self._dispatch(row):
+                    return
+
+    def _dispatch(self, row: dict[str, Any]) -> bool:
+        rel = row["path"]
+        job = _Job(
+            rel_path=rel,
+            source=self.source_dir / rel,
+            doc_id=row["doc_id"] or _doc_id_for_path(rel),
+            claim=row["claim"],
+        )
+        with self._idle:
+            self._pending += 1
+        if not job.source.is_file():
+            job.remove = True
+            return self._put(self._write_q, job)
+        try:
+            job.content_hash = file_content_hash(job.source)
+        except OSError as e:
+            self.ledger.mark_failed(rel, f"hash: {e}", claim=job.claim)
+            self._done()
+            return True
+        md_path = self.processed_dir / f"{job.doc_id}.md"
+        if job.content_hash == row["indexed_hash"] and md_path.exists():
+            self.ledger.mark_indexed(rel, claim=job.claim, content_hash=job.content_hash, doc_id=job.doc_id)
+            self.skipped += 1
+            self._done()
+            return True
+        try:
+            converted = md_path.exists() and md_path.stat().st_mtime >= job.source.stat().st_mtime
+        except OSError:
+            converted = False
+        if converted:
+            # Processed output is newer than the source (e.g. converted before a restart).
+            job.md_path = md_path
+            return self._put(self._embed_q, job)
+        return self._put(self._q, job)
+
+    def _convert_loop(self) -> None:
+        while True:
+            job = self._get(self._q)
+            if job is None:
+                return
+            job.started = self._stats["convert"].start()
             try:
-                doc_id, md_path = convert_file_to_processed(
-                    item,
+                future = self._executor.submit(
+                    convert_file_to_processed,
+                    job.source,
                     self.processed_dir,
                     self.source_dir,
                     ingest_config=self._ingest_config,
                 )
-                index_processed_file(
-                    self.workspace,
-                    md_path,
-                    chunk_size=self._chunk_size(),
-                    chunk_overlap=self._chunk_overlap(),
-                    config=self._config,
+            except Exception as e:
+                self._fail(job, "convert", e)
+                continue
+            if not self._put(self._converting, (job, future)):
+                return
+
+    def _collect_loop(self) -> None:
+        while True:
+            entry = self._get(self._converting)
+            if entry is None:
+                return
+            job, future = entry
+            try:
+                job.doc_id, job.md_path = future.result()
+            except Exception as e:
+                self._fail(job, "convert", e)
+                continue
+            self._stats["convert"].finish(job.started, ok=True)
+            if not self._put(self._embed_q, job):
+                return
+
+    def _embed_loop(self) -> None:
+        while True:
+            job = self._get(self._embed_q)
+            if job is None:
+                return
+            job.started = self._stats["embed"].start()
+            try:
+                job.doc = load_processed_doc(
+                    job.md_path, chunk_size=self._chunk_size(), chunk_overlap=self._chunk_overlap()
+                )
+                if job.doc is None:
+                    raise ValueError(f"{job.md_path} is not indexable")
+                job.vectors = embed_processed_doc(
+                    self.workspace, job.doc, config=self._config, batch_size=self.embed_batch_size
                 )
             except Exception as e:
-                logger.warning(f"Pipeline task failed for {item}: {e}")
-            finally:
-                self._q.task_done()
+                self._fail(job, "embed", e)
+                continue
+            self._stats["embed"].finish(job.started, ok=True)
+            if not self._put(self._write_q, job):
+                return
+
+    def _write_loop(self) -> None:
+        store = RetrievalStore(self.workspace)
+        while True:
+            job = self._get(self._write_q)
+            if job is None:
+                return
+            job.started = self._stats["write"].start()
+            try:
+                if job.remove:
+                    self._remove_doc(store, job)
+                else:
+                    write_processed_doc(self.workspace, job.doc, job.vectors, config=self._config, store=store)
+                    self.ledger.mark_indexed(
+                        job.rel_path, claim=job.claim, content_hash=job.content_hash, doc_id=job.doc_id
+                    )
+            except Exception as e:
+                self._fail(job, "write", e)
+                continue
+            self._stats["write"].finish(job.started, ok=True)
+            self._done()
+            if self._pending <= 0:
+                self._optimize_index(store)
+                self._write_status(force=True)
+            else:
+                self._write_status()
+
+    def _remove_doc(self, store: RetrievalStore, job: _Job) -> None:
+        """Drop the FTS and vector entries and processed output of a deleted source file."""
+        store.delete_by_doc_id(job.doc_id)
+        delete_doc_vectors(self.workspace, job.doc_id, config=self._config)
+        for suffix in (".md", ".json"):
+            (self.processed_dir / f"{job.doc_id}{suffix}").unlink(missing_ok=True)
+        self.ledger.forget(job.rel_path, claim=job.claim)
+        logger.debug(f"Removed {job.rel_path} (doc_id={job.doc_id}) from knowledge index")
+
+    def _optimize_index(self, store: RetrievalStore) -> None:
+        """Merge FTS segments once the pipeline drains (deferred off the per-document write path)."""
+        try:
+            store.optimize_if_due()
+        except Exception as e:
+            logger.debug(f"Pipeline FTS optimize skipped: {e}")
+
+    # -- status -------------------------------------------------------------
+
+    def status(self) -> dict[str, Any]:
+        """Progress snapshot: pending files plus per-stage depth, counters and throughput."""
+        write = self._stats["write"]
+        return {
+            "running": self.is_running(),
+            "pending": max(0, self._pending),
+            "convertWorkers": self.convert_workers,
+            "embedConcurrency": self.embed_concurrency,
+            "indexed": write.completed,
+            "skipped": self.skipped,
+            "failed": sum(s.failed for s in self._stats.values()),
+            "ledger": self.ledger.counts(),
+            "stages": {
+                "convert": self._stats["convert"].snapshot(self._q.qsize()),
+                "embed": self._stats["embed"].snapshot(self._embed_q.qsize()),
+                "write": write.snapshot(self._write_q.qsize()),
+            },
+            "updatedAt": int(time.time() * 1000),
+        }
+
+    def _write_status(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._status_written < STATUS_WRITE_INTERVAL_S:
+            return
+        self._status_written = now
+        try:
+            self.processed_dir.mkdir(parents=True, exist_ok=True)
+            path = self.processed_dir / STATUS_FILE_NAME
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.status()), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.debug(f"Pipeline status write failed: {e}")
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def is_running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until every file put() so far (including debounced ones) has been indexed or failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0 or self.ledger.outstanding() > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(timeout=0.05 if remaining is None else min(0.05, remaining))
+            return True
 
     def start(self) -> None:
-        if self._thread is not None and self._thread.is_alive():
+        """Resume interrupted work, reconcile the source dir with the ledger, start the stages."""
+        if self.is_running():
             return
         self._stop.clear()
-        self._thread = threading.Thread(target=self._worker, daemon=True)
-        self._thread.start()
-        logger.debug("Knowledge pipeline queue worker started")
+        resumed = self.ledger.resume()
+        report = self.reconcile()
+        if resumed or report["changed"] or report["removed"]:
+            logger.info(
+                f"Knowledge pipeline: {report['changed']} new/changed, {report['removed']} removed, "
+                f"{resumed} resumed"
+            )
+        if self.convert_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.convert_workers, mp_context=_process_context())
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kp-convert")
+        loops = [self._schedule_loop, self._convert_loop, self._collect_loop, self._write_loop]
+        loops += [self._embed_loop] * self.embed_concurrency
+        self._threads = [threading.Thread(target=fn, daemon=True) for fn in loops]
+        for t in self._threads:
+            t.start()
+        self._thread = self._threads[0]
+        logger.debug(
+            f"Knowledge pipeline started: {self.convert_workers} convert workers, "
+            f"{self.embed_concurrency} embed workers"
+        )
 
     def stop(self) -> None:
         self._stop.set()
-        self._q.put(None)
-        if self._thread is not None:
-            self._thread.join(timeout=5.0)
-            self._thread = None
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=5.0)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._write_status(force=True)
+        self._threads = []
+        self._thread = None
@@ -1,6 +1,7 @@
 """Standalone entry point for knowledge pipeline worker subprocess."""
 
 import os
+import signal
 import sys
 from pathlib import Path
 from typing import Any
@@ -16,94 +17,33 @@ def main() -> None:
 
     logger.info(f"Starting knowledge pipeline worker: source={source_dir}, processed={processed_dir}")
 
-    from joyhousebot.services.knowledge_pipeline.converter import SUPPORTED_EXTENSIONS
-    from joyhousebot.services.knowledge_pipeline.converter import convert_file_to_processed
-    from joyhousebot.services.knowledge_pipeline.indexer import index_processed_file
-    import queue
-    import threading
+    from joyhousebot.services.knowledge_pipeline.pipeline_queue import KnowledgePipelineQueue
+    from joyhousebot.services.knowledge_pipeline.watcher import start_watcher
 
-    class PipelineWorker:
-        """Simple worker that processes files from source_dir."""
-
-        def __init__(self):
-            self._q = queue.Queue()
-            self._stop = threading.Event()
-            self._thread = None
-
-        def put(self, path: Path) -> None:
-            p = Path(path).resolve()
-            if p.suffix.lower() not in SUPPORTED_EXTENSIONS:
-                return
-            try:
-                p.relative_to(source_dir)
-            except ValueError:
-                return
-            self._q.put(p)
-
-        def _worker(self) -> None:
-            while not self._stop.is_set():
-                try:
-                    item = self._q.get(timeout=0.5)
-                except queue.Empty:
-                    continue
-                if item is None:
-                    break
-                try:
-                    convert_file_to_processed(item, processed_dir, source_dir)
-                    md_path = processed_dir / f"{item.stem}.md"
-                    if md_path.exists():
-                        index_processed_file(workspace, md_path)
-                except Exception as e:
-                    logger.warning(f"Pipeline task failed for {item}: {e}")
-                finally:
-                    self._q.task_done()
-
-        def start(self) -> None:
-            if self._thread is not None and self._thread.is_alive():
-                return
-            self._stop.clear()
-            self._thread = threading.Thread(target=self._worker, daemon=True)
-            self._thread.start()
-
-        def stop(self) -> None:
-            self._stop.set()
-            self._q.put(None)
-            if self._thread is not None:
-                self._thread.join(timeout=5.0)
-
-    worker = PipelineWorker()
+    config: Any = None
+    try:
+        from joyhousebot.config.loader import load_config
+        config = load_config()
+    except Exception as e:
+        logger.warning(f"Knowledge pipeline worker running without config: {e}")
+    tools = getattr(config, "tools", None)
+
+    worker = KnowledgePipelineQueue(
+        workspace,
+        source_dir,
+        processed_dir,
+        ingest_config=getattr(tools, "ingest", None),
+        pipeline_config=getattr(tools, "knowledge_pipeline", None),
+        config=config,
+    )
     worker.start()
 
-    def _start_file_watcher() -> threading.Thread | None:
-        """Start file watcher thread if watchfiles is available."""
-        try:
-            from watchfiles import watch
-        except ImportError:
-            logger.warning("watchfiles not installed; file watch disabled")
-            return None
-
-        def _watch_loop() -> None:
-            seen: set[tuple[str, float]] = set()
-            for changes in watch(source_dir):
-                for change, path_str in changes:
-                    path = Path(path_str)
-                    if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-                        continue
-                    try:
-                        key = (str(path), path.stat().st_mtime)
-                        if key in seen:
-                            continue
-                        seen.add(key)
-                        worker.put(path)
-                    except OSError:
-                        pass
+    start_watcher(workspace, source_dir, processed_dir, worker, config=config)
 
-        thread = threading.Thread(target=_watch_loop, daemon=True)
-        thread.start()
-        logger.info(f"File watcher started for {source_dir}")
-        return thread
+    def _on_sigterm(_signum: int, _frame: Any) -> None:
+        raise KeyboardInterrupt
 
-    watcher_thread = _start_file_watcher()
+    signal.signal(signal.SIGTERM, _on_sigterm)
 
     try:
         import time
@@ -19,7 +19,7 @@ def start_watcher(
     config: Any = None,
 ) -> threading.Thread | None:
     """
-    Start a background thread that watches source_dir and puts new/changed files into pipeline_queue.
+    Start a background thread that watches source_dir and puts new/changed/deleted files into pipeline_queue.
     Returns the watcher thread, or None if watch is disabled or source_dir does not exist.
     """
     watch_enabled = True
@@ -38,20 +38,13 @@ def start_watcher(
         except ImportError:
             logger.warning("watchfiles not installed; knowledge dir watch disabled")
             return
-        seen: set[tuple[str, float]] = set()
+        # Deduplication, debouncing and persistence live in the queue's ingestion ledger.
         for changes in watch(source_dir):
-            for change, path_str in changes:
+            for _change, path_str in changes:
                 path = Path(path_str)
-                if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                if path.suffix.lower() not in SUPPORTED_EXTENSIONS or path.is_dir():
                     continue
-                try:
-                    key = (str(path), path.stat().st_mtime)
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    pipeline_queue.put(path)
-                except OSError:
-                    pass
+                pipeline_queue.put(path)
 
     thread = threading.Thread(target=_watch_loop, daemon=True)
     thread.start()
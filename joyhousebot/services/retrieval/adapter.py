@@ -2,25 +2,20 @@
 
 from __future__ import annotations
 
-import math
+import asyncio
 from pathlib import Path
 from typing import Any, Awaitable, Callable
 
 from joyhousebot.services.retrieval.hybrid import hybrid_search_async
 from joyhousebot.services.retrieval.memory_search import search_memory_files
 from joyhousebot.services.retrieval.memory_vector_store import search_memory_sqlite_vector
+from joyhousebot.services.retrieval.result_cache import (
+    get_result_cache,
+    index_generation,
+    normalize_query,
+)
 from joyhousebot.services.retrieval.vector_optional import get_memory_embedding_provider
-
-
-def _cosine_sim(a: list[float], b: list[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    if na == 0 or nb == 0:
-        return 0.0
-    return dot / (na * nb)
+from joyhousebot.services.retrieval.vector_search import rank_by_cosine
 
 
 async def search_async(
@@ -34,15 +29,53 @@ async def search_async(
     mcp_memory_search_callable: Callable[[str, int], Awaitable[list[dict[str, Any]]]] | None = None,
     mcp_knowledge_search_callable: Callable[[str, int], Awaitable[list[dict[str, Any]]]] | None = None,
     memory_scope_key: str | None = None,
+    cache_info: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
     """
     Unified search: knowledge scope uses knowledge_backend (builtin = FTS5+Chroma, or qmd when callable provided);
     memory scope uses memory_backend (builtin = grep, or mcp_qmd / sqlite_vector when configured).
+
+    Results are served from the retrieval result cache while the index generation of
+    the scope is unchanged; pass a dict as cache_info to learn whether this call hit.
     """
     query = (query or "").strip()
     if not query:
         return []
 
+    cache = get_result_cache(config)
+    if cache is not None:
+        key = (
+            str(workspace), scope, memory_scope_key if scope == "memory" else None,
+            normalize_query(query), top_k, source_type, doc_id,
+        )
+        # Taken before searching, so a write racing with this search invalidates the entry.
+        token = await asyncio.to_thread(index_generation, workspace, scope, memory_scope_key)
+        cached = cache.get(key, token)
+        if cache_info is not None:
+            cache_info["hit"] = cached is not None
+        if cached is not None:
+            return cached
+    hits = await _search_uncached(
+        workspace, config, query, top_k, source_type, doc_id, scope,
+        mcp_memory_search_callable, mcp_knowledge_search_callable, memory_scope_key,
+    )
+    if cache is not None:
+        cache.put(key, token, hits)
+    return hits
+
+
+async def _search_uncached(
+    workspace: Path,
+    config: Any,
+    query: str,
+    top_k: int,
+    source_type: str | None,
+    doc_id: str | None,
+    scope: str,
+    mcp_memory_search_callable: Callable[[str, int], Awaitable[list[dict[str, Any]]]] | None,
+    mcp_knowledge_search_callable: Callable[[str, int], Awaitable[list[dict[str, Any]]]] | None,
+    memory_scope_key: str | None,
+) -> list[dict[str, Any]]:
     if scope == "knowledge":
         retrieval_cfg = getattr(getattr(config, "tools", None), "retrieval", None)
         knowledge_backend = (getattr(retrieval_cfg, "knowledge_backend", "builtin") or "builtin").strip().lower()
@@ -93,9 +126,7 @@ async def search_async(
                     texts = [h["content"] for h in hits]
                     query_vec, *hit_vecs = await provider.aembed([query] + texts)
                     if query_vec and len(hit_vecs) == len(hits):
-                        scored = [(h, _cosine_sim(query_vec, v)) for h, v in zip(hits, hit_vecs)]
-                        scored.sort(key=lambda x: -x[1])
-                        hits = [h for h, _ in scored[:mem_top_k]]
+                        hits = [hits[i] for i in rank_by_cosine(query_vec, hit_vecs, mem_top_k)]
                 except Exception:
                     hits = hits[:mem_top_k]
         else:
@@ -65,6 +65,10 @@ class ChromaVectorStore:
         }
         coll.upsert(ids=[cid], embeddings=[vector], metadatas=[m])
 
+    def delete_by_doc_id(self, doc_id: str) -> None:
+        """Remove all chunk vectors of a document."""
+        self._get_collection().delete(where={"doc_id": str(doc_id)})
+
     def search(
         self,
         query_vector: list[float],
@@ -0,0 +1,297 @@
+"""Content-addressed embedding cache: in-process LRU in front of a size-bounded SQLite store."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from joyhousebot.utils.helpers import ensure_dir
+
+try:
+    import numpy as np
+except ImportError:  # optional; struct is used without numpy
+    np = None  # type: ignore[assignment]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 2048
+# After an over-budget write, evict least recently used rows down to this share of max_bytes.
+EVICT_TO_RATIO = 0.9
+# Disk hits queue their last_used update; the queue is written with the next put or once it gets this long.
+TOUCH_FLUSH_ENTRIES = 256
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vec: list[float]) -> bytes:
+    if np is not None:
+        return np.asarray(vec, dtype=np.float32).tobytes()
+    import struct
+
+    return struct.pack(f"{len(vec)}f", *vec)
+
+
+def _unpack(blob: bytes) -> list[float]:
+    if np is not None:
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+    import struct
+
+    return list(struct.unpack(f"{len(blob) // 4}f", blob))
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by (model, sha256(text)).
+
+    Lookups go to an in-process LRU first, then to SQLite (WAL, shared by every
+    process using the same file, e.g. the knowledge pipeline subprocess). The SQLite
+    tier is bounded by max_bytes of vector data and evicts least recently used rows;
+    the byte total is kept in process (re-read on eviction) and last_used updates from
+    disk hits are batched instead of written on every lookup.
+    Vectors are stored as float32, so cached values may differ from the provider's
+    float64 output in the last digits.
+    """
+
+    _shared: dict[str, "EmbeddingCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ):
+        self.db_path = Path(db_path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.memory_entries = max(0, int(memory_entries))
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._memory: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._total_bytes: int | None = None
+        self._pending_touch: dict[tuple[str, str], float] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, db_path: Path, **kwargs: Any) -> "EmbeddingCache":
+        """Process-wide cache for db_path (created on first use with kwargs)."""
+        key = str(Path(db_path).expanduser().resolve())
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls(Path(key), **kwargs)
+                cls._shared[key] = cache
+            return cache
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.db_path.parent)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: tuple[str, str], vec: list[float]) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """Cached vector for each text (None where missing)."""
+        hashes = [text_hash(t) for t in texts]
+        out: list[list[float] | None] = [None] * len(texts)
+        with self._lock:
+            pending: dict[str, list[int]] = {}
+            for i, h in enumerate(hashes):
+                vec = self._memory.get((model, h))
+                if vec is not None:
+                    self._memory.move_to_end((model, h))
+                    out[i] = vec
+                    self.memory_hits += 1
+                else:
+                    pending.setdefault(h, []).append(i)
+            if pending:
+                try:
+                    found = self._load(model, list(pending))
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache read failed: {e}")
+                    found = {}
+                for h, idxs in pending.items():
+                    vec = found.get(h)
+                    if vec is None:
+                        self.misses += len(idxs)
+                        continue
+                    self._remember((model, h), vec)
+                    self.disk_hits += len(idxs)
+                    for i in idxs:
+                        out[i] = vec
+        return out
+
+    def _load(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        conn = self._connection()
+        found: dict[str, list[float]] = {}
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *batch],
+            ).fetchall()
+            found.update((h, _unpack(blob)) for h, blob in rows)
+        if found:
+            now = time.time()
+            self._pending_touch.update(((model, h), now) for h in found)
+            if len(self._pending_touch) >= TOUCH_FLUSH_ENTRIES:
+                self._flush_touch_locked(conn)
+        return found
+
+    def _flush_touch_locked(self, conn: sqlite3.Connection) -> None:
+        if not self._pending_touch:
+            return
+        pending, self._pending_touch = self._pending_touch, {}
+        conn.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+            [(ts, model, h) for (model, h), ts in pending.items()],
+        )
+
+    def put_many(self, model: str, texts: list[str], vectors: list[list[float]]) -> None:
+        """Store vectors for texts (pairs with an empty vector are skipped)."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                if not vec:
+                    continue
+                h = text_hash(text)
+                vec = list(vec)
+                self._remember((model, h), vec)
+                blob = _pack(vec)
+                rows.append((model, h, blob, len(blob), now))
+            if not rows or not self.max_bytes:
+                return
+            try:
+                conn = self._connection()
+                self._flush_touch_locked(conn)
+                if self._total_bytes is None:
+                    self._total_bytes = self._disk_bytes(conn)
+                replaced = self._stored_sizes(conn, model, [row[1] for row in rows])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._total_bytes += sum(row[3] for row in rows) - replaced
+                if self._total_bytes > self.max_bytes:
+                    self._evict_locked(conn)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    @staticmethod
+    def _disk_bytes(conn: sqlite3.Connection) -> int:
+        return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0])
+
+    @staticmethod
+    def _stored_sizes(conn: sqlite3.Connection, model: str, hashes: list[str]) -> int:
+        total = 0
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            total += int(conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *batch],
+            ).fetchone()[0])
+        return total
+
+    def _evict_locked(self, conn: sqlite3.Connection) -> None:
+        # Other processes write the same file, so re-read the real total before deleting.
+        total = self._disk_bytes(conn)
+        self._total_bytes = total
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * EVICT_TO_RATIO)
+        # Delete the oldest rows whose cumulative size brings the total under target.
+        cur = conn.execute(
+            """
+            DELETE FROM embeddings WHERE (model, text_hash) IN (
+                SELECT model, text_hash FROM (
+                    SELECT model, text_hash,
+                           SUM(size) OVER (ORDER BY last_used, text_hash) AS freed
+                    FROM embeddings
+                ) WHERE freed - size < ?
+            )
+            """,
+            (total - target,),
+        )
+        self.evictions += max(0, cur.rowcount)
+        self._total_bytes = self._disk_bytes(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memoryHits": self.memory_hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+                "memoryEntries": len(self._memory),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._pending_touch.clear()
+            self._connection().execute("DELETE FROM embeddings")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_touch_locked(self._conn)
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+                self._conn.close()
+                self._conn = None
+                self._total_bytes = None
+
+
+def get_embedding_cache(config: Any) -> EmbeddingCache | None:
+    """Process-wide embedding cache per config.tools.retrieval (None when disabled)."""
+    retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
+    if retrieval is not None and not getattr(retrieval, "embedding_cache_enabled", True):
+        return None
+    from joyhousebot.config.loader import get_data_dir
+
+    return EmbeddingCache.shared(
+        get_data_dir() / "cache" / "embeddings.db",
+        max_bytes=int(getattr(retrieval, "embedding_cache_max_mb", 256) or 0) * 1024 * 1024,
+        memory_entries=int(getattr(retrieval, "embedding_cache_memory_entries", DEFAULT_MEMORY_ENTRIES) or 0),
+    )
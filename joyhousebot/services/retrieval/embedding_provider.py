@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from loguru import logger
 
+from joyhousebot.services.retrieval.embedding_cache import EmbeddingCache
+
 
 def _get_embedding_api_key(config: Any, provider: str) -> str | None:
     """Resolve API key for embedding provider from config.providers."""
@@ -21,31 +24,70 @@ def _get_embedding_api_key(config: Any, provider: str) -> str | None:
 
 
 class LiteLLMEmbeddingProvider:
-    """Embed texts via LiteLLM (OpenAI, Azure, etc.)."""
+    """
+    Embed texts via LiteLLM (OpenAI, Azure, etc.).
+
+    With a cache (EmbeddingCache), embed/aembed look every text up by (model, text
+    hash) first and send only misses to the API, deduplicated within the call.
+    aembed does its cache reads and writes in a worker thread.
+    """
 
-    def __init__(self, model: str, provider: str = "openai", api_key: str | None = None):
+    def __init__(
+        self,
+        model: str,
+        provider: str = "openai",
+        api_key: str | None = None,
+        cache: EmbeddingCache | None = None,
+    ):
         self.model = model
         self.provider = (provider or "openai").strip().lower()
         self._api_key = (api_key or "").strip() or None
+        self.cache = cache
+
+    def _litellm_model(self) -> str:
+        # LiteLLM model format: openai/text-embedding-3-small or just model name
+        model = self.model
+        if self.provider and "/" not in model:
+            model = f"{self.provider}/{model}"
+        return model
+
+    def _plan(self, texts: list[str]) -> tuple[list[list[float] | None], list[str]]:
+        """Cached vectors per text (None for misses) and the distinct texts to request."""
+        if self.cache is None:
+            return [None] * len(texts), list(texts)
+        cached = self.cache.get_many(self._litellm_model(), texts)
+        misses = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        return cached, misses
+
+    def _merge(
+        self, texts: list[str], cached: list[list[float] | None], misses: list[str], fetched: list[list[float]]
+    ) -> list[list[float]]:
+        if self.cache is None:
+            return fetched
+        if len(fetched) != len(misses):
+            return []
+        self.cache.put_many(self._litellm_model(), misses, fetched)
+        by_text = dict(zip(misses, fetched))
+        return [vec if vec is not None else by_text[t] for t, vec in zip(texts, cached)]
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         """Sync embed; returns list of vectors. Empty input returns []."""
         if not texts:
             return []
+        cached, misses = self._plan(texts)
+        if not misses:
+            return [v for v in cached if v is not None]
         try:
             import litellm
-            # LiteLLM model format: openai/text-embedding-3-small or just model name
-            model = self.model
-            if self.provider and "/" not in model:
-                model = f"{self.provider}/{model}"
-            kwargs: dict[str, Any] = {"model": model, "input": texts}
+            kwargs: dict[str, Any] = {"model": self._litellm_model(), "input": misses}
             if self._api_key:
                 kwargs["api_key"] = self._api_key
             response = litellm.embedding(**kwargs)
+            fetched: list[list[float]] = []
             if response and getattr(response, "data", None):
                 out = [d.embedding for d in response.data if getattr(d, "embedding", None)]
-                return out[: len(texts)]
-            return []
+                fetched = out[: len(misses)]
+            return self._merge(texts, cached, misses, fetched)
         except Exception as e:
             logger.warning(f"Embedding failed: {e}")
             return []
@@ -54,19 +96,25 @@ class LiteLLMEmbeddingProvider:
         """Async embed; returns list of vectors."""
         if not texts:
             return []
+        if self.cache is not None:
+            cached, misses = await asyncio.to_thread(self._plan, texts)
+        else:
+            cached, misses = self._plan(texts)
+        if not misses:
+            return [v for v in cached if v is not None]
         try:
             import litellm
-            model = self.model
-            if self.provider and "/" not in model:
-                model = f"{self.provider}/{model}"
-            kwargs: dict[str, Any] = {"model": model, "input": texts, "aembedding": True}
+            kwargs: dict[str, Any] = {"model": self._litellm_model(), "input": misses, "aembedding": True}
             if self._api_key:
                 kwargs["api_key"] = self._api_key
             response = await litellm.aembedding(**kwargs)
+            fetched: list[list[float]] = []
             if response and getattr(response, "data", None):
                 out = [d.embedding for d in response.data if getattr(d, "embedding", None)]
-                return out[: len(texts)]
-            return []
+                fetched = out[: len(misses)]
+            if self.cache is not None:
+                return await asyncio.to_thread(self._merge, texts, cached, misses, fetched)
+            return self._merge(texts, cached, misses, fetched)
         except Exception as e:
             logger.warning(f"Embedding failed: {e}")
             return []
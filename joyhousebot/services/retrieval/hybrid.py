@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from loguru import logger
+
 from joyhousebot.services.retrieval.store import RetrievalStore
 from joyhousebot.services.retrieval.vector_optional import (
     get_embedding_provider,
@@ -13,6 +19,22 @@ from joyhousebot.services.retrieval.vector_optional import (
 )
 
 RRF_K = 60
+# Each recall list is over-fetched to top_k * RECALL_OVERFETCH before fusion, so a
+# document ranked low by one retriever can still be lifted by the other.
+RECALL_OVERFETCH = 3
+# Bound on concurrent blocking recall calls (SQLite FTS5, Chroma) across all searches.
+RECALL_MAX_WORKERS = 8
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _recall_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RECALL_MAX_WORKERS, thread_name_prefix="retrieval-recall")
+        return _executor
 
 
 def _hit_key(h: dict[str, Any]) -> str:
@@ -42,6 +64,120 @@ def _vector_meta_to_hit(meta: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+class _HybridQuery:
+    """
+    One knowledge query: FTS5 recall, optional vector recall and RRF fusion, each
+    timed into `timings` (ms). The sync and async entry points only differ in how
+    they drive these steps.
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        config: Any,
+        query: str,
+        top_k: int,
+        source_type: str | None,
+        doc_id: str | None,
+        timings: dict[str, float] | None,
+    ):
+        self.query = query
+        self.top_k = top_k
+        self.source_type = source_type
+        self.doc_id = doc_id
+        self.timings = timings if timings is not None else {}
+        self.store = RetrievalStore(workspace)
+        self.embedding_provider = None
+        self.vector_store = None
+        if should_enable_vector(workspace, config):
+            self.embedding_provider = get_embedding_provider(config)
+            self.vector_store = get_vector_store(workspace, config) if self.embedding_provider else None
+        self.hybrid = bool(self.embedding_provider and self.vector_store)
+        self.fetch_k = top_k * RECALL_OVERFETCH if self.hybrid else top_k
+        self._started = time.perf_counter()
+
+    def _timed(self, stage: str, started: float) -> None:
+        self.timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+    def fts(self) -> list[dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            return self.store.search(
+                query=self.query, top_k=self.fetch_k, source_type=self.source_type, doc_id=self.doc_id
+            )
+        finally:
+            self._timed("ftsMs", started)
+
+    def embed(self) -> list[float] | None:
+        """Query embedding on the calling thread; failures degrade to FTS-only results."""
+        started = time.perf_counter()
+        try:
+            vectors: list[list[float]] | Exception = self.embedding_provider.embed([self.query])
+        except Exception as e:
+            vectors = e
+        return self._query_vector(vectors, started)
+
+    async def aembed(self) -> list[float] | None:
+        """Query embedding without blocking the event loop; same fallback as embed()."""
+        started = time.perf_counter()
+        try:
+            vectors: list[list[float]] | Exception = await self.embedding_provider.aembed([self.query])
+        except Exception as e:
+            vectors = e
+        return self._query_vector(vectors, started)
+
+    def _query_vector(self, vectors: list[list[float]] | Exception, started: float) -> list[float] | None:
+        self._timed("embedMs", started)
+        if isinstance(vectors, Exception):
+            logger.debug(f"hybrid_search query embed failed, FTS only: {vectors}")
+            return None
+        return vectors[0] if vectors else None
+
+    def vector(self, query_vector: list[float]) -> list[tuple[str, float, dict[str, Any]]]:
+        """Vector recall; failures degrade to FTS-only results."""
+        started = time.perf_counter()
+        try:
+            results = self.vector_store.search(
+                query_vector=query_vector,
+                top_k=self.fetch_k,
+                source_type=self.source_type,
+            ) or []
+        except Exception as e:
+            logger.debug(f"hybrid_search vector recall failed, FTS only: {e}")
+            return []
+        finally:
+            self._timed("vectorMs", started)
+        if self.doc_id:
+            results = [r for r in results if (r[2] or {}).get("doc_id") == self.doc_id]
+        return results
+
+    def fuse(
+        self, fts_hits: list[dict[str, Any]], vec_results: list[tuple[str, float, dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        started = time.perf_counter()
+        if not vec_results:
+            hits = fts_hits[: self.top_k]
+        else:
+            # Key -> hit (prefer FTS5 hit for consistent structure)
+            key_to_hit = {_hit_key(h): h for h in fts_hits}
+            for cid, _score, meta in vec_results:
+                if cid not in key_to_hit:
+                    key_to_hit[cid] = _vector_meta_to_hit(meta)
+            # RRF ranks (1-based)
+            rank_fts = {_hit_key(h): r for r, h in enumerate(fts_hits, 1)}
+            rank_vec = {cid: r for r, (cid, _, _) in enumerate(vec_results, 1)}
+            rrf_scores = [
+                (key, 1.0 / (RRF_K + rank_fts.get(key, 999)) + 1.0 / (RRF_K + rank_vec.get(key, 999)))
+                for key in set(rank_fts) | set(rank_vec)
+            ]
+            rrf_scores.sort(key=lambda x: -x[1])
+            hits = [key_to_hit[k] for k, _ in rrf_scores[: self.top_k] if k in key_to_hit]
+        self._timed("fuseMs", started)
+        self._timed("totalMs", self._started)
+        logger.debug(f"hybrid_search timings {self.timings}")
+        return hits
+
+
 def hybrid_search(
     workspace: Path,
     config: Any,
@@ -49,66 +185,23 @@ def hybrid_search(
     top_k: int = 10,
     source_type: str | None = None,
     doc_id: str | None = None,
+    timings: dict[str, float] | None = None,
 ) -> list[dict[str, Any]]:
     """
     Search knowledge base: FTS5 only, or FTS5 + vector with RRF fusion when vector is enabled.
-    Returns list of hits in same format as RetrievalStore.search.
+    Returns list of hits in same format as RetrievalStore.search. Pass a dict as timings
+    to receive per-stage durations in ms.
     """
     query = (query or "").strip()
     if not query:
         return []
-
-    store = RetrievalStore(workspace)
-    fts_hits = store.search(query=query, top_k=top_k, source_type=source_type, doc_id=doc_id)
-
-    if not should_enable_vector(workspace, config):
-        return fts_hits
-
-    embedding_provider = get_embedding_provider(config)
-    vector_store = get_vector_store(workspace, config)
-    if not embedding_provider or not vector_store:
-        return fts_hits
-
-    # Vector recall
-    try:
-        vectors = embedding_provider.embed([query])
-        if not vectors:
-            return fts_hits
-        query_vector = vectors[0]
-    except Exception:
-        return fts_hits
-
-    vec_results = vector_store.search(
-        query_vector=query_vector,
-        top_k=top_k,
-        source_type=source_type,
-    )
-
-    if not vec_results:
-        return fts_hits
-
-    # Key -> hit (prefer FTS5 hit for consistent structure)
-    key_to_hit: dict[str, dict[str, Any]] = {}
-    for h in fts_hits:
-        key_to_hit[_hit_key(h)] = h
-    for cid, _score, meta in vec_results:
-        key = cid
-        if key not in key_to_hit:
-            key_to_hit[key] = _vector_meta_to_hit(meta)
-
-    # RRF ranks (1-based)
-    rank_fts: dict[str, int] = {_hit_key(h): r for r, h in enumerate(fts_hits, 1)}
-    rank_vec: dict[str, int] = {cid: r for r, (cid, _, _) in enumerate(vec_results, 1)}
-
-    all_keys = set(rank_fts) | set(rank_vec)
-    rrf_scores = [
-        (key, 1.0 / (RRF_K + rank_fts.get(key, 999)) + 1.0 / (RRF_K + rank_vec.get(key, 999)))
-        for key in all_keys
-    ]
-    rrf_scores.sort(key=lambda x: -x[1])
-
-    top_keys = [k for k, _ in rrf_scores[:top_k]]
-    return [key_to_hit[k] for k in top_keys if k in key_to_hit]
+    q = _HybridQuery(workspace, config, query, top_k, source_type, doc_id, timings)
+    if not q.hybrid:
+        return q.fuse(q.fts(), [])
+    fts_future = _recall_executor().submit(q.fts)
+    query_vector = q.embed()
+    vec_results = q.vector(query_vector) if query_vector else []
+    return q.fuse(fts_future.result(), vec_results)
 
 
 async def hybrid_search_async(
@@ -118,52 +211,26 @@ async def hybrid_search_async(
     top_k: int = 10,
     source_type: str | None = None,
     doc_id: str | None = None,
+    timings: dict[str, float] | None = None,
 ) -> list[dict[str, Any]]:
-    """Async variant: uses aembed for query vector when vector is enabled."""
+    """
+    Async variant: the FTS5 query runs on the recall executor concurrently with the
+    query embedding (aembed), then the vector query runs on the executor; nothing
+    blocking touches the event loop (the query object, which opens the store and
+    vector backend, is also built on the executor).
+    """
     query = (query or "").strip()
     if not query:
         return []
-
-    store = RetrievalStore(workspace)
-    fts_hits = store.search(query=query, top_k=top_k, source_type=source_type, doc_id=doc_id)
-
-    if not should_enable_vector(workspace, config):
-        return fts_hits
-
-    embedding_provider = get_embedding_provider(config)
-    vector_store = get_vector_store(workspace, config)
-    if not embedding_provider or not vector_store:
-        return fts_hits
-
-    try:
-        vectors = await embedding_provider.aembed([query])
-        if not vectors:
-            return fts_hits
-        query_vector = vectors[0]
-    except Exception:
-        return fts_hits
-
-    vec_results = vector_store.search(
-        query_vector=query_vector,
-        top_k=top_k,
-        source_type=source_type,
+    loop = asyncio.get_running_loop()
+    executor = _recall_executor()
+    q = await loop.run_in_executor(
+        executor, _HybridQuery, workspace, config, query, top_k, source_type, doc_id, timings
     )
+    fts_future = loop.run_in_executor(executor, q.fts)
+    if not q.hybrid:
+        return q.fuse(await fts_future, [])
+    query_vector = await q.aembed()
+    vec_results = await loop.run_in_executor(executor, q.vector, query_vector) if query_vector else []
+    return q.fuse(await fts_future, vec_results)
 
-    if not vec_results:
-        return fts_hits
-
-    key_to_hit = {_hit_key(h): h for h in fts_hits}
-    for cid, _score, meta in vec_results:
-        if cid not in key_to_hit:
-            key_to_hit[cid] = _vector_meta_to_hit(meta)
-
-    rank_fts = {_hit_key(h): r for r, h in enumerate(fts_hits, 1)}
-    rank_vec = {cid: r for r, (cid, _, _) in enumerate(vec_results, 1)}
-    all_keys = set(rank_fts) | set(rank_vec)
-    rrf_scores = [
-        (key, 1.0 / (RRF_K + rank_fts.get(key, 999)) + 1.0 / (RRF_K + rank_vec.get(key, 999)))
-        for key in all_keys
-    ]
-    rrf_scores.sort(key=lambda x: -x[1])
-    top_keys = [k for k, _ in rrf_scores[:top_k]]
-    return [key_to_hit[k] for k in top_keys if k in key_to_hit]
@@ -0,0 +1,284 @@
+"""SQLite FTS5 index over memory paragraphs, maintained incrementally per file."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+MEMORY_REL = "memory"
+FTS_DB_NAME = ".memory_fts.db"
+SNIPPET_MAX_CHARS = 700
+# Recency boost: score * (1 + RECENCY_WEIGHT * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)).
+RECENCY_WEIGHT = 0.5
+RECENCY_HALF_LIFE_DAYS = 30.0
+# BM25 candidates fetched per requested hit before recency re-ranking.
+CANDIDATE_FACTOR = 4
+# The trigram tokenizer matches substrings (like the grep it replaces, and for CJK
+# text without spaces); terms shorter than this cannot be matched.
+MIN_TERM_CHARS = 3
+
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
+
+
+def _parse_date(text: str) -> float | None:
+    m = _DATE_RE.search(text)
+    if not m:
+        return None
+    try:
+        return datetime.strptime(m.group(1), "%Y-%m-%d").timestamp()
+    except ValueError:
+        return None
+
+
+def split_paragraphs(text: str, first_line: int = 0) -> list[tuple[int, str]]:
+    """(line number, paragraph) for each blank-line separated block of text."""
+    out: list[tuple[int, str]] = []
+    block: list[str] = []
+    start = first_line
+    for i, line in enumerate(text.splitlines(), first_line):
+        if line.strip():
+            if not block:
+                start = i
+            block.append(line)
+        elif block:
+            out.append((start, "\n".join(block)))
+            block = []
+    if block:
+        out.append((start, "\n".join(block)))
+    return out
+
+
+def fts_query(query: str) -> str | None:
+    """FTS5 MATCH expression: the whole query as a phrase, OR each term (None when nothing is matchable)."""
+    query = " ".join(query.split())
+    terms = [t for t in re.findall(r"\w+", query) if len(t) >= MIN_TERM_CHARS]
+    parts = []
+    if len(query) >= MIN_TERM_CHARS:
+        parts.append('"' + query.replace('"', '""') + '"')
+    parts.extend(f'"{t}"' for t in dict.fromkeys(terms) if t != query)
+    return " OR ".join(parts) or None
+
+
+class MemoryFtsIndex:
+    """
+    Full-text index over memory files, one row per paragraph, scoped like the
+    memory directories (scope "" is the shared memory/ dir).
+
+    refresh_scope() brings a scope up to date by stat: new or changed files are
+    re-indexed, removed files dropped. A file that only grew (its previously indexed
+    bytes hash the same, e.g. HISTORY.md and daily logs) has just the appended tail
+    indexed. Each paragraph
+    keeps a recency timestamp (date in its text or file name, else file mtime) used
+    to boost BM25 ranking toward recent memories.
+    """
+
+    def __init__(self, workspace: Path):
+        self.workspace = Path(workspace)
+        self.db_path = self.workspace / MEMORY_REL / FTS_DB_NAME
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        key = str(self.db_path)
+        fresh = not self.db_path.exists()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if fresh or key not in _initialized:
+            with _init_lock:
+                self._init_schema(conn)
+                _initialized.add(key)
+        return conn
+
+    @staticmethod
+    def _init_schema(conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS memory_fts_files (
+                scope_key TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                lines INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (scope_key, file_path)
+            );
+            CREATE TABLE IF NOT EXISTS memory_paragraphs (
+                id INTEGER PRIMARY KEY,
+                scope_key TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                line_no INTEGER NOT NULL,
+                recency REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_memory_paragraphs_file ON memory_paragraphs(scope_key, file_path);
+            CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(content, tokenize='trigram');
+            """
+        )
+        conn.commit()
+
+    # -- maintenance --------------------------------------------------------
+
+    def refresh_scope(self, scope: str, candidates: list[tuple[str, Path]]) -> int:
+        """Sync the scope with its files on disk (stat only for unchanged files). Returns files re-indexed."""
+        current: dict[str, tuple[Path, float, int]] = {}
+        for rel, path in candidates:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            current[rel] = (path, st.st_mtime, st.st_size)
+        conn = self._connect()
+        try:
+            indexed = {
+                r[0]: r[1:]
+                for r in conn.execute(
+                    "SELECT file_path, mtime, size, lines, content_hash FROM memory_fts_files WHERE scope_key = ?",
+                    (scope,),
+                )
+            }
+            changed = 0
+            for rel in indexed.keys() - current.keys():
+                self._drop_file(conn, scope, rel)
+                changed += 1
+            for rel, (path, mtime, size) in current.items():
+                prev = indexed.get(rel)
+                if prev is not None and prev[0] == mtime and prev[1] == size:
+                    continue
+                self._index_file(conn, scope, rel, path, prev)
+                changed += 1
+            conn.commit()
+            return changed
+        finally:
+            conn.close()
+
+    def refresh_file(self, scope: str, rel: str, path: Path) -> None:
+        """Re-index one file after a write (only the appended tail when the file just grew)."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT mtime, size, lines, content_hash FROM memory_fts_files WHERE scope_key = ? AND file_path = ?",
+                (scope, rel),
+            ).fetchone()
+            if not path.exists():
+                self._drop_file(conn, scope, rel)
+            else:
+                self._index_file(conn, scope, rel, path, row)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _drop_file(self, conn: sqlite3.Connection, scope: str, rel: str) -> None:
+        conn.execute(
+            "DELETE FROM memory_fts WHERE rowid IN"
+            " (SELECT id FROM memory_paragraphs WHERE scope_key = ? AND file_path = ?)",
+            (scope, rel),
+        )
+        conn.execute("DELETE FROM memory_paragraphs WHERE scope_key = ? AND file_path = ?", (scope, rel))
+        conn.execute("DELETE FROM memory_fts_files WHERE scope_key = ? AND file_path = ?", (scope, rel))
+
+    def _index_file(
+        self,
+        conn: sqlite3.Connection,
+        scope: str,
+        rel: str,
+        path: Path,
+        prev: tuple[float, int, int, str] | None,
+    ) -> None:
+        st = path.stat()
+        data = path.read_bytes()
+        tail_from = 0
+        first_line = 0
+        if (
+            prev is not None
+            and 0 < prev[1] < len(data)
+            and data[prev[1] - 1:prev[1]] == b"\n"
+            and hashlib.sha1(data[: prev[1]]).hexdigest() == prev[3]
+        ):
+            # Appended past a line boundary with the old content intact: index only the new bytes.
+            tail_from, first_line = prev[1], prev[2]
+        else:
+            self._drop_file(conn, scope, rel)
+        text = data[tail_from:].decode("utf-8", errors="replace")
+        file_recency = _parse_date(Path(rel).name) or st.st_mtime
+        for line_no, para in split_paragraphs(text, first_line):
+            recency = _parse_date(para[:40]) or file_recency
+            cur = conn.execute(
+                "INSERT INTO memory_paragraphs (scope_key, file_path, line_no, recency) VALUES (?, ?, ?, ?)",
+                (scope, rel, line_no, recency),
+            )
+            conn.execute("INSERT INTO memory_fts (rowid, content) VALUES (?, ?)", (cur.lastrowid, para))
+        lines = first_line + text.count("\n") + (0 if text.endswith("\n") or not text else 1)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO memory_fts_files (scope_key, file_path, mtime, size, lines, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (scope, rel, st.st_mtime, len(data), lines, hashlib.sha1(data).hexdigest()),
+        )
+
+    # -- search -------------------------------------------------------------
+
+    def search(self, scope: str, query: str, top_k: int) -> list[dict[str, Any]] | None:
+        """BM25 + recency ranked paragraphs of the scope; None when the query has no matchable terms."""
+        match = fts_query(query)
+        if match is None:
+            return None
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT p.file_path, p.line_no, p.recency, f.content, bm25(memory_fts) AS score
+                FROM memory_fts f JOIN memory_paragraphs p ON p.id = f.rowid
+                WHERE memory_fts MATCH ? AND p.scope_key = ?
+                ORDER BY score LIMIT ?
+                """,
+                (match, scope, max(1, top_k) * CANDIDATE_FACTOR),
+            ).fetchall()
+        finally:
+            conn.close()
+        now = time.time()
+
+        def ranked(row: tuple) -> float:
+            age_days = max(0.0, (now - row[2]) / 86400)
+            boost = 1 + RECENCY_WEIGHT * math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+            return -row[4] * boost  # bm25() is lower-is-better
+
+        rows.sort(key=ranked, reverse=True)
+        return [_hit(file_path, line_no, content) for file_path, line_no, _rec, content, _s in rows[:top_k]]
+
+
+def _hit(rel_path: str, line_no: int, content: str) -> dict[str, Any]:
+    if len(content) > SNIPPET_MAX_CHARS:
+        content = content[: SNIPPET_MAX_CHARS - 3] + "..."
+    return {
+        "doc_id": rel_path,
+        "source_type": "memory",
+        "source_url": "",
+        "file_path": rel_path,
+        "title": Path(rel_path).name,
+        "chunk_index": line_no,
+        "page": None,
+        "content": content,
+        "trace": {"doc_id": rel_path, "source": rel_path, "page": None},
+    }
+
+
+def index_memory_write(workspace: Path, memory_dir: Path, path: Path) -> None:
+    """Update the index after MemoryStore wrote path (never raises: memory writes must not fail on it)."""
+    try:
+        workspace = Path(workspace)
+        base = workspace / MEMORY_REL
+        scope = memory_dir.relative_to(base).as_posix() if memory_dir != base else ""
+        rel = path.relative_to(workspace).as_posix()
+        MemoryFtsIndex(workspace).refresh_file(scope, rel, path)
+    except Exception as e:
+        logger.debug(f"Memory FTS update skipped for {path}: {e}")
@@ -1,18 +1,43 @@
-"""Builtin memory search: grep-style search over memory/*.md, MEMORY.md, HISTORY.md, .abstract."""
+"""Builtin memory search: full-text search over memory/*.md, MEMORY.md, HISTORY.md, .abstract."""
 
 from __future__ import annotations
 
 import re
+import sqlite3
 from pathlib import Path
 from typing import Any
 
+from loguru import logger
+
 from joyhousebot.agent.memory import safe_scope_key
+from joyhousebot.services.retrieval.memory_fts import MemoryFtsIndex
 
 MEMORY_REL = "memory"
 SNIPPET_MAX_CHARS = 700
 CONTEXT_LINES = 2
 
 
+def memory_candidates(memory_dir: Path, rel_prefix: str) -> list[tuple[str, Path]]:
+    """Searchable memory files (workspace-relative path, Path): MEMORY.md, HISTORY.md, .abstract, *.md, insights/*, lessons/*."""
+    candidates: list[tuple[str, Path]] = []
+    if (memory_dir / "MEMORY.md").exists():
+        candidates.append((f"{rel_prefix}MEMORY.md", memory_dir / "MEMORY.md"))
+    if (memory_dir / "HISTORY.md").exists():
+        candidates.append((f"{rel_prefix}HISTORY.md", memory_dir / "HISTORY.md"))
+    abstract_file = memory_dir / ".abstract"
+    if abstract_file.exists():
+        candidates.append((f"{rel_prefix}.abstract", abstract_file))
+    for p in memory_dir.glob("*.md"):
+        if p.name not in ("MEMORY.md", "HISTORY.md"):
+            candidates.append((f"{rel_prefix}{p.name}", p))
+    for sub in ("insights", "lessons"):
+        subdir = memory_dir / sub
+        if subdir.is_dir():
+            for p in subdir.glob("*.md"):
+                candidates.append((f"{rel_prefix}{sub}/{p.name}", p))
+    return candidates
+
+
 def search_memory_files(
     workspace: Path,
     query: str,
@@ -23,6 +48,10 @@ def search_memory_files(
     Search memory directory: MEMORY.md, HISTORY.md, .abstract, and memory/YYYY-MM-DD.md.
     When scope_key is set, search under memory/<safe_scope_key>/ (per-session/per-user).
     Returns hits with content, file_path, trace (compatible with retrieve tool).
+
+    Uses the FTS5 paragraph index (BM25 + recency, see memory_fts), refreshed by stat
+    before each query; falls back to a line grep when FTS5 is unavailable or the query
+    has no term long enough to index.
     """
     query = (query or "").strip()
     if not query:
@@ -35,24 +64,21 @@ def search_memory_files(
         return []
 
     rel_prefix = f"{MEMORY_REL}/{safe}/" if safe else f"{MEMORY_REL}/"
-    # Files to search (workspace-relative path -> Path)
-    candidates: list[tuple[str, Path]] = []
-    if (memory_dir / "MEMORY.md").exists():
-        candidates.append((f"{rel_prefix}MEMORY.md", memory_dir / "MEMORY.md"))
-    if (memory_dir / "HISTORY.md").exists():
-        candidates.append((f"{rel_prefix}HISTORY.md", memory_dir / "HISTORY.md"))
-    abstract_file = memory_dir / ".abstract"
-    if abstract_file.exists():
-        candidates.append((f"{rel_prefix}.abstract", abstract_file))
-    for p in memory_dir.glob("*.md"):
-        if p.name not in ("MEMORY.md", "HISTORY.md"):
-            candidates.append((f"{rel_prefix}{p.name}", p))
-    for sub in ("insights", "lessons"):
-        subdir = memory_dir / sub
-        if subdir.is_dir():
-            for p in subdir.glob("*.md"):
-                candidates.append((f"{rel_prefix}{sub}/{p.name}", p))
+    candidates = memory_candidates(memory_dir, rel_prefix)
+    try:
+        index = MemoryFtsIndex(workspace)
+        index.refresh_scope(safe, candidates)
+        hits = index.search(safe, query, top_k)
+    except sqlite3.Error as e:
+        logger.debug(f"Memory FTS search unavailable, using grep: {e}")
+        hits = None
+    if hits is not None:
+        return hits
+    return _grep_memory_files(candidates, query, top_k)
+
 
+def _grep_memory_files(candidates: list[tuple[str, Path]], query: str, top_k: int) -> list[dict[str, Any]]:
+    """Case-insensitive substring scan, one hit per matching line with CONTEXT_LINES around it."""
     pattern = re.compile(re.escape(query), re.IGNORECASE)
     hits: list[dict[str, Any]] = []
 
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import sqlite3
 import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
 from joyhousebot.agent.memory import safe_scope_key
+from joyhousebot.services.retrieval.memory_search import memory_candidates
+from joyhousebot.services.retrieval.result_cache import bump_generation
+from joyhousebot.services.retrieval.vector_search import MatrixCache, VectorMatrix
 
 MEMORY_REL = "memory"
 CHUNK_CHARS = 1600
@@ -45,50 +53,33 @@ def _embedding_to_blob(vec: list[float]) -> bytes:
     return struct.pack(f"{len(vec)}f", *vec)
 
 
-def _blob_to_embedding(blob: bytes) -> list[float]:
-    n = len(blob) // 4
-    return list(struct.unpack(f"{n}f", blob))
-
-
-def _cosine_sim(a: list[float], b: list[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sum(x * x for x in a) ** 0.5
-    nb = sum(x * x for x in b) ** 0.5
-    if na == 0 or nb == 0:
-        return 0.0
-    return dot / (na * nb)
-
-
-def _memory_candidates(memory_dir: Path, rel_prefix: str) -> list[tuple[str, Path]]:
-    """Same file set as memory_search: MEMORY.md, HISTORY.md, .abstract, *.md, insights/*, lessons/*."""
-    candidates: list[tuple[str, Path]] = []
-    if (memory_dir / "MEMORY.md").exists():
-        candidates.append((f"{rel_prefix}MEMORY.md", memory_dir / "MEMORY.md"))
-    if (memory_dir / "HISTORY.md").exists():
-        candidates.append((f"{rel_prefix}HISTORY.md", memory_dir / "HISTORY.md"))
-    if (memory_dir / ".abstract").exists():
-        candidates.append((f"{rel_prefix}.abstract", memory_dir / ".abstract"))
-    for p in memory_dir.glob("*.md"):
-        if p.name not in ("MEMORY.md", "HISTORY.md"):
-            candidates.append((f"{rel_prefix}{p.name}", p))
-    for sub in ("insights", "lessons"):
-        subdir = memory_dir / sub
-        if subdir.is_dir():
-            for p in subdir.glob("*.md"):
-                candidates.append((f"{rel_prefix}{sub}/{p.name}", p))
-    return candidates
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Process-wide: per (index db, scope) matrices, versioned by the index_meta build stamp.
+_MATRIX_CACHE = MatrixCache()
+
+# Index dbs whose schema has been set up in this process (refresher thread and
+# to_thread readers connect concurrently).
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
 
 
 class MemoryVectorStore:
-    """SQLite-backed vector index over memory files for semantic search."""
+    """
+    SQLite-backed vector index over memory files for semantic search.
+
+    Searches score a cached, row-normalized float32 matrix of the scope's embeddings
+    (see vector_search.VectorMatrix); the matrix is reloaded when the index is rebuilt.
+    """
 
     def __init__(self, workspace: Path):
         self.workspace = Path(workspace)
         self.db_path = self.workspace / MEMORY_REL / INDEX_DB_NAME
 
     def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS memory_index (
                 id INTEGER PRIMARY KEY,
@@ -97,11 +88,33 @@ class MemoryVectorStore:
                 chunk_index INTEGER NOT NULL,
                 content TEXT NOT NULL,
                 embedding BLOB NOT NULL,
-                file_mtime REAL NOT NULL
+                file_mtime REAL NOT NULL,
+                chunk_hash TEXT
             )
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_scope ON memory_index(scope_key)")
         conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)")
+        # Per-file state for incremental refresh: a file is re-chunked only when its
+        # mtime/size changed and its content hash differs from the indexed one.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_files (
+                scope_key TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (scope_key, file_path)
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(memory_index)").fetchall()}
+        if "chunk_hash" not in columns:
+            try:
+                conn.execute("ALTER TABLE memory_index ADD COLUMN chunk_hash TEXT")
+            except sqlite3.OperationalError as e:
+                # Another process migrated the same pre-chunk_hash index first.
+                if "duplicate column" not in str(e).lower():
+                    raise
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_scope_file ON memory_index(scope_key, file_path)")
         conn.commit()
 
     def _scope_dir(self, scope_key: str | None) -> tuple[Path, str]:
@@ -111,72 +124,182 @@ class MemoryVectorStore:
         rel_prefix = f"{MEMORY_REL}/{safe}/" if safe else f"{MEMORY_REL}/"
         return memory_dir, rel_prefix
 
-    def _is_stale(self, conn: sqlite3.Connection, scope_key: str | None, memory_dir: Path, rel_prefix: str) -> bool:
-        """True if any source file is newer than what we have in index_meta."""
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        key = str(self.db_path)
+        fresh = not self.db_path.exists()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if fresh or key not in _initialized:
+            with _init_lock:
+                self._init_schema(conn)
+                _initialized.add(key)
+        return conn
+
+    @staticmethod
+    def _file_stats(candidates: list[tuple[str, Path]]) -> dict[str, tuple[Path, float, int]]:
+        stats: dict[str, tuple[Path, float, int]] = {}
+        for rel_path, path in candidates:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stats[rel_path] = (path, st.st_mtime, st.st_size)
+        return stats
+
+    def needs_refresh(self, scope_key: str | None) -> bool:
+        """True if any memory file of the scope was added, removed or touched since the last refresh (stat only)."""
+        memory_dir, rel_prefix = self._scope_dir(scope_key)
+        if not memory_dir.is_dir():
+            return False
+        if not self.db_path.exists():
+            return True
+        current = self._file_stats(memory_candidates(memory_dir, rel_prefix))
+        conn = self._connect()
+        try:
+            indexed = {
+                r[0]: (r[1], r[2])
+                for r in conn.execute(
+                    "SELECT file_path, mtime, size FROM memory_files WHERE scope_key = ?",
+                    (scope_key or "shared",),
+                ).fetchall()
+            }
+        finally:
+            conn.close()
+        return indexed != {rel: (mtime, size) for rel, (_p, mtime, size) in current.items()}
+
+    def has_rows(self, scope_key: str | None) -> bool:
+        if not self.db_path.exists():
+            return False
+        conn = self._connect()
         try:
             row = conn.execute(
-                "SELECT value FROM index_meta WHERE key = ?",
-                (f"mtime_{scope_key or 'shared'}",),
+                "SELECT 1 FROM memory_index WHERE scope_key = ? LIMIT 1", (scope_key or "shared",)
             ).fetchone()
-            last = float(row[0]) if row else 0.0
-        except Exception:
-            return True
-        candidates = _memory_candidates(memory_dir, rel_prefix)
-        for _rel, path in candidates:
-            if path.exists():
+        finally:
+            conn.close()
+        return row is not None
+
+    def refresh_index(self, scope_key: str | None, embed_fn: Any, force_rebuild: bool = False) -> dict[str, int]:
+        """
+        Bring the scope's index up to date with its memory files, incrementally.
+
+        Unchanged files (same mtime and size, or same content hash) are skipped. A
+        changed file is re-chunked, and only chunks whose content hash is not already
+        indexed in the scope are sent to embed_fn; the rest reuse stored embeddings.
+        Returns counts: files changed/removed, chunks embedded/reused.
+        """
+        scope_val = scope_key or "shared"
+        report = {"files_changed": 0, "files_removed": 0, "chunks_embedded": 0, "chunks_reused": 0}
+        memory_dir, rel_prefix = self._scope_dir(scope_key)
+        if not memory_dir.is_dir():
+            return report
+        current = self._file_stats(memory_candidates(memory_dir, rel_prefix))
+        conn = self._connect()
+        try:
+            if force_rebuild:
+                conn.execute("DELETE FROM memory_index WHERE scope_key = ?", (scope_val,))
+                conn.execute("DELETE FROM memory_files WHERE scope_key = ?", (scope_val,))
+            indexed = {
+                r[0]: (r[1], r[2], r[3])
+                for r in conn.execute(
+                    "SELECT file_path, mtime, size, content_hash FROM memory_files WHERE scope_key = ?",
+                    (scope_val,),
+                ).fetchall()
+            }
+            for rel_path in set(indexed) - set(current):
+                conn.execute(
+                    "DELETE FROM memory_index WHERE scope_key = ? AND file_path = ?", (scope_val, rel_path)
+                )
+                conn.execute(
+                    "DELETE FROM memory_files WHERE scope_key = ? AND file_path = ?", (scope_val, rel_path)
+                )
+                report["files_removed"] += 1
+            known_embeddings: dict[str, bytes] | None = None
+            for rel_path, (path, mtime, size) in sorted(current.items()):
+                prev = indexed.get(rel_path)
+                if prev is not None and prev[0] == mtime and prev[1] == size:
+                    continue
                 try:
-                    if path.stat().st_mtime > last:
-                        return True
-                except OSError:
-                    pass
-        return False
+                    text = path.read_text(encoding="utf-8")
+                except Exception:
+                    continue
+                content_hash = _sha256(text)
+                if prev is None or prev[2] != content_hash:
+                    if known_embeddings is None:
+                        known_embeddings = {
+                            r[0]: r[1]
+                            for r in conn.execute(
+                                "SELECT chunk_hash, embedding FROM memory_index"
+                                " WHERE scope_key = ? AND chunk_hash IS NOT NULL",
+                                (scope_val,),
+                            ).fetchall()
+                        }
+                    if not self._reindex_file(
+                        conn, scope_val, rel_path, path, text, mtime, embed_fn, known_embeddings, report
+                    ):
+                        continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO memory_files (scope_key, file_path, mtime, size, content_hash)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (scope_val, rel_path, mtime, size, content_hash),
+                )
+            if report["files_changed"] or report["files_removed"] or force_rebuild:
+                max_mtime = max((mtime for _p, mtime, _s in current.values()), default=0.0)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                    [(f"mtime_{scope_val}", str(max_mtime)), (f"built_{scope_val}", str(time.time_ns()))],
+                )
+                _MATRIX_CACHE.invalidate((str(self.db_path), scope_val))
+            conn.commit()
+        finally:
+            conn.close()
+        if report["files_changed"] or report["files_removed"]:
+            bump_generation(self.workspace, "memory")
+            logger.debug(f"Memory vector index refreshed for scope {scope_val}: {report}")
+        return report
 
-    def _build_index(
-        self,
-        scope_key: str | None,
-        memory_dir: Path,
-        rel_prefix: str,
-        embed_fn: Any,
+    @staticmethod
+    def _reindex_file(
         conn: sqlite3.Connection,
-    ) -> int:
-        scope_val = scope_key or "shared"
-        conn.execute("DELETE FROM memory_index WHERE scope_key = ?", (scope_val,))
-        candidates = _memory_candidates(memory_dir, rel_prefix)
-        max_mtime = 0.0
-        count = 0
-        for rel_path, path in candidates:
-            try:
-                text = path.read_text(encoding="utf-8")
-                mtime = path.stat().st_mtime
-                if mtime > max_mtime:
-                    max_mtime = mtime
-            except Exception:
-                continue
-            chunks = _chunk_text(text)
-            if not chunks:
-                continue
+        scope_val: str,
+        rel_path: str,
+        path: Path,
+        text: str,
+        mtime: float,
+        embed_fn: Any,
+        known_embeddings: dict[str, bytes],
+        report: dict[str, int],
+    ) -> bool:
+        """Replace one file's chunks; False (index untouched) if embedding failed."""
+        chunks = _chunk_text(text)
+        hashes = [_sha256(c) for c in chunks]
+        missing = [i for i, h in enumerate(hashes) if h not in known_embeddings]
+        if missing:
             try:
-                vectors = embed_fn(chunks)
+                vectors = embed_fn([chunks[i] for i in missing])
             except Exception as e:
                 logger.warning(f"Memory vector embed failed for {path}: {e}")
-                continue
-            if len(vectors) != len(chunks):
-                continue
-            for i, (content, vec) in enumerate(zip(chunks, vectors)):
-                if not vec:
-                    continue
-                blob = _embedding_to_blob(vec)
-                conn.execute(
-                    "INSERT INTO memory_index (scope_key, file_path, chunk_index, content, embedding, file_mtime) VALUES (?, ?, ?, ?, ?, ?)",
-                    (scope_val, rel_path, i, content[:SNIPPET_MAX_CHARS * 2], blob, mtime),
-                )
-                count += 1
-        conn.execute(
-            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
-            (f"mtime_{scope_val}", str(max_mtime)),
+                return False
+            if len(vectors) != len(missing):
+                return False
+            for i, vec in zip(missing, vectors):
+                if vec:
+                    known_embeddings[hashes[i]] = _embedding_to_blob(vec)
+        conn.execute("DELETE FROM memory_index WHERE scope_key = ? AND file_path = ?", (scope_val, rel_path))
+        rows = [
+            (scope_val, rel_path, i, content[:SNIPPET_MAX_CHARS * 2], known_embeddings[h], mtime, h)
+            for i, (content, h) in enumerate(zip(chunks, hashes))
+            if h in known_embeddings
+        ]
+        conn.executemany(
+            "INSERT INTO memory_index (scope_key, file_path, chunk_index, content, embedding, file_mtime, chunk_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
         )
-        conn.commit()
-        return count
+        report["files_changed"] += 1
+        report["chunks_embedded"] += len(missing)
+        report["chunks_reused"] += len(chunks) - len(missing)
+        return True
 
     def ensure_index(
         self,
@@ -185,24 +308,33 @@ class MemoryVectorStore:
         embed_fn: Any,
         force_rebuild: bool = False,
     ) -> bool:
-        """Build or refresh index for scope; returns True if index is available."""
-        memory_dir, rel_prefix = self._scope_dir(scope_key)
+        """Refresh the scope's index in the calling thread; returns True if index is available."""
+        memory_dir, _rel_prefix = self._scope_dir(scope_key)
         if not memory_dir.is_dir():
             return False
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
         try:
-            self._init_schema(conn)
-            if force_rebuild or self._is_stale(conn, scope_key, memory_dir, rel_prefix):
-                n = self._build_index(scope_key, memory_dir, rel_prefix, embed_fn, conn)
-                if n > 0:
-                    logger.debug(f"Memory vector index built for scope {scope_key or 'shared'}: {n} chunks")
+            self.refresh_index(scope_key, embed_fn, force_rebuild=force_rebuild)
             return True
         except Exception as e:
             logger.warning(f"Memory vector index ensure failed: {e}")
             return False
-        finally:
-            conn.close()
+
+    def _scope_matrix(self, conn: sqlite3.Connection, scope_val: str) -> VectorMatrix:
+        rows = conn.execute(
+            "SELECT key, value FROM index_meta WHERE key IN (?, ?)",
+            (f"mtime_{scope_val}", f"built_{scope_val}"),
+        ).fetchall()
+        token = tuple(sorted(rows))
+        cache_key = (str(self.db_path), scope_val)
+        matrix = _MATRIX_CACHE.get(cache_key, token)
+        if matrix is None:
+            emb_rows = conn.execute(
+                "SELECT id, embedding FROM memory_index WHERE scope_key = ? ORDER BY id",
+                (scope_val,),
+            ).fetchall()
+            matrix = VectorMatrix.from_blobs([r[0] for r in emb_rows], [r[1] for r in emb_rows])
+            _MATRIX_CACHE.put(cache_key, token, matrix)
+        return matrix
 
     def search(
         self,
@@ -211,48 +343,132 @@ class MemoryVectorStore:
         top_k: int,
     ) -> list[dict[str, Any]]:
         """Return top_k hits by cosine similarity. Hit shape compatible with search_memory_files."""
-        scope_val = scope_key or "shared"
         if not query_embedding:
             return []
-        conn = sqlite3.connect(self.db_path)
+        return self.search_batch(scope_key, [query_embedding], top_k)[0]
+
+    def search_batch(
+        self,
+        scope_key: str | None,
+        query_embeddings: list[list[float]],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """search() for several query embeddings at once (one scoring pass over the matrix)."""
+        scope_val = scope_key or "shared"
+        if not query_embeddings or not self.db_path.exists():
+            return [[] for _ in query_embeddings]
+        conn = self._connect()
         try:
-            cur = conn.execute(
-                "SELECT file_path, chunk_index, content FROM memory_index WHERE scope_key = ?",
-                (scope_val,),
-            )
-            rows = cur.fetchall()
-            if not rows:
-                return []
-            cur2 = conn.execute(
-                "SELECT embedding FROM memory_index WHERE scope_key = ? ORDER BY id",
-                (scope_val,),
-            )
-            blobs = [r[0] for r in cur2.fetchall()]
-            if len(blobs) != len(rows):
-                return []
-            scored: list[tuple[float, tuple[str, int, str]]] = []
-            for (fp, ci, content), blob in zip(rows, blobs):
-                vec = _blob_to_embedding(blob)
-                sim = _cosine_sim(query_embedding, vec)
-                scored.append((sim, (fp, ci, content)))
-            scored.sort(key=lambda x: -x[0])
-            hits = []
-            for _sim, (file_path, chunk_index, content) in scored[:top_k]:
-                content_str = content if len(content) <= SNIPPET_MAX_CHARS else content[: SNIPPET_MAX_CHARS - 3] + "..."
-                hits.append({
-                    "doc_id": file_path,
-                    "source_type": "memory",
-                    "source_url": "",
-                    "file_path": file_path,
-                    "title": Path(file_path).name,
-                    "chunk_index": chunk_index,
-                    "page": None,
-                    "content": content_str,
-                    "trace": {"doc_id": file_path, "source": file_path, "page": None},
-                })
-            return hits
+            ranked = self._scope_matrix(conn, scope_val).search_batch(query_embeddings, top_k)
+            wanted = sorted({row_id for hits in ranked for row_id, _score in hits})
+            if not wanted:
+                return [[] for _ in query_embeddings]
+            placeholders = ",".join("?" * len(wanted))
+            meta = {
+                r[0]: (r[1], r[2], r[3])
+                for r in conn.execute(
+                    f"SELECT id, file_path, chunk_index, content FROM memory_index WHERE id IN ({placeholders})",
+                    wanted,
+                ).fetchall()
+            }
         finally:
             conn.close()
+        return [
+            [_memory_hit(*meta[row_id]) for row_id, _score in hits if row_id in meta]
+            for hits in ranked
+        ]
+
+
+def _memory_hit(file_path: str, chunk_index: int, content: str) -> dict[str, Any]:
+    content_str = content if len(content) <= SNIPPET_MAX_CHARS else content[: SNIPPET_MAX_CHARS - 3] + "..."
+    return {
+        "doc_id": file_path,
+        "source_type": "memory",
+        "source_url": "",
+        "file_path": file_path,
+        "title": Path(file_path).name,
+        "chunk_index": chunk_index,
+        "page": None,
+        "content": content_str,
+        "trace": {"doc_id": file_path, "source": file_path, "page": None},
+    }
+
+
+class MemoryIndexRefresher:
+    """
+    Background refresh of memory vector indexes, off the request path.
+
+    schedule() queues a refresh of one (workspace, scope) on a single worker thread;
+    requests for a scope that is already queued are coalesced, and a request that
+    arrives while its scope is refreshing triggers one more pass afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._queued: set[tuple[str, str]] = set()
+        self._running: set[tuple[str, str]] = set()
+        self._rerun: set[tuple[str, str]] = set()
+
+    def schedule(self, workspace: Path, scope_key: str | None, embed_fn: Any) -> Future | None:
+        key = (str(Path(workspace).resolve()), scope_key or "")
+        with self._lock:
+            if key in self._queued:
+                return None
+            if key in self._running:
+                self._rerun.add(key)
+                return None
+            self._queued.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-index")
+            return self._executor.submit(self._run, key, Path(workspace), scope_key, embed_fn)
+
+    def _run(self, key: tuple[str, str], workspace: Path, scope_key: str | None, embed_fn: Any) -> None:
+        while True:
+            with self._lock:
+                self._queued.discard(key)
+                self._running.add(key)
+            try:
+                MemoryVectorStore(workspace).refresh_index(scope_key, embed_fn)
+            except Exception as e:
+                logger.warning(f"Memory vector index refresh failed: {e}")
+            with self._lock:
+                self._running.discard(key)
+                if key not in self._rerun:
+                    return
+                self._rerun.discard(key)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until refreshes queued so far have finished (tests, shutdown)."""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.submit(lambda: None).result(timeout=timeout)
+
+
+_REFRESHER = MemoryIndexRefresher()
+
+
+def get_memory_index_refresher() -> MemoryIndexRefresher:
+    return _REFRESHER
+
+
+def schedule_memory_index_refresh(workspace: Path, config: Any, scope_key: str | None = None) -> bool:
+    """
+    Queue a background index refresh for a memory scope when the sqlite_vector backend
+    is in use (memory_backend sqlite_vector or auto) and an embedding provider is set.
+    """
+    from joyhousebot.services.retrieval.vector_optional import get_memory_embedding_provider
+
+    retrieval_cfg = getattr(getattr(config, "tools", None), "retrieval", None)
+    memory_backend = (getattr(retrieval_cfg, "memory_backend", "builtin") or "builtin").strip().lower()
+    if memory_backend not in ("sqlite_vector", "auto"):
+        return False
+    provider = get_memory_embedding_provider(config)
+    if provider is None:
+        return False
+    _REFRESHER.schedule(workspace, scope_key, provider.embed)
+    return True
 
 
 async def search_memory_sqlite_vector(
@@ -264,6 +480,9 @@ async def search_memory_sqlite_vector(
 ) -> list[dict[str, Any]] | None:
     """
     Semantic memory search via SQLite vector index. Returns None if index unavailable or embedding not configured (caller should fallback to builtin grep).
+
+    The index is never built here: a stale scope gets a background refresh and is
+    searched as currently indexed; a scope with no index yet falls back.
     """
     from joyhousebot.services.retrieval.vector_optional import get_memory_embedding_provider
 
@@ -272,11 +491,12 @@ async def search_memory_sqlite_vector(
         return None  # type: ignore[return-value]  # signal fallback
 
     store = MemoryVectorStore(workspace)
-
-    def embed_sync(texts: list[str]) -> list[list[float]]:
-        return provider.embed(texts)
-
-    if not store.ensure_index(scope_key, config, embed_sync, force_rebuild=False):
+    # Rows are checked before scheduling, so a search never waits on (or races with)
+    # the refresh it just started.
+    indexed = await asyncio.to_thread(store.has_rows, scope_key)
+    if await asyncio.to_thread(store.needs_refresh, scope_key):
+        _REFRESHER.schedule(workspace, scope_key, provider.embed)
+    if not indexed:
         return None  # type: ignore[return-value]
 
     try:
@@ -286,4 +506,4 @@ async def search_memory_sqlite_vector(
         return None  # type: ignore[return-value]
     if not vectors:
         return None  # type: ignore[return-value]
-    return store.search(scope_key, vectors[0], top_k)
+    return await asyncio.to_thread(store.search, scope_key, vectors[0], top_k)
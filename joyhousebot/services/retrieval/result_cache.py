@@ -0,0 +1,154 @@
+"""Query-result cache for retrieval, invalidated by index generation counters."""
+
+from __future__ import annotations
+
+import copy
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+from joyhousebot.agent.memory import safe_scope_key
+from joyhousebot.agent.prompt_cache import stat_signature
+from joyhousebot.services.retrieval.memory_search import MEMORY_REL, memory_candidates
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 300.0
+
+_generations: dict[tuple[str, str], int] = {}
+_generations_lock = threading.Lock()
+
+
+def _workspace_key(workspace: Path) -> str:
+    return str(Path(workspace).expanduser().resolve())
+
+
+def bump_generation(workspace: Path, domain: str) -> int:
+    """Advance the in-process generation of an index domain of a workspace (e.g. "memory")."""
+    key = (_workspace_key(workspace), domain)
+    with _generations_lock:
+        _generations[key] = _generations.get(key, 0) + 1
+        return _generations[key]
+
+
+def _local_generation(workspace: Path, domain: str) -> int:
+    with _generations_lock:
+        return _generations.get((_workspace_key(workspace), domain), 0)
+
+
+def _knowledge_store_generation(workspace: Path) -> int:
+    """Write counter persisted by RetrievalStore, so writes from the pipeline subprocess count too."""
+    from joyhousebot.services.retrieval.store import RETRIEVAL_DB_REL
+
+    db_path = Path(workspace) / RETRIEVAL_DB_REL
+    if not db_path.exists():
+        return 0
+    try:
+        conn = sqlite3.connect(db_path, timeout=5)
+        try:
+            row = conn.execute("SELECT value FROM retrieval_meta WHERE key = 'generation'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return -1  # unreadable: never matches a cached token
+    return int(row[0]) if row else 0
+
+
+def _memory_files_signature(workspace: Path, scope_key: str | None) -> tuple:
+    """Stat signature of the scope's memory files, so edits via edit_file / write_file count too."""
+    safe = safe_scope_key(scope_key) if scope_key else ""
+    memory_dir = Path(workspace) / MEMORY_REL / safe if safe else Path(workspace) / MEMORY_REL
+    if not memory_dir.is_dir():
+        return ()
+    rel_prefix = f"{MEMORY_REL}/{safe}/" if safe else f"{MEMORY_REL}/"
+    return stat_signature(sorted(path for _, path in memory_candidates(memory_dir, rel_prefix)))
+
+
+def index_generation(workspace: Path, scope: str, memory_scope_key: str | None = None) -> tuple[Hashable, ...]:
+    """Token that changes whenever the index behind scope may return different results."""
+    if scope == "memory":
+        return (_local_generation(workspace, "memory"), _memory_files_signature(workspace, memory_scope_key))
+    return (_knowledge_store_generation(workspace),)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").casefold().split())
+
+
+class RetrievalResultCache:
+    """
+    Bounded LRU of search results with a TTL.
+
+    Each entry is stored with the index generation token current when the search
+    started; get() only returns it while the token is unchanged and the entry is
+    younger than ttl_seconds (the TTL bounds staleness for sources without a
+    generation counter, e.g. MCP backends).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: OrderedDict[Hashable, tuple[Hashable, float, list[dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, token: Hashable) -> list[dict[str, Any]] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != token or now - entry[1] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            hits = entry[2]
+        return copy.deepcopy(hits)
+
+    def put(self, key: Hashable, token: Hashable, hits: list[dict[str, Any]]) -> None:
+        stored = copy.deepcopy(hits)
+        with self._lock:
+            self._entries[key] = (token, time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+                "entries": len(self._entries),
+            }
+
+
+_shared: RetrievalResultCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_result_cache(config: Any) -> RetrievalResultCache | None:
+    """Process-wide result cache per config.tools.retrieval (None when disabled)."""
+    global _shared
+    retrieval = getattr(getattr(config, "tools", None), "retrieval", None)
+    if retrieval is not None and not getattr(retrieval, "result_cache_enabled", True):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = RetrievalResultCache(
+                max_entries=int(getattr(retrieval, "result_cache_max_entries", DEFAULT_MAX_ENTRIES) or 1),
+                ttl_seconds=float(getattr(retrieval, "result_cache_ttl_seconds", DEFAULT_TTL_SECONDS) or 0),
+            )
+        return _shared
@@ -1,11 +1,72 @@
 """SQLite FTS5-backed retrieval store for knowledge chunks with metadata and evidence trace."""
 
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from joyhousebot.utils.helpers import ensure_dir
 
+RETRIEVAL_DB_REL = Path("knowledge") / "retrieval.db"
+# Documents written since the last FTS optimize before optimize_if_due() merges segments.
+OPTIMIZE_EVERY_DOCS = 50
+
+_INSERT_CHUNK_SQL = """
+    INSERT INTO knowledge (doc_id, source_type, source_url, file_path, title, chunk_index, page, content)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_FTS_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
+        INSERT INTO knowledge_fts(rowid, doc_id, source_type, source_url, title, content)
+        VALUES (new.id, new.doc_id, new.source_type, new.source_url, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
+        DELETE FROM knowledge_fts WHERE rowid = old.id;
+    END
+    """,
+)
+
+
+def _chunk_rows(
+    doc_id: str, source_type: str, source_url: str, title: str, file_path: str, chunks: list[dict]
+) -> list[tuple]:
+    return [
+        (doc_id, source_type, source_url or "", file_path or "", title, i, c.get("page") or 0, c.get("text", ""))
+        for i, c in enumerate(chunks)
+    ]
+
+
+class BulkLoad:
+    """
+    Documents collected by RetrievalStore.bulk_load() and written in one transaction on exit.
+
+    replace_doc() only buffers rows, so callers parse and chunk without holding the
+    write lock. On exit FTS triggers are dropped, rows go into `knowledge` only, and
+    the FTS index is rebuilt from `knowledge` in one pass before commit.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[tuple[str, list[tuple]]] = []
+        self.docs = 0
+        self.chunks = 0
+
+    def replace_doc(
+        self, doc_id: str, source_type: str, source_url: str, title: str, file_path: str, chunks: list[dict]
+    ) -> None:
+        rows = _chunk_rows(doc_id, source_type, source_url, title, file_path, chunks)
+        self._pending.append((doc_id, rows))
+        self.docs += 1
+        self.chunks += len(rows)
+
+    def _write(self, conn: sqlite3.Connection) -> None:
+        for doc_id, rows in self._pending:
+            conn.execute("DELETE FROM knowledge WHERE doc_id = ?", (doc_id,))
+            conn.executemany(_INSERT_CHUNK_SQL, rows)
+
 
 class RetrievalStore:
     """Full-text search over ingested knowledge using SQLite FTS5. Supports metadata filter and BM25-style ranking."""
@@ -13,11 +74,27 @@ class RetrievalStore:
     def __init__(self, workspace: Path):
         self.workspace = Path(workspace)
         ensure_dir(self.workspace / "knowledge")
-        self.db_path = self.workspace / "knowledge" / "retrieval.db"
+        self.db_path = self.workspace / RETRIEVAL_DB_REL
         self._init_schema()
 
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits on success, rolls back on error, and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     def _init_schema(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL: searches keep reading the previous snapshot while a document is replaced.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS knowledge (
                     id INTEGER PRIMARY KEY,
@@ -40,19 +117,14 @@ class RetrievalStore:
                     tokenize='unicode61'
                 )
             """)
-            conn.execute("""
-                CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
-                    INSERT INTO knowledge_fts(rowid, doc_id, source_type, source_url, title, content)
-                    VALUES (new.id, new.doc_id, new.source_type, new.source_url, new.title, new.content);
-                END
-            """)
-            conn.execute("""
-                CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
-                    INSERT INTO knowledge_fts(knowledge_fts, rowid, doc_id, source_type, source_url, title, content)
-                    VALUES ('delete', old.id, old.doc_id, old.source_type, old.source_url, old.title, old.content);
-                END
-            """)
-            conn.commit()
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'knowledge_ad'").fetchone()
+            if row and "'delete'" in (row[0] or ""):
+                # Older trigger used the FTS5 'delete' command, which only applies to
+                # external-content tables and fails on this one.
+                conn.execute("DROP TRIGGER knowledge_ad")
+            for trigger_sql in _FTS_TRIGGERS_SQL:
+                conn.execute(trigger_sql)
+            conn.execute("CREATE TABLE IF NOT EXISTS retrieval_meta (key TEXT PRIMARY KEY, value TEXT)")
 
     def index_chunk(
         self,
@@ -65,35 +137,99 @@ class RetrievalStore:
         content: str,
         file_path: str = "",
     ) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
-                """
-                INSERT INTO knowledge (doc_id, source_type, source_url, file_path, title, chunk_index, page, content)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _INSERT_CHUNK_SQL,
                 (doc_id, source_type, source_url or "", file_path or "", title, chunk_index, page or 0, content),
             )
-            conn.commit()
+            self._bump_generation(conn)
 
     def delete_by_doc_id(self, doc_id: str) -> None:
         """Remove all chunks for a document (e.g. before re-indexing)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("DELETE FROM knowledge WHERE doc_id = ?", (doc_id,))
-            conn.commit()
+            self._bump_generation(conn)
 
     def index_doc(self, doc_id: str, source_type: str, source_url: str, title: str, file_path: str, chunks: list[dict]) -> None:
-        """Index all chunks of a document. chunks: list of {text, page}."""
-        for i, c in enumerate(chunks):
-            self.index_chunk(
-                doc_id=doc_id,
-                source_type=source_type,
-                source_url=source_url,
-                title=title,
-                chunk_index=i,
-                page=c.get("page"),
-                content=c.get("text", ""),
-                file_path=file_path,
+        """Index all chunks of a document in one transaction. chunks: list of {text, page}."""
+        with self._connect() as conn:
+            conn.executemany(_INSERT_CHUNK_SQL, _chunk_rows(doc_id, source_type, source_url, title, file_path, chunks))
+            self._count_writes(conn)
+
+    def replace_doc(self, doc_id: str, source_type: str, source_url: str, title: str, file_path: str, chunks: list[dict]) -> None:
+        """Atomically replace a document's chunks: readers see the old or the new version, never neither."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM knowledge WHERE doc_id = ?", (doc_id,))
+            conn.executemany(_INSERT_CHUNK_SQL, _chunk_rows(doc_id, source_type, source_url, title, file_path, chunks))
+            self._count_writes(conn)
+
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> None:
+        """Advance the index generation (read by the retrieval result cache) in the current transaction."""
+        conn.execute(
+            """
+            INSERT INTO retrieval_meta (key, value) VALUES ('generation', 1)
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """
+        )
+
+    @classmethod
+    def _count_writes(cls, conn: sqlite3.Connection, docs: int = 1) -> None:
+        cls._bump_generation(conn)
+        conn.execute(
+            """
+            INSERT INTO retrieval_meta (key, value) VALUES ('writes_since_optimize', ?)
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value
+            """,
+            (docs,),
+        )
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[BulkLoad]:
+        """
+        Write many documents in a single transaction and rebuild the FTS index once.
+
+        Documents passed to the loader are buffered; the write transaction is only opened
+        after the block exits, for the inserts and the FTS rebuild (knowledge_fts is
+        repopulated from `knowledge` with one INSERT ... SELECT, then optimized). Nothing
+        is written if the block raises, and readers see all documents or none.
+        """
+        loader = BulkLoad()
+        yield loader
+        if not loader.docs:
+            return
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DROP TRIGGER IF EXISTS knowledge_ai")
+            conn.execute("DROP TRIGGER IF EXISTS knowledge_ad")
+            loader._write(conn)
+            conn.execute("DELETE FROM knowledge_fts")
+            conn.execute(
+                """
+                INSERT INTO knowledge_fts(rowid, doc_id, source_type, source_url, title, content)
+                SELECT id, doc_id, source_type, source_url, title, content FROM knowledge
+                """
             )
+            for trigger_sql in _FTS_TRIGGERS_SQL:
+                conn.execute(trigger_sql)
+            self._bump_generation(conn)
+        self.optimize()
+
+    def optimize(self) -> None:
+        """Merge all FTS index segments into one (faster queries; run off the write path)."""
+        with self._connect() as conn:
+            conn.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('optimize')")
+            conn.execute("INSERT OR REPLACE INTO retrieval_meta (key, value) VALUES ('writes_since_optimize', '0')")
+
+    def optimize_if_due(self, min_docs: int = OPTIMIZE_EVERY_DOCS) -> bool:
+        """optimize() once at least min_docs documents were written since the last one."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM retrieval_meta WHERE key = 'writes_since_optimize'").fetchone()
+        if row is None or int(row[0] or 0) < max(1, min_docs):
+            return False
+        self.optimize()
+        return True
 
     def search(
         self,
@@ -107,7 +243,7 @@ class RetrievalStore:
             return []
 
         query_clean = query.strip().replace('"', '""')
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             sql = """
                 SELECT k.id, k.doc_id, k.source_type, k.source_url, k.file_path, k.title, k.chunk_index, k.page, k.content
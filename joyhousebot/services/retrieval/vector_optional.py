@@ -8,6 +8,7 @@ Backends: none (default), chroma, qdrant, pgvector.
 from pathlib import Path
 from typing import Any
 
+from joyhousebot.services.retrieval.embedding_cache import get_embedding_cache
 from joyhousebot.services.retrieval.embedding_provider import LiteLLMEmbeddingProvider
 from joyhousebot.services.retrieval.embedding_provider import _get_embedding_api_key
 
@@ -49,7 +50,9 @@ def get_embedding_provider(config: Any):  # -> LiteLLMEmbeddingProvider | None
         return None
     provider = (getattr(retrieval, "embedding_provider", "") or "openai").strip() or "openai"
     api_key = _get_embedding_api_key(config, provider)
-    return LiteLLMEmbeddingProvider(model=model, provider=provider, api_key=api_key)
+    return LiteLLMEmbeddingProvider(
+        model=model, provider=provider, api_key=api_key, cache=get_embedding_cache(config)
+    )
 
 
 def get_memory_embedding_provider(config: Any):  # -> LiteLLMEmbeddingProvider | None
@@ -68,7 +71,9 @@ def get_memory_embedding_provider(config: Any):  # -> LiteLLMEmbeddingProvider |
         return None
     provider = (getattr(retrieval, "embedding_provider", "") or "openai").strip() or "openai"
     api_key = _get_embedding_api_key(config, provider)
-    return LiteLLMEmbeddingProvider(model=model, provider=provider, api_key=api_key)
+    return LiteLLMEmbeddingProvider(
+        model=model, provider=provider, api_key=api_key, cache=get_embedding_cache(config)
+    )
 
 
 def get_vector_store(workspace: Path, config: Any):  # -> ChromaVectorStore | None
@@ -0,0 +1,164 @@
+"""Cosine top-k over embedding matrices (NumPy when available, pure Python otherwise)."""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with the retrieval extra; keep search working without it
+    np = None  # type: ignore[assignment]
+
+MATRIX_CACHE_MAX_ENTRIES = 32
+
+
+class VectorMatrix:
+    """
+    Row-normalized float32 matrix of embeddings with their ids.
+
+    Rows are normalized once at build time, so a query is scored against every row
+    with one matrix-vector (or matrix-matrix for batches) product, and the top k are
+    selected with argpartition instead of a full sort. Rows whose dimension differs
+    from the first row are dropped.
+    """
+
+    def __init__(self, ids: Sequence[Any], vectors: Sequence[Sequence[float]]):
+        kept_ids: list[Any] = []
+        kept: list[Sequence[float]] = []
+        dim = 0
+        for row_id, vec in zip(ids, vectors):
+            if vec is None or len(vec) == 0:
+                continue
+            if not dim:
+                dim = len(vec)
+            if len(vec) != dim:
+                continue
+            kept_ids.append(row_id)
+            kept.append(vec)
+        self.ids = kept_ids
+        self.dim = dim
+        if np is not None:
+            matrix = np.asarray(kept, dtype=np.float32).reshape(len(kept), dim)
+            self._matrix = _normalize_rows(matrix)
+        else:
+            self._rows = [_normalize(list(map(float, v))) for v in kept]
+
+    @classmethod
+    def from_blobs(cls, ids: Sequence[Any], blobs: Sequence[bytes]) -> "VectorMatrix":
+        """Build from packed float32 blobs (struct "f" / numpy float32 layout)."""
+        if np is not None:
+            if blobs and len({len(b) for b in blobs}) == 1:
+                # Common case: one join + one frombuffer for the whole matrix.
+                dim = len(blobs[0]) // 4
+                matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), dim)
+                return cls._from_array(ids, matrix)
+            vectors = [np.frombuffer(b, dtype=np.float32) for b in blobs]
+        else:
+            import struct
+
+            vectors = [struct.unpack(f"{len(b) // 4}f", b) for b in blobs]
+        return cls(ids, vectors)
+
+    @classmethod
+    def _from_array(cls, ids: Sequence[Any], matrix: Any) -> "VectorMatrix":
+        self = cls.__new__(cls)
+        self.ids = list(ids)
+        self.dim = int(matrix.shape[1]) if matrix.size else 0
+        self._matrix = _normalize_rows(matrix)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        if np is not None:
+            return int(self._matrix.nbytes)
+        return len(self.ids) * self.dim * 8
+
+    def search(self, query: Sequence[float], top_k: int) -> list[tuple[Any, float]]:
+        """Top-k (id, cosine score) pairs for one query, best first."""
+        return self.search_batch([query], top_k)[0]
+
+    def search_batch(self, queries: Sequence[Sequence[float]], top_k: int) -> list[list[tuple[Any, float]]]:
+        """Top-k (id, cosine score) pairs for each query; queries of the wrong dimension get []."""
+        if top_k <= 0 or not self.ids:
+            return [[] for _ in queries]
+        k = min(int(top_k), len(self.ids))
+        valid = [i for i, q in enumerate(queries) if q is not None and len(q) == self.dim]
+        results: list[list[tuple[Any, float]]] = [[] for _ in queries]
+        if not valid:
+            return results
+        if np is not None:
+            q = np.asarray([queries[i] for i in valid], dtype=np.float32).reshape(len(valid), self.dim)
+            q = _normalize_rows(q)
+            scores = q @ self._matrix.T  # (queries, rows)
+            if k < scores.shape[1]:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), (len(valid), scores.shape[1]))
+            for out_idx, row_scores, row_top in zip(valid, scores, top):
+                order = row_top[np.argsort(-row_scores[row_top], kind="stable")]
+                results[out_idx] = [(self.ids[j], float(row_scores[j])) for j in order]
+            return results
+        for out_idx in valid:
+            qn = _normalize(list(map(float, queries[out_idx])))
+            scored = [(sum(x * y for x, y in zip(qn, row)), j) for j, row in enumerate(self._rows)]
+            scored.sort(key=lambda s: -s[0])
+            results[out_idx] = [(self.ids[j], score) for score, j in scored[:k]]
+        return results
+
+
+def _normalize_rows(matrix: Any) -> Any:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else vec
+
+
+def rank_by_cosine(query: Sequence[float], vectors: Sequence[Sequence[float]], top_k: int) -> list[int]:
+    """Indices of the top_k vectors most similar to query, best first."""
+    return [i for i, _score in VectorMatrix(range(len(vectors)), vectors).search(query, top_k)]
+
+
+class MatrixCache:
+    """
+    Small LRU of VectorMatrix objects keyed by (index, scope), each tagged with a
+    version token. get() returns the matrix only while the token matches, so a
+    rebuilt index (new token) is reloaded on its next search.
+    """
+
+    def __init__(self, max_entries: int = MATRIX_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[Hashable, tuple[Hashable, VectorMatrix]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, token: Hashable) -> VectorMatrix | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != token:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, token: Hashable, matrix: VectorMatrix) -> None:
+        with self._lock:
+            self._entries[key] = (token, matrix)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Callable
 
+from joyhousebot.session.usage_ledger import message_cache_usage
+
 
 def _parse_date_to_ms(raw: Any) -> int | None:
     """Parse YYYY-MM-DD to start of day UTC timestamp. Return None if invalid."""
@@ -89,6 +91,166 @@ def _iso_to_ms(iso: Any) -> int | None:
     return None
 
 
+def _usage_ledger(agent: Any) -> Any | None:
+    """The agent's UsageLedger when usage is pre-aggregated (None: scan session messages)."""
+    return getattr(agent, "usage_ledger", None)
+
+
+def _backfill_ledger(agent: Any, ledger: Any, keys: list[str]) -> None:
+    """Ingest sessions the ledger has never seen (created before it existed); a one-time range read each."""
+    known = ledger.known_sessions() if len(keys) > 1 else {k for k in keys if ledger.has_session(k)}
+    for key in keys:
+        if key and key not in known:
+            ledger.ingest(key, agent.sessions.get_history(key, None))
+
+
+def _ledger_totals(row: dict[str, Any], empty_usage_totals: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    totals = empty_usage_totals()
+    totals["input"] = int(row.get("input") or 0)
+    totals["output"] = int(row.get("output") or 0)
+    totals["cacheRead"] = int(row.get("cache_read") or 0)
+    totals["cacheWrite"] = int(row.get("cache_write") or 0)
+    totals["totalTokens"] = totals["input"] + totals["output"]
+    totals["totalCost"] = float(row.get("cost") or 0)
+    totals["outputCost"] = float(row.get("output_cost") or 0)
+    return totals
+
+
+def _build_usage_payload_from_ledger(
+    *,
+    ledger: Any,
+    agent: Any,
+    limit: int,
+    start_date: str,
+    end_date: str,
+    now_ms: Callable[[], int],
+    empty_usage_totals: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    _backfill_ledger(agent, ledger, [str(m.get("key") or "") for m in agent.sessions.list_sessions()])
+
+    per_session: dict[str, dict[str, Any]] = {}
+    for row in ledger.daily_rollups(start_date, end_date, ("session_key", "day")):
+        key = row["session_key"]
+        entry = per_session.get(key)
+        if entry is None:
+            entry = per_session[key] = {
+                "key": key,
+                "label": key,
+                "sessionId": key,
+                "updatedAt": None,
+                "firstActivity": None,
+                "lastActivity": None,
+                "activityDates": [],
+                "usage": {
+                    **empty_usage_totals(),
+                    "messageCounts": {
+                        "total": 0, "user": 0, "assistant": 0, "toolCalls": 0, "toolResults": 0, "errors": 0,
+                    },
+                    "dailyBreakdown": [],
+                },
+            }
+        usage = entry["usage"]
+        usage["input"] += int(row["input"] or 0)
+        usage["output"] += int(row["output"] or 0)
+        usage["cacheRead"] += int(row["cache_read"] or 0)
+        usage["cacheWrite"] += int(row["cache_write"] or 0)
+        usage["totalTokens"] = usage["input"] + usage["output"]
+        usage["totalCost"] += float(row["cost"] or 0)
+        usage["outputCost"] += float(row["output_cost"] or 0)
+        counts = usage["messageCounts"]
+        counts["total"] += int(row["messages"] or 0)
+        counts["user"] += int(row["user_messages"] or 0)
+        counts["assistant"] += int(row["assistant_messages"] or 0)
+        counts["toolCalls"] += int(row["tool_calls"] or 0)
+        counts["toolResults"] += int(row["tool_results"] or 0)
+        counts["errors"] += int(row["errors"] or 0)
+        usage["dailyBreakdown"].append(
+            {
+                "date": row["day"],
+                "tokens": int(row["input"] or 0) + int(row["output"] or 0),
+                "cacheRead": int(row["cache_read"] or 0),
+                "cacheWrite": int(row["cache_write"] or 0),
+                "cost": float(row["cost"] or 0),
+                "messages": int(row["messages"] or 0),
+                "toolCalls": int(row["tool_calls"] or 0),
+                "errors": int(row["errors"] or 0),
+            }
+        )
+        entry["activityDates"].append(row["day"])
+        if row["first_ms"] is not None and (entry["firstActivity"] is None or row["first_ms"] < entry["firstActivity"]):
+            entry["firstActivity"] = row["first_ms"]
+        if row["last_ms"] is not None and (entry["lastActivity"] is None or row["last_ms"] > entry["lastActivity"]):
+            entry["lastActivity"] = entry["updatedAt"] = row["last_ms"]
+
+    sessions = sorted(per_session.values(), key=lambda e: e["lastActivity"] or 0, reverse=True)[:limit]
+    totals = empty_usage_totals()
+    total_messages = {"total": 0, "user": 0, "assistant": 0, "toolCalls": 0, "toolResults": 0, "errors": 0}
+    daily_map: dict[str, dict[str, Any]] = {}
+    for entry in sessions:
+        usage = entry["usage"]
+        for k in ("input", "output", "cacheRead", "cacheWrite", "totalTokens", "totalCost", "outputCost"):
+            totals[k] += usage[k]
+        for k in total_messages:
+            total_messages[k] += usage["messageCounts"][k]
+        for day_entry in usage["dailyBreakdown"]:
+            day = daily_map.setdefault(day_entry["date"], {
+                **empty_usage_totals(),
+                "date": day_entry["date"],
+                "messages": 0,
+                "toolCalls": 0,
+                "errors": 0,
+            })
+            day["totalTokens"] += day_entry["tokens"]
+            day["cacheRead"] += day_entry["cacheRead"]
+            day["cacheWrite"] += day_entry["cacheWrite"]
+            day["totalCost"] += day_entry["cost"]
+            day["messages"] += day_entry["messages"]
+            day["toolCalls"] += day_entry["toolCalls"]
+            day["errors"] += day_entry["errors"]
+
+    by_model = [
+        {
+            "provider": row["provider"] or None,
+            "model": row["model"] or None,
+            "count": int(row["assistant_messages"] or 0),
+            "totals": _ledger_totals(row, empty_usage_totals),
+        }
+        for row in ledger.daily_rollups(start_date, end_date, ("provider", "model"))
+    ]
+    by_provider = [
+        {
+            "provider": row["provider"] or None,
+            "count": int(row["assistant_messages"] or 0),
+            "totals": _ledger_totals(row, empty_usage_totals),
+        }
+        for row in ledger.daily_rollups(start_date, end_date, ("provider",))
+    ]
+    by_channel = [
+        {"channel": row["channel"] or None, "totals": _ledger_totals(row, empty_usage_totals)}
+        for row in ledger.daily_rollups(start_date, end_date, ("channel",))
+    ]
+    return {
+        "updatedAt": now_ms(),
+        "startDate": start_date,
+        "endDate": end_date,
+        "sessions": sessions,
+        "totals": totals,
+        "aggregates": {
+            "messages": total_messages,
+            "tools": {
+                "totalCalls": total_messages["toolCalls"],
+                "uniqueTools": 0,
+                "tools": [],
+            },
+            "byModel": by_model,
+            "byProvider": by_provider,
+            "byAgent": [],
+            "byChannel": by_channel,
+            "daily": [daily_map[d] for d in sorted(daily_map)],
+        },
+    }
+
+
 def build_usage_payload(
     *,
     params: dict[str, Any],
@@ -99,6 +261,17 @@ def build_usage_payload(
 ) -> dict[str, Any]:
     start_ms, end_ms, start_date, end_date = parse_date_range(params)
     limit = min(1000, max(1, int(params.get("limit") or 1000)))
+    ledger = _usage_ledger(agent)
+    if ledger is not None:
+        return _build_usage_payload_from_ledger(
+            ledger=ledger,
+            agent=agent,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            now_ms=now_ms,
+            empty_usage_totals=empty_usage_totals,
+        )
     sessions_meta = agent.sessions.list_sessions()
 
     # Filter sessions by updated_at in [start_ms, end_ms]; include sessions with no timestamp
@@ -175,6 +348,8 @@ def build_usage_payload(
                     "errors": 0,
                 }
             daily_map[day]["totalTokens"] += int(day_entry.get("tokens") or 0)
+            daily_map[day]["cacheRead"] += int(day_entry.get("cacheRead") or 0)
+            daily_map[day]["cacheWrite"] += int(day_entry.get("cacheWrite") or 0)
             daily_map[day]["totalCost"] += float(day_entry.get("cost") or 0)
             daily_map[day]["messages"] += int(day_entry.get("messages") or 0)
             daily_map[day]["toolCalls"] += int(day_entry.get("toolCalls") or 0)
@@ -210,6 +385,30 @@ def build_usage_timeseries(
     now_ms: Callable[[], int],
     estimate_tokens: Callable[[str], int],
 ) -> dict[str, Any]:
+    ledger = _usage_ledger(agent)
+    if ledger is not None:
+        _backfill_ledger(agent, ledger, [key])
+        points = []
+        cumulative_tokens = 0
+        cumulative_cost = 0.0
+        for event in ledger.events(key):
+            tokens = int(event["input"]) + int(event["output"])
+            cumulative_tokens += tokens
+            cumulative_cost += float(event["cost"])
+            points.append(
+                {
+                    "timestamp": event["ts_ms"] if event["ts_ms"] is not None else now_ms(),
+                    "input": int(event["input"]),
+                    "output": int(event["output"]),
+                    "cacheRead": int(event["cache_read"]),
+                    "cacheWrite": int(event["cache_write"]),
+                    "totalTokens": tokens,
+                    "cost": float(event["cost"]),
+                    "cumulativeTokens": cumulative_tokens,
+                    "cumulativeCost": cumulative_cost,
+                }
+            )
+        return {"sessionId": key, "points": points}
     session = agent.sessions.get_or_create(key)
     points = []
     cumulative_tokens = 0
@@ -234,6 +433,7 @@ def build_usage_timeseries(
             inp = tokens if message.get("role") == "user" else 0
             out = tokens if message.get("role") == "assistant" else 0
         cost = float(message.get("cost") or 0)
+        cache_read, cache_write = message_cache_usage(message)
         cumulative_tokens += tokens
         cumulative_cost += cost
         points.append(
@@ -241,8 +441,8 @@ def build_usage_timeseries(
                 "timestamp": ts,
                 "input": inp,
                 "output": out,
-                "cacheRead": 0,
-                "cacheWrite": 0,
+                "cacheRead": cache_read,
+                "cacheWrite": cache_write,
                 "totalTokens": tokens,
                 "cost": cost,
                 "cumulativeTokens": cumulative_tokens,
@@ -259,6 +459,21 @@ def build_usage_logs(
     agent: Any,
     estimate_tokens: Callable[[str], int],
 ) -> dict[str, Any]:
+    ledger = _usage_ledger(agent)
+    if ledger is not None:
+        _backfill_ledger(agent, ledger, [key])
+        return {
+            "logs": [
+                {
+                    "timestamp": event["timestamp"],
+                    "role": event["role"] or "assistant",
+                    "content": event["preview"],
+                    "tokens": int(event["input"]) + int(event["output"]),
+                    "cost": float(event["cost"]),
+                }
+                for event in ledger.events(key, limit=limit)
+            ]
+        }
     session = agent.sessions.get_or_create(key)
     logs = []
     for message in session.messages[-limit:]:
@@ -1,5 +1,8 @@
 """Session management module."""
 
-from joyhousebot.session.manager import SessionManager, Session
+from joyhousebot.session.base import Session, SessionBackend
+from joyhousebot.session.jsonl_backend import JsonlSessionBackend
+from joyhousebot.session.manager import SessionManager
+from joyhousebot.session.sqlite_backend import SqliteSessionBackend
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "SessionBackend", "JsonlSessionBackend", "SqliteSessionBackend"]
@@ -0,0 +1,125 @@
+"""Session model and the storage backend interface."""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from joyhousebot.utils.tokens import count_message_tokens, message_tokens
+
+
+@dataclass
+class Session:
+    """
+    A conversation session.
+
+    Stores messages in JSONL format for easy reading and persistence.
+
+    Important: Messages are append-only for LLM cache efficiency.
+    The consolidation process writes summaries to MEMORY.md/HISTORY.md
+    but does NOT modify the messages list or get_history() output.
+    """
+
+    key: str  # channel:chat_id
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Set when messages were removed (clear); the next save rewrites storage instead of appending.
+    needs_rewrite: bool = field(default=False, repr=False, compare=False)
+    # Running token sums: _token_prefix[i] is the token count of messages[:i]. Extended
+    # lazily as messages are appended, so a token-budgeted window is a bisect away.
+    _token_prefix: list[int] = field(default_factory=lambda: [0], init=False, repr=False, compare=False)
+
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        """Add a message to the session (its token count is cached under "tokens")."""
+        msg = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+            **kwargs
+        }
+        msg["tokens"] = count_message_tokens(msg)
+        self.messages.append(msg)
+        self.updated_at = datetime.now()
+
+    def _sync_token_prefix(self) -> list[int]:
+        prefix = self._token_prefix
+        if len(prefix) - 1 > len(self.messages):
+            del prefix[1:]
+        for msg in self.messages[len(prefix) - 1:]:
+            # Messages loaded from older storage get their count cached here, once.
+            msg["tokens"] = message_tokens(msg)
+            prefix.append(prefix[-1] + msg["tokens"])
+        return prefix
+
+    def get_history(self, max_messages: int = 500, max_tokens: int | None = None) -> list[dict[str, Any]]:
+        """
+        Get recent messages in LLM format (role + content, plus the cached "tokens" count).
+
+        With max_tokens, the window is further cut from the front so the kept messages
+        total at most max_tokens.
+        """
+        prefix = self._sync_token_prefix()
+        start = max(0, len(self.messages) - max_messages) if max_messages > 0 else 0
+        if max_tokens is not None and max_tokens > 0:
+            # Smallest i with tokens(messages[i:]) <= max_tokens.
+            start = max(start, bisect_left(prefix, prefix[-1] - max_tokens))
+        return [{"role": m["role"], "content": m["content"], "tokens": m["tokens"]} for m in self.messages[start:]]
+
+    def clear(self) -> None:
+        """Clear all messages and reset session to initial state."""
+        self.messages = []
+        self._token_prefix = [0]
+        self.last_consolidated = 0
+        self.updated_at = datetime.now()
+        self.needs_rewrite = True
+
+
+class SessionBackend(ABC):
+    """
+    Persistent storage for sessions.
+
+    save() must be append-friendly: a backend may persist only messages added since
+    the previous save, and must rewrite when session.needs_rewrite is set or fewer
+    messages are present than were stored.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def load(self, key: str) -> Session | None:
+        """Load a full session, or None if it does not exist."""
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist the session."""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a session; True if it existed."""
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """Session info dicts (key, created_at, updated_at, path), newest first."""
+
+    @abstractmethod
+    def read_recent(self, key: str, max_messages: int | None) -> list[dict[str, Any]]:
+        """Last max_messages stored messages (all when None; full dicts, oldest first) without loading the session."""
+
+    @abstractmethod
+    def path_for(self, key: str) -> Path:
+        """Storage location for a session (file or database)."""
+
+    def forget(self, key: str) -> None:
+        """Drop any per-key write state (the next save starts from a clean rewrite)."""
+
+    def flush(self) -> None:
+        """Make buffered writes durable."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
@@ -0,0 +1,343 @@
+"""JSONL session backend: one append-only file per session (the default)."""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from joyhousebot.session.base import Session, SessionBackend
+from joyhousebot.utils.helpers import ensure_dir, safe_filename
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None
+
+
+DURABILITY_MODES = ("always", "batch", "os")
+_TAIL_READ_BYTES = 64 * 1024
+
+
+@dataclass
+class _PersistState:
+    """What is on disk for one session file."""
+
+    message_count: int = 0  # Messages already written
+    trailers: int = 0  # Metadata trailer records appended since the last compaction
+    needs_compaction: bool = False
+
+
+def metadata_record(session: Session) -> dict[str, Any]:
+    """Metadata header/trailer line for a session file."""
+    return {
+        "_type": "metadata",
+        "key": session.key,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "metadata": session.metadata,
+        "last_consolidated": session.last_consolidated
+    }
+
+
+def read_session_file(path: Path, key: str) -> tuple[Session, _PersistState]:
+    """Parse a session file; the last metadata record wins and a torn final line is dropped."""
+    messages = []
+    metadata = {}
+    created_at = None
+    updated_at = None
+    last_consolidated = 0
+    metadata_records = 0
+    torn_tail = False
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a partial last line; drop it and compact on next save.
+                torn_tail = True
+                continue
+
+            if data.get("_type") == "metadata":
+                metadata_records += 1
+                metadata = data.get("metadata", {})
+                created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+                updated_at = datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
+                last_consolidated = data.get("last_consolidated", 0)
+                key = data.get("key") or key
+            else:
+                messages.append(data)
+
+    session = Session(
+        key=key,
+        messages=messages,
+        created_at=created_at or datetime.now(),
+        updated_at=updated_at or created_at or datetime.now(),
+        metadata=metadata,
+        last_consolidated=last_consolidated
+    )
+    state = _PersistState(
+        message_count=len(messages),
+        trailers=max(0, metadata_records - 1),
+        needs_compaction=torn_tail,
+    )
+    return session, state
+
+
+class JsonlSessionBackend(SessionBackend):
+    """
+    Sessions as JSONL files in the sessions directory.
+
+    A file starts with a metadata header followed by one line per message. Saves are
+    append-only: new messages plus a metadata trailer record are appended (the last
+    metadata record wins on load). After compact_every appends, or when messages were
+    removed, the file is rewritten atomically with a single fresh header.
+
+    Durability: "always" fsyncs every save, "batch" group-commits (an append is fsynced
+    within fsync_interval_s, by a later append or a background timer), "os" never
+    fsyncs appends. Compaction always fsyncs before the atomic replace.
+    """
+
+    name = "jsonl"
+
+    def __init__(
+        self,
+        sessions_dir: Path,
+        durability: str = "batch",
+        fsync_interval_s: float = 1.0,
+        compact_every: int = 200,
+    ):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        durability = str(durability or "batch").strip().lower()
+        self.durability = durability if durability in DURABILITY_MODES else "batch"
+        self.fsync_interval_s = max(0.0, float(fsync_interval_s))
+        self.compact_every = max(1, int(compact_every or 1))
+        self._locks: dict[str, threading.Lock] = {}
+        self._persisted: dict[str, _PersistState] = {}
+        self._sync_lock = threading.Lock()
+        self._dirty_paths: set[Path] = set()
+        self._last_group_commit = time.monotonic()
+        self._flush_timer: threading.Timer | None = None
+
+    def path_for(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def load(self, key: str) -> Session | None:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            session, state = read_session_file(path, key)
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+        session.key = key
+        self._persisted[key] = state
+        return session
+
+    def read_recent(self, key: str, max_messages: int | None) -> list[dict[str, Any]]:
+        path = self.path_for(key)
+        if not path.exists() or (max_messages is not None and max_messages <= 0):
+            return []
+        recent: deque[dict[str, Any]] = deque(maxlen=max_messages)
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or '"_type": "metadata"' in line[:40]:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if data.get("_type") != "metadata":
+                    recent.append(data)
+        return list(recent)
+
+    def save(self, session: Session) -> None:
+        path = self.path_for(session.key)
+        lock = self._locks.setdefault(session.key, threading.Lock())
+        with lock:
+            with self._file_lock(path):
+                state = self._persisted.get(session.key)
+                total = len(session.messages)
+                if (
+                    state is None
+                    or session.needs_rewrite
+                    or state.needs_compaction
+                    or state.message_count > total
+                    or state.trailers >= self.compact_every
+                    or not path.exists()
+                ):
+                    self._compact(path, session)
+                    self._persisted[session.key] = _PersistState(message_count=total)
+                    return
+                lines = [json.dumps(msg) for msg in session.messages[state.message_count:total]]
+                lines.append(json.dumps(metadata_record(session)))
+                with open(path, "a") as f:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    self._sync_append(f, path)
+                state.message_count = total
+                state.trailers += 1
+
+    def _compact(self, path: Path, session: Session) -> None:
+        """Atomically rewrite the session file with one header and all messages."""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(metadata_record(session)) + "\n")
+            for msg in session.messages:
+                f.write(json.dumps(msg) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        with self._sync_lock:
+            self._dirty_paths.discard(path)
+
+    def _sync_append(self, f: Any, path: Path) -> None:
+        """Apply the durability policy after an append."""
+        if self.durability == "always":
+            os.fsync(f.fileno())
+            return
+        if self.durability != "batch":
+            return
+        with self._sync_lock:
+            self._dirty_paths.add(path)
+            elapsed = time.monotonic() - self._last_group_commit
+            if elapsed < self.fsync_interval_s:
+                # Bound the window even if no further append arrives.
+                self._schedule_flush_locked(self.fsync_interval_s - elapsed)
+                return
+            os.fsync(f.fileno())
+            self._dirty_paths.discard(path)
+            self._group_commit_locked()
+
+    def _schedule_flush_locked(self, delay: float) -> None:
+        if self._flush_timer is not None:
+            return
+        timer = threading.Timer(max(0.0, delay), self._timer_flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _timer_flush(self) -> None:
+        with self._sync_lock:
+            self._flush_timer = None
+            if self._dirty_paths:
+                self._group_commit_locked()
+
+    def _group_commit_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        for dirty in list(self._dirty_paths):
+            try:
+                fd = os.open(dirty, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+        self._dirty_paths.clear()
+        self._last_group_commit = time.monotonic()
+
+    def flush(self) -> None:
+        """Fsync any appends still pending under the batch durability policy."""
+        with self._sync_lock:
+            self._group_commit_locked()
+
+    @contextmanager
+    def _file_lock(self, path: Path):
+        """Cross-process lock for session writes on POSIX systems."""
+        lock_path = path.with_suffix(path.suffix + ".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            lock_file.close()
+
+    def forget(self, key: str) -> None:
+        self._persisted.pop(key, None)
+        # The cross-process file lock still serializes a save that holds the popped lock.
+        self._locks.pop(key, None)
+
+    def delete(self, key: str) -> bool:
+        self.forget(key)
+        path = self.path_for(key)
+        lock_path = path.with_suffix(path.suffix + ".lock")
+        if not path.exists():
+            return False
+        try:
+            if lock_path.exists():
+                try:
+                    lock_path.unlink()
+                except OSError:
+                    pass
+            path.unlink()
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to delete session {key}: {e}")
+            return False
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                data = self._read_latest_metadata(path)
+                if data is not None:
+                    sessions.append({
+                        "key": data.get("key") or path.stem.replace("_", ":"),
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_latest_metadata(path: Path) -> dict[str, Any] | None:
+        """Latest metadata record: the trailer near the end of the file, else the header line."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - _TAIL_READ_BYTES))
+            tail = f.read().decode("utf-8", errors="replace")
+            for line in reversed(tail.splitlines()):
+                line = line.strip()
+                if '"_type": "metadata"' not in line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if data.get("_type") == "metadata":
+                    return data
+            f.seek(0)
+            first_line = f.readline().decode("utf-8", errors="replace").strip()
+        if first_line:
+            data = json.loads(first_line)
+            if data.get("_type") == "metadata":
+                return data
+        return None
@@ -1,232 +1,183 @@
 """Session management for conversation history."""
 
-import json
-import os
-import threading
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from contextlib import contextmanager
-from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Any
 
-from loguru import logger
+from joyhousebot.session.base import Session, SessionBackend
+from joyhousebot.session.jsonl_backend import JsonlSessionBackend
+from joyhousebot.session.sqlite_backend import SqliteSessionBackend
 
-from joyhousebot.utils.helpers import ensure_dir, safe_filename
+__all__ = ["Session", "SessionManager", "default_sessions_dir", "create_session_backend"]
 
-try:
-    import fcntl
-except ImportError:  # pragma: no cover - Windows fallback
-    fcntl = None
 
+def default_sessions_dir() -> Path:
+    return Path.home() / ".joyhousebot" / "sessions"
 
-@dataclass
-class Session:
-    """
-    A conversation session.
-
-    Stores messages in JSONL format for easy reading and persistence.
-
-    Important: Messages are append-only for LLM cache efficiency.
-    The consolidation process writes summaries to MEMORY.md/HISTORY.md
-    but does NOT modify the messages list or get_history() output.
-    """
 
-    key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    metadata: dict[str, Any] = field(default_factory=dict)
-    last_consolidated: int = 0  # Number of messages already consolidated to files
-    
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session."""
-        msg = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        self.messages.append(msg)
-        self.updated_at = datetime.now()
-    
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Get recent messages in LLM format (role + content only)."""
-        return [{"role": m["role"], "content": m["content"]} for m in self.messages[-max_messages:]]
-    
-    def clear(self) -> None:
-        """Clear all messages and reset session to initial state."""
-        self.messages = []
-        self.last_consolidated = 0
-        self.updated_at = datetime.now()
+def create_session_backend(sessions_config: Any | None = None) -> SessionBackend:
+    """Build the backend selected by sessions_config.backend ("jsonl" default, or "sqlite")."""
+    durability = str(getattr(sessions_config, "durability", "batch") or "batch").strip().lower()
+    backend = str(getattr(sessions_config, "backend", "jsonl") or "jsonl").strip().lower()
+    if backend == "sqlite":
+        sqlite_path = str(getattr(sessions_config, "sqlite_path", "") or "").strip()
+        db_path = Path(sqlite_path).expanduser() if sqlite_path else default_sessions_dir() / "sessions.db"
+        return SqliteSessionBackend(db_path, durability=durability)
+    return JsonlSessionBackend(
+        default_sessions_dir(),
+        durability=durability,
+        fsync_interval_s=max(0, int(getattr(sessions_config, "batch_fsync_interval_ms", 1000) or 0)) / 1000.0,
+        compact_every=int(getattr(sessions_config, "compact_every", 200) or 1),
+    )
 
 
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Storage is delegated to a SessionBackend: JSONL files (default, append-only with
+    periodic compaction) or a SQLite database (sessions.backend = "sqlite"). Loaded
+    sessions are kept in a bounded LRU cache (cache_max_entries, evicted after
+    cache_ttl_seconds without access); evicted sessions are reloaded on demand.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        sessions_config: Any | None = None,
+        backend: SessionBackend | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".joyhousebot" / "sessions")
-        self._cache: dict[str, Session] = {}
-        self._locks: dict[str, threading.Lock] = {}
-    
+        self.backend = backend or create_session_backend(sessions_config)
+        self.cache_max_entries = max(1, int(getattr(sessions_config, "cache_max_entries", 1000) or 1))
+        self.cache_ttl_s = max(0.0, float(getattr(sessions_config, "cache_ttl_seconds", 3600) or 0))
+        # key -> (session, last access monotonic time); most recently used last
+        self._cache: OrderedDict[str, tuple[Session, float]] = OrderedDict()
+        self._io_executor: ThreadPoolExecutor | None = None
+
     def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
-    
+        """Get the storage path for a session (session file, or the database for sqlite)."""
+        return self.backend.path_for(key)
+
+    def _cache_get(self, key: str) -> Session | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        session, last_access = entry
+        now = time.monotonic()
+        if self.cache_ttl_s and now - last_access > self.cache_ttl_s:
+            self._cache.pop(key, None)
+            return None
+        self._cache[key] = (session, now)
+        self._cache.move_to_end(key)
+        return session
+
+    def _cache_put(self, session: Session) -> None:
+        self._cache[session.key] = (session, time.monotonic())
+        self._cache.move_to_end(session.key)
+        while len(self._cache) > self.cache_max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            self.backend.forget(evicted)
+
     def get_or_create(self, key: str) -> Session:
         """
         Get an existing session or create a new one.
-        
+
         Args:
             key: Session key (usually channel:chat_id).
-        
+
         Returns:
             The session.
         """
-        if key in self._cache:
-            return self._cache[key]
-        
+        session = self._cache_get(key)
+        if session is not None:
+            return session
+
         session = self._load(key)
         if session is None:
             session = Session(key=key)
-        
-        self._cache[key] = session
+
+        self._cache_put(session)
         return session
-    
+
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
+        """Load a session from the backend."""
+        return self.backend.load(key)
 
-        if not path.exists():
-            return None
+    def get_history(self, key: str, max_messages: int | None = 500) -> list[dict[str, Any]]:
+        """
+        Recent messages (full dicts, oldest first; all when max_messages is None).
+
+        Served from the cache when the session is loaded; otherwise a range read that
+        does not load or cache the session.
+        """
+        session = self._cache_get(key)
+        if session is not None:
+            if max_messages is None:
+                return list(session.messages)
+            return list(session.messages[-max_messages:]) if max_messages > 0 else []
+        return self.backend.read_recent(key, max_messages)
 
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
-    
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-        lock = self._locks.setdefault(session.key, threading.Lock())
-        with lock:
-            with self._file_lock(path):
-                tmp_path = path.with_suffix(path.suffix + ".tmp")
-                with open(tmp_path, "w") as f:
-                    metadata_line = {
-                        "_type": "metadata",
-                        "created_at": session.created_at.isoformat(),
-                        "updated_at": session.updated_at.isoformat(),
-                        "metadata": session.metadata,
-                        "last_consolidated": session.last_consolidated
-                    }
-                    f.write(json.dumps(metadata_line) + "\n")
-                    for msg in session.messages:
-                        f.write(json.dumps(msg) + "\n")
-                    f.flush()
-                    os.fsync(f.fileno())
-
-                os.replace(tmp_path, path)
-
-        self._cache[session.key] = session
-
-    @contextmanager
-    def _file_lock(self, path: Path):
-        """Cross-process lock for session writes on POSIX systems."""
-        lock_path = path.with_suffix(path.suffix + ".lock")
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
-        lock_file = open(lock_path, "a+")
-        try:
-            if fcntl is not None:
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
-            yield
-        finally:
-            if fcntl is not None:
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
-            lock_file.close()
-    
+        """Save a session (appends new messages; rewrites when messages were removed)."""
+        self.backend.save(session)
+        session.needs_rewrite = False
+        self._cache_put(session)
+
+    async def save_async(self, session: Session) -> None:
+        """Save a session without blocking the event loop.
+
+        A snapshot is taken on the calling thread and written on a dedicated
+        single-thread executor, so writes are applied in submission order.
+        """
+        snapshot = Session(
+            key=session.key,
+            messages=list(session.messages),
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            metadata=copy.deepcopy(session.metadata),
+            last_consolidated=session.last_consolidated,
+            needs_rewrite=session.needs_rewrite,
+        )
+        session.needs_rewrite = False
+        self._cache_put(session)
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-io")
+        await asyncio.get_running_loop().run_in_executor(self._io_executor, self.backend.save, snapshot)
+
+    def flush(self) -> None:
+        """Make buffered writes durable (batch durability policy)."""
+        self.backend.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background writer."""
+        if self._io_executor is not None:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+        self.backend.close()
+
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
         self._cache.pop(key, None)
+        self.backend.forget(key)
 
     def delete(self, key: str) -> bool:
         """
-        Delete a session from disk and cache.
+        Delete a session from storage and cache.
         Returns True if the session existed and was removed.
         """
         self.invalidate(key)
-        path = self._get_session_path(key)
-        lock_path = path.with_suffix(path.suffix + ".lock")
-        if not path.exists():
-            return False
-        try:
-            if lock_path.exists():
-                try:
-                    lock_path.unlink()
-                except OSError:
-                    pass
-            path.unlink()
-            return True
-        except OSError as e:
-            logger.warning(f"Failed to delete session {key}: {e}")
-            return False
+        return self.backend.delete(key)
 
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
-        
+
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.backend.list_sessions()
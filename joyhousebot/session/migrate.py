@@ -0,0 +1,60 @@
+"""Import JSONL session files into the SQLite session backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from joyhousebot.session.jsonl_backend import read_session_file
+from joyhousebot.session.sqlite_backend import SqliteSessionBackend
+
+
+@dataclass
+class MigrationReport:
+    imported: int = 0
+    skipped: int = 0  # Already present in the database (use overwrite to replace)
+    failed: list[str] = field(default_factory=list)
+    messages: int = 0
+
+
+def key_from_filename(path: Path) -> str:
+    """Best-effort key for files written before metadata records carried the key."""
+    channel, sep, rest = path.stem.partition("_")
+    return f"{channel}:{rest}" if sep else channel
+
+
+def migrate_jsonl_to_sqlite(
+    sessions_dir: Path,
+    db_path: Path,
+    *,
+    overwrite: bool = False,
+) -> MigrationReport:
+    """
+    Copy every *.jsonl session in sessions_dir into the SQLite database at db_path.
+
+    Source files are left untouched; sessions already in the database are skipped
+    unless overwrite is set.
+    """
+    report = MigrationReport()
+    backend = SqliteSessionBackend(db_path, durability="os")
+    try:
+        existing = {row["key"] for row in backend.list_sessions()}
+        for path in sorted(Path(sessions_dir).glob("*.jsonl")):
+            try:
+                session, _ = read_session_file(path, key_from_filename(path))
+            except Exception as e:
+                logger.warning(f"Failed to read session file {path}: {e}")
+                report.failed.append(str(path))
+                continue
+            if session.key in existing and not overwrite:
+                report.skipped += 1
+                continue
+            session.needs_rewrite = True
+            backend.save(session)
+            report.imported += 1
+            report.messages += len(session.messages)
+    finally:
+        backend.close()
+    return report
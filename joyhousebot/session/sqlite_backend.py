@@ -0,0 +1,197 @@
+"""SQLite session backend: all sessions in one WAL database."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from joyhousebot.session.base import Session, SessionBackend
+from joyhousebot.utils.helpers import ensure_dir
+
+# Durability policy -> PRAGMA synchronous. In WAL mode NORMAL only risks the most
+# recent commits on power loss (never corruption), which matches "batch".
+_SYNCHRONOUS = {"always": "FULL", "batch": "NORMAL", "os": "OFF"}
+
+
+class SqliteSessionBackend(SessionBackend):
+    """
+    Sessions in a SQLite database (WAL mode).
+
+    sessions(key, created_at, updated_at, ...) is indexed by updated_at so listing is a
+    single indexed scan; messages(session_key, seq) is the clustered key, so appends
+    insert only new rows and recent-history reads are a bounded range scan.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path, durability: str = "batch"):
+        self.db_path = Path(db_path)
+        ensure_dir(self.db_path.parent)
+        self.durability = durability if durability in _SYNCHRONOUS else "batch"
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS[self.durability]};")
+            self._conn = conn
+        return self._conn
+
+    def _init_db(self) -> None:
+        with self._lock:
+            self._connection().executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    key TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    metadata_json TEXT NOT NULL DEFAULT '{}',
+                    last_consolidated INTEGER NOT NULL DEFAULT 0,
+                    message_count INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_sessions_updated_at
+                    ON sessions(updated_at);
+
+                CREATE TABLE IF NOT EXISTS messages (
+                    session_key TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    body_json TEXT NOT NULL,
+                    PRIMARY KEY (session_key, seq)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    def path_for(self, key: str) -> Path:
+        return self.db_path
+
+    def load(self, key: str) -> Session | None:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT * FROM sessions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            bodies = conn.execute(
+                "SELECT body_json FROM messages WHERE session_key = ? ORDER BY seq", (key,)
+            ).fetchall()
+        try:
+            return Session(
+                key=key,
+                messages=[json.loads(b["body_json"]) for b in bodies],
+                created_at=datetime.fromisoformat(row["created_at"]),
+                updated_at=datetime.fromisoformat(row["updated_at"]),
+                metadata=json.loads(row["metadata_json"] or "{}"),
+                last_consolidated=int(row["last_consolidated"] or 0),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    def read_recent(self, key: str, max_messages: int | None) -> list[dict[str, Any]]:
+        if max_messages is None:
+            max_messages = -1  # SQLite: negative LIMIT means no limit
+        elif max_messages <= 0:
+            return []
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT body_json FROM messages WHERE session_key = ? ORDER BY seq DESC LIMIT ?",
+                (key, max_messages),
+            ).fetchall()
+        return [json.loads(r["body_json"]) for r in reversed(rows)]
+
+    def save(self, session: Session) -> None:
+        total = len(session.messages)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT message_count FROM sessions WHERE key = ?", (session.key,)
+                ).fetchone()
+                stored = int(row["message_count"]) if row is not None else 0
+                if session.needs_rewrite or stored > total:
+                    conn.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+                    stored = 0
+                if total > stored:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO messages (session_key, seq, body_json) VALUES (?, ?, ?)",
+                        [(session.key, seq, json.dumps(session.messages[seq])) for seq in range(stored, total)],
+                    )
+                conn.execute(
+                    """
+                    INSERT INTO sessions (key, created_at, updated_at, metadata_json, last_consolidated, message_count)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        updated_at = excluded.updated_at,
+                        metadata_json = excluded.metadata_json,
+                        last_consolidated = excluded.last_consolidated,
+                        message_count = excluded.message_count
+                    """,
+                    (
+                        session.key,
+                        session.created_at.isoformat(),
+                        session.updated_at.isoformat(),
+                        json.dumps(session.metadata),
+                        session.last_consolidated,
+                        total,
+                    ),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+                cur = conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cur.rowcount > 0
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, created_at, updated_at, message_count FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {
+                "key": r["key"],
+                "created_at": r["created_at"],
+                "updated_at": r["updated_at"],
+                "message_count": r["message_count"],
+                "path": str(self.db_path),
+            }
+            for r in rows
+        ]
+
+    def flush(self) -> None:
+        """Checkpoint the WAL into the main database file."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+                except sqlite3.Error:
+                    pass
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
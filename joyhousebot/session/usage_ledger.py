@@ -0,0 +1,338 @@
+"""Pre-aggregated token/cost usage per session, day, model, provider and channel."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from joyhousebot.utils.helpers import ensure_dir
+from joyhousebot.utils.tokens import count_tokens
+
+LOG_PREVIEW_CHARS = 1000
+ROLLUP_DIMENSIONS = ("model", "provider", "channel")
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count for messages without provider usage (same counter as context budgeting)."""
+    return count_tokens(text or "")
+
+
+def _timestamp_ms(raw: Any) -> int | None:
+    if isinstance(raw, (int, float)) and raw > 0:
+        return int(raw) if raw >= 1e12 else int(raw * 1000)
+    if isinstance(raw, str) and raw.strip():
+        try:
+            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+    return None
+
+
+def _day(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def message_usage(message: dict[str, Any]) -> tuple[int, int, float]:
+    """(input tokens, output tokens, cost) for one session message; estimates when usage is missing."""
+    role = str(message.get("role") or "")
+    usage = message.get("usage")
+    if isinstance(usage, dict):
+        inp = int(usage.get("input") or usage.get("prompt_tokens") or 0)
+        out = int(usage.get("output") or usage.get("completion_tokens") or 0)
+    else:
+        tokens = estimate_tokens(str(message.get("content") or ""))
+        inp = tokens if role == "user" else 0
+        out = tokens if role == "assistant" else 0
+    cost = message.get("cost")
+    return inp, out, float(cost) if isinstance(cost, (int, float)) and cost >= 0 else 0.0
+
+
+def message_cache_usage(message: dict[str, Any]) -> tuple[int, int]:
+    """(prompt tokens read from, written to the provider prompt cache) for one session message."""
+    usage = message.get("usage")
+    if not isinstance(usage, dict):
+        return 0, 0
+    read = usage.get("cacheRead") or usage.get("cache_read_tokens") or 0
+    write = usage.get("cacheWrite") or usage.get("cache_write_tokens") or 0
+    return int(read), int(write)
+
+
+def provider_from_model(model: str) -> str:
+    return model.split("/", 1)[0].strip() if "/" in model else ""
+
+
+def message_fingerprint(message: dict[str, Any]) -> str:
+    """Identity of one stored message (role, timestamp, content), to detect a replaced history."""
+    raw = "\x1f".join(str(message.get(k) or "") for k in ("role", "timestamp", "content"))
+    return hashlib.sha1(raw.encode("utf-8", "replace")).hexdigest()
+
+
+class UsageLedger:
+    """
+    SQLite ledger of session usage, updated as turns are persisted.
+
+    usage_daily holds one row per (session, day, model, provider, channel) with summed
+    tokens, cost and message counts, so dashboards aggregate O(days x dimensions) rows
+    instead of re-reading every message. usage_events keeps one short row per message
+    for per-session timeseries and logs. usage_sessions records how many messages of
+    each session have been ingested, which makes ingest() idempotent and incremental.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.db_path.parent)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS usage_sessions (
+                    session_key TEXT PRIMARY KEY,
+                    ingested INTEGER NOT NULL DEFAULT 0,
+                    last_fingerprint TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS usage_daily (
+                    session_key TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    model TEXT NOT NULL DEFAULT '',
+                    provider TEXT NOT NULL DEFAULT '',
+                    channel TEXT NOT NULL DEFAULT '',
+                    messages INTEGER NOT NULL DEFAULT 0,
+                    user_messages INTEGER NOT NULL DEFAULT 0,
+                    assistant_messages INTEGER NOT NULL DEFAULT 0,
+                    tool_calls INTEGER NOT NULL DEFAULT 0,
+                    tool_results INTEGER NOT NULL DEFAULT 0,
+                    errors INTEGER NOT NULL DEFAULT 0,
+                    input INTEGER NOT NULL DEFAULT 0,
+                    output INTEGER NOT NULL DEFAULT 0,
+                    cache_read INTEGER NOT NULL DEFAULT 0,
+                    cache_write INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0,
+                    output_cost REAL NOT NULL DEFAULT 0,
+                    first_ms INTEGER,
+                    last_ms INTEGER,
+                    PRIMARY KEY (session_key, day, model, provider, channel)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_usage_daily_day ON usage_daily(day);
+
+                CREATE TABLE IF NOT EXISTS usage_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_key TEXT NOT NULL,
+                    ts_ms INTEGER,
+                    timestamp TEXT,
+                    role TEXT NOT NULL,
+                    model TEXT NOT NULL DEFAULT '',
+                    input INTEGER NOT NULL DEFAULT 0,
+                    output INTEGER NOT NULL DEFAULT 0,
+                    cache_read INTEGER NOT NULL DEFAULT 0,
+                    cache_write INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0,
+                    preview TEXT NOT NULL DEFAULT ''
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_usage_events_session ON usage_events(session_key, id);
+                """
+            )
+            # Ledgers created before prompt-cache accounting lack the cache columns.
+            for table in ("usage_daily", "usage_events"):
+                cols = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+                for col in ("cache_read", "cache_write"):
+                    if col not in cols:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} INTEGER NOT NULL DEFAULT 0")
+            cols = {r["name"] for r in conn.execute("PRAGMA table_info(usage_sessions)")}
+            if "last_fingerprint" not in cols:
+                conn.execute("ALTER TABLE usage_sessions ADD COLUMN last_fingerprint TEXT")
+            self._conn = conn
+        return self._conn
+
+    def known_sessions(self) -> set[str]:
+        with self._lock:
+            rows = self._connection().execute("SELECT session_key FROM usage_sessions").fetchall()
+        return {r["session_key"] for r in rows}
+
+    def has_session(self, session_key: str) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM usage_sessions WHERE session_key = ?", (session_key,)
+            ).fetchone()
+        return row is not None
+
+    def ingest(
+        self,
+        session_key: str,
+        messages: list[dict[str, Any]],
+        *,
+        channel: str | None = None,
+        provider_for_model: Callable[[str], str] | None = None,
+    ) -> int:
+        """
+        Record messages of a session not yet ingested; returns how many were added.
+
+        messages is the full session history. The cursor remembers a fingerprint of the
+        last ingested message; when the history is shorter than the cursor, or the message
+        at the cursor is a different one, the session was cleared (/new, sessions.reset)
+        and the current messages are counted afresh, even if it has grown back past the
+        old count.
+        """
+        if channel is None:
+            channel = session_key.split(":", 1)[0] if ":" in session_key else ""
+        resolve_provider = provider_for_model or provider_from_model
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT ingested, last_fingerprint FROM usage_sessions WHERE session_key = ?",
+                    (session_key,),
+                ).fetchone()
+                start = int(row["ingested"]) if row is not None else 0
+                if start > len(messages) or (
+                    start > 0
+                    and row["last_fingerprint"] is not None
+                    and message_fingerprint(messages[start - 1]) != row["last_fingerprint"]
+                ):
+                    start = 0
+                fresh = messages[start:]
+                self._record_locked(conn, session_key, fresh, channel, resolve_provider)
+                conn.execute(
+                    """
+                    INSERT INTO usage_sessions (session_key, ingested, last_fingerprint) VALUES (?, ?, ?)
+                    ON CONFLICT(session_key) DO UPDATE SET
+                        ingested = excluded.ingested, last_fingerprint = excluded.last_fingerprint
+                    """,
+                    (session_key, len(messages), message_fingerprint(messages[-1]) if messages else None),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(fresh)
+
+    @staticmethod
+    def _record_locked(
+        conn: sqlite3.Connection,
+        session_key: str,
+        messages: Iterable[dict[str, Any]],
+        channel: str,
+        resolve_provider: Callable[[str], str],
+    ) -> None:
+        daily_rows = []
+        event_rows = []
+        for m in messages:
+            role = str(m.get("role") or "")
+            content = str(m.get("content") or "")
+            model = str(m.get("model") or "")
+            inp, out, cost = message_usage(m)
+            cache_read, cache_write = message_cache_usage(m)
+            ts_ms = _timestamp_ms(m.get("timestamp"))
+            is_error = 1 if "error" in content.lower() else 0
+            event_rows.append((
+                session_key, ts_ms, m.get("timestamp") if isinstance(m.get("timestamp"), str) else None,
+                role, model, inp, out, cache_read, cache_write, cost, content[:LOG_PREVIEW_CHARS],
+            ))
+            if ts_ms is None:
+                continue
+            daily_rows.append((
+                session_key, _day(ts_ms), model, resolve_provider(model) if model else "", channel,
+                1 if role == "user" else 0,
+                1 if role == "assistant" else 0,
+                1 if m.get("tools_used") else 0,
+                1 if role == "tool" else 0,
+                is_error,
+                inp, out, cache_read, cache_write, cost,
+                cost if role == "assistant" else 0.0,
+                ts_ms, ts_ms,
+            ))
+        if event_rows:
+            conn.executemany(
+                """
+                INSERT INTO usage_events (
+                    session_key, ts_ms, timestamp, role, model, input, output, cache_read, cache_write, cost, preview
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                event_rows,
+            )
+        if daily_rows:
+            conn.executemany(
+                """
+                INSERT INTO usage_daily (
+                    session_key, day, model, provider, channel, messages, user_messages, assistant_messages,
+                    tool_calls, tool_results, errors, input, output, cache_read, cache_write, cost, output_cost,
+                    first_ms, last_ms
+                ) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(session_key, day, model, provider, channel) DO UPDATE SET
+                    messages = messages + 1,
+                    user_messages = user_messages + excluded.user_messages,
+                    assistant_messages = assistant_messages + excluded.assistant_messages,
+                    tool_calls = tool_calls + excluded.tool_calls,
+                    tool_results = tool_results + excluded.tool_results,
+                    errors = errors + excluded.errors,
+                    input = input + excluded.input,
+                    output = output + excluded.output,
+                    cache_read = cache_read + excluded.cache_read,
+                    cache_write = cache_write + excluded.cache_write,
+                    cost = cost + excluded.cost,
+                    output_cost = output_cost + excluded.output_cost,
+                    first_ms = MIN(first_ms, excluded.first_ms),
+                    last_ms = MAX(last_ms, excluded.last_ms)
+                """,
+                daily_rows,
+            )
+
+    def daily_rollups(self, start_day: str, end_day: str, group_by: tuple[str, ...] = ("session_key", "day")) -> list[dict[str, Any]]:
+        """Summed usage_daily rows for days in [start_day, end_day], grouped by the given columns."""
+        allowed = {"session_key", "day", *ROLLUP_DIMENSIONS}
+        if not group_by or any(col not in allowed for col in group_by):
+            raise ValueError(f"invalid group_by: {group_by}")
+        cols = ", ".join(group_by)
+        with self._lock:
+            rows = self._connection().execute(
+                f"""
+                SELECT {cols},
+                    SUM(messages) AS messages, SUM(user_messages) AS user_messages,
+                    SUM(assistant_messages) AS assistant_messages, SUM(tool_calls) AS tool_calls,
+                    SUM(tool_results) AS tool_results, SUM(errors) AS errors,
+                    SUM(input) AS input, SUM(output) AS output,
+                    SUM(cache_read) AS cache_read, SUM(cache_write) AS cache_write, SUM(cost) AS cost,
+                    SUM(output_cost) AS output_cost, MIN(first_ms) AS first_ms, MAX(last_ms) AS last_ms
+                FROM usage_daily
+                WHERE day BETWEEN ? AND ?
+                GROUP BY {cols}
+                ORDER BY {cols}
+                """,
+                (start_day, end_day),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def events(self, session_key: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Per-message usage rows of a session, oldest first (the last `limit` when given)."""
+        with self._lock:
+            rows = self._connection().execute(
+                """
+                SELECT ts_ms, timestamp, role, model, input, output, cache_read, cache_write, cost, preview
+                FROM usage_events WHERE session_key = ? ORDER BY id DESC LIMIT ?
+                """,
+                (session_key, -1 if limit is None else max(0, int(limit))),
+            ).fetchall()
+        return [dict(r) for r in reversed(rows)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
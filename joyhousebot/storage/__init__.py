@@ -1,6 +1,6 @@
 """Local storage backends."""
 
-from joyhousebot.storage.sqlite_store import LocalStateStore, TaskStatus
+from joyhousebot.storage.sqlite_store import AsyncLocalStateStore, LocalStateStore, TaskStatus
 
-__all__ = ["LocalStateStore", "TaskStatus"]
+__all__ = ["AsyncLocalStateStore", "LocalStateStore", "TaskStatus"]
 
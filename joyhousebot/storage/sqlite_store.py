@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterator, Literal
 
 from joyhousebot.utils.helpers import ensure_dir
 
 TaskStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+# Retries a task gets (failures plus expired leases) before it is marked failed.
+DEFAULT_TASK_MAX_RETRIES = 3
 
 
 def _utc_now() -> str:
@@ -46,24 +53,155 @@ class TaskRecord:
     error: dict[str, Any] | None
 
 
+class _ConnectionPool:
+    """
+    Long-lived connections to one database, handed out one per transaction.
+
+    Connections are configured once (WAL, pragmas) and keep sqlite3's per-connection
+    prepared-statement cache warm across calls. Idle connections beyond max_idle are
+    closed on release, so bursts from many threads do not leak handles.
+    """
+
+    def __init__(self, db_path: Path, max_idle: int = 4, cached_statements: int = 256):
+        self.db_path = db_path
+        self.max_idle = max(1, max_idle)
+        self.cached_statements = cached_statements
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; commit on success, roll back on error."""
+        conn = self.acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class AsyncLocalStateStore:
+    """
+    Awaitable facade over a LocalStateStore.
+
+    Every store method is available as a coroutine (``await store.aio.get_sync_json(...)``)
+    that runs on a dedicated single-thread executor, so the event loop never blocks on
+    SQLite and writes are applied in submission order. submit() schedules a call without
+    waiting for it (fire-and-forget writes such as trace persistence).
+    """
+
+    def __init__(self, store: "LocalStateStore"):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-store")
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.store, name)
+        if not callable(attr):
+            return attr
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(attr, *args, **kwargs))
+
+        return _call
+
+    async def run(self, fn: Any, /, *args: Any, **kwargs: Any) -> Any:
+        """Run a callable that uses the store (e.g. a response builder) on the store executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def submit(self, method: str, /, *args: Any, **kwargs: Any) -> Future:
+        return self._executor.submit(getattr(self.store, method), *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
 class LocalStateStore:
     """Local SQLite store for offline-first house operation."""
 
+    _shared: dict[str, "LocalStateStore"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
         ensure_dir(db_path.parent)
+        self._pool = _ConnectionPool(db_path)
+        self._aio: AsyncLocalStateStore | None = None
         self._init_db()
 
     @classmethod
     def default(cls) -> "LocalStateStore":
-        return cls(Path.home() / ".joyhousebot" / "state" / "house.db")
+        return cls.shared(Path.home() / ".joyhousebot" / "state" / "house.db")
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
-        return conn
+    @classmethod
+    def shared(cls, db_path: Path) -> "LocalStateStore":
+        """Process-wide store for db_path; schema init and migrations run only on first use."""
+        key = str(db_path)
+        stale: LocalStateStore | None = None
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None or not db_path.exists():
+                stale = store
+                store = cls(db_path)
+                cls._shared[key] = store
+        if stale is not None:
+            # The file was removed under it; release its pooled connections and executor thread.
+            stale.close()
+        return store
+
+    @property
+    def aio(self) -> AsyncLocalStateStore:
+        """Async facade sharing this store's connection pool."""
+        if self._aio is None:
+            with self._shared_lock:
+                if self._aio is None:
+                    self._aio = AsyncLocalStateStore(self)
+        return self._aio
+
+    def _connect(self) -> Any:
+        """Transaction scope on a pooled connection: ``with self._connect() as conn:``."""
+        return self._pool.transaction()
+
+    def close(self) -> None:
+        if self._aio is not None:
+            self._aio.shutdown()
+            self._aio = None
+        self._pool.close()
 
     def _init_db(self) -> None:
         with self._connect() as conn:
@@ -101,6 +239,10 @@ class LocalStateStore:
                 CREATE INDEX IF NOT EXISTS idx_task_queue_status_priority
                     ON task_queue(status, priority, created_at);
 
+                -- Covers the claim scan (status filter, priority order, retry gate) without table lookups.
+                CREATE INDEX IF NOT EXISTS idx_task_queue_claim
+                    ON task_queue(status, priority, created_at, next_retry_at);
+
                 CREATE TABLE IF NOT EXISTS task_execution_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     task_id TEXT NOT NULL,
@@ -164,6 +306,7 @@ class LocalStateStore:
                 """
             )
             self._migrate_identity_columns(conn)
+            self._migrate_task_lease_columns(conn)
             self._migrate_wallet_to_wallets(conn)
 
     def _migrate_identity_columns(self, conn: sqlite3.Connection) -> None:
@@ -183,6 +326,19 @@ class LocalStateStore:
             if name not in existing:
                 conn.execute(f"ALTER TABLE house_identity ADD COLUMN {name} {type_def}")
 
+    def _migrate_task_lease_columns(self, conn: sqlite3.Connection) -> None:
+        """Lease columns for claimed tasks (worker id + expiry used to requeue tasks of crashed workers)."""
+        existing = {
+            str(row["name"])
+            for row in conn.execute("PRAGMA table_info(task_queue)").fetchall()
+        }
+        for name in ("lease_owner", "lease_expires_at"):
+            if name not in existing:
+                conn.execute(f"ALTER TABLE task_queue ADD COLUMN {name} TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_queue_lease ON task_queue(status, lease_expires_at)"
+        )
+
     def _migrate_wallet_to_wallets(self, conn: sqlite3.Connection) -> None:
         """Migrate single wallet row to wallets table if any."""
         row = conn.execute(
@@ -322,6 +478,10 @@ class LocalStateStore:
             ).fetchone()
         if not row:
             return None
+        return self._task_from_row(row)
+
+    @staticmethod
+    def _task_from_row(row: sqlite3.Row) -> TaskRecord:
         return TaskRecord(
             task_id=str(row["task_id"]),
             source=str(row["source"]),
@@ -337,31 +497,125 @@ class LocalStateStore:
             error=json.loads(row["error_json"]) if row["error_json"] else None,
         )
 
-    def pop_next_queued_task(self) -> TaskRecord | None:
+    def claim_tasks(
+        self,
+        *,
+        limit: int = 1,
+        lease_owner: str | None = None,
+        lease_seconds: int | None = None,
+        max_retries: int = DEFAULT_TASK_MAX_RETRIES,
+    ) -> list[TaskRecord]:
+        """
+        Atomically claim up to `limit` runnable queued tasks (priority order).
+
+        One IMMEDIATE transaction: requeue running tasks whose lease expired, flip the
+        next queued rows to running with UPDATE ... RETURNING, and log the claims. Safe
+        with several worker processes on the same database. With lease_seconds the
+        claim expires unless renewed (renew_task_lease); without it the task stays
+        running until its status is updated. An expired lease counts as a retry, so a
+        task that keeps crashing or hanging its worker fails after max_retries.
+        """
+        limit = max(1, int(limit))
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        lease_expires_at = (
+            (now_dt + timedelta(seconds=max(1, int(lease_seconds)))).isoformat() if lease_seconds else None
+        )
         with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT task_id
-                FROM task_queue
-                WHERE status = 'queued'
-                  AND (next_retry_at IS NULL OR julianday(next_retry_at) <= julianday('now'))
-                ORDER BY priority ASC, created_at ASC
-                LIMIT 1
+            conn.execute("BEGIN IMMEDIATE")
+            self._requeue_expired_leases_locked(conn, now, max_retries)
+            rows = conn.execute(
                 """
-            ).fetchone()
-            if not row:
-                return None
-            task_id = str(row["task_id"])
-            conn.execute(
+                UPDATE task_queue
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?, updated_at = ?
+                WHERE task_id IN (
+                    SELECT task_id
+                    FROM task_queue
+                    WHERE status = 'queued'
+                      AND (next_retry_at IS NULL OR julianday(next_retry_at) <= julianday(?))
+                    ORDER BY priority ASC, created_at ASC
+                    LIMIT ?
+                )
+                RETURNING task_id, source, task_type, task_version, payload_json, status,
+                          priority, retry_count, next_retry_at, error_json, created_at, updated_at
+                """,
+                (lease_owner, lease_expires_at, now, now, limit),
+            ).fetchall()
+            detail = {"status": "running"}
+            if lease_owner:
+                detail["lease_owner"] = lease_owner
+            if rows:
+                conn.executemany(
+                    "INSERT INTO task_execution_log (task_id, event, detail_json, created_at) VALUES (?, ?, ?, ?)",
+                    [(row["task_id"], "claimed", json.dumps(detail, ensure_ascii=False), now) for row in rows],
+                )
+        tasks = [self._task_from_row(row) for row in rows]
+        tasks.sort(key=lambda t: (t.priority, t.created_at))
+        return tasks
+
+    @staticmethod
+    def _requeue_expired_leases_locked(conn: sqlite3.Connection, now: str, max_retries: int) -> int:
+        # Same budget as a failed run: requeue while retry_count < max_retries, else fail.
+        error = json.dumps(
+            {"code": "LEASE_EXPIRED", "message": "worker lease expired before the task finished", "retryable": True}
+        )
+        rows = conn.execute(
+            """
+            UPDATE task_queue
+            SET status = CASE WHEN retry_count < ? THEN 'queued' ELSE 'failed' END,
+                retry_count = retry_count + 1,
+                error_json = ?,
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE status = 'running'
+              AND lease_expires_at IS NOT NULL
+              AND julianday(lease_expires_at) <= julianday(?)
+            RETURNING task_id, status, retry_count
+            """,
+            (max(0, int(max_retries)), error, now, now),
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "INSERT INTO task_execution_log (task_id, event, detail_json, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        row["task_id"],
+                        "lease_expired",
+                        json.dumps({"status": row["status"], "retry_count": row["retry_count"]}),
+                        now,
+                    )
+                    for row in rows
+                ],
+            )
+        return len(rows)
+
+    def requeue_expired_leases(self, max_retries: int = DEFAULT_TASK_MAX_RETRIES) -> int:
+        """Requeue (or fail, past max_retries) running tasks whose lease expired; returns how many."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return self._requeue_expired_leases_locked(conn, _utc_now(), max_retries)
+
+    def renew_task_lease(self, *, task_id: str, lease_owner: str, lease_seconds: int) -> bool:
+        """Extend a claimed task's lease; False if the task is no longer held by lease_owner."""
+        now_dt = datetime.now(timezone.utc)
+        with self._connect() as conn:
+            cur = conn.execute(
                 """
                 UPDATE task_queue
-                SET status = 'running', updated_at = ?
-                WHERE task_id = ?
+                SET lease_expires_at = ?, updated_at = ?
+                WHERE task_id = ? AND status = 'running' AND lease_owner = ?
                 """,
-                (_utc_now(), task_id),
+                (
+                    (now_dt + timedelta(seconds=max(1, int(lease_seconds)))).isoformat(),
+                    now_dt.isoformat(),
+                    task_id,
+                    lease_owner,
+                ),
             )
-        self.log_task_event(task_id=task_id, event="claimed", detail={"status": "running"})
-        return self.get_task(task_id)
+            return cur.rowcount > 0
+
+    def pop_next_queued_task(self) -> TaskRecord | None:
+        tasks = self.claim_tasks(limit=1)
+        return tasks[0] if tasks else None
 
     def update_task_status(
         self,
@@ -381,6 +635,8 @@ class LocalStateStore:
                     error_json = ?,
                     retry_count = retry_count + ?,
                     next_retry_at = ?,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
                     updated_at = ?
                 WHERE task_id = ?
                 """,
@@ -413,25 +669,7 @@ class LocalStateStore:
 
         with self._connect() as conn:
             rows = conn.execute(query, params).fetchall()
-        tasks: list[TaskRecord] = []
-        for row in rows:
-            tasks.append(
-                TaskRecord(
-                    task_id=str(row["task_id"]),
-                    source=str(row["source"]),
-                    task_type=str(row["task_type"]),
-                    task_version=str(row["task_version"]),
-                    payload=json.loads(row["payload_json"]) if row["payload_json"] else {},
-                    status=str(row["status"]),
-                    priority=int(row["priority"]),
-                    retry_count=int(row["retry_count"]),
-                    next_retry_at=row["next_retry_at"],
-                    created_at=str(row["created_at"]),
-                    updated_at=str(row["updated_at"]),
-                    error=json.loads(row["error_json"]) if row["error_json"] else None,
-                )
-            )
-        return tasks
+        return [self._task_from_row(row) for row in rows]
 
     def requeue_with_backoff(
         self,
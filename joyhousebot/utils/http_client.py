@@ -0,0 +1,387 @@
+"""Process-wide pooled HTTP client for outbound tool and provider requests."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import ipaddress
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+from urllib.parse import urlparse
+from urllib.request import getproxies
+
+import httpx
+from loguru import logger
+
+# Per-caller request timeouts (seconds); config tools.http.timeouts overrides entries.
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    "web_search": 10.0,
+    "web_fetch": 30.0,
+    "url_ingest": 30.0,
+    "transcription": 60.0,
+}
+DEFAULT_TIMEOUT = 30.0
+_DNS_MAX_ENTRIES = 1024
+
+
+class DnsCache:
+    """TTL cache of host -> resolved addresses, filled via the event loop's getaddrinfo."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = _DNS_MAX_ENTRIES) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._entries: dict[str, tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """Addresses for host (cached); IP literals are returned as-is."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return list(entry[1])
+            self.misses += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        if addresses and self.ttl_seconds > 0:
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[host] = (now + self.ttl_seconds, addresses)
+        return addresses
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def _dns_backend(inner: Any, dns: DnsCache) -> Any:
+    """httpcore network backend that connects to DnsCache addresses (TLS still uses the hostname for SNI)."""
+    import httpcore
+
+    class CachingDnsBackend(httpcore.AsyncNetworkBackend):
+        async def connect_tcp(
+            self,
+            host: str,
+            port: int,
+            timeout: float | None = None,
+            local_address: str | None = None,
+            socket_options: Iterable[Any] | None = None,
+        ) -> Any:
+            try:
+                addresses = await dns.resolve(host, port)
+            except OSError:
+                addresses = []
+            last_error: Exception | None = None
+            for address in addresses or [host]:
+                try:
+                    return await inner.connect_tcp(
+                        address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                    )
+                except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                    last_error = e
+            assert last_error is not None
+            raise last_error
+
+        async def connect_unix_socket(self, path: str, timeout: float | None = None, socket_options: Any = None) -> Any:
+            return await inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+        async def sleep(self, seconds: float) -> None:
+            await inner.sleep(seconds)
+
+    return CachingDnsBackend()
+
+
+def _httpcore_error_map() -> tuple[tuple[type[Exception], type[httpx.TransportError]], ...]:
+    import httpcore
+
+    # Most specific first; mirrors the exceptions httpx's own transport raises.
+    return (
+        (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+        (httpcore.ReadTimeout, httpx.ReadTimeout),
+        (httpcore.WriteTimeout, httpx.WriteTimeout),
+        (httpcore.PoolTimeout, httpx.PoolTimeout),
+        (httpcore.TimeoutException, httpx.TimeoutException),
+        (httpcore.ConnectError, httpx.ConnectError),
+        (httpcore.ReadError, httpx.ReadError),
+        (httpcore.WriteError, httpx.WriteError),
+        (httpcore.NetworkError, httpx.NetworkError),
+        (httpcore.ProxyError, httpx.ProxyError),
+        (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+        (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+        (httpcore.ProtocolError, httpx.ProtocolError),
+    )
+
+
+def _as_httpx_error(exc: Exception) -> Exception:
+    for core_type, httpx_type in _httpcore_error_map():
+        if isinstance(exc, core_type):
+            return httpx_type(str(exc))
+    return exc
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for part in self._stream:
+                yield part
+        except Exception as e:
+            mapped = _as_httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _DnsCachingTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an httpcore connection pool whose network backend resolves through a DnsCache."""
+
+    def __init__(self, dns: DnsCache, limits: httpx.Limits, http2: bool = False) -> None:
+        import httpcore
+
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=_dns_backend(httpcore.AnyIOBackend(), dns),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        import httpcore
+
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self._pool.handle_async_request(core_request)
+        except Exception as e:
+            mapped = _as_httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+# Close tasks for superseded clients, referenced until they finish.
+_closing: set[asyncio.Future[Any]] = set()
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except RuntimeError as e:
+        # Created on an event loop that is already closed; nothing left to release.
+        logger.debug("HTTP client close skipped: {}", e)
+
+
+def _close_superseded(client: httpx.AsyncClient | None, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Close a client that is being replaced, on the event loop that owns its connections."""
+    if client is None or client.is_closed:
+        return
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if loop is not None and loop is not current and loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), loop)
+    elif current is not None and loop is current:
+        task = current.create_task(_aclose_quietly(client))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    # Otherwise the owning loop is stopped or closed: its transports cannot be awaited any
+    # more, and dropping the client lets them release their sockets when collected.
+
+
+class HttpClientService:
+    """
+    One pooled httpx.AsyncClient shared by web_search, web_fetch, url ingest and
+    transcription instead of a fresh client (new TCP/TLS handshakes) per call.
+
+    Adds connection limits / keep-alive, optional HTTP/2, a TTL DNS cache, a
+    per-host concurrency cap and per-caller timeouts. The client is created lazily
+    and recreated when used from a different event loop (e.g. successive
+    asyncio.run calls in the CLI); the superseded client is closed. Pass transport= (e.g. httpx.MockTransport) to
+    serve requests locally in tests.
+    """
+
+    def __init__(self, config: Any | None = None, *, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.max_connections = max(1, int(getattr(config, "max_connections", 100)))
+        self.max_keepalive_connections = max(0, int(getattr(config, "max_keepalive_connections", 20)))
+        self.keepalive_expiry = float(getattr(config, "keepalive_expiry_seconds", 30.0))
+        self.http2 = bool(getattr(config, "http2", False))
+        self.max_redirects = max(0, int(getattr(config, "max_redirects", 5)))
+        self.per_host_limit = max(0, int(getattr(config, "per_host_limit", 8)))
+        self.timeouts = {**DEFAULT_TIMEOUTS, **dict(getattr(config, "timeouts", None) or {})}
+        dns_ttl = float(getattr(config, "dns_cache_ttl_seconds", 60.0))
+        self.dns = DnsCache(dns_ttl) if dns_ttl > 0 and transport is None else None
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+        self.clients_created = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # Connections and semaphores are bound to the loop that created them.
+            _close_superseded(self._client, self._loop)
+            self._client = self._build_client()
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    def timeout_for(self, name: str) -> float:
+        return float(self.timeouts.get(name, DEFAULT_TIMEOUT))
+
+    async def request(self, method: str, url: str, *, name: str = "", **kwargs: Any) -> httpx.Response:
+        """Send one request under the per-host limit; timeout defaults to timeout_for(name)."""
+        kwargs.setdefault("timeout", self.timeout_for(name))
+        client = self.client
+        async with self._host_slot(urlparse(url).hostname or ""):
+            self.requests += 1
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url: str, *, name: str = "", **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, name=name, **kwargs)
+
+    async def post(self, url: str, *, name: str = "", **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, name=name, **kwargs)
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        self._host_slots = {}
+        if client is not None and not client.is_closed:
+            await _aclose_quietly(client)
+
+    def close_soon(self) -> None:
+        """Release the pooled client without awaiting (for callers outside the event loop)."""
+        client, loop = self._client, self._loop
+        self._client, self._loop, self._host_slots = None, None, {}
+        _close_superseded(client, loop)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "maxConnections": self.max_connections,
+            "maxKeepaliveConnections": self.max_keepalive_connections,
+            "perHostLimit": self.per_host_limit,
+            "requests": self.requests,
+            "clientsCreated": self.clients_created,
+            "dnsCache": self.dns.stats() if self.dns is not None else None,
+        }
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        if self.per_host_limit <= 0 or not host:
+            yield
+            return
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        async with slot:
+            yield
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("tools.http.http2 is on but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        transport = self._transport
+        # httpx only mounts HTTP(S)_PROXY / ALL_PROXY when no transport is passed, and a
+        # proxy resolves target hosts itself, so the DNS cache is skipped behind one.
+        if transport is None and self.dns is not None and not _env_proxy_configured():
+            transport = _DnsCachingTransport(self.dns, limits, http2=http2)
+        self.clients_created += 1
+        return httpx.AsyncClient(
+            transport=transport,
+            limits=limits,
+            http2=http2,
+            max_redirects=self.max_redirects,
+        )
+
+
+def _env_proxy_configured() -> bool:
+    return any(getproxies().get(scheme) for scheme in ("http", "https", "all"))
+
+
+_shared: HttpClientService | None = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClientService:
+    """Process-wide service (defaults until configure_http_client is called)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClientService()
+        return _shared
+
+
+def configure_http_client(config: Any) -> HttpClientService:
+    """Replace the process-wide service with one built from config.tools.http."""
+    global _shared
+    cfg = getattr(getattr(config, "tools", None), "http", None)
+    with _shared_lock:
+        previous, _shared = _shared, HttpClientService(cfg)
+        service = _shared
+    if previous is not None:
+        previous.close_soon()
+    return service
+
+
+async def close_http_client() -> None:
+    """Close the process-wide client's pooled connections (call on shutdown)."""
+    with _shared_lock:
+        service = _shared
+    if service is not None:
+        await service.aclose()
@@ -0,0 +1,147 @@
+"""Token counting for context budgeting and usage estimates."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Protocol
+
+from loguru import logger
+
+# cl100k is litellm's bundled (offline) encoding and errs high for CJK against newer
+# tokenizers, which is the safe side for context budgets.
+DEFAULT_ENCODING = "cl100k_base"
+# Per-message structure (role, separators) on top of content tokens.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Images and other non-text content parts.
+NON_TEXT_PART_TOKENS = 64
+
+# Fallback calibration (measured against cl100k_base): English prose and code run
+# about 4 chars/token; CJK ideographs, kana and hangul about one token per char;
+# other non-ASCII scripts (Cyrillic, Greek, ...) about 2 chars/token.
+ASCII_CHARS_PER_TOKEN = 4
+CJK_TOKENS_PER_CHAR = 1.0
+OTHER_CHARS_PER_TOKEN = 2
+
+_CJK_RE = re.compile(
+    "[\u1100-\u11ff\u2e80-\u2fdf\u3000-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff"
+    "\uac00-\ud7af\uf900-\ufaff\uff00-\uffef\U00020000-\U0002fa1f]"
+)
+
+
+class TokenCounter(Protocol):
+    name: str
+
+    def count(self, text: str) -> int: ...
+
+
+class HeuristicTokenCounter:
+    """Script-aware character estimate used when no BPE tokenizer is available."""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        ascii_chars = len(text.encode("ascii", "ignore"))
+        if ascii_chars == len(text):
+            return (ascii_chars + ASCII_CHARS_PER_TOKEN - 1) // ASCII_CHARS_PER_TOKEN
+        cjk = len(_CJK_RE.findall(text))
+        other = len(text) - ascii_chars - cjk
+        estimate = (
+            ascii_chars / ASCII_CHARS_PER_TOKEN
+            + cjk * CJK_TOKENS_PER_CHAR
+            + other / OTHER_CHARS_PER_TOKEN
+        )
+        return int(estimate + 0.999)
+
+
+class TiktokenCounter:
+    """Exact BPE counts from a tiktoken encoding."""
+
+    def __init__(self, encoding: Any):
+        self._encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def _bundled_tiktoken_cache() -> None:
+    """Point tiktoken at litellm's bundled encodings so loading works offline (unless configured)."""
+    if os.environ.get("TIKTOKEN_CACHE_DIR"):
+        return
+    spec = importlib.util.find_spec("litellm")
+    if spec is None or not spec.submodule_search_locations:
+        return
+    bundled = Path(list(spec.submodule_search_locations)[0]) / "litellm_core_utils" / "tokenizers"
+    if bundled.is_dir():
+        os.environ["TIKTOKEN_CACHE_DIR"] = str(bundled)
+
+
+def load_token_counter(encoding: str = DEFAULT_ENCODING) -> TokenCounter:
+    """tiktoken counter when the package and encoding are available, else the heuristic."""
+    try:
+        import tiktoken
+
+        _bundled_tiktoken_cache()
+        return TiktokenCounter(tiktoken.get_encoding(encoding))
+    except Exception as e:
+        logger.debug(f"tiktoken unavailable ({e}); using heuristic token counts")
+        return HeuristicTokenCounter()
+
+
+_counter: TokenCounter | None = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Process-wide counter (loaded on first use)."""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = load_token_counter()
+    return _counter
+
+
+def set_token_counter(counter: TokenCounter | None) -> None:
+    """Install a counter (e.g. a provider-specific tokenizer); None reloads the default."""
+    global _counter
+    with _counter_lock:
+        _counter = counter
+
+
+def count_tokens(text: str) -> int:
+    return get_token_counter().count(text or "")
+
+
+def count_message_tokens(msg: dict[str, Any]) -> int:
+    """Tokens one chat message costs in the context window (content, tool calls, overhead)."""
+    counter = get_token_counter()
+    n = MESSAGE_OVERHEAD_TOKENS
+    content = msg.get("content")
+    if isinstance(content, str):
+        n += counter.count(content)
+    elif isinstance(content, list):
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "text" and "text" in part:
+                n += counter.count(str(part["text"]))
+            else:
+                n += NON_TEXT_PART_TOKENS
+    for call in msg.get("tool_calls") or []:
+        n += counter.count(str(call))
+    return n
+
+
+def message_tokens(msg: dict[str, Any]) -> int:
+    """Cached count from msg["tokens"] (set when the message was appended), else computed."""
+    cached = msg.get("tokens")
+    if isinstance(cached, int) and not isinstance(cached, bool) and cached >= 0:
+        return cached
+    return count_message_tokens(msg)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark MemoryVectorStore.search over large memory indexes.
+
+Fills a temporary memory index with random embeddings, then compares the previous
+per-row scan (struct.unpack + pure-Python cosine for every chunk) with the cached
+NumPy matrix: cold search (loads the matrix), warm search, and batched queries.
+
+Usage:
+  python scripts/bench_memory_vector_search.py
+  python scripts/bench_memory_vector_search.py --chunks 10000 100000 --dim 1536 --queries 20
+  python scripts/bench_memory_vector_search.py --skip-legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sqlite3
+import statistics
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from joyhousebot.services.retrieval.memory_vector_store import MemoryVectorStore
+
+
+def _fill(store: MemoryVectorStore, chunks: int, dim: int, rng: np.random.Generator) -> None:
+    store.db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store.db_path)
+    store._init_schema(conn)
+    batch = 5000
+    for start in range(0, chunks, batch):
+        vecs = rng.standard_normal((min(batch, chunks - start), dim), dtype=np.float32)
+        conn.executemany(
+            "INSERT INTO memory_index (scope_key, file_path, chunk_index, content, embedding, file_mtime)"
+            " VALUES ('shared', ?, ?, ?, ?, 0)",
+            [(f"memory/f{(start + i) // 50}.md", i, f"chunk {start + i}", v.tobytes()) for i, v in enumerate(vecs)],
+        )
+    conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('mtime_shared', '1')")
+    conn.commit()
+    conn.close()
+
+
+def _legacy_search(db_path: Path, query: list[float], top_k: int) -> list[tuple[float, int]]:
+    """The pre-matrix implementation: unpack and score every row in Python."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, embedding FROM memory_index WHERE scope_key = 'shared' ORDER BY id").fetchall()
+    conn.close()
+    nq = math.sqrt(sum(x * x for x in query))
+    scored = []
+    for row_id, blob in rows:
+        vec = struct.unpack(f"{len(blob) // 4}f", blob)
+        dot = sum(x * y for x, y in zip(query, vec))
+        nv = math.sqrt(sum(x * x for x in vec))
+        scored.append((dot / (nq * nv) if nq and nv else 0.0, row_id))
+    scored.sort(key=lambda s: -s[0])
+    return scored[:top_k]
+
+
+def _ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the slow per-row baseline")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>8} {'legacy ms':>10} {'cold ms':>9} {'warm p50':>9} {'warm p95':>9} {'batch/q ms':>11}")
+    for chunks in args.chunks:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MemoryVectorStore(Path(tmp))
+            _fill(store, chunks, args.dim, rng)
+            queries = [rng.standard_normal(args.dim, dtype=np.float32).tolist() for _ in range(args.queries)]
+
+            legacy = float("nan") if args.skip_legacy else _ms(lambda: _legacy_search(store.db_path, queries[0], args.top_k))
+            cold = _ms(lambda: store.search(None, queries[0], args.top_k))
+            warm = sorted(_ms(lambda q=q: store.search(None, q, args.top_k)) for q in queries)
+            batch = queries[: args.batch]
+            batch_ms = _ms(lambda: store.search_batch(None, batch, args.top_k)) / len(batch)
+
+            p95 = warm[min(len(warm) - 1, int(len(warm) * 0.95))]
+            print(
+                f"{chunks:>8} {legacy:>10.1f} {cold:>9.1f} {statistics.median(warm):>9.2f} "
+                f"{p95:>9.2f} {batch_ms:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
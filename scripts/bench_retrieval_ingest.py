@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark knowledge ingestion throughput into the FTS5 RetrievalStore.
+
+Indexes synthetic documents three ways and reports chunks/sec:
+  per-chunk  one connection + commit per chunk (the previous index_doc behaviour)
+  replace    RetrievalStore.replace_doc: one transaction per document
+  bulk       RetrievalStore.bulk_load: one transaction, one FTS rebuild, then optimize
+
+Usage:
+  python scripts/bench_retrieval_ingest.py
+  python scripts/bench_retrieval_ingest.py --docs 200 2000 --chunks-per-doc 20 --chunk-chars 1200
+  python scripts/bench_retrieval_ingest.py --skip-per-chunk
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+_WORDS = [
+    "agent", "memory", "vector", "index", "search", "house", "robot", "token", "prompt", "cache",
+    "sqlite", "query", "chunk", "ledger", "stream", "model", "worker", "queue", "lease", "policy",
+]
+
+
+def _docs(n: int, chunks_per_doc: int, chunk_chars: int, rng: random.Random) -> list[dict]:
+    words_per_chunk = max(1, chunk_chars // 7)
+    return [
+        {
+            "doc_id": f"doc{d}",
+            "source_type": "text",
+            "source_url": "",
+            "title": f"Document {d}",
+            "file_path": f"processed/doc{d}.md",
+            "chunks": [
+                {"text": " ".join(rng.choices(_WORDS, k=words_per_chunk)), "page": None}
+                for _ in range(chunks_per_doc)
+            ],
+        }
+        for d in range(n)
+    ]
+
+
+def _per_chunk(store: RetrievalStore, docs: list[dict]) -> None:
+    for doc in docs:
+        store.delete_by_doc_id(doc["doc_id"])
+        for i, c in enumerate(doc["chunks"]):
+            store.index_chunk(
+                doc["doc_id"], doc["source_type"], doc["source_url"], doc["title"], i, c["page"], c["text"],
+                file_path=doc["file_path"],
+            )
+
+
+def _replace(store: RetrievalStore, docs: list[dict]) -> None:
+    for doc in docs:
+        store.replace_doc(**doc)
+    store.optimize_if_due()
+
+
+def _bulk(store: RetrievalStore, docs: list[dict]) -> None:
+    with store.bulk_load() as loader:
+        for doc in docs:
+            loader.replace_doc(**doc)
+
+
+def _rate(fn, docs: list[dict], chunks: int) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RetrievalStore(Path(tmp))
+        started = time.perf_counter()
+        fn(store, docs)
+        elapsed = time.perf_counter() - started
+        assert store.search("agent", top_k=1), "index is empty after load"
+    return elapsed, chunks / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--chunks-per-doc", type=int, default=10)
+    parser.add_argument("--chunk-chars", type=int, default=1200)
+    parser.add_argument("--skip-per-chunk", action="store_true", help="Skip the slow per-chunk baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    modes = [("replace", _replace), ("bulk", _bulk)]
+    if not args.skip_per_chunk:
+        modes.insert(0, ("per-chunk", _per_chunk))
+    print(f"{'docs':>6} {'chunks':>7} {'mode':>10} {'seconds':>9} {'chunks/s':>10}")
+    for n in args.docs:
+        docs = _docs(n, args.chunks_per_doc, args.chunk_chars, rng)
+        chunks = n * args.chunks_per_doc
+        for name, fn in modes:
+            elapsed, rate = _rate(fn, docs, chunks)
+            print(f"{n:>6} {chunks:>7} {name:>10} {elapsed:>9.2f} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
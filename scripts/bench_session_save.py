@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark SessionManager.save latency against history length.
+
+Compares the append path with a full rewrite on every save (the previous
+behaviour) for each durability mode and session backend.
+
+Usage:
+  python scripts/bench_session_save.py
+  python scripts/bench_session_save.py --lengths 100 1000 10000 --saves 50 --durability always
+  python scripts/bench_session_save.py --backend sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from joyhousebot.session.manager import SessionManager
+
+
+def _bench(workspace: Path, backend: str, history: int, saves: int, durability: str, rewrite: bool) -> list[float]:
+    manager = SessionManager(workspace, sessions_config=SimpleNamespace(
+        backend=backend,
+        durability=durability,
+        batch_fsync_interval_ms=1000,
+        compact_every=10_000,
+    ))
+    key = f"bench:{backend}:{durability}:{int(rewrite)}:{history}"
+    session = manager.get_or_create(key)
+    for i in range(history):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i} " + "x" * 200)
+    manager.save(session)
+
+    samples: list[float] = []
+    for i in range(saves):
+        session.add_message("user", f"turn {i}")
+        session.add_message("assistant", f"reply {i} " + "y" * 200)
+        session.needs_rewrite = rewrite
+        started = time.perf_counter()
+        manager.save(session)
+        samples.append((time.perf_counter() - started) * 1000)
+    manager.close()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--saves", type=int, default=30)
+    parser.add_argument("--durability", nargs="+", default=["always", "batch", "os"])
+    parser.add_argument("--backend", nargs="+", default=["jsonl", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Session storage lives under ~/.joyhousebot; point HOME at the scratch dir.
+        os.environ["HOME"] = tmp
+        workspace = Path(tmp)
+        print(f"{'backend':<8} {'durability':<10} {'mode':<8} {'history':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for backend in args.backend:
+            for durability in args.durability:
+                for history in args.lengths:
+                    for mode, rewrite in (("rewrite", True), ("append", False)):
+                        samples = sorted(_bench(workspace, backend, history, args.saves, durability, rewrite))
+                        p50 = statistics.median(samples)
+                        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+                        print(f"{backend:<8} {durability:<10} {mode:<8} {history:>8} {p50:>9.3f} {p95:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Micro-benchmark LocalStateStore hot paths (insert_agent_trace, get_sync_json).
+
+Compares the shared, pooled store with constructing a store per call (what
+api/server.py::_get_store did before: schema init + fresh connection each time).
+
+Usage:
+  python scripts/bench_state_store.py
+  python scripts/bench_state_store.py --ops 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from joyhousebot.storage.sqlite_store import LocalStateStore
+
+
+def _measure(ops: int, fn: Callable[[int], None]) -> list[float]:
+    samples = []
+    for i in range(ops):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return sorted(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "house.db"
+        shared = LocalStateStore.shared(db_path)
+        shared.set_sync_json(name="auth.profile_usage", value={"p": {"last_used": 1}})
+
+        def trace(store_for: Callable[[], LocalStateStore]) -> Callable[[int], None]:
+            def _run(i: int) -> None:
+                store_for().insert_agent_trace(
+                    trace_id=f"run-{i}-{time.perf_counter_ns()}",
+                    session_key="bench:1",
+                    status="ok",
+                    started_at_ms=i,
+                    ended_at_ms=i + 1,
+                    steps_json="[]",
+                    tools_used="[]",
+                    message_preview="hello",
+                )
+            return _run
+
+        def sync_json(store_for: Callable[[], LocalStateStore]) -> Callable[[int], None]:
+            return lambda _i: store_for().get_sync_json(name="auth.profile_usage", default={})
+
+        cases = [
+            ("insert_agent_trace", "per-call", trace(lambda: LocalStateStore(db_path))),
+            ("insert_agent_trace", "shared", trace(lambda: LocalStateStore.shared(db_path))),
+            ("get_sync_json", "per-call", sync_json(lambda: LocalStateStore(db_path))),
+            ("get_sync_json", "shared", sync_json(lambda: LocalStateStore.shared(db_path))),
+        ]
+        print(f"{'operation':<20} {'store':<9} {'p50 us':>9} {'p95 us':>9} {'ops/s':>9}")
+        for name, mode, fn in cases:
+            samples = _measure(args.ops, fn)
+            p50 = statistics.median(samples)
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            ops_s = 1_000_000 / (sum(samples) / len(samples))
+            print(f"{name:<20} {mode:<9} {p50:>9.1f} {p95:>9.1f} {ops_s:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from joyhousebot.agent.loop import AgentLoop
+from joyhousebot.agent.tools.base import Tool
+from joyhousebot.bus.queue import MessageBus
+from joyhousebot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class _SlowTool(Tool):
+    def __init__(self, name: str, parallel_safe: bool, log: list[str], delay: float = 0.05):
+        self._name = name
+        self.parallel_safe = parallel_safe
+        self._log = log
+        self._delay = delay
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "test tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"key": {"type": "string"}}}
+
+    async def execute(self, key: str = "", **kwargs: Any) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self._log.append(f"start:{self._name}:{key}")
+        await asyncio.sleep(self._delay)
+        self._log.append(f"end:{self._name}:{key}")
+        self.active -= 1
+        return f"{self._name}:{key}"
+
+
+class _ToolCallingProvider(LLMProvider):
+    def __init__(self, calls: list[ToolCallRequest]) -> None:
+        super().__init__(api_key="x")
+        self._calls = calls
+        self.seen_messages: list[list[dict[str, Any]]] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.seen_messages.append(list(messages))
+        if len(self.seen_messages) == 1:
+            return LLMResponse(content=None, tool_calls=list(self._calls))
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "test/model"
+
+
+def _make_loop(tmp_path: Path, provider: LLMProvider, parallel: bool) -> AgentLoop:
+    config = SimpleNamespace(tools=SimpleNamespace(parallel_tool_calls=parallel, max_parallel_tool_calls=2))
+    return AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, config=config, max_iterations=3)
+
+
+def _calls(*specs: tuple[str, str]) -> list[ToolCallRequest]:
+    return [ToolCallRequest(id=f"call_{i}", name=name, arguments={"key": key}) for i, (name, key) in enumerate(specs)]
+
+
+@pytest.mark.asyncio
+async def test_parallel_safe_calls_overlap_with_cap_and_keep_result_order(tmp_path: Path) -> None:
+    log: list[str] = []
+    provider = _ToolCallingProvider(_calls(("fetch", "a"), ("fetch", "b"), ("fetch", "c")))
+    loop = _make_loop(tmp_path, provider, parallel=True)
+    fetch = _SlowTool("fetch", True, log)
+    loop.tools.register(fetch)
+
+    events: list[tuple[str, dict]] = []
+
+    async def on_event(etype: str, payload: dict) -> None:
+        events.append((etype, payload))
+
+    messages = [{"role": "user", "content": "go"}]
+    final, tools_used, _, _ = await loop._run_agent_loop(messages, execution_stream_callback=on_event)
+
+    assert final == "done"
+    assert fetch.peak == 2
+    assert tools_used == ["fetch", "fetch", "fetch"]
+    tool_msgs = [m for m in provider.seen_messages[1] if m.get("role") == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == ["call_0", "call_1", "call_2"]
+    assert [m["content"] for m in tool_msgs] == ["fetch:a", "fetch:b", "fetch:c"]
+    ends = [p for e, p in events if e == "tool_end"]
+    assert all("duration_ms" in p and "started_at_ms" in p for p in ends)
+
+
+@pytest.mark.asyncio
+async def test_unsafe_call_is_barrier_and_default_mode_is_sequential(tmp_path: Path) -> None:
+    log: list[str] = []
+    provider = _ToolCallingProvider(_calls(("fetch", "a"), ("write", "w"), ("fetch", "b")))
+    loop = _make_loop(tmp_path, provider, parallel=True)
+    loop.tools.register(_SlowTool("fetch", True, log))
+    loop.tools.register(_SlowTool("write", False, log))
+
+    await loop._run_agent_loop([{"role": "user", "content": "go"}])
+    assert log == [
+        "start:fetch:a", "end:fetch:a",
+        "start:write:w", "end:write:w",
+        "start:fetch:b", "end:fetch:b",
+    ]
+
+    log.clear()
+    provider = _ToolCallingProvider(_calls(("fetch", "a"), ("fetch", "b")))
+    loop = _make_loop(tmp_path, provider, parallel=False)
+    fetch = _SlowTool("fetch", True, log)
+    loop.tools.register(fetch)
+    await loop._run_agent_loop([{"role": "user", "content": "go"}])
+    assert fetch.peak == 1
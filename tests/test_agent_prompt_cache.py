@@ -0,0 +1,89 @@
+"""Tests for memoized system prompt sections in ContextBuilder."""
+
+from pathlib import Path
+
+from joyhousebot.agent.context import ContextBuilder
+from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.agent.prompt_cache import PromptSectionCache, stat_signature
+
+
+def _misses(builder: ContextBuilder, section: str) -> int:
+    return builder.prompt_cache_stats()["sections"][section]["misses"]
+
+
+def test_unchanged_prompt_is_served_from_cache(tmp_path: Path) -> None:
+    (tmp_path / "AGENTS.md").write_text("Be brief.")
+    builder = ContextBuilder(tmp_path)
+    first = builder.build_system_prompt()
+    second = builder.build_system_prompt()
+    assert first == second
+    assert "Be brief." in second
+    stats = builder.prompt_cache_stats()
+    assert stats["sections"]["bootstrap"] == {**stats["sections"]["bootstrap"], "hits": 1, "misses": 1}
+    assert stats["sections"]["skills"]["hits"] == 1
+    assert stats["hitRate"] == 0.5
+
+
+def test_only_dirty_sections_are_rebuilt(tmp_path: Path) -> None:
+    (tmp_path / "AGENTS.md").write_text("Be brief.")
+    builder = ContextBuilder(tmp_path)
+    builder.build_system_prompt()
+
+    (tmp_path / "AGENTS.md").write_text("Be thorough and precise.")
+    prompt = builder.build_system_prompt()
+    assert "Be thorough and precise." in prompt
+    assert _misses(builder, "bootstrap") == 2
+    assert _misses(builder, "skills") == 1
+    assert _misses(builder, "memory") == 1
+
+
+def test_memory_writes_and_new_skills_invalidate_their_sections(tmp_path: Path) -> None:
+    builder = ContextBuilder(tmp_path)
+    builder.build_system_prompt()
+
+    MemoryStore(tmp_path).write_long_term("- Prefers metric units.")
+    skill_dir = tmp_path / "skills" / "my-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\ndescription: Custom workspace skill\n---\n\nDo things.")
+
+    prompt = builder.build_system_prompt()
+    assert "Prefers metric units." in prompt
+    assert "Custom workspace skill" in prompt
+    assert _misses(builder, "memory") == 2
+    assert _misses(builder, "skills") == 2
+    assert _misses(builder, "bootstrap") == 1
+
+
+def test_scoped_memory_sections_are_cached_separately(tmp_path: Path) -> None:
+    MemoryStore(tmp_path).write_long_term("shared fact")
+    MemoryStore(tmp_path, scope_key="s1").write_long_term("scoped fact")
+    builder = ContextBuilder(tmp_path)
+    assert "shared fact" in builder.build_system_prompt()
+    assert "scoped fact" in builder.build_system_prompt(scope_key="s1")
+    assert "shared fact" in builder.build_system_prompt()
+    memory = builder.prompt_cache_stats()["sections"]["memory"]
+    assert (memory["hits"], memory["misses"]) == (1, 2)
+
+
+def test_section_cache_evicts_least_recently_used() -> None:
+    cache = PromptSectionCache(max_entries=2)
+    builds: list[str] = []
+
+    def build(name: str):
+        return lambda: builds.append(name) or name
+
+    cache.get("memory:a", 1, build("a"))
+    cache.get("memory:b", 1, build("b"))
+    cache.get("memory:a", 1, build("a"))
+    cache.get("memory:c", 1, build("c"))
+    cache.get("memory:a", 1, build("a"))
+    cache.get("memory:b", 1, build("b"))
+    assert builds == ["a", "b", "c", "b"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_stat_signature_marks_missing_files(tmp_path: Path) -> None:
+    (tmp_path / "a").write_text("x")
+    sig = stat_signature([tmp_path / "a", tmp_path / "b"])
+    assert sig[0][2] == 1
+    assert sig[1] == (str(tmp_path / "b"), None, None)
@@ -0,0 +1,123 @@
+"""Tests for streaming on every agent-loop iteration and streamed tool-call assembly."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import joyhousebot.providers.litellm_provider as lp
+from joyhousebot.agent.loop import AgentLoop
+from joyhousebot.bus.queue import MessageBus
+from joyhousebot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from joyhousebot.providers.litellm_provider import LiteLLMProvider, _merge_tool_call_delta
+
+
+class _ScriptedStreamingProvider(LLMProvider):
+    """Streams a tool call on the first turn and a plain answer on the second."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stream_calls = 0
+        self.chat_calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.chat_calls += 1
+        return LLMResponse(content="blocking")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.stream_calls += 1
+        if self.stream_calls == 1:
+            yield ("delta", "Checking.")
+            call = ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})
+            yield ("done", LLMResponse(content="Checking.", tool_calls=[call], finish_reason="tool_calls"))
+        else:
+            yield ("delta", "All ")
+            yield ("delta", "done.")
+            yield ("done", LLMResponse(content="All done."))
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_every_iteration_streams_and_reports_timing(tmp_path: Path) -> None:
+    provider = _ScriptedStreamingProvider()
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, model="test-model")
+    deltas: list[str] = []
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    async def on_delta(content: str) -> None:
+        deltas.append(content)
+
+    async def on_event(etype: str, payload: dict[str, Any]) -> None:
+        events.append((etype, payload))
+
+    final, tools_used, aborted, _ = await loop._run_agent_loop(
+        [{"role": "user", "content": "hi"}],
+        stream_callback=on_delta,
+        execution_stream_callback=on_event,
+    )
+    assert (final, tools_used, aborted) == ("All done.", ["list_dir"], False)
+    assert provider.stream_calls == 2 and provider.chat_calls == 0
+    assert deltas == ["Checking.", "\n\nAll ", "done."]
+    ends = [p for e, p in events if e == "llm_end"]
+    assert [p["iteration"] for p in ends] == [1, 2]
+    assert all(p["streamed"] and p["ttftMs"] is not None and p["durationMs"] >= p["ttftMs"] for p in ends)
+    assert [p["toolCalls"] for p in ends] == [1, 0]
+
+
+def test_streamed_tool_call_fragments_assemble_by_index() -> None:
+    acc: dict[int, dict[str, Any]] = {}
+    _merge_tool_call_delta(acc, {"index": 0, "id": "a", "function": {"name": "read_file", "arguments": ""}})
+    _merge_tool_call_delta(acc, {"index": 1, "id": "b", "function": {"name": "exec", "arguments": '{"cmd"'}})
+    _merge_tool_call_delta(acc, {"index": 0, "function": {"arguments": '{"path": '}})
+    _merge_tool_call_delta(acc, {"index": 0, "function": {"arguments": '"x"}'}})
+    _merge_tool_call_delta(acc, {"index": 1, "function": {"arguments": ': "ls"}'}})
+    assert acc == {
+        0: {"id": "a", "name": "read_file", "arguments": '{"path": "x"}'},
+        1: {"id": "b", "name": "exec", "arguments": '{"cmd": "ls"}'},
+    }
+
+
+async def test_streamed_object_chunk_usage_reaches_stored_message(tmp_path: Path, monkeypatch) -> None:
+    seen_kwargs: dict[str, Any] = {}
+
+    def _chunk(content: str | None, finish: str | None = None, usage: Any = None) -> SimpleNamespace:
+        delta = SimpleNamespace(content=content, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish)], usage=usage)
+
+    async def _stream():
+        yield _chunk("Hel")
+        # Some providers attach usage to the last chunk that still carries choices.
+        usage = SimpleNamespace(
+            prompt_tokens=120,
+            completion_tokens=5,
+            total_tokens=125,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=100),
+        )
+        yield _chunk("lo", finish="stop", usage=usage)
+
+    async def _acompletion(**kwargs):
+        seen_kwargs.update(kwargs)
+        return _stream()
+
+    monkeypatch.setattr(lp, "acompletion", _acompletion)
+    provider = LiteLLMProvider(api_key="x", default_model="openai/gpt-4o-mini")
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, model="openai/gpt-4o-mini")
+    deltas: list[str] = []
+
+    async def on_delta(content: str) -> None:
+        deltas.append(content)
+
+    try:
+        text = await loop.process_direct("hi", session_key="t:stream-usage", stream_callback=on_delta)
+    finally:
+        await loop.close_mcp()
+    assert text == "Hello" and deltas == ["Hel", "lo"]
+    assert seen_kwargs["stream_options"] == {"include_usage": True}
+    stored = loop.sessions.get_or_create("t:stream-usage").messages[-1]
+    assert stored["role"] == "assistant"
+    assert stored["usage"] == {
+        "prompt_tokens": 120,
+        "completion_tokens": 5,
+        "total_tokens": 125,
+        "cache_read_tokens": 100,
+    }
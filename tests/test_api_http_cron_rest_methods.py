@@ -157,5 +157,6 @@ def test_cron_job_to_dict_serializes_nested_fields():
     assert data["id"] == "j1"
     assert data["schedule"]["every_ms"] == 1000
     assert data["payload"]["message"] == "hi"
+    assert data["payload"]["cacheable"] is False
     assert data["state"]["last_status"] == "ok"
 
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from joyhousebot.agent.run_context import RunContext, agent_run_context
+from joyhousebot.agent.tools.message import MessageTool
+from joyhousebot.bus.events import InboundMessage, OutboundMessage
+from joyhousebot.bus.workers import SessionWorkerPool
+
+
+def _msg(chat_id: str, content: str) -> InboundMessage:
+    return InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=content)
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_fifo_within_session_and_runs_sessions_in_parallel() -> None:
+    order: dict[str, list[str]] = {}
+    active = 0
+    peak = 0
+
+    async def handler(msg: InboundMessage) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        order.setdefault(msg.chat_id, []).append(msg.content)
+        active -= 1
+
+    pool = SessionWorkerPool(handler, max_concurrency=3)
+    for i in range(5):
+        for chat in ("a", "b", "c", "d"):
+            pool.submit(_msg(chat, str(i)))
+    await pool.join()
+
+    assert order == {chat: ["0", "1", "2", "3", "4"] for chat in ("a", "b", "c", "d")}
+    assert peak == 3
+    assert pool.stats()["processedTotal"] == 20
+    assert pool.stats()["shards"] == []
+
+
+@pytest.mark.asyncio
+async def test_system_message_shares_its_origin_session_shard() -> None:
+    order: list[str] = []
+    active = 0
+    peak = 0
+
+    async def handler(msg: InboundMessage) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        order.append(msg.content)
+        active -= 1
+
+    pool = SessionWorkerPool(handler, max_concurrency=4)
+    pool.submit(InboundMessage(channel="telegram", sender_id="u", chat_id="123", content="user-1"))
+    pool.submit(InboundMessage(channel="system", sender_id="subagent", chat_id="telegram:123", content="announce"))
+    assert [s["sessionKey"] for s in pool.stats()["shards"]] == ["telegram:123"]
+    pool.submit(InboundMessage(channel="telegram", sender_id="u", chat_id="123", content="user-2"))
+    await pool.join()
+
+    assert order == ["user-1", "announce", "user-2"]
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_queue_depth_and_in_flight_per_shard() -> None:
+    release = asyncio.Event()
+
+    async def handler(msg: InboundMessage) -> None:
+        await release.wait()
+
+    pool = SessionWorkerPool(handler, max_concurrency=1)
+    pool.submit(_msg("a", "1"))
+    pool.submit(_msg("a", "2"))
+    pool.submit(_msg("b", "1"))
+    await asyncio.sleep(0)
+
+    stats = pool.stats()
+    shards = {s["sessionKey"]: s for s in stats["shards"]}
+    assert stats["inFlight"] == 1
+    assert stats["queued"] == 2
+    assert shards["test:a"]["inFlight"] == 1
+    assert shards["test:a"]["queueDepth"] == 1
+    # b is waiting for the only slot: still queued, not lost between the two counts.
+    assert (shards["test:b"]["inFlight"], shards["test:b"]["queueDepth"]) == (0, 1)
+
+    release.set()
+    await pool.join()
+    assert pool.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_handler_error_does_not_stop_shard() -> None:
+    seen: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        if msg.content == "boom":
+            raise RuntimeError("boom")
+        seen.append(msg.content)
+
+    pool = SessionWorkerPool(handler, max_concurrency=2)
+    pool.submit(_msg("a", "boom"))
+    pool.submit(_msg("a", "after"))
+    await pool.join()
+    assert seen == ["after"]
+
+
+@pytest.mark.asyncio
+async def test_message_tool_routes_by_run_context_for_concurrent_runs() -> None:
+    sent: list[OutboundMessage] = []
+
+    async def send(msg: OutboundMessage) -> None:
+        await asyncio.sleep(0)
+        sent.append(msg)
+
+    tool = MessageTool(send_callback=send)
+
+    async def run(channel: str, chat_id: str) -> None:
+        with agent_run_context(RunContext(session_key=f"{channel}:{chat_id}", channel=channel, chat_id=chat_id)):
+            await asyncio.sleep(0)
+            await tool.execute(content=chat_id)
+
+    await asyncio.gather(run("telegram", "t1"), run("slack", "s1"))
+    assert {(m.channel, m.chat_id, m.content) for m in sent} == {
+        ("telegram", "t1", "t1"),
+        ("slack", "s1", "s1"),
+    }
@@ -279,3 +279,30 @@ def test_request_raises_normalized_network_error(monkeypatch) -> None:
     assert err.value.code == "CONTROL_PLANE_NETWORK_ERROR"
     assert err.value.retryable is True
 
+
+
+@pytest.mark.asyncio
+async def test_async_reports_share_payloads_with_sync_methods(monkeypatch) -> None:
+    client = ControlPlaneClient("http://127.0.0.1:8000")
+    calls: list[tuple[str, str, dict | None]] = []
+
+    async def fake_arequest(method: str, path: str, json_body=None):
+        calls.append((method, path, json_body))
+        if path.endswith("/tasks/claim"):
+            return {"assignment": {"id": "x", "taskType": "agent.prompt"}}
+        return {"state": "completed"}
+
+    monkeypatch.setattr(client, "_arequest", fake_arequest)
+
+    hb = await client.heartbeat_async(house_id="b1", status="online", metrics={"x": 1})
+    assert hb["ok"] is True
+    assert calls[-1][2]["metricsData"] == {"x": 1}
+    assert (await client.claim_task_async(house_id="b1"))["task_id"] == "x"
+    await client.report_task_progress_async(house_id="b1", task_id="t1", progress=0.5, detail="doing")
+    assert calls[-1] == ("POST", "/houses/b1/tasks/t1/progress", {"progress": 0.5, "detail": "doing", "message": "doing"})
+    await client.report_task_result_async(house_id="b1", task_id="t1", result={"output": "ok"})
+    assert calls[-1][2]["output"] == {"output": "ok"}
+    failure = await client.report_task_failure_async(house_id="b1", task_id="t1", error={"code": "E"})
+    assert calls[-1][1] == "/houses/b1/tasks/t1/fail"
+    assert failure["status"] == "completed"
+    await client.aclose()
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from joyhousebot.cli.command_groups.house_command import _AgentLoopPool, _WorkerTaskStats
+
+
+class FakeLoop:
+    def __init__(self) -> None:
+        self.closed = False
+        self.stopped = False
+
+    async def close_mcp(self) -> None:
+        self.closed = True
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_pool_reuses_warm_loops_up_to_size() -> None:
+    built: list[FakeLoop] = []
+
+    def factory() -> FakeLoop:
+        built.append(FakeLoop())
+        return built[-1]
+
+    pool = _AgentLoopPool(factory, size=2)
+    active = 0
+    peak = 0
+
+    async def run_task() -> None:
+        nonlocal active, peak
+        async with pool.lease():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(run_task() for _ in range(6)))
+    assert len(built) == 2
+    assert peak == 2
+
+    await pool.close()
+    assert all(loop.closed and loop.stopped for loop in built)
+
+
+def test_worker_task_stats_snapshot() -> None:
+    stats = _WorkerTaskStats(window_seconds=60.0)
+    stats.record("completed", 0.2, now=0.0)
+    stats.record("retried", 0.4, now=10.0)
+    stats.record("failed", 0.6, now=70.0)
+
+    snap = stats.snapshot(running=1, now=70.0)
+    assert (snap["completed"], snap["retried"], snap["failed"], snap["running"]) == (1, 1, 1, 1)
+    assert snap["lastLatencyMs"] == 600
+    assert snap["avgLatencyMs"] == 400
+    assert snap["throughputPerMin"] == 2.0  # the completion at t=0 left the 60s window
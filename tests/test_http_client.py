@@ -0,0 +1,204 @@
+"""Tests for the shared pooled outbound HTTP client."""
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+
+import httpcore
+import httpx
+import pytest
+
+from joyhousebot.agent.tools import web
+from joyhousebot.agent.tools.ingest import url_ingest
+from joyhousebot.agent.tools.web import WebFetchTool, WebSearchTool
+from joyhousebot.config.schema import Config, HttpClientConfig
+from joyhousebot.providers.transcription import GroqTranscriptionProvider
+from joyhousebot.utils import http_client
+from joyhousebot.utils.http_client import (
+    DnsCache,
+    HttpClientService,
+    _dns_backend,
+    _DnsCachingTransport,
+    configure_http_client,
+)
+
+
+def _service(handler, **kwargs) -> HttpClientService:
+    return HttpClientService(HttpClientConfig(**kwargs), transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def open_hosts(monkeypatch):
+    monkeypatch.setattr(web, "_is_forbidden_host", lambda host: False)
+    monkeypatch.setattr(url_ingest, "_is_forbidden_host", lambda host: False)
+
+
+async def test_search_reuses_one_client_with_per_tool_timeout() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"web": {"results": [{"title": "Hit", "url": "https://x.test/"}]}})
+
+    http = _service(handler, timeouts={"web_search": 4.5})
+    tool = WebSearchTool(api_key="k", http=http)
+    for _ in range(2):
+        assert "1. Hit" in await tool.execute(query="q")
+    assert http.stats()["clientsCreated"] == 1 and http.stats()["requests"] == 2
+    assert seen[0].extensions["timeout"]["read"] == 4.5
+    assert seen[0].headers["X-Subscription-Token"] == "k"
+    await http.aclose()
+    assert http.stats()["open"] is False
+
+
+async def test_fetch_and_ingest_follow_redirects_through_injected_client(open_hosts) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/old":
+            return httpx.Response(302, headers={"location": "https://site.test/new"})
+        return httpx.Response(200, text="plain body", headers={"content-type": "text/plain"})
+
+    http = _service(handler)
+    result = json.loads(await WebFetchTool(http=http).execute(url="https://site.test/old"))
+    assert (result["finalUrl"], result["text"]) == ("https://site.test/new", "plain body")
+
+    doc = await url_ingest.fetch_and_ingest_url("https://site.test/old", http=http)
+    assert doc.trace["final_url"] == "https://site.test/new"
+    assert http.stats()["clientsCreated"] == 1
+
+
+async def test_per_host_limit_caps_concurrency_per_host_only() -> None:
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200)
+
+    http = _service(handler, per_host_limit=2)
+    urls = ["https://a.test/"] * 6 + ["https://b.test/"] * 3
+    await asyncio.gather(*(http.get(u) for u in urls))
+    assert peak == {"a.test": 2, "b.test": 2}
+
+
+async def test_transcription_posts_through_shared_client(tmp_path: Path) -> None:
+    audio = tmp_path / "clip.ogg"
+    audio.write_bytes(b"OggS")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer g"
+        assert request.extensions["timeout"]["read"] == 60.0
+        return httpx.Response(200, json={"text": "hello"})
+
+    assert await GroqTranscriptionProvider(api_key="g", http=_service(handler)).transcribe(audio) == "hello"
+
+
+async def test_dns_cache_reuses_lookups_within_ttl(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def fake_getaddrinfo(host, port, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("203.0.113.7", port))] * 2
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", fake_getaddrinfo)
+    dns = DnsCache(ttl_seconds=60)
+    assert await dns.resolve("api.test", 443) == ["203.0.113.7"]
+    assert await dns.resolve("api.test", 443) == ["203.0.113.7"]
+    assert await dns.resolve("198.51.100.1", 443) == ["198.51.100.1"]
+    assert calls == ["api.test"]
+    assert dns.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+async def test_dns_backend_tries_cached_addresses_in_order() -> None:
+    class Inner:
+        def __init__(self) -> None:
+            self.hosts: list[str] = []
+
+        async def connect_tcp(self, host, port, **kwargs):
+            self.hosts.append(host)
+            if host == "192.0.2.1":
+                raise httpcore.ConnectError("unreachable")
+            return "stream"
+
+    dns = DnsCache(ttl_seconds=60)
+    dns._entries["api.test"] = (float("inf"), ["192.0.2.1", "192.0.2.2"])
+    inner = Inner()
+    assert await _dns_backend(inner, dns).connect_tcp("api.test", 443) == "stream"
+    assert inner.hosts == ["192.0.2.1", "192.0.2.2"]
+
+
+def test_configure_from_tools_http_config(monkeypatch) -> None:
+    monkeypatch.setattr(http_client, "_shared", None)
+    config = Config()
+    config.tools.http.per_host_limit = 3
+    config.tools.http.timeouts = {"web_fetch": 12}
+    http = configure_http_client(config)
+    assert http.per_host_limit == 3
+    assert http.timeout_for("web_fetch") == 12.0 and http.timeout_for("web_search") == 10.0
+    assert http.dns is not None and http_client.get_http_client() is http
+
+
+async def test_default_transport_resolves_through_dns_cache() -> None:
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    http = HttpClientService(HttpClientConfig())
+    assert isinstance(http.client._transport, _DnsCachingTransport)
+    http.dns._entries["api.test"] = (float("inf"), ["127.0.0.1"])
+    try:
+        response = await http.get(f"http://api.test:{port}/")
+        assert (response.status_code, response.text) == (200, "ok")
+        assert http.dns.stats()["hits"] == 1
+        with pytest.raises(httpx.ConnectError):
+            http.dns._entries["down.test"] = (float("inf"), ["127.0.0.1"])
+            await http.get("http://down.test:1/")
+    finally:
+        await http.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_env_proxy_is_honored(monkeypatch) -> None:
+    first_lines: list[bytes] = []
+
+    async def proxy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = await reader.readuntil(b"\r\n\r\n")
+        first_lines.append(request.split(b"\r\n", 1)[0])
+        writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(proxy, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    for name in ("NO_PROXY", "no_proxy", "ALL_PROXY", "all_proxy", "HTTP_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", f"http://127.0.0.1:{port}")
+    http = HttpClientService(HttpClientConfig())
+    try:
+        assert not isinstance(http.client._transport, _DnsCachingTransport)
+        with pytest.raises(httpx.ProxyError):
+            await http.get("https://api.test/")
+        assert first_lines == [b"CONNECT api.test:443 HTTP/1.1"]
+    finally:
+        await http.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_reconfigure_closes_previous_client(monkeypatch) -> None:
+    monkeypatch.setattr(http_client, "_shared", None)
+    old = configure_http_client(Config())
+    old_client = old.client
+    new = configure_http_client(Config())
+    await asyncio.sleep(0)
+    assert new is not old and old_client.is_closed
+    await new.aclose()
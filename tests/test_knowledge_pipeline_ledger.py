@@ -0,0 +1,142 @@
+"""Durable ingestion ledger: debounce, content-hash skips, resume and startup reconciliation."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from joyhousebot.services.knowledge_pipeline import pipeline_queue
+from joyhousebot.services.knowledge_pipeline.ledger import MAX_ATTEMPTS, IngestionLedger
+from joyhousebot.services.knowledge_pipeline.pipeline_queue import KnowledgePipelineQueue
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+
+@pytest.fixture
+def conversions(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    seen: list[str] = []
+    convert = pipeline_queue.convert_file_to_processed
+
+    def counting_convert(source_path, *args, **kwargs):
+        seen.append(Path(source_path).name)
+        return convert(source_path, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline_queue, "convert_file_to_processed", counting_convert)
+    return seen
+
+
+def _queue(tmp_path: Path, debounce_ms: int = 0) -> KnowledgePipelineQueue:
+    source = tmp_path / "knowledgebase"
+    source.mkdir(exist_ok=True)
+    config = SimpleNamespace(convert_workers=1, debounce_ms=debounce_ms)
+    return KnowledgePipelineQueue(tmp_path, source, tmp_path / "processed", pipeline_config=config)
+
+
+def test_observe_coalesces_a_burst_until_the_debounce_elapses(tmp_path: Path) -> None:
+    ledger = IngestionLedger(tmp_path / "ledger.db")
+    for i in range(5):
+        assert ledger.observe("a.md", 10 + i, 100.0 + i, due_at=200.0 + i) is True
+    assert ledger.claim_due(now=203.0) == []
+    (row,) = ledger.claim_due(now=204.0)
+    assert (row["path"], row["size"]) == ("a.md", 14)
+    assert ledger.counts() == {"processing": 1}
+
+    ledger.mark_indexed("a.md", claim=row["claim"], content_hash="h", doc_id="d")
+    assert ledger.observe("a.md", 14, 104.0, due_at=300.0) is False
+    assert ledger.outstanding() == 0
+
+
+def test_change_during_processing_waits_for_the_in_flight_claim(tmp_path: Path) -> None:
+    ledger = IngestionLedger(tmp_path / "ledger.db")
+    ledger.observe("a.md", 10, 100.0, due_at=0.0)
+    (first,) = ledger.claim_due(now=1.0)
+    assert ledger.observe("a.md", 11, 101.0, due_at=2.0) is True
+    # Not handed out again while the first run is in flight.
+    assert ledger.claim_due(now=10.0) == []
+
+    # A stale claim cannot finish the row; the owning one re-queues it for the change.
+    ledger.mark_indexed("a.md", claim=first["claim"] - 1, content_hash="old", doc_id="d")
+    assert ledger.get("a.md")["state"] == "processing"
+    ledger.mark_indexed("a.md", claim=first["claim"], content_hash="h1", doc_id="d")
+    row = ledger.get("a.md")
+    assert (row["state"], row["indexed_hash"], row["rerun"]) == ("pending", "h1", 0)
+
+    (second,) = ledger.claim_due(now=10.0)
+    assert second["claim"] == first["claim"] + 1 and second["size"] == 11
+    ledger.mark_failed("a.md", "late", claim=first["claim"])
+    assert ledger.get("a.md")["state"] == "processing"
+    ledger.mark_indexed("a.md", claim=second["claim"], content_hash="h2", doc_id="d")
+    assert ledger.get("a.md")["state"] == "indexed"
+
+
+def test_unchanged_failed_file_stops_after_max_attempts_across_restarts(tmp_path: Path) -> None:
+    ledger = IngestionLedger(tmp_path / "ledger.db")
+    ledger.observe("bad.pdf", 10, 100.0, due_at=0.0)
+    for _ in range(MAX_ATTEMPTS):
+        (row,) = ledger.claim_due(now=1.0)
+        ledger.mark_failed(row["path"], "broken", claim=row["claim"])
+        # What start() does on every restart.
+        ledger.resume(now=0.0)
+        ledger.reconcile([("bad.pdf", 10, 100.0)], now=0.0)
+    row = ledger.get("bad.pdf")
+    assert (row["state"], row["attempts"]) == ("failed", MAX_ATTEMPTS)
+    assert ledger.claim_due(now=1.0) == []
+
+    # Editing the file gives it a fresh retry budget.
+    assert ledger.reconcile([("bad.pdf", 11, 101.0)], now=0.0) == {"changed": 1, "removed": 0}
+    row = ledger.get("bad.pdf")
+    assert (row["state"], row["attempts"]) == ("pending", 0)
+
+
+def test_save_storm_converts_once_and_unchanged_content_is_skipped(tmp_path: Path, conversions) -> None:
+    q = _queue(tmp_path, debounce_ms=300)
+    q.start()
+    try:
+        note = q.source_dir / "note.md"
+        for i in range(10):
+            note.write_text(f"# Note\n\nwombat draft {i}", encoding="utf-8")
+            q.put(note)
+        assert q.wait_idle(timeout=10)
+        assert conversions == ["note.md"]
+        assert "draft 9" in RetrievalStore(tmp_path).search("wombat")[0]["content"]
+
+        os.utime(note, (1, 1))  # touched, same bytes
+        q.put(note)
+        assert q.wait_idle(timeout=10)
+        assert conversions == ["note.md"]
+        assert q.status()["skipped"] == 1
+    finally:
+        q.stop()
+
+
+def test_restart_resumes_claimed_work_and_reconciles_the_source_dir(tmp_path: Path, conversions) -> None:
+    first = _queue(tmp_path)
+    (first.source_dir / "kept.md").write_text("# Kept\n\nplatypus", encoding="utf-8")
+    (first.source_dir / "gone.md").write_text("# Gone\n\nechidna", encoding="utf-8")
+    first.start()
+    assert first.wait_idle(timeout=10)
+    first.stop()
+    assert sorted(conversions) == ["gone.md", "kept.md"]
+
+    # Crash mid-flight: a change was claimed but never finished; another file was deleted offline.
+    (first.source_dir / "kept.md").write_text("# Kept\n\nplatypus v2", encoding="utf-8")
+    first.put(first.source_dir / "kept.md")
+    assert [r["path"] for r in first.ledger.claim_due(now=1e12)] == ["kept.md"]
+    (first.source_dir / "gone.md").unlink()
+    (first.source_dir / "new.txt").write_text("numbat", encoding="utf-8")
+    conversions.clear()
+
+    second = _queue(tmp_path)
+    second.start()
+    try:
+        assert second.wait_idle(timeout=10)
+    finally:
+        second.stop()
+    assert sorted(conversions) == ["kept.md", "new.txt"]
+    store = RetrievalStore(tmp_path)
+    assert "v2" in store.search("platypus")[0]["content"]
+    assert store.search("echidna") == []
+    assert len(store.search("numbat")) == 1
+    assert second.ledger.get("gone.md") is None
+    assert second.ledger.counts() == {"indexed": 2}
+    assert len(list(second.processed_dir.glob("*.md"))) == 2
@@ -0,0 +1,146 @@
+"""Staged knowledge pipeline: process-pool conversion, bounded stages, progress status."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from joyhousebot.services.knowledge_pipeline import indexer
+from joyhousebot.services.knowledge_pipeline.pipeline_queue import (
+    KnowledgePipelineQueue,
+    read_pipeline_status,
+)
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+
+def _pipeline_config(**overrides):
+    values = dict(
+        convert_chunk_size=500, convert_chunk_overlap=50, convert_workers=2,
+        embed_concurrency=2, embed_batch_size=2, stage_queue_size=2, debounce_ms=0,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def dirs(tmp_path: Path) -> tuple[Path, Path, Path]:
+    source = tmp_path / "knowledgebase"
+    source.mkdir()
+    return tmp_path, source, tmp_path / "knowledge" / "processed"
+
+
+def test_process_pool_pipeline_indexes_all_files_with_backpressure(dirs) -> None:
+    workspace, source, processed = dirs
+    q = KnowledgePipelineQueue(workspace, source, processed, pipeline_config=_pipeline_config())
+    q.start()
+    try:
+        for i in range(12):
+            (source / f"note{i}.md").write_text(f"# Note {i}\n\nquokka number{i}", encoding="utf-8")
+        (source / "broken.pdf").write_bytes(b"not a pdf")
+        # Stage queues hold 2 items each, so the scheduler blocks until the stages catch up.
+        for path in sorted(source.iterdir()):
+            q.put(path)
+        assert q.wait_idle(timeout=60)
+        status = q.status()
+    finally:
+        q.stop()
+
+    assert len(RetrievalStore(workspace).search("quokka", top_k=50)) == 12
+    assert status["pending"] == 0
+    assert status["indexed"] == 12
+    assert status["stages"]["write"]["completed"] == 12
+    assert status["stages"]["convert"]["completed"] + status["stages"]["convert"]["failed"] == 13
+    assert status["failed"] >= 1
+    assert status["convertWorkers"] == 2
+    written = read_pipeline_status(processed)
+    assert written is not None and written["indexed"] == 12 and written["running"] is False
+
+
+def test_embed_stage_batches_chunks_and_hands_vectors_to_writer(dirs, monkeypatch) -> None:
+    workspace, source, processed = dirs
+    batches: list[int] = []
+    written: dict[str, int] = {}
+
+    def fake_embed(_workspace, doc, *, config=None, batch_size=64):
+        texts = [c["text"] for c in doc["chunks"]]
+        for start in range(0, len(texts), batch_size):
+            batches.append(len(texts[start:start + batch_size]))
+        return [[1.0, 0.0] for _ in texts]
+
+    def fake_write(_workspace, doc, vectors, *, config=None, store=None):
+        written[doc["doc_id"]] = len(vectors or [])
+
+    monkeypatch.setattr("joyhousebot.services.knowledge_pipeline.pipeline_queue.embed_processed_doc", fake_embed)
+    monkeypatch.setattr("joyhousebot.services.knowledge_pipeline.pipeline_queue.write_processed_doc", fake_write)
+
+    q = KnowledgePipelineQueue(
+        workspace, source, processed, pipeline_config=_pipeline_config(convert_workers=1, embed_batch_size=3)
+    )
+    q.start()
+    try:
+        (source / "long.txt").write_text("lorem ipsum dolor " * 200, encoding="utf-8")
+        q.put(source / "long.txt")
+        assert q.wait_idle(timeout=30)
+    finally:
+        q.stop()
+    assert len(written) == 1
+    (chunks,) = written.values()
+    assert chunks > 3 and sum(batches) == chunks and max(batches) == 3
+
+
+def test_embed_processed_doc_batches_provider_calls(tmp_path: Path, monkeypatch) -> None:
+    calls: list[int] = []
+
+    class Provider:
+        def embed(self, texts):
+            calls.append(len(texts))
+            return [[0.5] for _ in texts]
+
+    import joyhousebot.services.retrieval.vector_optional as vo
+
+    monkeypatch.setattr(vo, "should_enable_vector", lambda *_: True)
+    monkeypatch.setattr(vo, "get_vector_store", lambda *_: object())
+    monkeypatch.setattr(vo, "get_embedding_provider", lambda *_: Provider())
+    doc = {"chunks": [{"text": str(i)} for i in range(5)]}
+    vectors = indexer.embed_processed_doc(tmp_path, doc, config=object(), batch_size=2)
+    assert calls == [2, 2, 1]
+    assert len(vectors) == 5
+
+
+def test_removed_source_drops_its_vectors(dirs, monkeypatch) -> None:
+    workspace, source, processed = dirs
+
+    class Store:
+        def __init__(self) -> None:
+            self.doc_ids: set[str] = set()
+
+        def index(self, doc_id, chunk_index, vector, meta):
+            self.doc_ids.add(doc_id)
+
+        def delete_by_doc_id(self, doc_id):
+            self.doc_ids.discard(doc_id)
+
+    import joyhousebot.services.retrieval.vector_optional as vo
+
+    vectors = Store()
+    monkeypatch.setattr(vo, "get_vector_store", lambda *_: vectors)
+    monkeypatch.setattr(
+        "joyhousebot.services.knowledge_pipeline.pipeline_queue.embed_processed_doc",
+        lambda _workspace, doc, **_: [[1.0] for _ in doc["chunks"]],
+    )
+    q = KnowledgePipelineQueue(
+        workspace, source, processed, pipeline_config=_pipeline_config(convert_workers=1), config=SimpleNamespace()
+    )
+    q.start()
+    try:
+        (source / "gone.md").write_text("# Gone\n\nechidna", encoding="utf-8")
+        q.put(source / "gone.md")
+        assert q.wait_idle(timeout=30)
+        assert len(vectors.doc_ids) == 1
+        (source / "gone.md").unlink()
+        q.put(source / "gone.md")
+        assert q.wait_idle(timeout=30)
+    finally:
+        q.stop()
+    assert vectors.doc_ids == set()
+    assert RetrievalStore(workspace).search("echidna") == []
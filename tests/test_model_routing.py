@@ -0,0 +1,129 @@
+"""Tests for latency-aware model/profile routing."""
+
+import asyncio
+import random
+from pathlib import Path
+
+from joyhousebot.agent.loop import AgentLoop
+from joyhousebot.agent.routing import ModelRouter
+from joyhousebot.bus.queue import MessageBus
+from joyhousebot.config.schema import ModelRoutingConfig
+from joyhousebot.providers.base import LLMProvider, LLMResponse
+
+
+def _router(strategy: str, **kwargs) -> ModelRouter:
+    return ModelRouter(ModelRoutingConfig(strategy=strategy, min_samples=2, **kwargs), rng=random.Random(7))
+
+
+def _feed(router: ModelRouter, model: str, ms: float, n: int = 3, ok: bool = True, reason: str = "") -> None:
+    for _ in range(n):
+        router.record(model, None, latency_ms=ms, ttft_ms=ms / 2, ok=ok, reason=reason)
+
+
+def test_fixed_strategy_keeps_configured_order() -> None:
+    router = _router("fixed")
+    _feed(router, "slow", 900)
+    _feed(router, "fast", 100)
+    assert router.order_models(["slow", "fast"]) == ["slow", "fast"]
+    assert router.hedge_delay_s("slow", None) is None
+
+
+def test_fastest_prefers_healthy_low_ttft_then_unknown_then_unhealthy() -> None:
+    router = _router("fastest")
+    _feed(router, "primary", 900)
+    _feed(router, "quick", 100)
+    _feed(router, "broken", 50)
+    _feed(router, "broken", 0, n=3, ok=False, reason="rate_limit")
+    assert router.order_models(["primary", "broken", "untested", "quick"]) == [
+        "quick", "primary", "untested", "broken"
+    ]
+    stats = router.stats()["models"]
+    assert stats["quick"]["ttftEwmaMs"] == 50.0
+    assert stats["broken"]["errorRate"] > 0.5 and stats["broken"]["rateLimitRate"] > 0.5
+
+
+def test_always_failing_route_ranks_last() -> None:
+    router = _router("fastest")
+    _feed(router, "flaky", 100)
+    _feed(router, "flaky", 0, n=3, ok=False)
+    _feed(router, "dead", 0, n=3, ok=False)
+    assert router.stats()["models"]["flaky"]["errorRate"] > 0.5
+    assert router.order_models(["dead", "untested", "flaky"]) == ["untested", "flaky", "dead"]
+
+    weighted = _router("weighted")
+    _feed(weighted, "ok", 100)
+    _feed(weighted, "dead", 0, n=6, ok=False)
+    firsts = [weighted.order_models(["dead", "ok"])[0] for _ in range(200)]
+    assert firsts.count("ok") > 160  # no longer a coin flip at the mean weight
+
+
+def test_weighted_order_favours_fast_candidates() -> None:
+    router = _router("weighted")
+    _feed(router, "a", 100)
+    _feed(router, "b", 2000)
+    firsts = [router.order_models(["b", "a"])[0] for _ in range(200)]
+    assert firsts.count("a") > 150
+
+
+def test_hedge_delay_uses_ttft_p95_and_profile_stats_are_mirrored() -> None:
+    usage: dict = {"work": {"failure_count": 0}}
+    router = ModelRouter(
+        ModelRoutingConfig(strategy="hedged", min_samples=2, hedge_delay_ms=1500, hedge_min_delay_ms=10),
+        profile_usage=usage,
+    )
+    assert router.hedge_delay_s("m", "work") == 1.5
+    for ttft in (100, 200, 300, 400):
+        router.record("m", "work", latency_ms=1000, ttft_ms=ttft)
+    assert router.hedge_delay_s("m", "work") == 0.4
+    assert usage["work"]["failure_count"] == 0
+    assert usage["work"]["ttft_ewma_ms"] is not None and usage["work"]["error_rate"] == 0.0
+
+
+class _ByModelProvider(LLMProvider):
+    """Replies per model name after a model-specific delay; records cancellations."""
+
+    def __init__(self, delays: dict[str, float]) -> None:
+        super().__init__()
+        self.delays = delays
+        self.cancelled: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        try:
+            await asyncio.sleep(self.delays[model])
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        return LLMResponse(content=f"from {model}")
+
+    def get_default_model(self) -> str:
+        return "primary"
+
+
+async def test_hedged_call_uses_faster_fallback_and_cancels_primary(tmp_path: Path) -> None:
+    provider = _ByModelProvider({"primary": 5.0, "backup": 0.01})
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path, model="primary", model_fallbacks=["backup"]
+    )
+    loop.router = ModelRouter(ModelRoutingConfig(strategy="hedged", hedge_delay_ms=20, hedge_min_delay_ms=0))
+    response, used = await loop._call_provider_with_fallback(
+        messages=[{"role": "user", "content": "hi"}], tools=None, primary_model="primary"
+    )
+    assert (response.content, used) == ("from backup", "backup")
+    assert provider.cancelled == ["primary"]
+    routes = {r["model"]: r for r in loop.router.stats()["routes"]}
+    assert routes["backup"]["samples"] == 1
+    # The hedged-away primary only gets a TTFT lower bound, not a completed sample.
+    assert routes["primary"]["samples"] == 0 and routes["primary"]["ttftEwmaMs"] >= 20
+
+
+async def test_hedge_not_fired_when_primary_answers_in_time(tmp_path: Path) -> None:
+    provider = _ByModelProvider({"primary": 0.0, "backup": 0.0})
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path, model="primary", model_fallbacks=["backup"]
+    )
+    loop.router = ModelRouter(ModelRoutingConfig(strategy="hedged", hedge_delay_ms=1000))
+    response, used = await loop._call_provider_with_fallback(
+        messages=[{"role": "user", "content": "hi"}], tools=None, primary_model="primary"
+    )
+    assert used == "primary"
+    assert [r["model"] for r in loop.router.stats()["routes"]] == ["primary"]
@@ -0,0 +1,91 @@
+"""Tests for pooled runtime provider instances."""
+
+from pathlib import Path
+
+import pytest
+
+from joyhousebot.agent.loop import AgentLoop
+from joyhousebot.bus.queue import MessageBus
+from joyhousebot.config.schema import AuthProfileConfig, Config
+from joyhousebot.providers.litellm_provider import LiteLLMProvider
+from joyhousebot.providers.pool import (
+    ProviderPool,
+    RuntimeProviderSettings,
+    resolve_runtime_provider_settings,
+)
+
+
+def _counting_pool(**kwargs) -> tuple[ProviderPool, list[RuntimeProviderSettings]]:
+    built: list[RuntimeProviderSettings] = []
+
+    def factory(settings: RuntimeProviderSettings):
+        built.append(settings)
+        return object()
+
+    return ProviderPool(factory=factory, **kwargs), built
+
+
+def test_pool_reuses_instances_per_settings_key() -> None:
+    pool, built = _counting_pool()
+    a = RuntimeProviderSettings(model="openai/gpt-4o", api_key="sk-a", extra_headers={"X-A": "1"})
+    assert pool.get(a) is pool.get(RuntimeProviderSettings(model="openai/gpt-4o", api_key="sk-a", extra_headers={"X-A": "1"}))
+    pool.get(RuntimeProviderSettings(model="openai/gpt-4o", api_key="sk-a", extra_headers={"X-A": "2"}))
+    pool.get(RuntimeProviderSettings(model="openai/gpt-4o", api_key="sk-b", extra_headers={"X-A": "1"}))
+    pool.get(RuntimeProviderSettings(model="openai/gpt-4o", profile_id="p1", api_key="sk-a", extra_headers={"X-A": "1"}))
+    assert len(built) == 4
+    assert pool.stats() == {"hits": 1, "misses": 4, "hitRate": 0.2, "entries": 4}
+
+
+def test_pool_evicts_least_recently_used_and_invalidates() -> None:
+    pool, built = _counting_pool(max_entries=2)
+    a, b, c = (RuntimeProviderSettings(model=m) for m in ("a", "b", "c"))
+    pool.get(a)
+    pool.get(b)
+    pool.get(a)
+    pool.get(c)
+    pool.get(a)
+    pool.get(b)
+    assert [s.model for s in built] == ["a", "b", "c", "b"]
+    pool.invalidate()
+    pool.get(a)
+    assert pool.stats()["entries"] == 1
+    assert len(built) == 5
+
+
+def test_profile_overrides_provider_config() -> None:
+    config = Config()
+    config.providers.openai.api_key = "sk-config"
+    config.providers.openai.extra_headers = {"X-Team": "core"}
+    config.auth.profiles["work"] = AuthProfileConfig(
+        provider="openai", token="tok-work", api_base="https://proxy.example/v1", extra_headers={"X-Profile": "work"}
+    )
+    base = resolve_runtime_provider_settings(config, model="openai/gpt-4o", profile_id=None, provider_name="openai")
+    assert (base.api_key, base.extra_headers) == ("sk-config", {"X-Team": "core"})
+    work = resolve_runtime_provider_settings(config, model="openai/gpt-4o", profile_id="work", provider_name="openai")
+    assert work.api_key == "tok-work"
+    assert work.api_base == "https://proxy.example/v1"
+    assert work.extra_headers == {"X-Team": "core", "X-Profile": "work"}
+
+
+def test_agent_loop_and_subagents_share_pooled_providers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Provider construction writes keys into os.environ with setdefault; keep it contained.
+    monkeypatch.setenv("OPENAI_API_KEY", "preset")
+    config = Config()
+    config.providers.openai.api_key = "sk-config"
+    config.auth.profiles["work"] = AuthProfileConfig(provider="openai", api_key="sk-work")
+    loop = AgentLoop(
+        bus=MessageBus(), provider=LiteLLMProvider(), workspace=tmp_path, model="openai/gpt-4o", config=config
+    )
+    first = loop._build_runtime_provider(model="openai/gpt-4o", profile_id="work")
+    assert isinstance(first, LiteLLMProvider)
+    assert first.api_key == "sk-work"
+    assert loop._build_runtime_provider(model="openai/gpt-4o", profile_id="work") is first
+    assert loop.subagents._build_runtime_provider(model="openai/gpt-4o", profile_id="work") is first
+    assert loop._build_runtime_provider(model="openai/gpt-4o", profile_id=None) is not first
+
+    # Editing the profile in place yields a fresh provider on the next call.
+    config.auth.profiles["work"].api_key = "sk-rotated"
+    rotated = loop._build_runtime_provider(model="openai/gpt-4o", profile_id="work")
+    assert rotated is not first
+    assert rotated.api_key == "sk-rotated"
+    assert loop.provider_pool.stats()["hits"] == 2
@@ -0,0 +1,82 @@
+"""Tests for the cache-aware prompt layout and provider prompt caching hints."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from joyhousebot.agent.context import ContextBuilder
+from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.providers.litellm_provider import (
+    LiteLLMProvider,
+    _apply_prompt_caching,
+    _usage_dict,
+)
+
+
+def test_build_messages_puts_stable_prompt_first(tmp_path: Path) -> None:
+    (tmp_path / "AGENTS.md").write_text("Be brief.")
+    MemoryStore(tmp_path).write_long_term("Prefers tea.")
+    builder = ContextBuilder(tmp_path)
+    messages = builder.build_messages(history=[], current_message="hi", channel="cli", chat_id="1")
+    stable, volatile = messages[0]["content"], messages[1]["content"]
+    assert [m["role"] for m in messages] == ["system", "system", "user"]
+    assert "Be brief." in stable and "<skills>" in stable
+    assert "Prefers tea." not in stable and "Current Time" not in stable
+    assert "Prefers tea." in volatile and "# Current Time" in volatile and "Chat ID: 1" in volatile
+
+    MemoryStore(tmp_path).write_long_term("Prefers coffee now.")
+    again = builder.build_messages(history=[], current_message="hi", channel="cli", chat_id="1")
+    assert again[0]["content"] == stable
+    assert "Prefers coffee now." in again[1]["content"]
+
+
+def test_cache_breakpoints_on_stable_system_and_last_message() -> None:
+    messages = [
+        {"role": "system", "content": "stable"},
+        {"role": "system", "content": "volatile"},
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "1"}]},
+        {"role": "tool", "tool_call_id": "1", "content": "result"},
+    ]
+    out = _apply_prompt_caching(messages, enabled=True)
+    marked = [i for i, m in enumerate(out) if "cache_control" in m]
+    assert marked == [0, 4]
+    assert out[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in messages[0]
+
+    blocks = [{"role": "user", "content": [{"type": "image_url"}, {"type": "text", "text": "x"}]}]
+    assert _apply_prompt_caching(blocks, enabled=True)[0]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_system_messages_merged_without_prompt_caching() -> None:
+    messages = [
+        {"role": "system", "content": "stable"},
+        {"role": "system", "content": "volatile"},
+        {"role": "user", "content": "hi"},
+    ]
+    out = _apply_prompt_caching(messages, enabled=False)
+    assert out == [{"role": "system", "content": "stable\n\n---\n\nvolatile"}, {"role": "user", "content": "hi"}]
+
+
+def test_prompt_caching_enabled_per_route() -> None:
+    assert LiteLLMProvider()._supports_prompt_caching("claude-opus-4-5")
+    assert not LiteLLMProvider()._supports_prompt_caching("gpt-4o")
+    openrouter = LiteLLMProvider(provider_name="openrouter")
+    assert openrouter._supports_prompt_caching("openrouter/anthropic/claude-sonnet-4-5")
+    assert not openrouter._supports_prompt_caching("openrouter/openai/gpt-4o")
+    aihubmix = LiteLLMProvider(provider_name="aihubmix")
+    assert not aihubmix._supports_prompt_caching("openai/claude-sonnet-4-5")
+
+
+def test_usage_dict_reports_cache_tokens() -> None:
+    anthropic = SimpleNamespace(
+        prompt_tokens=1200, completion_tokens=50, total_tokens=1250,
+        cache_read_input_tokens=1000, cache_creation_input_tokens=150, prompt_tokens_details=None,
+    )
+    assert _usage_dict(anthropic) == {
+        "prompt_tokens": 1200, "completion_tokens": 50, "total_tokens": 1250,
+        "cache_read_tokens": 1000, "cache_write_tokens": 150,
+    }
+    openai = {"prompt_tokens": 2000, "completion_tokens": 10, "total_tokens": 2010,
+              "prompt_tokens_details": {"cached_tokens": 1536}}
+    assert _usage_dict(openai)["cache_read_tokens"] == 1536
+    assert _usage_dict(None) == {}
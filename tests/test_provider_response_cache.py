@@ -0,0 +1,146 @@
+"""Tests for the opt-in exact-match LLM response cache."""
+
+import threading
+from pathlib import Path
+
+from joyhousebot.config.schema import ResponseCacheConfig
+from joyhousebot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from joyhousebot.providers.response_cache import (
+    CachingProvider,
+    ResponseCache,
+    has_volatile_tool_results,
+    response_cache_allowed,
+    response_cache_key,
+)
+from joyhousebot.session.usage_ledger import message_usage
+
+
+class _CountingProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            tool_calls=[ToolCallRequest(id="t1", name="read_file", arguments={"path": "HEARTBEAT.md"})],
+            usage={"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110},
+        )
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _messages(time_line: str = "2026-10-16 09:00 (Friday) (UTC)") -> list[dict]:
+    return [
+        {"role": "system", "content": "stable"},
+        {"role": "system", "content": f"# Current Time\n\n{time_line}\n\n## Current Session\nChannel: cli"},
+        {"role": "user", "content": "Read HEARTBEAT.md"},
+    ]
+
+
+async def test_cacheable_runs_hit_with_zero_usage(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "r.db"))
+    token = response_cache_allowed.set(True)
+    try:
+        first = await provider.chat(_messages(), model="m")
+        # A later minute only changes the Current Time section, which is not part of the key.
+        second = await provider.chat(_messages("2026-10-16 09:30 (Friday) (UTC)"), model="m")
+    finally:
+        response_cache_allowed.reset(token)
+    assert inner.calls == 1
+    assert second.content == first.content == "answer 1"
+    assert second.tool_calls == first.tool_calls
+    assert message_usage({"role": "assistant", "content": "x", "usage": second.usage}) == (0, 0, 0.0)
+    assert provider.cache.stats()["hits"] == 1
+
+
+async def test_next_day_misses_cache(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "r.db"))
+    await provider.chat(_messages(), model="m", temperature=0)
+    await provider.chat(_messages("2026-10-17 09:00 (Saturday) (UTC)"), model="m", temperature=0)
+    assert inner.calls == 2
+    assert response_cache_key(
+        model="m", messages=_messages("2026-10-16 23:59 (Friday) (UTC)"), tools=None, temperature=0, max_tokens=1
+    ) == response_cache_key(model="m", messages=_messages(), tools=None, temperature=0, max_tokens=1)
+
+
+async def test_not_cached_without_opt_in_unless_temperature_zero(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "r.db"))
+    await provider.chat(_messages(), model="m")
+    await provider.chat(_messages(), model="m")
+    assert inner.calls == 2
+    await provider.chat(_messages(), model="m", temperature=0)
+    await provider.chat(_messages(), model="m", temperature=0)
+    assert inner.calls == 3
+    # Different max_tokens is a different key.
+    await provider.chat(_messages(), model="m", temperature=0, max_tokens=10)
+    assert inner.calls == 4
+
+
+async def test_volatile_tool_results_bypass_cache(tmp_path: Path) -> None:
+    inner = _CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "r.db"))
+    stamped = _messages() + [{"role": "tool", "name": "read_file", "content": "updated 2026-10-16T08:59:01Z"}]
+    for _ in range(2):
+        await provider.chat(stamped, model="m", temperature=0)
+    assert inner.calls == 2
+    assert provider.cache.stats()["bypassed"] == 2
+    assert has_volatile_tool_results([{"role": "tool", "name": "web_search", "content": "results"}])
+    assert not has_volatile_tool_results([{"role": "tool", "name": "read_file", "content": "- water plants"}])
+
+
+async def test_streamed_hits_replay_content(tmp_path: Path) -> None:
+    provider = CachingProvider(_CountingProvider(), ResponseCache(tmp_path / "r.db"))
+    await provider.chat(_messages(), model="m", temperature=0)
+    events = [e async for e in provider.chat_stream(_messages(), model="m", temperature=0)]
+    assert [kind for kind, _ in events] == ["delta", "done"]
+    assert events[0][1] == "answer 1"
+
+
+def test_ttl_and_size_eviction(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "r.db", ttl_seconds=60, max_bytes=600)
+    keys = [
+        response_cache_key(model="m", messages=[{"role": "user", "content": str(i)}], tools=None, temperature=0, max_tokens=1)
+        for i in range(6)
+    ]
+    for key in keys:
+        cache.put(key, LLMResponse(content="x" * 150))
+    assert cache.get(keys[0], "m") is None
+    assert cache.get(keys[-1], "m") is not None
+    assert cache.stats()["evictions"] > 0
+
+    cache.put(keys[0], LLMResponse(content="fresh"))
+    cache._connection().execute("UPDATE responses SET created_at = created_at - 61 WHERE key = ?", (keys[0],))
+    assert cache.get(keys[0], "m") is None
+    # Errors are never stored.
+    cache.put(keys[1], LLMResponse(content="boom", finish_reason="error"))
+    assert cache.get(keys[1], "m") is None
+
+
+async def test_cache_reads_and_writes_run_off_the_event_loop(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "r.db")
+    threads: list[int] = []
+    get, put = cache.get, cache.put
+
+    def record_get(*args):
+        threads.append(threading.get_ident())
+        return get(*args)
+
+    def record_put(*args):
+        threads.append(threading.get_ident())
+        return put(*args)
+
+    cache.get, cache.put = record_get, record_put
+    provider = CachingProvider(_CountingProvider(), cache)
+    await provider.chat(_messages(), model="m", temperature=0)
+    assert len(threads) == 2 and threading.get_ident() not in threads
+
+
+def test_heartbeat_runs_are_not_cacheable_by_default() -> None:
+    # Heartbeat prompts repeat within a day; caching them would replay HEARTBEAT_OK over timed tasks.
+    assert ResponseCacheConfig(enabled=True).heartbeat is False
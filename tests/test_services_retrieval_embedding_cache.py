@@ -0,0 +1,104 @@
+"""Tests for the content-addressed embedding cache and its use by the embedding provider."""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from joyhousebot.services.retrieval.embedding_cache import EmbeddingCache, text_hash
+from joyhousebot.services.retrieval.embedding_provider import LiteLLMEmbeddingProvider
+
+
+class FakeLiteLLM:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def _response(self, texts: list[str]):
+        self.calls.append(list(texts))
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(t)), 1.0]) for t in texts])
+
+    def embedding(self, model: str, input: list[str], **_kwargs):
+        return self._response(input)
+
+    async def aembedding(self, model: str, input: list[str], **_kwargs):
+        return self._response(input)
+
+
+@pytest.fixture
+def fake_litellm(monkeypatch: pytest.MonkeyPatch) -> FakeLiteLLM:
+    fake = FakeLiteLLM()
+    monkeypatch.setitem(sys.modules, "litellm", fake)
+    return fake
+
+
+def test_cache_tiers_and_counters(tmp_path: Path) -> None:
+    cache = EmbeddingCache(tmp_path / "emb.db", memory_entries=1)
+    cache.put_many("m", ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0, 2.0], [3.0, 4.0], None]
+    assert cache.get_many("other-model", ["a"]) == [None]
+    stats = cache.stats()
+    assert (stats["memoryHits"], stats["diskHits"], stats["misses"]) == (1, 1, 2)  # LRU of 1 keeps "b"
+
+    # A second process (fresh instance) reads the persisted vectors.
+    assert EmbeddingCache(tmp_path / "emb.db").get_many("m", ["b"]) == [[3.0, 4.0]]
+
+
+def test_cache_evicts_least_recently_used_beyond_max_bytes(tmp_path: Path) -> None:
+    cache = EmbeddingCache(tmp_path / "emb.db", max_bytes=3 * 16, memory_entries=0)
+    for i, text in enumerate(["t0", "t1", "t2"]):
+        cache.put_many("m", [text], [[float(i)] * 4])  # 16 bytes each
+    cache.get_many("m", ["t0"])  # t0 is now more recent than t1
+    cache.put_many("m", ["t3"], [[3.0] * 4])
+    # Over budget: the oldest rows go until usage is back under 90% of max_bytes.
+    assert cache.get_many("m", ["t0", "t1", "t2", "t3"]) == [[0.0] * 4, None, None, [3.0] * 4]
+    assert cache.evictions == 2
+
+
+def test_cache_tracks_bytes_in_process_and_defers_touches(tmp_path: Path) -> None:
+    cache = EmbeddingCache(tmp_path / "emb.db", max_bytes=2 * 16, memory_entries=0)
+    for _ in range(3):
+        cache.put_many("m", ["same"], [[1.0] * 4])  # replacing a row does not grow the total
+    cache.put_many("m", ["other"], [[2.0] * 4])
+    assert cache.evictions == 0 and cache._total_bytes == 32
+
+    cache.get_many("m", ["same"])
+    assert list(cache._pending_touch) == [("m", text_hash("same"))]
+    cache.close()  # pending touches are written before the connection closes
+    assert cache._pending_touch == {}
+
+
+@pytest.mark.asyncio
+async def test_provider_aembed_uses_cache_off_the_event_loop(tmp_path: Path, fake_litellm: FakeLiteLLM) -> None:
+    cache = EmbeddingCache(tmp_path / "emb.db")
+    threads: list[int] = []
+    get_many, put_many = cache.get_many, cache.put_many
+
+    def record_get(*args):
+        threads.append(threading.get_ident())
+        return get_many(*args)
+
+    def record_put(*args):
+        threads.append(threading.get_ident())
+        return put_many(*args)
+
+    cache.get_many, cache.put_many = record_get, record_put
+    provider = LiteLLMEmbeddingProvider("text-embedding-3-small", cache=cache)
+    assert await provider.aembed(["hello"]) == [[5.0, 1.0]]
+    assert len(threads) == 2 and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_provider_sends_only_misses(tmp_path: Path, fake_litellm: FakeLiteLLM) -> None:
+    provider = LiteLLMEmbeddingProvider("text-embedding-3-small", cache=EmbeddingCache(tmp_path / "emb.db"))
+    assert provider.embed(["hello", "hi", "hello"]) == [[5.0, 1.0], [2.0, 1.0], [5.0, 1.0]]
+    assert fake_litellm.calls == [["hello", "hi"]]
+
+    assert await provider.aembed(["query", "hello", "hi"]) == [[5.0, 1.0], [5.0, 1.0], [2.0, 1.0]]
+    assert await provider.aembed(["query", "hello", "hi"]) == [[5.0, 1.0], [5.0, 1.0], [2.0, 1.0]]
+    assert fake_litellm.calls == [["hello", "hi"], ["query"]]
+
+    uncached = LiteLLMEmbeddingProvider("text-embedding-3-small")
+    uncached.embed(["hello"])
+    assert fake_litellm.calls[-1] == ["hello"]
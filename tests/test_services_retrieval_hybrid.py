@@ -0,0 +1,156 @@
+"""Hybrid knowledge search: concurrent FTS/vector recall, over-fetch, RRF fusion, timings."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from joyhousebot.services.retrieval import hybrid
+from joyhousebot.services.retrieval.hybrid import (
+    RECALL_OVERFETCH,
+    hybrid_search,
+    hybrid_search_async,
+)
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+
+class FakeEmbedder:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+
+    def embed(self, texts):
+        time.sleep(self.delay)
+        return [[1.0, 0.0] for _ in texts]
+
+    async def aembed(self, texts):
+        await asyncio.sleep(self.delay)
+        return [[1.0, 0.0] for _ in texts]
+
+
+class FakeVectorStore:
+    def __init__(self, ranked: list[tuple[str, int]]) -> None:
+        self.ranked = ranked
+        self.requested_top_k: list[int] = []
+        self.threads: list[str] = []
+
+    def search(self, query_vector, top_k, source_type=None):
+        self.requested_top_k.append(top_k)
+        self.threads.append(threading.current_thread().name)
+        return [
+            (f"{d}:{i}", 0.9, {"doc_id": d, "chunk_index": i, "content": f"vector {d}", "title": d})
+            for d, i in self.ranked[:top_k]
+        ]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    store = RetrievalStore(tmp_path)
+    for n in range(6):
+        # d0 matches "otter" most strongly, d5 least.
+        store.index_doc(f"d{n}", "text", "", f"Doc {n}", "", [{"text": "otter " * (6 - n) + "river", "page": None}])
+    return tmp_path
+
+
+def _enable_vector(monkeypatch, embedder, vector_store) -> None:
+    monkeypatch.setattr(hybrid, "should_enable_vector", lambda *_: True)
+    monkeypatch.setattr(hybrid, "get_embedding_provider", lambda *_: embedder)
+    monkeypatch.setattr(hybrid, "get_vector_store", lambda *_: vector_store)
+
+
+@pytest.mark.asyncio
+async def test_fts_only_search_is_offloaded_and_timed(workspace: Path) -> None:
+    timings: dict[str, float] = {}
+    hits = await hybrid_search_async(workspace, None, "otter", top_k=2, timings=timings)
+    assert [h["doc_id"] for h in hits] == ["d0", "d1"]
+    assert {"ftsMs", "fuseMs", "totalMs"} <= set(timings)
+
+
+@pytest.mark.asyncio
+async def test_store_and_vector_backend_are_opened_off_the_event_loop(workspace: Path, monkeypatch) -> None:
+    opened: list[str] = []
+    init_schema = RetrievalStore._init_schema
+
+    def recording_init_schema(self) -> None:
+        opened.append(threading.current_thread().name)
+        init_schema(self)
+
+    def get_vector_store(*_):
+        opened.append(threading.current_thread().name)
+        return FakeVectorStore([("d0", 0)])
+
+    _enable_vector(monkeypatch, FakeEmbedder(), None)
+    monkeypatch.setattr(hybrid, "get_vector_store", get_vector_store)
+    monkeypatch.setattr(RetrievalStore, "_init_schema", recording_init_schema)
+    await hybrid_search_async(workspace, None, "otter", top_k=2)
+    assert len(opened) == 2 and all(name.startswith("retrieval-recall") for name in opened)
+
+
+@pytest.mark.asyncio
+async def test_fts_runs_concurrently_with_query_embedding(workspace: Path, monkeypatch) -> None:
+    vector_store = FakeVectorStore([("d5", 0)])
+    _enable_vector(monkeypatch, FakeEmbedder(delay=0.3), vector_store)
+    search = RetrievalStore.search
+    fts_threads: list[str] = []
+
+    def slow_search(self, *args, **kwargs):
+        fts_threads.append(threading.current_thread().name)
+        time.sleep(0.3)
+        return search(self, *args, **kwargs)
+
+    monkeypatch.setattr(RetrievalStore, "search", slow_search)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    tick_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    timings: dict[str, float] = {}
+    hits = await hybrid_search_async(workspace, object(), "otter", top_k=3, timings=timings)
+    elapsed = time.perf_counter() - started
+    tick_task.cancel()
+
+    assert elapsed < 0.5  # FTS (0.3 s) overlapped the embedding (0.3 s)
+    assert ticks >= 10  # event loop kept running throughout
+    assert fts_threads[0].startswith("retrieval-recall")
+    assert vector_store.threads[0].startswith("retrieval-recall")
+    assert {"ftsMs", "embedMs", "vectorMs", "fuseMs", "totalMs"} <= set(timings)
+    assert "d5" in [h["doc_id"] for h in hits]
+
+
+def test_recall_is_overfetched_before_rrf_and_sync_matches_async(workspace: Path, monkeypatch) -> None:
+    # d3 is 4th by FTS but 1st by vector: only visible to fusion thanks to over-fetch.
+    vector_store = FakeVectorStore([("d3", 0), ("d9", 0), ("d0", 0)])
+    _enable_vector(monkeypatch, FakeEmbedder(), vector_store)
+
+    hits = hybrid_search(workspace, object(), "otter", top_k=2)
+    assert vector_store.requested_top_k == [2 * RECALL_OVERFETCH]
+    assert [h["doc_id"] for h in hits] == ["d0", "d3"]
+    assert asyncio.run(hybrid_search_async(workspace, object(), "otter", top_k=2)) == hits
+
+    only_d3 = hybrid_search(workspace, object(), "otter", top_k=5, doc_id="d3")
+    assert {h["doc_id"] for h in only_d3} == {"d3"}
+
+
+def test_embed_failure_falls_back_to_fts_in_sync_and_async(workspace: Path, monkeypatch) -> None:
+    class FailingEmbedder:
+        def embed(self, texts):
+            raise RuntimeError("provider down")
+
+        async def aembed(self, texts):
+            raise RuntimeError("provider down")
+
+    vector_store = FakeVectorStore([("d5", 0)])
+    _enable_vector(monkeypatch, FailingEmbedder(), vector_store)
+    sync_timings: dict[str, float] = {}
+    async_timings: dict[str, float] = {}
+    hits = hybrid_search(workspace, object(), "otter", top_k=2, timings=sync_timings)
+    assert asyncio.run(hybrid_search_async(workspace, object(), "otter", top_k=2, timings=async_timings)) == hits
+    assert [h["doc_id"] for h in hits] == ["d0", "d1"]
+    assert vector_store.requested_top_k == []
+    assert "embedMs" in sync_timings and "embedMs" in async_timings
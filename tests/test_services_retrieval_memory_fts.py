@@ -0,0 +1,122 @@
+"""Tests for the FTS5 memory index behind builtin memory search."""
+
+import os
+import sqlite3
+from pathlib import Path
+
+from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.services.retrieval.memory_fts import MemoryFtsIndex, fts_query, split_paragraphs
+from joyhousebot.services.retrieval.memory_search import search_memory_files
+
+
+def _paragraph_count(workspace: Path, file_path: str) -> int:
+    conn = sqlite3.connect(workspace / "memory" / ".memory_fts.db")
+    try:
+        return conn.execute("SELECT COUNT(*) FROM memory_paragraphs WHERE file_path = ?", (file_path,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_split_paragraphs_keeps_start_lines() -> None:
+    text = "a\nb\n\n\nc\n\nd\ne"
+    assert split_paragraphs(text) == [(0, "a\nb"), (4, "c"), (6, "d\ne")]
+    assert split_paragraphs("x", first_line=10) == [(10, "x")]
+
+
+def test_fts_query_drops_short_terms() -> None:
+    assert fts_query("ab") is None
+    assert fts_query('say "hi" to deploy') == '"say ""hi"" to deploy" OR "say" OR "deploy"'
+
+
+def test_search_returns_paragraph_hits(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "MEMORY.md").write_text("# Prefs\nUser likes tea.\n\n# Work\nMigrating the billing service.\n")
+    hits = search_memory_files(tmp_path, query="billing", top_k=5)
+    assert len(hits) == 1
+    assert hits[0]["file_path"] == "memory/MEMORY.md"
+    assert hits[0]["chunk_index"] == 3
+    assert hits[0]["content"] == "# Work\nMigrating the billing service."
+
+
+def test_recent_paragraphs_rank_first(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "2020-01-01.md").write_text("Talked about the database migration plan.\n")
+    (memory_dir / "2099-01-01.md").write_text("Talked about the database migration plan.\n")
+    hits = search_memory_files(tmp_path, query="database migration", top_k=2)
+    assert [h["file_path"] for h in hits] == ["memory/2099-01-01.md", "memory/2020-01-01.md"]
+
+
+def test_better_bm25_match_ranks_first(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "MEMORY.md").write_text(
+        "The kubernetes cluster runs kubernetes workloads.\n\nSome unrelated text mentioning a cluster once among many other words.\n"
+    )
+    hits = search_memory_files(tmp_path, query="kubernetes cluster", top_k=2)
+    assert "kubernetes" in hits[0]["content"]
+
+
+def test_memory_store_writes_update_index_incrementally(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-01 10:00] Chose Postgres for storage.")
+    assert search_memory_files(tmp_path, query="Postgres", top_k=5)[0]["file_path"] == "memory/HISTORY.md"
+    assert _paragraph_count(tmp_path, "memory/HISTORY.md") == 1
+
+    store.append_history("[2026-01-02 10:00] Added a Redis cache.")
+    # The append is indexed as a tail: the earlier paragraph row is kept, not rebuilt.
+    assert _paragraph_count(tmp_path, "memory/HISTORY.md") == 2
+    hits = search_memory_files(tmp_path, query="Redis", top_k=5)
+    assert hits[0]["chunk_index"] == 2
+
+    store.append_history("[2026-01-03 10:00] Dropped Redis.", max_entries=1)
+    assert _paragraph_count(tmp_path, "memory/HISTORY.md") == 1
+    assert search_memory_files(tmp_path, query="Postgres", top_k=5) == []
+
+    store.write_long_term("Prefers concise answers.")
+    assert search_memory_files(tmp_path, query="concise", top_k=5)[0]["file_path"] == "memory/MEMORY.md"
+
+
+def test_external_edits_and_deletes_are_picked_up(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    note = memory_dir / "notes.md"
+    note.write_text("alpha release notes\n")
+    assert search_memory_files(tmp_path, query="alpha", top_k=5)
+
+    note.write_text("omega release notes, longer than before\n")
+    os.utime(note, (1, 1))
+    assert search_memory_files(tmp_path, query="alpha", top_k=5) == []
+    assert search_memory_files(tmp_path, query="omega", top_k=5)
+
+    note.unlink()
+    assert search_memory_files(tmp_path, query="omega", top_k=5) == []
+    assert _paragraph_count(tmp_path, "memory/notes.md") == 0
+
+
+def test_scopes_are_isolated(tmp_path: Path) -> None:
+    MemoryStore(tmp_path, scope_key="session:abc").write_long_term("secret project falcon")
+    MemoryStore(tmp_path).write_long_term("shared project heron")
+    assert search_memory_files(tmp_path, query="project", top_k=5, scope_key=None)[0]["content"] == "shared project heron"
+    scoped = search_memory_files(tmp_path, query="project", top_k=5, scope_key="session:abc")
+    assert [h["content"] for h in scoped] == ["secret project falcon"]
+
+
+def test_short_queries_fall_back_to_grep(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "MEMORY.md").write_text("line one\nuses Go at work\nline three\n")
+    hits = search_memory_files(tmp_path, query="Go", top_k=5)
+    assert len(hits) == 1
+    assert hits[0]["chunk_index"] == 1
+
+
+def test_refresh_scope_skips_unchanged_files(tmp_path: Path) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "MEMORY.md").write_text("stable content\n")
+    index = MemoryFtsIndex(tmp_path)
+    candidates = [("memory/MEMORY.md", memory_dir / "MEMORY.md")]
+    assert index.refresh_scope("", candidates) == 1
+    assert index.refresh_scope("", candidates) == 0
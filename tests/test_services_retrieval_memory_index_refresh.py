@@ -0,0 +1,109 @@
+"""Tests for incremental, background refresh of the memory vector index."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+import joyhousebot.services.retrieval.vector_optional as vector_optional
+from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.services.retrieval.memory_vector_store import (
+    MemoryVectorStore,
+    get_memory_index_refresher,
+    search_memory_sqlite_vector,
+)
+
+
+class CountingEmbedder:
+    keys = ("dark", "coffee", "python", "travel")
+
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[float(t.lower().count(k)) + 0.01 for k in self.keys] for t in texts]
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        return self.embed(texts)
+
+
+def test_refresh_reembeds_only_changed_chunks(tmp_path: Path) -> None:
+    memory = MemoryStore(tmp_path)
+    memory.write_long_term("User prefers dark mode.")
+    memory.append_l2_daily("2026-01-01", "Drank coffee.")
+    store = MemoryVectorStore(tmp_path)
+    embedder = CountingEmbedder()
+
+    first = store.refresh_index(None, embedder.embed)
+    assert (first["files_changed"], first["chunks_embedded"]) == (2, 2)
+    assert store.needs_refresh(None) is False
+    assert store.refresh_index(None, embedder.embed)["files_changed"] == 0
+
+    embedder.embedded.clear()
+    memory.append_history("[2026-01-02] Started learning python.")
+    assert store.needs_refresh(None) is True
+    report = store.refresh_index(None, embedder.embed)
+    assert report == {"files_changed": 1, "files_removed": 0, "chunks_embedded": 1, "chunks_reused": 0}
+    assert embedder.embedded == ["[2026-01-02] Started learning python."]
+
+    # Rewriting a file with identical content only refreshes its stat.
+    memory.write_long_term("User prefers dark mode.")
+    assert store.refresh_index(None, embedder.embed)["files_changed"] == 0
+
+    memory.get_l2_path("2026-01-01").unlink()
+    assert store.refresh_index(None, embedder.embed)["files_removed"] == 1
+    hits = store.search(None, embedder.embed(["python"])[0], top_k=5)
+    assert {h["file_path"] for h in hits} == {"memory/MEMORY.md", "memory/HISTORY.md"}
+
+
+@pytest.mark.asyncio
+async def test_search_refreshes_in_background(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    embedder = CountingEmbedder()
+    monkeypatch.setattr(vector_optional, "get_memory_embedding_provider", lambda config: embedder)
+    MemoryStore(tmp_path).write_long_term("User drinks coffee daily.")
+
+    # No index yet: the search falls back instead of embedding memory inline.
+    assert await search_memory_sqlite_vector(tmp_path, object(), "coffee", top_k=3) is None
+    get_memory_index_refresher().wait(timeout=10)
+    hits = await search_memory_sqlite_vector(tmp_path, object(), "coffee", top_k=3)
+    assert [h["file_path"] for h in hits] == ["memory/MEMORY.md"]
+
+
+def test_memory_store_writes_notify_on_change(tmp_path: Path) -> None:
+    changes: list[str | None] = []
+    memory = MemoryStore(tmp_path, scope_key="telegram:1", on_change=changes.append)
+    memory.write_long_term("fact")
+    memory.append_history("entry")
+    memory.append_l2_daily("2026-01-01", "log")
+    memory.update_l0_abstract("index")
+    assert changes == ["telegram:1"] * 4
+
+
+def test_concurrent_connects_migrate_old_index_once(tmp_path: Path) -> None:
+    store = MemoryVectorStore(tmp_path)
+    store.db_path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(store.db_path)
+    conn.execute(
+        "CREATE TABLE memory_index (id INTEGER PRIMARY KEY, scope_key TEXT NOT NULL, file_path TEXT NOT NULL,"
+        " chunk_index INTEGER NOT NULL, content TEXT NOT NULL, embedding BLOB NOT NULL, file_mtime REAL NOT NULL)"
+    )
+    conn.close()
+    errors: list[Exception] = []
+
+    def connect() -> None:
+        try:
+            MemoryVectorStore(tmp_path)._connect().close()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=connect) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    conn = sqlite3.connect(store.db_path)
+    assert "chunk_hash" in {row[1] for row in conn.execute("PRAGMA table_info(memory_index)")}
+    conn.close()
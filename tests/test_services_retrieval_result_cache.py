@@ -0,0 +1,80 @@
+"""Retrieval result cache: LRU + TTL, invalidated by index generation counters."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from joyhousebot.agent.memory import MemoryStore
+from joyhousebot.agent.tools.retrieve import RetrieveTool
+from joyhousebot.services.retrieval.adapter import search_async
+from joyhousebot.services.retrieval.result_cache import RetrievalResultCache, index_generation
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+
+def test_cache_honours_token_ttl_and_lru_bound() -> None:
+    cache = RetrievalResultCache(max_entries=2, ttl_seconds=0.2)
+    cache.put("a", (1,), [{"doc_id": "x", "trace": {}}])
+    hit = cache.get("a", (1,))
+    assert hit == [{"doc_id": "x", "trace": {}}]
+    hit[0]["trace"]["mutated"] = True
+    assert cache.get("a", (1,)) == [{"doc_id": "x", "trace": {}}]  # callers get copies
+    assert cache.get("a", (2,)) is None  # index moved on
+    cache.put("a", (1,), [])
+    cache.put("b", (1,), [])
+    cache.put("c", (1,), [])
+    assert cache.get("a", (1,)) is None and cache.stats()["evictions"] == 1
+    time.sleep(0.25)
+    assert cache.get("c", (1,)) is None
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_knowledge_results_are_cached_until_the_store_changes(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    store.index_doc("d1", "text", "", "Doc", "", [{"text": "capybara facts", "page": None}])
+    first: dict = {}
+    hits = await search_async(tmp_path, None, "Capybara", cache_info=first)
+    again: dict = {}
+    assert await search_async(tmp_path, None, "  capybara ", cache_info=again) == hits
+    assert (first, again) == ({"hit": False}, {"hit": True})
+
+    generation = index_generation(tmp_path, "knowledge")
+    store.replace_doc("d2", "text", "", "Doc 2", "", [{"text": "more capybara", "page": None}])
+    assert index_generation(tmp_path, "knowledge") != generation
+    after: dict = {}
+    assert len(await search_async(tmp_path, None, "capybara", cache_info=after)) == 2
+    assert after == {"hit": False}
+
+
+@pytest.mark.asyncio
+async def test_memory_writes_invalidate_and_tool_reports_hits(tmp_path: Path) -> None:
+    memory = MemoryStore(tmp_path)
+    memory.write_long_term("Likes hiking in the alps.")
+    tool = RetrieveTool(tmp_path)
+
+    first = json.loads(await tool.execute(query="hiking", scope="memory"))
+    second = json.loads(await tool.execute(query="hiking", scope="memory"))
+    assert first["cached"] is False and second["cached"] is True
+    assert second["hits"] == first["hits"]
+
+    memory.write_long_term("Likes hiking in the alps. Hiking boots size 42.")
+    third = json.loads(await tool.execute(query="hiking", scope="memory"))
+    assert third["cached"] is False
+    assert "boots" in json.dumps(third["hits"])
+    assert tool.cache_stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_direct_memory_file_edits_invalidate(tmp_path: Path) -> None:
+    MemoryStore(tmp_path).write_long_term("Likes hiking in the alps.")
+    tool = RetrieveTool(tmp_path)
+    first = json.loads(await tool.execute(query="hiking", scope="memory"))
+    assert json.loads(await tool.execute(query="hiking", scope="memory"))["cached"] is True
+
+    # What edit_file / write_file do: no MemoryStore, so no generation bump.
+    (tmp_path / "memory" / "MEMORY.md").write_text("Likes hiking in the alps. Hiking poles too.", encoding="utf-8")
+    after = json.loads(await tool.execute(query="hiking", scope="memory"))
+    assert after["cached"] is False
+    assert "poles" in json.dumps(after["hits"]) and after["hits"] != first["hits"]
@@ -0,0 +1,78 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from joyhousebot.services.retrieval.store import RetrievalStore
+
+
+def _chunks(*texts: str) -> list[dict]:
+    return [{"text": t, "page": None} for t in texts]
+
+
+def _fts_rows(store: RetrievalStore) -> int:
+    with sqlite3.connect(store.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM knowledge_fts").fetchone()[0]
+
+
+def test_replace_doc_swaps_chunks_atomically(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    store.index_doc("d1", "text", "", "Doc", "a.md", _chunks("alpha apples", "alpha bananas"))
+    assert len(store.search("alpha")) == 2
+
+    store.replace_doc("d1", "text", "", "Doc", "a.md", _chunks("gamma cherries"))
+    assert store.search("alpha") == []
+    assert [h["content"] for h in store.search("gamma")] == ["gamma cherries"]
+    assert _fts_rows(store) == 1
+
+
+def test_bulk_load_rebuilds_fts_once_and_keeps_triggers(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    store.index_doc("old", "text", "", "Old", "", _chunks("stale zebra"))
+    with store.bulk_load() as loader:
+        loader.replace_doc("old", "text", "", "Old", "", _chunks("fresh zebra"))
+        for i in range(20):
+            loader.replace_doc(f"d{i}", "url", "https://x", f"T{i}", "", _chunks(f"kiwi {i}", "mango"))
+    assert (loader.docs, loader.chunks) == (21, 41)
+    assert [h["content"] for h in store.search("zebra")] == ["fresh zebra"]
+    assert len(store.search("mango", top_k=100)) == 20
+    assert _fts_rows(store) == 41
+
+    # Triggers are back: ordinary writes stay searchable after a bulk load.
+    store.replace_doc("d0", "url", "https://x", "T0", "", _chunks("papaya"))
+    assert [h["doc_id"] for h in store.search("papaya")] == ["d0"]
+    assert len(store.search("mango", top_k=100)) == 19
+
+
+def test_bulk_load_rolls_back_on_error(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    store.index_doc("keep", "text", "", "Keep", "", _chunks("original walnut"))
+    with pytest.raises(RuntimeError):
+        with store.bulk_load() as loader:
+            loader.replace_doc("keep", "text", "", "Keep", "", _chunks("replaced"))
+            raise RuntimeError("boom")
+    assert [h["content"] for h in store.search("walnut")] == ["original walnut"]
+    store.index_doc("later", "text", "", "Later", "", _chunks("walnut pie"))
+    assert len(store.search("walnut")) == 2
+
+
+def test_bulk_load_holds_no_write_lock_while_collecting(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    with store.bulk_load() as loader:
+        loader.replace_doc("bulk", "text", "", "Bulk", "", _chunks("fig bulk"))
+        # Another writer is not blocked while documents are still being parsed.
+        RetrievalStore(tmp_path).index_doc("live", "text", "", "Live", "", _chunks("fig live"))
+        assert [h["doc_id"] for h in store.search("fig")] == ["live"]
+    assert sorted(h["doc_id"] for h in store.search("fig")) == ["bulk", "live"]
+    assert _fts_rows(store) == 2
+
+
+def test_optimize_if_due_counts_document_writes(tmp_path: Path) -> None:
+    store = RetrievalStore(tmp_path)
+    for i in range(3):
+        store.replace_doc(f"d{i}", "text", "", "", "", _chunks(f"pear {i}"))
+    assert store.optimize_if_due(min_docs=4) is False
+    store.index_doc("d3", "text", "", "", "", _chunks("pear 3"))
+    assert store.optimize_if_due(min_docs=4) is True
+    assert store.optimize_if_due(min_docs=1) is False
+    assert len(store.search("pear")) == 4
@@ -0,0 +1,73 @@
+"""Tests for the cached cosine top-k engine and its use by the memory vector index."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+import joyhousebot.services.retrieval.vector_search as vector_search
+from joyhousebot.services.retrieval.memory_vector_store import MemoryVectorStore
+from joyhousebot.services.retrieval.vector_search import VectorMatrix, rank_by_cosine
+
+
+def _brute_force(query, vectors, k):
+    def cos(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        na = sum(x * x for x in a) ** 0.5
+        nb = sum(x * x for x in b) ** 0.5
+        return dot / (na * nb)
+
+    return sorted(range(len(vectors)), key=lambda i: -cos(query, vectors[i]))[:k]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_vector_matrix_matches_brute_force(monkeypatch: pytest.MonkeyPatch, use_numpy: bool) -> None:
+    if not use_numpy:
+        monkeypatch.setattr(vector_search, "np", None)
+    rng = random.Random(7)
+    vectors = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(200)]
+    queries = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(3)]
+    matrix = VectorMatrix([f"id{i}" for i in range(200)], vectors)
+
+    results = matrix.search_batch(queries + [[1.0, 2.0]], top_k=5)
+    for query, hits in zip(queries, results):
+        assert [row_id for row_id, _ in hits] == [f"id{i}" for i in _brute_force(query, vectors, 5)]
+        assert all(a[1] >= b[1] for a, b in zip(hits, hits[1:]))
+    assert results[-1] == []  # wrong dimension
+    assert rank_by_cosine(queries[0], vectors, 3) == _brute_force(queries[0], vectors, 3)
+    assert len(matrix.search(queries[0], top_k=500)) == 200
+
+
+def _embed(texts: list[str]) -> list[list[float]]:
+    # Deterministic toy embedding: letter counts of a few keywords.
+    keys = ("dark", "coffee", "python", "travel")
+    return [[float(t.lower().count(k)) + 0.01 for k in keys] for t in texts]
+
+
+def test_memory_vector_store_caches_matrix_until_rebuild(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    (memory_dir / "MEMORY.md").write_text("User prefers dark mode.")
+    (memory_dir / "notes.md").write_text("Drinks coffee every morning.")
+    store = MemoryVectorStore(tmp_path)
+    assert store.ensure_index(None, None, _embed)
+
+    loads = []
+    original = VectorMatrix.from_blobs.__func__
+
+    def counting_from_blobs(cls, ids, blobs):
+        loads.append(len(ids))
+        return original(cls, ids, blobs)
+
+    monkeypatch.setattr(VectorMatrix, "from_blobs", classmethod(counting_from_blobs))
+
+    hits = store.search(None, _embed(["coffee"])[0], top_k=1)
+    assert [h["file_path"] for h in hits] == ["memory/notes.md"]
+    batch = store.search_batch(None, _embed(["dark", "coffee"]), top_k=2)
+    assert [hs[0]["title"] for hs in batch] == ["MEMORY.md", "notes.md"]
+    assert loads == [2]
+
+    (memory_dir / "python.md").write_text("Writes python daily.")
+    assert store.ensure_index(None, None, _embed, force_rebuild=True)
+    assert store.search(None, _embed(["python"])[0], top_k=1)[0]["file_path"] == "memory/python.md"
+    assert loads == [2, 3]
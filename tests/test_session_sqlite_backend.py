@@ -0,0 +1,98 @@
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from joyhousebot.session.manager import SessionManager
+from joyhousebot.session.migrate import migrate_jsonl_to_sqlite
+from joyhousebot.session.sqlite_backend import SqliteSessionBackend
+
+
+@pytest.fixture
+def make_manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def _make(**cfg) -> SessionManager:
+        return SessionManager(tmp_path / "ws", sessions_config=SimpleNamespace(**cfg))
+
+    return _make
+
+
+def test_sqlite_roundtrip_append_and_rewrite(make_manager) -> None:
+    manager = make_manager(backend="sqlite", durability="os")
+    assert isinstance(manager.backend, SqliteSessionBackend)
+    session = manager.get_or_create("tg:1")
+    session.add_message("user", "m0")
+    session.metadata["topic"] = "x"
+    manager.save(session)
+    session.add_message("assistant", "m1")
+    manager.save(session)
+
+    reloaded = make_manager(backend="sqlite").get_or_create("tg:1")
+    assert [m["content"] for m in reloaded.messages] == ["m0", "m1"]
+    assert reloaded.metadata == {"topic": "x"}
+
+    session.clear()
+    session.add_message("user", "fresh")
+    manager.save(session)
+    assert [m["content"] for m in make_manager(backend="sqlite").get_or_create("tg:1").messages] == ["fresh"]
+
+    listed = manager.list_sessions()
+    assert [s["key"] for s in listed] == ["tg:1"]
+    assert manager.delete("tg:1") is True
+    assert manager.list_sessions() == []
+
+
+@pytest.mark.parametrize("backend", ["jsonl", "sqlite"])
+def test_get_history_range_read_without_caching(make_manager, backend: str) -> None:
+    writer = make_manager(backend=backend, durability="os")
+    session = writer.get_or_create("cli:range")
+    for i in range(10):
+        session.add_message("user", f"m{i}")
+    writer.save(session)
+    writer.close()
+
+    reader = make_manager(backend=backend)
+    assert [m["content"] for m in reader.get_history("cli:range", 3)] == ["m7", "m8", "m9"]
+    assert "cli:range" not in reader._cache
+    assert reader.get_history("cli:missing", 3) == []
+
+
+def test_cache_is_bounded_lru_with_ttl(make_manager) -> None:
+    manager = make_manager(durability="os", cache_max_entries=2, cache_ttl_seconds=3600)
+    a = manager.get_or_create("t:a")
+    manager.get_or_create("t:b")
+    assert manager.get_or_create("t:a") is a
+    manager.get_or_create("t:c")
+    assert list(manager._cache) == ["t:a", "t:c"]
+
+    manager.cache_ttl_s = 0.01
+    time.sleep(0.02)
+    assert manager.get_or_create("t:a") is not a
+
+
+def test_migrate_jsonl_to_sqlite(make_manager, tmp_path: Path) -> None:
+    jsonl = make_manager(durability="os")
+    for key in ("telegram:42", "cli:user_with_underscore"):
+        session = jsonl.get_or_create(key)
+        session.add_message("user", f"hello {key}")
+        jsonl.save(session)
+    jsonl.close()
+    legacy = tmp_path / ".joyhousebot" / "sessions" / "slack_C1.jsonl"
+    legacy.write_text(
+        json.dumps({"_type": "metadata", "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00",
+                    "metadata": {}, "last_consolidated": 0}) + "\n"
+        + json.dumps({"role": "user", "content": "old"}) + "\n"
+    )
+
+    db_path = tmp_path / ".joyhousebot" / "sessions" / "sessions.db"
+    report = migrate_jsonl_to_sqlite(tmp_path / ".joyhousebot" / "sessions", db_path)
+    assert (report.imported, report.skipped, report.failed) == (3, 0, [])
+    assert migrate_jsonl_to_sqlite(tmp_path / ".joyhousebot" / "sessions", db_path).skipped == 3
+
+    sqlite = make_manager(backend="sqlite")
+    assert {s["key"] for s in sqlite.list_sessions()} == {"telegram:42", "cli:user_with_underscore", "slack:C1"}
+    assert sqlite.get_or_create("cli:user_with_underscore").messages[0]["content"] == "hello cli:user_with_underscore"
+    assert sqlite.get_history("slack:C1", 5)[0]["content"] == "old"
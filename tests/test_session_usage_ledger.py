@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from joyhousebot.services.sessions.usage_service import (
+    build_usage_logs,
+    build_usage_payload,
+    build_usage_timeseries,
+)
+from joyhousebot.session.manager import SessionManager
+from joyhousebot.session.usage_ledger import UsageLedger
+
+
+def _empty_usage_totals():
+    return {
+        "input": 0, "output": 0, "cacheRead": 0, "cacheWrite": 0, "totalTokens": 0, "totalCost": 0,
+        "inputCost": 0, "outputCost": 0, "cacheReadCost": 0, "cacheWriteCost": 0, "missingCostEntries": 0,
+    }
+
+
+def _fail_scan(*_args, **_kwargs):
+    raise AssertionError("ledger-backed usage must not rescan session messages")
+
+
+def _turn(session, n: int, model: str) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    session.messages.append({"role": "user", "content": f"question {n}", "timestamp": now})
+    session.messages.append({
+        "role": "assistant", "content": f"answer {n}", "timestamp": now, "model": model,
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}, "cost": 0.5,
+    })
+
+
+@pytest.fixture
+def agent(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    sessions = SessionManager(tmp_path / "ws", sessions_config=SimpleNamespace(durability="os"))
+    return SimpleNamespace(sessions=sessions, usage_ledger=UsageLedger(tmp_path / "usage.db"))
+
+
+def test_ingest_is_incremental_and_restarts_after_clear(agent) -> None:
+    ledger = agent.usage_ledger
+    session = agent.sessions.get_or_create("telegram:1")
+    _turn(session, 1, "openai/gpt-4o")
+    assert ledger.ingest(session.key, session.messages) == 2
+    assert ledger.ingest(session.key, session.messages) == 0
+    _turn(session, 2, "openai/gpt-4o")
+    assert ledger.ingest(session.key, session.messages) == 2
+
+    session.clear()
+    _turn(session, 3, "anthropic/claude")
+    assert ledger.ingest(session.key, session.messages) == 2
+    assert [e["preview"] for e in ledger.events(session.key, limit=2)] == ["question 3", "answer 3"]
+
+
+def test_ingest_restarts_after_reset_that_grows_past_old_cursor(agent) -> None:
+    ledger = agent.usage_ledger
+    session = agent.sessions.get_or_create("telegram:1")
+    _turn(session, 1, "openai/gpt-4o")
+    _turn(session, 2, "openai/gpt-4o")
+    assert ledger.ingest(session.key, session.messages) == 4
+
+    session.clear()
+    for n in range(3, 6):
+        _turn(session, n, "openai/gpt-4o")
+    assert ledger.ingest(session.key, session.messages) == 6
+    assert len(ledger.events(session.key)) == 10
+    [row] = ledger.daily_rollups("0000-01-01", "9999-12-31", group_by=("session_key",))
+    assert row["output"] == 25 and row["assistant_messages"] == 5
+
+
+def test_usage_payload_served_from_rollups_with_dimensions(agent) -> None:
+    live = agent.sessions.get_or_create("telegram:1")
+    _turn(live, 1, "openai/gpt-4o")
+    _turn(live, 2, "anthropic/claude")
+    agent.sessions.save(live)
+    agent.usage_ledger.ingest(live.key, live.messages, channel="telegram")
+
+    # Saved before the ledger existed: backfilled once from storage.
+    legacy = agent.sessions.get_or_create("slack:C1")
+    _turn(legacy, 1, "openai/gpt-4o")
+    agent.sessions.save(legacy)
+
+    payload = build_usage_payload(
+        params={}, now_ms=lambda: 1, agent=agent,
+        empty_usage_totals=_empty_usage_totals, session_usage_entry=_fail_scan,
+    )
+    assert {s["key"] for s in payload["sessions"]} == {"telegram:1", "slack:C1"}
+    # 3 provider-reported replies (15 each) + 3 user messages estimated at 3 tokens each.
+    assert payload["totals"]["totalTokens"] == 54
+    assert payload["totals"]["totalCost"] == pytest.approx(1.5)
+    aggregates = payload["aggregates"]
+    assert aggregates["messages"]["assistant"] == 3
+    assert {(m["provider"], m["model"], m["count"]) for m in aggregates["byModel"] if m["model"]} == {
+        ("openai", "openai/gpt-4o", 2), ("anthropic", "anthropic/claude", 1),
+    }
+    assert {p["provider"] for p in aggregates["byProvider"]} >= {"openai", "anthropic"}
+    assert {c["channel"]: c["totals"]["totalTokens"] for c in aggregates["byChannel"]} == {"slack": 18, "telegram": 36}
+    assert aggregates["daily"][0]["messages"] == 6
+
+    series = build_usage_timeseries(key="slack:C1", agent=agent, now_ms=lambda: 0, estimate_tokens=_fail_scan)
+    assert series["points"][-1]["cumulativeTokens"] == 18
+    logs = build_usage_logs(key="telegram:1", limit=1, agent=agent, estimate_tokens=_fail_scan)
+    assert logs["logs"] == [
+        {"timestamp": live.messages[-1]["timestamp"], "role": "assistant", "content": "answer 2", "tokens": 15, "cost": 0.5}
+    ]
+
+
+def test_prompt_cache_tokens_roll_up(agent) -> None:
+    session = agent.sessions.get_or_create("telegram:1")
+    _turn(session, 1, "anthropic/claude")
+    session.messages[-1]["usage"].update({"cache_read_tokens": 800, "cache_write_tokens": 200})
+    agent.sessions.save(session)
+    agent.usage_ledger.ingest(session.key, session.messages, channel="telegram")
+
+    payload = build_usage_payload(
+        params={}, now_ms=lambda: 1, agent=agent,
+        empty_usage_totals=_empty_usage_totals, session_usage_entry=_fail_scan,
+    )
+    assert (payload["totals"]["cacheRead"], payload["totals"]["cacheWrite"]) == (800, 200)
+    assert payload["aggregates"]["daily"][0]["cacheRead"] == 800
+    by_model = {m["model"]: m["totals"] for m in payload["aggregates"]["byModel"] if m["model"]}
+    assert by_model["anthropic/claude"]["cacheRead"] == 800
+    series = build_usage_timeseries(key=session.key, agent=agent, now_ms=lambda: 0, estimate_tokens=_fail_scan)
+    assert [p["cacheWrite"] for p in series["points"]] == [0, 200]
+
+
+def test_ledger_without_cache_columns_is_migrated(tmp_path: Path) -> None:
+    import sqlite3
+
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE usage_events (id INTEGER PRIMARY KEY AUTOINCREMENT, session_key TEXT NOT NULL, ts_ms INTEGER,"
+        " timestamp TEXT, role TEXT NOT NULL, model TEXT NOT NULL DEFAULT '', input INTEGER NOT NULL DEFAULT 0,"
+        " output INTEGER NOT NULL DEFAULT 0, cost REAL NOT NULL DEFAULT 0, preview TEXT NOT NULL DEFAULT '')"
+    )
+    conn.commit()
+    conn.close()
+    ledger = UsageLedger(db)
+    ledger.ingest("cli:1", [{"role": "assistant", "content": "hi", "usage": {"cache_read_tokens": 5}}])
+    assert ledger.events("cli:1")[0]["cache_read"] == 5
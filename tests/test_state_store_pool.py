@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from joyhousebot.storage.sqlite_store import LocalStateStore
+
+
+def test_shared_store_is_singleton_and_inits_schema_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    original = LocalStateStore._init_db
+
+    def counting_init(self):
+        calls.append(self.db_path)
+        original(self)
+
+    monkeypatch.setattr(LocalStateStore, "_init_db", counting_init)
+    db_path = tmp_path / "state" / "house.db"
+    first = LocalStateStore.shared(db_path)
+    for _ in range(5):
+        assert LocalStateStore.shared(db_path) is first
+    assert calls == [db_path]
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    assert LocalStateStore.default() is LocalStateStore.default()
+    assert len(calls) == 2
+
+
+def test_shared_store_closes_replaced_instance_when_db_is_removed(tmp_path: Path) -> None:
+    db_path = tmp_path / "house.db"
+    first = LocalStateStore.shared(db_path)
+    first.set_sync_json(name="k", value={"i": 1})
+    executor = first.aio._executor
+    db_path.unlink()
+    second = LocalStateStore.shared(db_path)
+    assert second is not first
+    assert first._aio is None and first._pool._closed and executor._shutdown
+    assert second.get_sync_json(name="k", default=None) is None
+
+
+def test_pooled_connections_are_reused_across_threads(tmp_path: Path) -> None:
+    store = LocalStateStore(tmp_path / "house.db")
+    errors: list[BaseException] = []
+
+    def worker(n: int) -> None:
+        try:
+            for i in range(50):
+                store.set_sync_json(name=f"k{n}", value={"i": i})
+                assert store.get_sync_json(name=f"k{n}", default=None) == {"i": i}
+        except BaseException as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(store._pool._idle) <= store._pool.max_idle
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_async_facade_runs_on_executor_in_order(tmp_path: Path) -> None:
+    store = LocalStateStore(tmp_path / "house.db")
+    main_thread = threading.get_ident()
+    seen: list[int] = []
+
+    def probe() -> str:
+        seen.append(threading.get_ident())
+        return "ok"
+
+    for i in range(20):
+        store.aio.submit("set_sync_json", name="counter", value={"i": i})
+    assert await store.aio.get_sync_json(name="counter", default=None) == {"i": 19}
+    assert await store.aio.run(probe) == "ok"
+    assert seen and seen[0] != main_thread
+    results = await asyncio.gather(*(store.aio.get_sync_value(name="missing") for _ in range(5)))
+    assert results == [None] * 5
+    store.close()
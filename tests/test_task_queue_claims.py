@@ -0,0 +1,86 @@
+import threading
+import time
+from pathlib import Path
+
+from joyhousebot.storage.sqlite_store import LocalStateStore
+
+
+def _enqueue(store: LocalStateStore, n: int, priority: int = 100) -> None:
+    for i in range(n):
+        store.enqueue_task(
+            task_id=f"t{priority}-{i}", source="local", task_type="demo", task_version="1.0",
+            payload={"i": i}, priority=priority,
+        )
+
+
+def test_claim_tasks_batches_in_priority_order_and_logs(tmp_path: Path) -> None:
+    store = LocalStateStore(tmp_path / "house.db")
+    _enqueue(store, 3, priority=100)
+    _enqueue(store, 2, priority=10)
+
+    claimed = store.claim_tasks(limit=3, lease_owner="w1", lease_seconds=60)
+    assert [t.task_id for t in claimed] == ["t10-0", "t10-1", "t100-0"]
+    assert all(t.status == "running" for t in claimed)
+    assert "claimed" in [e["event"] for e in store.list_task_events(task_id="t10-0")]
+
+    assert [t.task_id for t in store.claim_tasks(limit=10)] == ["t100-1", "t100-2"]
+    assert store.claim_tasks(limit=10) == []
+    assert store.pop_next_queued_task() is None
+
+
+def test_concurrent_workers_never_claim_the_same_task(tmp_path: Path) -> None:
+    db_path = tmp_path / "house.db"
+    _enqueue(LocalStateStore(db_path), 60)
+    claims: list[str] = []
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        store = LocalStateStore(db_path)  # separate pool, as in a separate process
+        while True:
+            batch = store.claim_tasks(limit=3, lease_owner=f"w{n}", lease_seconds=60)
+            if not batch:
+                return
+            with lock:
+                claims.extend(t.task_id for t in batch)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(claims) == 60
+    assert len(set(claims)) == 60
+
+
+def test_expired_lease_is_requeued_and_renewal_keeps_it(tmp_path: Path) -> None:
+    store = LocalStateStore(tmp_path / "house.db")
+    _enqueue(store, 2)
+    held, crashed = store.claim_tasks(limit=2, lease_owner="w1", lease_seconds=1)
+
+    assert store.renew_task_lease(task_id=held.task_id, lease_owner="w1", lease_seconds=60) is True
+    assert store.renew_task_lease(task_id=held.task_id, lease_owner="w2", lease_seconds=60) is False
+    time.sleep(1.1)
+
+    reclaimed = store.claim_tasks(limit=5, lease_owner="w2", lease_seconds=60)
+    assert [t.task_id for t in reclaimed] == [crashed.task_id]
+    assert "lease_expired" in [e["event"] for e in store.list_task_events(task_id=crashed.task_id)]
+    assert store.renew_task_lease(task_id=crashed.task_id, lease_owner="w1", lease_seconds=60) is False
+
+    store.update_task_status(task_id=held.task_id, status="completed")
+    assert store.renew_task_lease(task_id=held.task_id, lease_owner="w1", lease_seconds=60) is False
+    assert store.requeue_expired_leases() == 0
+
+
+def test_expired_leases_count_as_retries_until_the_task_fails(tmp_path: Path) -> None:
+    store = LocalStateStore(tmp_path / "house.db")
+    _enqueue(store, 1)
+    for attempt in range(3):
+        (task,) = store.claim_tasks(limit=1, lease_owner="w1", lease_seconds=1, max_retries=2)
+        assert task.retry_count == attempt
+        time.sleep(1.1)
+    assert store.claim_tasks(limit=1, lease_owner="w1", lease_seconds=1, max_retries=2) == []
+    (task,) = store.list_tasks(status="failed")
+    assert task.retry_count == 3
+    assert task.error["code"] == "LEASE_EXPIRED"
+    events = [e for e in store.list_task_events(task_id=task.task_id) if e["event"] == "lease_expired"]
+    assert sorted(e["detail"]["status"] for e in events) == ["failed", "queued", "queued"]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import json
+
 import pytest
 
 from joyhousebot.services.chat.trace_context import (
@@ -64,3 +66,24 @@ def test_trace_recorder_no_truncation_when_none() -> None:
     long_result = "x" * 100
     rec.append("tool_end", {"tool": "exec", "result": long_result}, ts_ms=1000)
     assert rec.steps[0]["payload"]["result"] == long_result
+
+
+def test_trace_recorder_coalesces_consecutive_llm_deltas() -> None:
+    rec = TraceRecorder(started_at_ms=0)
+    rec.append("llm_delta", {"content": "Hel"}, ts_ms=10)
+    rec.append("llm_delta", {"content": "lo"}, ts_ms=20)
+    rec.append("llm_end", {"iteration": 1, "ttftMs": 10}, ts_ms=30)
+    rec.append("llm_delta", {"content": "again"}, ts_ms=40)
+    steps = json.loads(rec.to_steps_json())
+    assert [s["type"] for s in steps] == ["llm_delta", "llm_end", "llm_delta"]
+    assert steps[0] == {"type": "llm_delta", "payload": {"content": "Hello"}, "ts_ms": 10}
+    assert steps[2]["payload"]["content"] == "again"
+
+
+def test_trace_recorder_truncates_streamed_content() -> None:
+    rec = TraceRecorder(started_at_ms=0, max_step_payload_chars=10)
+    for i in range(1000):
+        rec.append("llm_delta", {"content": "abcd"}, ts_ms=i)
+    (step,) = json.loads(rec.to_steps_json())
+    assert step["payload"]["content"] == "abcdabcdab…"
+    assert step["ts_ms"] == 0
@@ -99,3 +99,26 @@ def test_list_agent_traces_by_session(store: LocalStateStore) -> None:
     items, _ = store.list_agent_traces(session_key="sess:one", limit=10)
     assert len(items) == 1
     assert items[0]["traceId"] == "run-a"
+
+
+def test_persist_trace_logs_failed_background_write(store: LocalStateStore, monkeypatch) -> None:
+    from loguru import logger
+
+    from joyhousebot.api import server
+    from joyhousebot.services.chat.trace_context import TraceRecorder, trace_recorder
+
+    def broken_insert(**kwargs):
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(store, "insert_agent_trace", broken_insert)
+    monkeypatch.setattr(server, "_get_store", lambda: store)
+    messages: list[str] = []
+    sink = logger.add(messages.append, level="WARNING")
+    try:
+        trace_recorder.set(TraceRecorder(started_at_ms=1000, message_preview="hi"))
+        server._persist_trace("run-x", "sess:main", "ok", None)
+        store.aio.shutdown(wait=True)
+    finally:
+        logger.remove(sink)
+    assert trace_recorder.get() is None
+    assert any("run-x" in m and "disk I/O error" in m for m in messages)
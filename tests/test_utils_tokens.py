@@ -0,0 +1,113 @@
+"""Tests for token counting, cached per-message counts and token-budgeted history."""
+
+import pytest
+
+from joyhousebot.agent.context import ContextBuilder
+from joyhousebot.session.base import Session
+from joyhousebot.session.usage_ledger import message_usage
+from joyhousebot.utils.tokens import (
+    MESSAGE_OVERHEAD_TOKENS,
+    HeuristicTokenCounter,
+    count_message_tokens,
+    get_token_counter,
+    load_token_counter,
+    set_token_counter,
+)
+
+
+class _CharCounter:
+    """One token per character, counting calls."""
+
+    name = "chars"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text)
+
+
+@pytest.fixture
+def chars():
+    counter = _CharCounter()
+    set_token_counter(counter)
+    yield counter
+    set_token_counter(None)
+
+
+def test_heuristic_counts_cjk_per_character() -> None:
+    counter = HeuristicTokenCounter()
+    assert counter.count("") == 0
+    assert counter.count("abcdefgh") == 2
+    # chars/4 would give 3 for these 12 ideographs; BPE tokenizers give ~12.
+    assert counter.count("我们明天上午十点开会讨论") == 12
+    assert counter.count("会议 meeting") == 2 + 2
+    assert counter.count("Привет") == 3
+
+
+def test_default_counter_uses_tiktoken_when_available() -> None:
+    pytest.importorskip("tiktoken")
+    counter = load_token_counter()
+    if isinstance(counter, HeuristicTokenCounter):
+        pytest.skip("no tiktoken encoding available offline")
+    assert counter.name == "tiktoken:cl100k_base"
+    assert counter.count("hello world") == 2
+    assert counter.count("<|endoftext|>") > 1
+
+
+def test_message_count_includes_parts_tool_calls_and_overhead(chars) -> None:
+    msg = {
+        "role": "assistant",
+        "content": [{"type": "text", "text": "abcd"}, {"type": "image_url", "image_url": {"url": "x"}}],
+        "tool_calls": ["call"],
+    }
+    assert count_message_tokens(msg) == MESSAGE_OVERHEAD_TOKENS + 4 + 64 + 4
+
+
+def test_add_message_caches_count_and_history_trims_by_tokens(chars) -> None:
+    session = Session(key="cli:t")
+    for i in range(10):
+        session.add_message("user", "x" * 6)  # 10 tokens each with overhead
+    assert session.messages[0]["tokens"] == 10
+    calls = chars.calls
+
+    history = session.get_history(max_messages=500, max_tokens=35)
+    assert len(history) == 3
+    assert [m["tokens"] for m in history] == [10, 10, 10]
+    assert len(session.get_history(max_messages=2, max_tokens=35)) == 2
+    assert len(session.get_history(max_messages=500, max_tokens=30)) == 3
+    assert len(session.get_history(max_messages=500, max_tokens=5)) == 0
+    assert len(session.get_history(max_messages=500)) == 10
+    # Windows come from the cached running sums: nothing was re-tokenized.
+    assert chars.calls == calls
+
+    session.add_message("assistant", "y" * 16)  # 20 tokens
+    assert [m["content"] for m in session.get_history(max_tokens=35)] == ["x" * 6, "y" * 16]
+
+    session.clear()
+    session.add_message("user", "z")
+    assert session.get_history(max_tokens=35) == [{"role": "user", "content": "z", "tokens": 5}]
+
+
+def test_loaded_messages_are_counted_once(chars) -> None:
+    session = Session(key="cli:legacy", messages=[{"role": "user", "content": "abc"} for _ in range(4)])
+    assert len(session.get_history(max_tokens=14)) == 2
+    assert chars.calls == 4
+    assert session.messages[0]["tokens"] == 7
+    session.get_history(max_tokens=14)
+    assert chars.calls == 4
+
+
+def test_trim_history_uses_cached_counts(chars) -> None:
+    history = [{"role": "user", "content": "ignored", "tokens": 10} for _ in range(5)]
+    assert len(ContextBuilder.trim_history_by_tokens(history, 25)) == 2
+    assert chars.calls == 0
+    assert len(ContextBuilder.trim_history_by_tokens([{"role": "user", "content": "abcdef"}], 10)) == 1
+    assert chars.calls == 1
+
+
+def test_usage_estimates_use_the_same_counter(chars) -> None:
+    assert get_token_counter() is chars
+    assert message_usage({"role": "user", "content": "你好"}) == (2, 0, 0.0)
+    assert message_usage({"role": "assistant", "content": "abc", "usage": {"output": 9}}) == (0, 9, 0.0)